@@ -0,0 +1,16 @@
+"""
+Put the checkout on ``sys.path`` so benchmarks run from it.
+
+The checkout root makes the ``doolittle`` facade importable, and
+``doolittle._paths`` adds every package's ``src/`` tree.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import doolittle._paths  # noqa: E402, F401
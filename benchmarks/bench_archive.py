@@ -0,0 +1,129 @@
+"""
+Session history: columnar SignalArchive vs. BioSignal JSON lines.
+
+Writes one session's signals a frame's batch at a time into a
+SignalArchive and, for comparison, as one BioSignal JSON document per
+line (the way a signal list is usually persisted). Then reads both
+back: the whole history, and a short time window of one source, which
+the archive answers from the memory map of the segments that overlap it
+and the JSON file only by parsing every line. Reports rows per second
+and bytes per row. Appends cost tens of microseconds whatever their
+size, so the archive is also written a second of frames at a time.
+
+Run with: python benchmarks/bench_archive.py [--rows 200000] [--batch 6] [--window 0.01]
+"""
+
+import argparse
+import itertools
+import json
+from pathlib import Path
+import tempfile
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from archive import SignalArchive
+from schema import BioSignal
+from signal_batch import SOURCES, BioSignalBatch
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=6, help="Signals per frame")
+    parser.add_argument("--window", type=float, default=0.01,
+                        help="Queried fraction of the history")
+    parser.add_argument("--segment-rows", type=int, default=65536)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = args.rows // args.batch
+    n = frames * args.batch
+    metadata = [{"primitive": "grimace", "roi": [12, 40, 96, 96]}, {"primitive": "vitals"}, {}]
+    batches = [
+        BioSignalBatch.from_columns(
+            source=rng.integers(0, len(SOURCES), args.batch),
+            species="cat",
+            normalized_value=rng.random(args.batch),
+            confidence=rng.uniform(0.3, 1.0, args.batch),
+            timestamp=np.full(args.batch, f / 30.0),
+            raw_value=rng.normal(80.0, 10.0, args.batch),
+            metadata=[metadata[i % 3] for i in range(args.batch)],
+        )
+        for f in range(frames)
+    ]
+    signals = BioSignalBatch.concat(batches).to_signals()
+    duration = frames / 30.0
+    start = duration * 0.5
+    end = start + duration * args.window
+    source = SOURCES[1]
+
+    def timed(fn):
+        best, out = float("inf"), None
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            out = fn()
+            best = min(best, time.perf_counter() - t)
+        return best, out
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root, jsonl = Path(tmp) / "archive", Path(tmp) / "signals.jsonl"
+        runs = itertools.count()
+
+        def write_archive(chunks):
+            with SignalArchive(root, segment_rows=args.segment_rows) as archive:
+                session = f"run-{next(runs)}"
+                for batch in chunks:
+                    archive.append(session, batch)
+                archive.seal(session)
+            return session
+
+        def write_json():
+            with open(jsonl, "w", encoding="utf-8") as f:
+                for s in signals:
+                    f.write(s.model_dump_json() + "\n")
+
+        seconds = [BioSignalBatch.concat(batches[i:i + 30]) for i in range(0, frames, 30)]
+        t_write, session = timed(lambda: write_archive(batches))
+        t_write_seconds, _ = timed(lambda: write_archive(seconds))
+        t_write_json, _ = timed(write_json)
+        archive_bytes = sum(p.stat().st_blocks * 512 for p in (root / session).iterdir())
+        json_bytes = jsonl.stat().st_size
+
+        def read_json(lo=-np.inf, hi=np.inf, sources=None):
+            with open(jsonl, encoding="utf-8") as f:
+                rows = [BioSignal.model_validate(json.loads(line)) for line in f]
+            return [
+                s for s in rows
+                if lo <= s.timestamp < hi and (sources is None or s.source in sources)
+            ]
+
+        archive = SignalArchive(root, readonly=True)
+        t_all, everything = timed(lambda: archive.query(session))
+        t_all_json, _ = timed(read_json)
+        t_window, window = timed(lambda: archive.query(session, start, end, sources=[source]))
+        t_window_json, window_json = timed(lambda: read_json(start, end, {source}))
+        assert len(window) == len(window_json) and len(everything) == n
+
+        with SignalArchive(root, segment_rows=args.segment_rows) as writer:
+            segments = len(writer.segments(session))
+            t = time.perf_counter()
+            writer.compact(session)
+            t_compact = time.perf_counter() - t
+        t_window_compacted, _ = timed(lambda: archive.query(session, start, end, sources=[source]))
+
+        print(f"{n} rows ({frames} frames x {args.batch} signals), window {len(window)} rows")
+        print(f"write, archive:       {n / t_write:12,.0f} rows/s  {archive_bytes / n:6.1f} B/row")
+        print(f"  a second at a time: {n / t_write_seconds:12,.0f} rows/s")
+        print(f"write, JSON lines:    {n / t_write_json:12,.0f} rows/s  "
+              f"{json_bytes / n:6.1f} B/row")
+        print(f"read all, archive:    {n / t_all:12,.0f} rows/s")
+        print(f"read all, JSON lines: {n / t_all_json:12,.0f} rows/s")
+        print(f"window, archive:      {t_window * 1e3:10.2f} ms")
+        print(f"window, compacted:    {t_window_compacted * 1e3:10.2f} ms "
+              f"({segments} segments merged in {t_compact * 1e3:.0f} ms)")
+        print(f"window, JSON lines:   {t_window_json * 1e3:10.2f} ms")
+
+if __name__ == "__main__":
+    main()
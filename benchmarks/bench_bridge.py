@@ -0,0 +1,64 @@
+"""
+Short sessions through DolittleBridge vs. a new AiVetPipeline per session.
+
+Each session sends ``--frames`` frames with a one-second clip, as a
+per-request triage endpoint would. The baseline builds a pipeline for
+every session's PipelineContext; bridges borrow the pooled pipeline.
+Also reports the cost of re-rendering a result in another format.
+
+Run with: python benchmarks/bench_bridge.py [--sessions 40] [--frames 3]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from doolittle import DolittleBridge, OutputFormat
+from pipeline import AiVetPipeline, PipelineContext
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--frames", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    species = ["cat", "dog", "rabbit"]
+    frames = rng.integers(16, 240, size=(args.frames, 480, 640, 3), dtype=np.uint8)
+    clip = (rng.standard_normal(16000) * 0.1).astype(np.float32)
+
+    start = time.perf_counter()
+    for s in range(args.sessions):
+        context = PipelineContext(session_id=f"s{s}", species=species[s % 3])
+        pipeline = AiVetPipeline(context)
+        for frame in frames:
+            pipeline.process_frame(frame, clip)
+    t_new = (time.perf_counter() - start) / args.sessions
+
+    start = time.perf_counter()
+    for s in range(args.sessions):
+        bridge = DolittleBridge(species=species[s % 3])
+        bridge.start_session(f"s{s}")
+        for frame in frames:
+            bridge.run_triage(image=frame, audio=clip)
+        bridge.end_session()
+    t_bridge = (time.perf_counter() - start) / args.sessions
+
+    bridge.start_session("render")
+    bridge.run_triage(image=frames[0], audio=clip)
+    reps = 10000
+    start = time.perf_counter()
+    for _ in range(reps):
+        bridge.render(OutputFormat.PET)
+        bridge.render(OutputFormat.CLINICAL)
+    t_render = (time.perf_counter() - start) / (2 * reps)
+
+    print(f"{args.sessions} sessions x {args.frames} frames + 1 s clips")
+    print(f"pipeline per session: {t_new * 1e3:7.1f} ms/session")
+    print(f"pooled bridge:        {t_bridge * 1e3:7.1f} ms/session ({t_new / t_bridge:.1f}x)")
+    print(f"re-render:            {t_render * 1e6:7.1f} us")
+
+if __name__ == "__main__":
+    main()
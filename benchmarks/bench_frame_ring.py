@@ -0,0 +1,68 @@
+"""
+Frame hand-off cost: shared-memory frame ring vs. copying into the worker arena.
+
+Capture writes 640x480 RGB frames into a FrameRing once. The pool then
+either copies each frame into its own shared arena (``process_frames``)
+or reads it straight from the ring (``process_ring``). Also reports the
+raw ring write rate and the cost of taking a reader view.
+
+Run with: python benchmarks/bench_frame_ring.py [--workers 2] [--frames 256] [--slots 64]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from frame_ring import FrameRing
+from workers import WorkerConfig, WorkerPool
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--frames", type=int, default=256)
+    parser.add_argument("--slots", type=int, default=64)
+    parser.add_argument("--sessions", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    source = rng.integers(0, 256, size=(args.slots, 480, 640, 3), dtype=np.uint8)
+
+    with FrameRing.create((480, 640, 3), slots=args.slots) as ring:
+        start = time.perf_counter()
+        for i in range(args.frames):
+            ring.write(source[i % args.slots], i / 30)
+        t_write = time.perf_counter() - start
+        start = time.perf_counter()
+        for seq in ring.available():
+            frame = ring.view(seq)
+            ring.is_current(seq)
+        t_view = (time.perf_counter() - start) / args.slots
+        del frame
+
+        seqs = list(ring.available())
+        session_ids = [f"session-{i % args.sessions}" for i in range(len(seqs))]
+        stack = np.stack([ring.view(s) for s in seqs])  # What a copying pipeline hands over
+        with WorkerPool(WorkerConfig(workers=args.workers)) as pool:
+            # Warm up
+            pool.process_ring(ring, seqs[:args.workers], session_ids[:args.workers], "cat")
+            start = time.perf_counter()
+            pool.process_frames(stack, None, session_ids, "cat", 0.0)
+            t_copy = time.perf_counter() - start
+            start = time.perf_counter()
+            pool.process_ring(ring, seqs, session_ids, "cat")
+            t_ring = time.perf_counter() - start
+
+    mb = 480 * 640 * 3 / 2**20
+    print(
+        f"ring write:     {args.frames / t_write:10.0f} frames/s "
+        f"({args.frames * mb / t_write:.0f} MiB/s)"
+    )
+    print(f"reader view:    {t_view * 1e6:10.2f} us/frame")
+    print(f"{len(seqs)} frames through {args.workers} worker(s)")
+    print(f"arena copy:     {len(seqs) / t_copy:10.0f} frames/s")
+    print(f"ring (no copy): {len(seqs) / t_ring:10.0f} frames/s  ({t_copy / t_ring:.2f}x)")
+
+if __name__ == "__main__":
+    main()
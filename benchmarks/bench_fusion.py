@@ -0,0 +1,81 @@
+"""
+Fusion engine throughput in signal sets per second.
+
+Each set holds a grimace score, two vitals deviations and a vocal score,
+spread over every species. Reports fusing sets one call at a time, all
+sets in one fuse_many call, and the array core alone (no BioSignal
+unpacking or PainAssessment construction).
+
+Run with: python benchmarks/bench_fusion.py [--sets 10000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from fusion import SPECIES, FusionEngine
+from schema import BioSignal, SignalSource
+
+SET_SOURCES = (
+    SignalSource.VISION_GRIMACE,
+    SignalSource.VISION_VITALS,
+    SignalSource.VISION_VITALS,
+    SignalSource.AUDIO_VOCAL,
+)
+
+def synthetic_sets(rng: np.random.Generator, n: int):
+    sets = []
+    for i in range(n):
+        species = SPECIES[i % len(SPECIES)]
+        sets.append([
+            BioSignal(
+                source=source,
+                species=species,
+                raw_value=0.0,
+                normalized_value=float(rng.random()),
+                confidence=float(rng.uniform(0.3, 1.0)),
+                timestamp=float(i),
+            )
+            for source in SET_SOURCES
+        ])
+    return sets
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sets", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    sets = synthetic_sets(rng, args.sets)
+    engine = FusionEngine()
+
+    n = args.sets * len(SET_SOURCES)
+    group = np.repeat(np.arange(args.sets), len(SET_SOURCES))
+    source = rng.integers(0, 5, n)
+    value, confidence, timestamp = rng.random(n), rng.random(n), rng.random(n)
+    species = np.arange(args.sets) % len(SPECIES)
+
+    def timed(fn):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    t_single = timed(lambda: [engine.fuse(s) for s in sets])
+    t_many = timed(lambda: engine.fuse_many(sets))
+    t_arrays = timed(
+        lambda: engine.fuse_arrays(group, source, value, confidence, timestamp, species)
+    )
+
+    print(f"{args.sets} signal sets x {len(SET_SOURCES)} signals")
+    print(f"fuse (per set): {args.sets / t_single:12.0f} sets/s")
+    print(f"fuse_many:      {args.sets / t_many:12.0f} sets/s")
+    print(f"fuse_arrays:    {args.sets / t_arrays:12.0f} sets/s")
+
+if __name__ == "__main__":
+    main()
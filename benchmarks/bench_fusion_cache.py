@@ -0,0 +1,82 @@
+"""
+Per-set fusion with and without the memoizing CachedFusionEngine.
+
+Streams the signal sets of resting animals (a fixed set per animal plus
+small frame-to-frame noise) through ``fuse`` one set at a time, as
+``process_frame`` does, and reports time per set, the hit rate and the
+largest difference in pain probability that rounding introduced. Also
+reports ``fuse_batch`` over all animals at once, which is not cached.
+
+Run with: python benchmarks/bench_fusion_cache.py [--animals 12] [--frames 500] [--noise 0.002]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from fusion import CachedFusionEngine, FusionEngine
+from signal_batch import BioSignalBatch
+
+SET_SOURCES = np.array([0, 1, 1, 3])  # Grimace, two vitals deviations, vocal
+SPECIES = ("cat", "dog", "rabbit")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--animals", type=int, default=12)
+    parser.add_argument("--frames", type=int, default=500)
+    parser.add_argument("--noise", type=float, default=0.002)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    k = len(SET_SOURCES)
+    values = rng.random((args.animals, k))
+    confidences = rng.uniform(0.3, 1.0, (args.animals, k))
+    stream = []
+    for frame in range(args.frames):
+        for a in range(args.animals):
+            stream.append((SPECIES[a % len(SPECIES)], BioSignalBatch.from_columns(
+                source=SET_SOURCES,
+                species=SPECIES[a % len(SPECIES)],
+                raw_value=[0.0] * k,
+                normalized_value=np.clip(values[a] + rng.normal(0.0, args.noise, k), 0.0, 1.0),
+                confidence=np.clip(confidences[a] + rng.normal(0.0, args.noise, k), 0.0, 1.0),
+                timestamp=np.full(k, float(frame)),
+            )))
+
+    engine, cached = FusionEngine(), CachedFusionEngine()
+
+    def timed(fn):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    t_engine = timed(lambda: [engine.fuse(batch, sp) for sp, batch in stream])
+    t_cached = timed(lambda: [cached.fuse(batch, sp) for sp, batch in stream])
+    deviation = max(
+        abs(engine.fuse(batch, sp).assessment.pain_probability
+            - cached.fuse(batch, sp).assessment.pain_probability)
+        for sp, batch in stream[:2000]
+    )
+    stats = cached.stats()
+
+    frame = BioSignalBatch.concat([batch for _, batch in stream[:args.animals]])
+    offsets = np.arange(args.animals + 1) * k
+    species = [sp for sp, _ in stream[:args.animals]]
+    t_batch = timed(lambda: engine.fuse_batch(frame, offsets, species))
+
+    n = len(stream)
+    print(f"{args.animals} animals x {args.frames} frames, noise {args.noise}")
+    print(f"fuse, engine:        {t_engine / n * 1e6:8.1f} us/set")
+    print(f"fuse, cached:        {t_cached / n * 1e6:8.1f} us/set "
+          f"(hit rate {stats['hit_rate']:.1%}, {stats['size']} sets cached)")
+    print(f"fuse_batch, engine:  {t_batch / args.animals * 1e6:8.1f} us/set (not cached)")
+    print(f"max probability difference from rounding: {deviation:.4f}")
+
+if __name__ == "__main__":
+    main()
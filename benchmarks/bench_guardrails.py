@@ -0,0 +1,77 @@
+"""
+Guardrail checks on vitals signals: vectorized batch vs. per-signal validation.
+
+The per-signal baseline looks up the bounds and compares each BioSignal
+in Python, as a field validator would. Also reports the cost of checking
+the two-row batch one frame of vitals produces, as in the streaming path.
+
+Run with: python benchmarks/bench_guardrails.py [--signals 100000]
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from guardrails import GuardrailEngine
+from schema import SignalSource
+from signal_batch import SPECIES, BioSignalBatch
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--signals", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.signals
+    metadata = [
+        {"metric": "heart_rate", "unit": "bpm"},
+        {"metric": "respiration_rate", "unit": "bpm"},
+    ]
+    batch = BioSignalBatch.from_columns(
+        source=SignalSource.VISION_VITALS,
+        species=rng.choice(["cat", "dog", "horse", "rabbit"], size=n).tolist(),
+        normalized_value=rng.random(n),
+        confidence=0.9,
+        timestamp=0.0,
+        raw_value=rng.uniform(0, 300, n),
+        metadata=[metadata[i % 2] for i in range(n)],
+    )
+    signals = batch.to_signals()
+    guardrails = GuardrailEngine()
+
+    start = time.perf_counter()
+    result = guardrails.check(batch)
+    t_batch = time.perf_counter() - start
+
+    bounds = {
+        (species, metric["metric"]): guardrails.bounds_for(species.value, metric["metric"])
+        for species in SPECIES
+        for metric in metadata
+    }
+    start = time.perf_counter()
+    rejected = 0
+    for signal in signals:
+        lo, hi = bounds[signal.species, signal.metadata["metric"]]
+        value = signal.raw_value
+        rejected += math.isnan(value) or not lo <= value <= hi
+    t_loop = time.perf_counter() - start
+    assert rejected == int(result.rejected.sum())
+
+    frame = batch[:2]
+    reps = 20000
+    start = time.perf_counter()
+    for _ in range(reps):
+        guardrails.check(frame)
+    t_frame = (time.perf_counter() - start) / reps
+
+    print(f"{n} vitals signals, {int(result.rejected.sum())} rejected")
+    print(f"per-signal loop: {t_loop * 1e3:8.1f} ms ({t_loop / n * 1e9:6.0f} ns/signal)")
+    print(f"batch check:     {t_batch * 1e3:8.1f} ms ({t_batch / n * 1e9:6.0f} ns/signal, "
+          f"{t_loop / t_batch:.0f}x)")
+    print(f"one frame (2 rows): {t_frame * 1e6:.1f} us")
+
+if __name__ == "__main__":
+    main()
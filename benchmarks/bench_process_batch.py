@@ -0,0 +1,70 @@
+"""
+Throughput of AiVetPipeline.process_batch against the per-frame path.
+
+Run with: python benchmarks/bench_process_batch.py [--items 256] [--repeat 5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from pipeline import AiVetPipeline, PipelineContext
+
+def make_workload(n: int, seed: int = 0):
+    """Synthetic 640x480 frames and 1 s clips at 16 kHz, like demo.py."""
+    rng = np.random.default_rng(seed)
+    images = rng.integers(0, 256, size=(n, 480, 640, 3), dtype=np.uint8)
+    lengths = rng.integers(8000, 16000, size=n)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    audio = (rng.standard_normal(offsets[-1]) * 0.1).astype(np.float32)
+    species = rng.choice(["cat", "dog", "rabbit"], size=n)
+    session_ids = np.array([f"session-{i % 64:03d}" for i in range(n)], dtype=object)
+    return images, audio, offsets, session_ids, species
+
+def bench(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=256)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    images, audio, offsets, session_ids, species = make_workload(args.items)
+    pipelines = {
+        sp: AiVetPipeline(PipelineContext(session_id="bench", species=sp))
+        for sp in np.unique(species)
+    }
+    batch_pipeline = AiVetPipeline(PipelineContext(session_id="bench", species="cat"))
+
+    def per_frame():
+        for i in range(args.items):
+            pipelines[species[i]].process_frame(
+                image=images[i], audio=audio[offsets[i]:offsets[i + 1]]
+            )
+
+    def batched():
+        batch_pipeline.process_batch(
+            images=images,
+            audio=audio,
+            audio_offsets=offsets,
+            session_ids=session_ids,
+            species=species,
+        )
+
+    t_frame = bench(per_frame, args.repeat)
+    t_batch = bench(batched, args.repeat)
+    print(f"items: {args.items}")
+    print(f"process_frame loop: {args.items / t_frame:10.1f} items/s ({t_frame * 1e3:.2f} ms)")
+    print(f"process_batch:      {args.items / t_batch:10.1f} items/s ({t_batch * 1e3:.2f} ms)")
+    print(f"speedup:            {t_frame / t_batch:10.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Respiration estimator cost at 30 fps x 200 concurrent patients.
+
+Reports the per-tick cost (one frame for every patient) of:
+- the sliding-DFT update + estimate, against recomputing an FFT over the
+  whole window every frame;
+- global flow from 640x480 frames, the pixel work feeding the estimator.
+
+Run with: python benchmarks/bench_respiration.py [--patients 200] [--seconds 10]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from vitals import RespirationEstimator, frame_to_gray, global_flow
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patients", type=int, default=200)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--window-s", type=float, default=30.0)
+    parser.add_argument("--gray-step", type=int, default=4)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    ticks = int(args.fps * args.seconds)
+    budget_ms = 1e3 / args.fps
+    t = np.arange(ticks)[:, None] / args.fps
+    rates = rng.uniform(20, 30, size=args.patients) / 60.0
+    flows = np.stack([np.sin(2 * np.pi * rates * t), np.cos(2 * np.pi * rates * t)], axis=-1)
+    flows += rng.normal(0, 0.5, flows.shape)
+
+    est = RespirationEstimator("cat", fps=args.fps, window_s=args.window_s, patients=args.patients)
+    start = time.perf_counter()
+    for i in range(ticks):
+        est.push(flows[i])
+        est.estimate()
+    sdft_ms = (time.perf_counter() - start) / ticks * 1e3
+
+    window = est.window
+    history = np.zeros((args.patients * 2, window))
+    start = time.perf_counter()
+    for i in range(ticks):
+        history = np.roll(history, -1, axis=1)
+        history[:, -1] = flows[i].reshape(-1)
+        np.abs(np.fft.rfft(history, axis=1)[:, est.bins]) ** 2
+    fft_ms = (time.perf_counter() - start) / ticks * 1e3
+
+    frames = rng.integers(0, 256, size=(2, 480, 640, 3), dtype=np.uint8)
+    prev = frame_to_gray(frames[0], args.gray_step)
+    start = time.perf_counter()
+    for i in range(args.patients):
+        gray = frame_to_gray(frames[(i + 1) % 2], args.gray_step)
+        global_flow(prev, gray)
+        prev = gray
+    flow_ms = (time.perf_counter() - start) * 1e3
+
+    print(f"patients: {args.patients} @ {args.fps:g} fps, window {args.window_s:g} s"
+          f" ({window} samples, {len(est.bins)} bins), budget {budget_ms:.1f} ms/tick")
+    print(f"sliding DFT update + estimate: {sdft_ms:8.3f} ms/tick")
+    print(f"full-window FFT per frame:     {fft_ms:8.3f} ms/tick")
+    print(f"global flow (640x480, step {args.gray_step}): {flow_ms:8.3f} ms/tick")
+    print(f"total with sliding DFT:        {sdft_ms + flow_ms:8.3f} ms/tick"
+          f" ({(sdft_ms + flow_ms) / budget_ms:.0%} of one core)")
+
+if __name__ == "__main__":
+    main()
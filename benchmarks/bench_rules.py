@@ -0,0 +1,126 @@
+"""
+Symptom rules: compiled decision table vs. per-assessment Python if-chains.
+
+Generates ``--rules`` random interval rules over the signal features,
+spread across species, and evaluates them on ``--groups`` fused signal
+sets. The baseline walks every rule's conditions in Python for each
+set, as hand-written rule code would. The table's time includes building
+the feature matrix from the batch; times are the best of ``--repeat``.
+
+The last row evaluates one signal set per call, as ``process_frame``
+does. There the table's fixed NumPy overhead (tens of microseconds) is
+larger than an if-chain over a few dozen rules; the table pays off once
+sets are batched.
+
+Run with: python benchmarks/bench_rules.py [--rules 30] [--groups 1000] [--repeat 5]
+"""
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+import _paths  # noqa: F401
+from rules import FEATURES, Rule, RuleEngine, signal_features
+from schema import SignalSource
+from signal_batch import BioSignalBatch, species_code
+
+def _best(fn: Callable[[], object], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=int, default=30)
+    parser.add_argument("--groups", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    species_names = ["cat", "dog", "rabbit", "horse", "bird"]
+    rules = []
+    for r in range(args.rules):
+        names = rng.choice(FEATURES, size=rng.integers(1, 4), replace=False)
+        when = {str(f): (float(rng.uniform(0, 0.5)), None) for f in names}
+        rules.append(Rule(f"symptom_{r % 40}", when, species=(species_names[r % 5],)))
+    engine = RuleEngine(rules)
+
+    sources = [SignalSource.VISION_GRIMACE, SignalSource.AUDIO_VOCAL]
+    sources += [SignalSource.VISION_VITALS] * 2
+    metadata = [{}, {}, {"metric": "heart_rate"}, {"metric": "respiration_rate"}]
+    counts = np.full(args.groups, 4)
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    n = int(offsets[-1])
+    kind = np.tile(np.arange(4), args.groups)
+    species = rng.choice(species_names, size=args.groups)
+    batch = BioSignalBatch.from_columns(
+        source=[sources[k] for k in kind],
+        species=np.repeat(species, 4).tolist(),
+        normalized_value=rng.random(n),
+        confidence=rng.random(n),
+        timestamp=0.0,
+        raw_value=rng.uniform(0, 1, n),
+        metadata=[metadata[k] for k in kind],
+    )
+    pain, confidence = rng.random(args.groups), rng.random(args.groups)
+
+    result = engine.evaluate(batch, offsets, species, pain, confidence)
+    t_table = _best(lambda: engine.evaluate(batch, offsets, species, pain, confidence), args.repeat)
+
+    features = signal_features(batch, offsets, pain, confidence)
+    codes = [species_code(s) for s in species]
+    compiled = [
+        ({species_code(s) for s in rule.species},
+         [(FEATURES.index(f), lo, hi) for f, (lo, hi) in rule.when.items()])
+        for rule in engine.rules
+    ]
+
+    def if_chains(groups: range = range(args.groups)) -> int:
+        fired = 0
+        for g in groups:
+            row = features[g].tolist()
+            for rule_species, conditions in compiled:
+                if codes[g] not in rule_species:
+                    continue
+                for f, lo, hi in conditions:
+                    value = row[f]
+                    if not (value >= (lo if lo is not None else -np.inf)
+                            and value <= (hi if hi is not None else np.inf)):
+                        break
+                else:
+                    fired += 1
+        return fired
+
+    fired = if_chains()
+    assert fired == int(result.fired.sum())
+    t_loop = _best(if_chains, args.repeat)
+
+    # One set per call, as in the per-frame pipeline path
+    single = min(args.groups, 100)
+    one = np.array([0, 4])
+
+    def single_table() -> None:
+        for g in range(single):
+            engine.evaluate(
+                batch[offsets[g]:offsets[g + 1]], one, species[g:g + 1],
+                pain[g:g + 1], confidence[g:g + 1],
+            )
+
+    t_single_table = _best(single_table, args.repeat) / single
+    t_single_loop = _best(lambda: [if_chains(range(g, g + 1)) for g in range(single)],
+                          args.repeat) / single
+
+    print(f"{args.rules} rules, {args.groups} signal sets, {fired} rule firings")
+    print(f"if-chains:      {t_loop * 1e3:8.1f} ms ({t_loop / args.groups * 1e6:6.1f} us/set)")
+    print(f"decision table: {t_table * 1e3:8.1f} ms ({t_table / args.groups * 1e6:6.1f} us/set, "
+          f"{t_loop / t_table:.1f}x)")
+    print(f"one set per call: if-chains {t_single_loop * 1e6:.1f} us, "
+          f"decision table {t_single_table * 1e6:.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Primitive runs saved by the adaptive scheduler on a simulated ward.
+
+Sessions are spread over triage levels (mostly routine) and receive
+frames at ``--fps`` for a simulated ``--minutes``. Reports the share of
+frames each level runs vitals on, the compute that implies against the
+budget, and the scheduler's own cost per decision.
+
+Run with: python benchmarks/bench_scheduler.py [--sessions 200] [--budget 0.5] [--minutes 10]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from scheduler import Scheduler, SchedulerConfig, TRIAGE_LEVELS
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=0.5, help="Primitive seconds per second")
+    parser.add_argument("--minutes", type=float, default=10.0)
+    parser.add_argument("--fps", type=float, default=5.0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    mix = [0.80, 0.10, 0.05, 0.03, 0.02]  # ROUTINE..EMERGENCY
+    levels = rng.choice(len(TRIAGE_LEVELS), size=args.sessions, p=mix)
+    session_ids = [f"kennel-{i:03d}" for i in range(args.sessions)]
+    cost = SchedulerConfig().primitives["vitals"].cost_s
+    scheduler = Scheduler(SchedulerConfig(budget_s=args.budget * args.fps / 30.0))
+    for session_id, level in zip(session_ids, levels):
+        scheduler.update(session_id, TRIAGE_LEVELS[level], 0.8, now=0.0)
+
+    ticks = np.arange(0.0, args.minutes * 60.0, 1.0 / args.fps)
+    warmup = len(ticks) // 5  # Skip the initial run every new session gets
+    runs = np.zeros(args.sessions)
+    start = time.perf_counter()
+    for k, now in enumerate(ticks):
+        for s, session_id in enumerate(session_ids):
+            if scheduler.due(session_id, "vitals", now) and k >= warmup:
+                runs[s] += 1
+    elapsed = time.perf_counter() - start
+
+    frames = len(ticks) - warmup
+    print(f"{args.sessions} sessions at {args.fps:g} fps, budget {args.budget:g} s/s at 30 fps")
+    print(f"{'level':>10} {'sessions':>9} {'frames run':>11} {'share':>6}")
+    for i, level in enumerate(TRIAGE_LEVELS):
+        mask = levels == i
+        if mask.any():
+            run_share = runs[mask].sum() / (mask.sum() * frames)
+            print(f"{level.value:>10} {mask.sum():9d} {run_share:11.1%} "
+                  f"{scheduler.shares[level]:6.2f}")
+    used = runs.sum() * cost / (frames / args.fps) * 30.0 / args.fps
+    unscheduled = args.sessions * cost * 30.0
+    print(f"vitals compute at 30 fps: {used:.2f} s/s (unscheduled {unscheduled:.2f} s/s)")
+    print(f"scheduler cost: {elapsed / (len(ticks) * args.sessions) * 1e6:.2f} us/decision")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Session store cost with thousands of concurrent monitoring sessions.
+
+Each update appends four signals and one fused assessment to a session,
+round-robin over all sessions. Reports the update rate and the memory
+held by the store against its configured ceiling.
+
+Run with: python benchmarks/bench_session_store.py [--sessions 5000] [--updates 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+import _paths  # noqa: F401
+from schema import SignalSource
+from session_store import SessionStore, SessionStoreConfig
+from signal_batch import BioSignalBatch
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--updates", type=int, default=100000)
+    parser.add_argument("--session-kb", type=int, default=16)
+    args = parser.parse_args()
+
+    config = SessionStoreConfig(
+        max_session_bytes=args.session_kb * 1024, max_sessions=args.sessions
+    )
+    store = SessionStore(config)
+    rng = np.random.default_rng(0)
+    signals = BioSignalBatch.from_columns(
+        source=[SignalSource.VISION_GRIMACE, SignalSource.VISION_VITALS,
+                SignalSource.VISION_VITALS, SignalSource.AUDIO_VOCAL],
+        species="cat",
+        normalized_value=rng.random(4),
+        confidence=0.9,
+        timestamp=0.0,
+    )
+    session_ids = [f"session-{i}" for i in range(args.sessions)]
+    probabilities = rng.random(args.updates)
+
+    # First pass creates every session; trace only that, since tracing slows the timed loop
+    tracemalloc.start()
+    for i, session_id in enumerate(session_ids):
+        p = float(probabilities[i % args.updates])
+        store.record_values(session_id, "cat", signals, p, 0.9, 0.0)
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for i in range(args.updates):
+        store.record_values(
+            session_ids[i % args.sessions], "cat", signals, float(probabilities[i]), 0.9, i / 30.0
+        )
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.sessions} sessions, {args.updates} updates")
+    print(f"update rate:        {args.updates / elapsed:10.0f} updates/s")
+    print(f"session memory:     {store.memory_bytes / 2**20:10.1f} MiB "
+          f"(cap {config.max_session_bytes * config.max_sessions / 2**20:.1f} MiB)")
+    print(f"traced allocations: {traced / 2**20:10.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Species config lookups: cached registry vs. the previous fallback-building lookup.
+
+The baseline lower-cases the key and builds a new fallback SpeciesConfig
+on every miss, as ``get_species_config`` used to. Also reports breed
+lookups and the memory allocated by a run of cached lookups.
+
+Run with: python benchmarks/bench_species.py [--lookups 1000000]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import _paths  # noqa: F401
+from schema import Species
+from species import SPECIES_CONFIGS, SpeciesConfig, get_species_config
+
+_PREVIOUS = {key: SPECIES_CONFIGS[key] for key in ("cat", "dog", "rabbit")}
+
+def _uncached(species: str) -> SpeciesConfig:
+    return _PREVIOUS.get(species.lower(), SpeciesConfig(
+        name=species,
+        pain_hiding_factor=0.5,
+        vocal_freq_range=(50, 8000),
+        grimace_supported=False,
+        gcps_supported=False,
+        typical_resting_rr=(15, 40),
+        typical_resting_hr=(60, 180),
+    ))
+
+def _time(fn, keys, n):
+    reps = n // len(keys)
+    start = time.perf_counter()
+    for _ in range(reps):
+        for key in keys:
+            fn(*key)
+    return (time.perf_counter() - start) / (reps * len(keys))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lookups", type=int, default=1000000)
+    args = parser.parse_args()
+
+    species = [(s.value,) for s in Species] + [(s,) for s in Species]
+    breeds = [("dog", "pug"), ("dog", "greyhound"), (Species.CAT, "Persian"), ("dog", "mutt")]
+    for key in species + breeds:
+        get_species_config(*key)  # Warm the caches
+
+    t_old = _time(_uncached, [(s.value,) for s in Species], args.lookups)
+    t_species = _time(get_species_config, species, args.lookups)
+    t_breed = _time(get_species_config, breeds, args.lookups)
+
+    tracemalloc.start()
+    _time(get_species_config, species + breeds, 100000)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"previous lookup: {t_old * 1e9:6.0f} ns")
+    print(f"species lookup:  {t_species * 1e9:6.0f} ns ({t_old / t_species:.1f}x)")
+    print(f"breed lookup:    {t_breed * 1e9:6.0f} ns")
+    print(f"retained after 100000 cached lookups: {current} bytes")
+
+if __name__ == "__main__":
+    main()
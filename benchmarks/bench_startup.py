@@ -0,0 +1,91 @@
+"""
+Time to first result of a fresh process, and weight loading with and without mmap.
+
+Each run starts a new interpreter, imports the pipeline, builds it and
+processes one frame with audio. With ``--idle`` the process waits that
+long between building the pipeline and the first frame (e.g. while a
+camera connects), which a prewarmed pipeline spends building its
+primitives. Times are medians over ``--runs`` processes.
+
+Also loads a ``--weights-mb`` weight file in a fresh process, once read
+with ``np.load`` and once mapped with ``load_weights``.
+
+Run with: python benchmarks/bench_startup.py [--runs 5] [--idle 0.3] [--weights-mb 256]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+import _paths  # noqa: F401
+from weights import save_weights
+
+STARTUP = """
+import time
+start = time.perf_counter()
+import numpy as np
+from pipeline import AiVetPipeline, PipelineContext
+imported = time.perf_counter()
+pipeline = AiVetPipeline(PipelineContext(session_id="s", species="cat"), prewarm={prewarm})
+built = time.perf_counter()
+rng = np.random.default_rng(0)
+image = rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+audio = (rng.standard_normal(16000) * 0.1).astype(np.float32)
+time.sleep({idle})
+first = time.perf_counter()
+pipeline.process_frame(image, audio)
+done = time.perf_counter()
+pipeline.process_frame(image, audio)
+steady = time.perf_counter() - done
+print(json.dumps([imported - start, built - imported, done - first, steady]))
+"""
+
+LOAD = """
+import time
+start = time.perf_counter()
+{load}
+weights["layer0"].sum()  # Touch one layer, as a first inference would
+print(json.dumps(time.perf_counter() - start))
+"""
+
+def _run(code: str) -> object:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    out = subprocess.run(
+        [sys.executable, "-c", "import json\n" + code],
+        env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--idle", type=float, default=0.3, help="Seconds before the first frame")
+    parser.add_argument("--weights-mb", type=int, default=256)
+    args = parser.parse_args()
+
+    print(f"{'':>10} {'import':>8} {'build':>8} {'first':>8} {'steady':>8}  (ms)")
+    for label, prewarm in (("lazy", False), ("prewarm", True)):
+        code = STARTUP.format(prewarm=prewarm, idle=args.idle)
+        times = np.median([_run(code) for _ in range(args.runs)], axis=0) * 1e3
+        print(f"{label:>10} " + " ".join(f"{t:8.1f}" for t in times))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "weights.npz")
+        layers = 8
+        size = args.weights_mb * 2**20 // (4 * layers)
+        save_weights(path, {f"layer{i}": np.ones(size, dtype=np.float32) for i in range(layers)})
+        for label, load in (
+            ("np.load", f"weights = dict(np.load({path!r}))"),
+            ("load_weights", f"from weights import load_weights\nweights = load_weights({path!r})"),
+        ):
+            t = np.median([_run("import numpy as np\n" + LOAD.format(load=load))
+                           for _ in range(args.runs)])
+            print(f"{args.weights_mb} MB weights, {label:>12}: {t * 1e3:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Per-session tail latency of AiVetPipeline.stream under concurrent load.
+
+Each session feeds 640x480 frames at --fps and 20 ms audio chunks in real
+time; the script reports p50/p99 capture-to-emit latency and drop counts.
+
+Run with: python benchmarks/bench_streaming.py [--sessions 32] [--seconds 5]
+"""
+
+import argparse
+import asyncio
+
+import numpy as np
+
+import _paths  # noqa: F401
+from pipeline import AiVetPipeline, PipelineContext
+
+async def paced(items, interval: float):
+    for item in items:
+        yield item
+        await asyncio.sleep(interval)
+
+async def run_session(index: int, fps: float, seconds: float, frame: np.ndarray, chunk: np.ndarray):
+    pipeline = AiVetPipeline(PipelineContext(session_id=f"bench-{index}", species="cat"))
+    n_frames = int(fps * seconds)
+    n_chunks = int(seconds / 0.02)
+    stream = pipeline.stream(
+        paced([frame] * n_frames, 1.0 / fps),
+        paced([chunk] * n_chunks, 0.02),
+    )
+    async for _ in stream:
+        pass
+    return stream.stats
+
+async def main_async(args):
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, size=(480, 640, 3), dtype=np.uint8)
+    chunk = (rng.standard_normal(320) * 0.1).astype(np.float32)
+    stats = await asyncio.gather(*[
+        run_session(i, args.fps, args.seconds, frame, chunk) for i in range(args.sessions)
+    ])
+    latencies = np.concatenate([list(s.latencies_s) for s in stats])
+    p99_per_session = [s.latency_percentile(99) for s in stats]
+    print(f"sessions: {args.sessions} @ {args.fps:g} fps for {args.seconds:g} s")
+    print(f"latency p50:            {np.percentile(latencies, 50) * 1e3:8.2f} ms")
+    print(f"latency p99:            {np.percentile(latencies, 99) * 1e3:8.2f} ms")
+    print(f"worst per-session p99:  {max(p99_per_session) * 1e3:8.2f} ms")
+    print(f"frames dropped:         {sum(s.frames_dropped for s in stats)}"
+          f" / {sum(s.frames_in for s in stats)}")
+    print(f"assessments dropped:    {sum(s.assessments_dropped for s in stats)}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Per-chunk cost of StreamingVocalAnalyzer over a long session.
+
+Feeds 20 ms chunks of synthetic calls and silence and reports chunk cost
+for the first and last minute, which should match: the analyzer's state
+is fixed-size, so cost does not grow with session length.
+
+Run with: python benchmarks/bench_streaming_audio.py [--minutes 10]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from vocalization import StreamingVocalAnalyzer
+
+SAMPLE_RATE = 16000
+CHUNK = SAMPLE_RATE // 50  # 20 ms
+
+def synthetic_minute(rng: np.random.Generator) -> np.ndarray:
+    """One minute alternating 1 s harmonic calls and 2 s of low noise."""
+    t = np.arange(SAMPLE_RATE) / SAMPLE_RATE
+    parts = []
+    for _ in range(20):
+        f0 = rng.uniform(400, 900)
+        parts.append(0.3 * np.sin(2 * np.pi * f0 * t) + 0.15 * np.sin(4 * np.pi * f0 * t))
+        parts.append(0.001 * rng.standard_normal(2 * SAMPLE_RATE))
+    return np.concatenate(parts).astype(np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--minutes", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    minute = synthetic_minute(rng)
+    analyzer = StreamingVocalAnalyzer("cat", sample_rate=SAMPLE_RATE)
+    per_minute_ms = []
+    events = 0
+    for _ in range(args.minutes):
+        costs = []
+        for start in range(0, len(minute), CHUNK):
+            t0 = time.perf_counter()
+            events += len(analyzer.push(minute[start:start + CHUNK]))
+            costs.append(time.perf_counter() - t0)
+        per_minute_ms.append((np.mean(costs) * 1e3, np.percentile(costs, 99) * 1e3))
+
+    print(f"{args.minutes} min session, 20 ms chunks at {SAMPLE_RATE} Hz, {events} events")
+    ends = (("first minute", per_minute_ms[0]), ("last minute", per_minute_ms[-1]))
+    for label, (mean, p99) in ends:
+        print(f"{label:13s} mean {mean:6.3f} ms/chunk  p99 {p99:6.3f} ms/chunk"
+              f"  ({mean / 20:.1%} of real time)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Overhead of pipeline telemetry: disabled, enabled, and enabled with a hook.
+
+Times ``process_frame`` and ``process_batch`` on the same inputs with
+three pipelines, interleaved so machine drift affects each alike, and
+reports the best run of each. Also reports the cost of one histogram
+record and of a stage with telemetry off.
+
+Run with: python benchmarks/bench_telemetry.py [--frames 200] [--items 32] [--repeat 5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from pipeline import AiVetPipeline, PipelineContext
+from telemetry import LatencyHistogram, StageHook, Telemetry
+
+class _CountingHook(StageHook):
+    def __init__(self):
+        self.calls = 0
+
+    def after(self, stage: str, species: str, items: int, seconds: float) -> None:
+        self.calls += 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--items", type=int, default=32)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, size=(args.frames, 240, 320, 3), dtype=np.uint8)
+    clip = (rng.standard_normal(8000) * 0.1).astype(np.float32)
+    audio = np.tile(clip, args.items)
+    offsets = np.arange(args.items + 1) * len(clip)
+    species = rng.choice(["cat", "dog", "rabbit"], size=args.items)
+    session_ids = [f"session-{i}" for i in range(args.items)]
+
+    context = PipelineContext(session_id="bench", species="cat")
+    pipelines = {
+        "off": AiVetPipeline(context),
+        "on": AiVetPipeline(context, telemetry=True),
+        "on + hook": AiVetPipeline(context, telemetry=Telemetry(hooks=[_CountingHook()])),
+    }
+
+    def per_frame(pipeline):
+        for frame in frames:
+            pipeline.process_frame(frame, clip)
+
+    def batched(pipeline):
+        for _ in range(4):
+            pipeline.process_batch(frames[:args.items], audio, offsets, session_ids, species)
+
+    for label, workload in (("process_frame", per_frame), ("process_batch", batched)):
+        best = dict.fromkeys(pipelines, float("inf"))
+        for pipeline in pipelines.values():
+            workload(pipeline)  # Build primitives and fill estimator windows
+        for _ in range(args.repeat):
+            for name, pipeline in pipelines.items():
+                start = time.perf_counter()
+                workload(pipeline)
+                best[name] = min(best[name], time.perf_counter() - start)
+        print(f"{label}:")
+        for name, t in best.items():
+            print(f"  {name:>10}: {t * 1e3:8.1f} ms ({t / best['off'] - 1:+.1%})")
+
+    histogram = LatencyHistogram()
+    values = rng.integers(10**4, 10**8, size=100000).tolist()
+    start = time.perf_counter()
+    for v in values:
+        histogram.record(v)
+    t_record = (time.perf_counter() - start) / len(values)
+    off = pipelines["off"]
+    start = time.perf_counter()
+    for _ in range(100000):
+        with off._timed("vision", "cat"):
+            pass
+    t_off = (time.perf_counter() - start) / 100000
+    print(f"histogram record: {t_record * 1e9:.0f} ns")
+    print(f"stage with telemetry off: {t_off * 1e9:.0f} ns")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Vocal feature extraction throughput at 16 kHz (the dataset audio spec).
+
+Compares per-clip extraction with extract_batch, which stacks the frames
+of every clip into shared FFT calls, and reports the real-time factor.
+The batch path mostly saves per-call overhead, so it gains most on short clips.
+
+Run with: python benchmarks/bench_vocal_features.py [--clips 128] [--seconds 0.5]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from vocalization import VocalFeatureExtractor
+
+SAMPLE_RATE = 16000
+
+def synthetic_clip(rng: np.random.Generator, seconds: float) -> np.ndarray:
+    """A jittered harmonic call in light noise, built period by period."""
+    f0 = rng.uniform(300, 1100)
+    jitter = rng.uniform(0.002, 0.06)
+    cycles = []
+    total = 0
+    while total < seconds * SAMPLE_RATE:
+        n = int(round(SAMPLE_RATE / f0 * (1 + jitter * rng.standard_normal())))
+        t = np.arange(n) / n
+        cycles.append(np.sin(2 * np.pi * t) + 0.5 * np.sin(4 * np.pi * t))
+        total += n
+    clip = 0.3 * np.concatenate(cycles)[:int(seconds * SAMPLE_RATE)]
+    clip += 0.01 * rng.standard_normal(len(clip))
+    return clip.astype(np.float32)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clips", type=int, default=128)
+    parser.add_argument("--seconds", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    clips = [synthetic_clip(rng, args.seconds) for _ in range(args.clips)]
+    extractor = VocalFeatureExtractor("cat", sample_rate=SAMPLE_RATE)
+    audio_s = args.clips * args.seconds
+
+    def timed(fn):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    t_single = timed(lambda: [extractor.extract(c) for c in clips])
+    t_batch = timed(lambda: extractor.extract_batch(clips))
+
+    print(f"{args.clips} clips x {args.seconds:g} s at {SAMPLE_RATE} Hz")
+    print(f"per-clip extract: {t_single * 1e3:8.1f} ms  ({audio_s / t_single:8.0f}x real time)")
+    print(f"extract_batch:    {t_batch * 1e3:8.1f} ms  ({audio_s / t_batch:8.0f}x real time)")
+
+if __name__ == "__main__":
+    main()
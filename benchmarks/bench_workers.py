@@ -0,0 +1,73 @@
+"""
+Scaling of the process-pool worker mode from 1 to N worker processes.
+
+Workload as in demo.py: 640x480 RGB frames (vitals monitoring, one
+stream per session) and 1 s audio clips at 16 kHz (vocal features).
+The in-process row runs the same primitives in the calling thread. Pool
+rows include writing every frame and clip into shared memory.
+
+Run with: python benchmarks/bench_workers.py [--max-workers 4] [--sessions 16] [--frames 8]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+import _paths  # noqa: F401
+from vitals import VitalsMonitor
+from vocalization import VocalFeatureExtractor
+from workers import WorkerConfig, WorkerPool
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=8, help="Frames per session")
+    parser.add_argument("--clips", type=int, default=32)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    n = args.sessions * args.frames
+    images = rng.integers(0, 256, size=(n, 480, 640, 3), dtype=np.uint8)
+    session_ids = [f"session-{i % args.sessions:03d}" for i in range(n)]
+    clips = [(rng.standard_normal(16000) * 0.1).astype(np.float32) for _ in range(args.clips)]
+
+    start = time.perf_counter()
+    monitors = {s: VitalsMonitor("cat") for s in set(session_ids)}
+    for i in range(n):
+        monitors[session_ids[i]].push_frame(images[i], 0.0)
+    t_frames = time.perf_counter() - start
+    start = time.perf_counter()
+    extractor = VocalFeatureExtractor("cat")
+    for clip in clips:
+        extractor.extract_batch([clip]).to_signal_batch("cat", 0.0)
+    t_audio = time.perf_counter() - start
+    baseline = t_frames + t_audio
+
+    print(f"{n} frames (640x480) over {args.sessions} sessions + {args.clips} x 1 s clips")
+    print(f"{'mode':>12} {'frames/s':>10} {'clips/s':>10} {'speedup':>8}")
+    print(
+        f"{'in-process':>12} {n / t_frames:10.0f} {args.clips / t_audio:10.0f} "
+        f"{1.0:8.2f}x  ({baseline * 1e3:.0f} ms)"
+    )
+
+    for workers in range(1, args.max_workers + 1):
+        with WorkerPool(WorkerConfig(workers=workers)) as pool:
+            # Warm up
+            pool.process_frames(images[:workers], None, session_ids[:workers], "cat", 0.0)
+            start = time.perf_counter()
+            pool.process_frames(images, None, session_ids, "cat", 0.0)
+            t_frames = time.perf_counter() - start
+            start = time.perf_counter()
+            pool.process_audio(clips, "cat", 0.0)
+            t_audio = time.perf_counter() - start
+        total = t_frames + t_audio
+        print(
+            f"{workers:>9} wk {n / t_frames:10.0f} {args.clips / t_audio:10.0f} "
+            f"{baseline / total:8.2f}x  ({total * 1e3:.0f} ms)"
+        )
+
+if __name__ == "__main__":
+    main()
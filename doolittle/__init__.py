@@ -0,0 +1,16 @@
+"""
+Doolittle - one import for the whole collective
+
+The packages live in separate ``src/`` trees; importing ``doolittle``
+puts them on the import path and exposes the ``DolittleBridge`` facade.
+
+Part of the Doolittle open-source collective.
+"""
+
+from . import _paths  # noqa: F401
+from .bridge import DolittleBridge, PipelinePool
+from .output import OutputFormat, render
+
+__version__ = "0.1.0"
+
+__all__ = ["DolittleBridge", "OutputFormat", "PipelinePool", "render"]
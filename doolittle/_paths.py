@@ -0,0 +1,12 @@
+"""
+Put every package's ``src/`` tree on ``sys.path`` so the facade runs from a checkout.
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+for src in sorted((ROOT / "packages").glob("*/src")):
+    if str(src) not in sys.path:
+        sys.path.insert(0, str(src))
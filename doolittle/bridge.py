@@ -0,0 +1,225 @@
+"""
+DolittleBridge: sessions, triage and output formatting over AiVetPipeline.
+
+One AiVetPipeline already serves any number of sessions and species:
+per-session estimators live in its SessionStore, and its fusion engine
+and vocal extractors are shared. Bridges therefore do not build a
+pipeline per session. They borrow a warm one from a ``PipelinePool``,
+keyed by the pipeline options, so a new bridge (one per request, say)
+reuses the primitives that earlier bridges loaded. Species and breed are
+per session and go to the pipeline with every item.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from pipeline import AiVetPipeline, PipelineContext
+from session_store import SessionStore
+
+from .output import OutputFormat, render
+
+@dataclass
+class _Session:
+    species: str
+    breed: Optional[str] = None
+    last_result: Optional[Dict[str, Any]] = None
+
+class _Pooled:
+    __slots__ = ("pipeline", "lock")
+
+    def __init__(self, pipeline: AiVetPipeline):
+        self.pipeline = pipeline
+        self.lock = threading.Lock()  # Pipelines are not thread-safe; calls are serialized
+
+class PipelinePool:
+    """
+    Warm pipelines shared by every bridge with the same options.
+
+    Options are compared by value for flags and by identity for objects
+    (stores, worker pools, schedulers). Every option value must be
+    hashable.
+
+    Args:
+        max_pipelines: Pipelines kept; the least recently acquired are
+            dropped (bridges that already hold one keep using it).
+    """
+
+    def __init__(self, max_pipelines: int = 16):
+        if max_pipelines < 1:
+            raise ValueError("max_pipelines must be >= 1")
+        self.max_pipelines = max_pipelines
+        self._pipelines: "OrderedDict[Tuple, _Pooled]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pipelines)
+
+    def acquire(self, **options: Any) -> _Pooled:
+        """The pooled pipeline for these options, built on first use."""
+        key = tuple(sorted(options.items()))
+        try:
+            hash(key)
+        except TypeError:
+            unhashable = [name for name, value in key if not _hashable(value)]
+            raise ValueError(f"pipeline options must be hashable, got {unhashable}") from None
+        with self._lock:
+            pooled = self._pipelines.get(key)
+            if pooled is None:
+                options = dict(options)
+                if options.get("store") is None:
+                    options["store"] = SessionStore()
+                # Only a default; bridges pass each item's species and breed
+                context = PipelineContext(session_id="bridge", species="unknown")
+                pooled = self._pipelines[key] = _Pooled(AiVetPipeline(context, **options))
+                while len(self._pipelines) > self.max_pipelines:
+                    self._pipelines.popitem(last=False)
+            else:
+                self._pipelines.move_to_end(key)
+            return pooled
+
+    def clear(self) -> None:
+        """Drop every pooled pipeline."""
+        with self._lock:
+            self._pipelines.clear()
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+POOL = PipelinePool()
+
+class DolittleBridge:
+    """
+    Entry point for running triage on a patient.
+
+    Example:
+        bridge = DolittleBridge(species="dog")
+        bridge.start_session(session_id="rex-001", breed="French Bulldog")
+        result = bridge.run_triage(image=frame, audio=clip, output_format=OutputFormat.CLINICAL)
+        owner_view = bridge.render(OutputFormat.PET)  # Same result, no re-analysis
+
+    Args:
+        species: Default species for new sessions.
+        breed: Default breed for new sessions; selects the guardrails'
+            normal vitals ranges.
+        pool: Pipeline pool to borrow from; defaults to the process-wide pool.
+        max_sessions: Open sessions kept; the least recently used are ended.
+        prewarm: Build the species' primitives in the background now.
+        **options: Passed to ``AiVetPipeline`` (``store``, ``workers``,
+            ``gate``, ``scheduler``, ``guardrails``, ``rules``,
+            ``telemetry``, ``fusion_cache``, ``dedup``). Without a ``store``
+            the pooled pipeline gets its own SessionStore, so results carry
+            the smoothed session triage level.
+    """
+
+    def __init__(
+        self,
+        species: str = "unknown",
+        breed: Optional[str] = None,
+        pool: Optional[PipelinePool] = None,
+        max_sessions: int = 10000,
+        prewarm: bool = False,
+        **options: Any,
+    ):
+        self.species = species
+        self.breed = breed
+        self.max_sessions = max_sessions
+        self._pooled = (pool or POOL).acquire(**options)
+        self._sessions: "OrderedDict[str, _Session]" = OrderedDict()
+        self.session_id: Optional[str] = None
+        if prewarm:
+            self.pipeline.prewarm([species])
+
+    @property
+    def pipeline(self) -> AiVetPipeline:
+        """The pooled pipeline this bridge runs on."""
+        return self._pooled.pipeline
+
+    def start_session(
+        self, session_id: str, species: Optional[str] = None, breed: Optional[str] = None
+    ) -> None:
+        """
+        Open (or reopen) a session and make it the current one.
+
+        ``species`` and ``breed`` default to the reopened session's, then
+        to the bridge's.
+        """
+        session = self._sessions.get(session_id)
+        if session is not None:
+            species = species or session.species
+            breed = breed or session.breed
+        else:
+            species = species or self.species
+            breed = breed or self.breed
+        self._sessions[session_id] = _Session(species, breed)
+        self._sessions.move_to_end(session_id)
+        self.session_id = session_id
+        while len(self._sessions) > self.max_sessions:
+            self.end_session(next(iter(self._sessions)))
+
+    def end_session(self, session_id: Optional[str] = None) -> bool:
+        """Close a session and free its state; returns whether it was open."""
+        session_id = session_id or self.session_id
+        if self._sessions.pop(session_id, None) is None:
+            return False
+        with self._pooled.lock:
+            self.pipeline.end_session(session_id)
+        if session_id == self.session_id:
+            self.session_id = None
+        return True
+
+    def run_triage(
+        self,
+        image: Optional[np.ndarray] = None,
+        audio: Optional[np.ndarray] = None,
+        output_format: OutputFormat = OutputFormat.CLINICAL,
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Analyze one frame and/or audio clip of a session (default: the current one).
+
+        Raises:
+            ValueError: No session given and none started, or neither an
+                image nor audio.
+        """
+        session_id = session_id or self.session_id
+        if session_id is None:
+            raise ValueError("No session; call start_session first")
+        if image is None and audio is None:
+            raise ValueError("run_triage needs an image, audio or both")
+        session = self._sessions.get(session_id)
+        if session is None:
+            self.start_session(session_id)
+            session = self._sessions[session_id]
+        else:
+            self._sessions.move_to_end(session_id)
+
+        images = None if image is None else np.asarray(image)[None]
+        offsets = None if audio is None else np.array([0, len(audio)])
+        with self._pooled.lock:
+            session.last_result = self.pipeline.process_batch(
+                images, audio, offsets, [session_id], [session.species], [session.breed]
+            )[0]
+        return render(session.last_result, output_format, session.species)
+
+    def render(
+        self, output_format: OutputFormat = OutputFormat.CLINICAL, session_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        The session's latest result in another format, without re-running analysis.
+
+        Raises:
+            ValueError: The session has no result yet.
+        """
+        session_id = session_id or self.session_id
+        session = self._sessions.get(session_id)
+        if session is None or session.last_result is None:
+            raise ValueError(f"No triage result for session '{session_id}'")
+        return render(session.last_result, output_format, session.species)
@@ -0,0 +1,92 @@
+"""
+Output formats for triage results.
+
+Renderers only read the per-item result the pipeline already produced,
+so a result can be shown to a veterinarian and to an owner (or shown
+again later) without re-running any analysis. Owner-facing messages are
+fixed strings chosen by triage level.
+"""
+
+from enum import Enum
+from typing import Any, Callable, Dict, Optional
+
+class OutputFormat(str, Enum):
+    """How ``run_triage`` presents a result."""
+    RAW = "raw"            # The pipeline's per-item result as is
+    CLINICAL = "clinical"  # Flat summary for veterinary staff
+    PET = "pet"            # Owner-facing message
+
+PET_MESSAGES: Dict[str, str] = {
+    "routine": "I'm feeling comfortable right now.",
+    "low": "I'm a little uneasy, but mostly okay. Keep an eye on me.",
+    "moderate": "Something doesn't feel right. Please watch me closely.",
+    "urgent": "I'm in pain. Please call the vet soon.",
+    "emergency": "I'm hurting badly. Please get me to a vet right away.",
+}
+DEFERRED_MESSAGE = "I'm hard to read right now. A vet should take a look at me."
+NO_SIGNAL_MESSAGE = "I couldn't be seen or heard clearly. Try again with a better view of me."
+
+# Fields a SessionStore adds to a triage result
+_SESSION_KEYS = ("smoothed_probability", "raw_triage_level", "level_changed")
+
+def triage_level(triage: Dict[str, Any]) -> Optional[str]:
+    """The level to act on: the session's held level when there is one."""
+    return triage.get("session_triage_level", triage.get("triage_level"))
+
+def pet_message(triage: Dict[str, Any]) -> str:
+    """Owner-facing message for a triage result."""
+    level = triage_level(triage)
+    if level is None:
+        return NO_SIGNAL_MESSAGE
+    if triage.get("deferred") and level in ("routine", "low"):
+        # Low confidence in a calm reading; do not reassure
+        return DEFERRED_MESSAGE
+    return PET_MESSAGES[level]
+
+def _raw(result: Dict[str, Any], species: str) -> Dict[str, Any]:
+    return result
+
+def _clinical(result: Dict[str, Any], species: str) -> Dict[str, Any]:
+    triage = result.get("triage", {})
+    assessment = triage.get("assessment")
+    out = {
+        "session_id": result.get("session_id"),
+        "species": species,
+        "status": triage.get("status", "no_signals"),
+        "pain_probability": triage.get("pain_probability"),
+        "confidence": triage.get("confidence"),
+        "triage_level": triage_level(triage),
+        "deferred": triage.get("deferred"),
+        "sources": [s.value for s in assessment.sources] if assessment is not None else [],
+        "pet_message": pet_message(triage),
+    }
+    for key in _SESSION_KEYS + ("symptoms", "rejected", "guardrail"):
+        if key in triage:
+            out[key] = triage[key]
+    skipped = [m for m in ("vision", "audio") if result.get(m, {}).get("status") == "skipped"]
+    if skipped:
+        out["skipped"] = skipped
+    return out
+
+def _pet(result: Dict[str, Any], species: str) -> Dict[str, Any]:
+    triage = result.get("triage", {})
+    return {
+        "session_id": result.get("session_id"),
+        "species": species,
+        "triage_level": triage_level(triage),
+        "pet_message": pet_message(triage),
+    }
+
+RENDERERS: Dict[OutputFormat, Callable[[Dict[str, Any], str], Dict[str, Any]]] = {
+    OutputFormat.RAW: _raw,
+    OutputFormat.CLINICAL: _clinical,
+    OutputFormat.PET: _pet,
+}
+
+def render(
+    result: Dict[str, Any],
+    output_format: OutputFormat = OutputFormat.CLINICAL,
+    species: str = "unknown",
+) -> Dict[str, Any]:
+    """Present a per-item pipeline result in ``output_format``."""
+    return RENDERERS[OutputFormat(output_format)](result, species)
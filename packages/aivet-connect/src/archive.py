@@ -0,0 +1,556 @@
+"""
+Append-only columnar archive of a session's BioSignal history.
+
+Each session is a directory of segments. A segment is a pair of files:
+
+- ``<first>-<last>.col``: a 64-byte header followed by one fixed-width
+  column per BioSignal field (timestamp, source, species, normalized
+  value, confidence, raw value, and the raw value and metadata indices),
+  each sized for the segment's capacity and aligned to 64 bytes,
+- ``<first>-<last>.blob``: the segment's side table, one JSON value per
+  line. Rows reference lines by number for metadata dicts and for raw
+  values that are not numbers; each distinct value is written once.
+
+Segments are written through a memory map and read through another, so
+a range query touches only the pages of the rows it returns. Rows are
+written before the header count that publishes them, and a reader takes
+the count first, so a reader in another process never sees a row half
+written. The header also keeps the segment's time range and the sources
+present, which lets a query skip whole segments. Within a segment whose
+rows arrived in time order (the usual case), a time range is found by
+binary search.
+
+A segment is closed once full or when its session is sealed. Compaction
+merges runs of closed segments into one segment, trimmed to its row
+count and sorted by time. A merged segment is named after the span of
+segments it replaces and written under a temporary name first; the old
+segments are removed afterwards, and until then a scan ignores segments
+inside a larger span, so an interrupted compaction loses no rows and
+shows none twice. The next compaction deletes what it left behind.
+
+There is one writing SignalArchive per directory; other processes may
+open it with ``readonly=True`` to query it while it is written.
+"""
+
+import copy
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+from schema import SignalSource
+from signal_batch import SOURCE_INDEX, BioSignalBatch
+
+_MAGIC = 0x5349474152434831  # "SIGARCH1"
+_VERSION = 1
+_ALIGN = 64
+
+_HEADER = np.dtype([
+    ("magic", "<u8"),
+    ("version", "<u8"),
+    ("capacity", "<i8"),
+    ("count", "<i8"),        # Rows published; written last
+    ("flags", "<i8"),
+    ("source_mask", "<i8"),  # Bit per source code present
+    ("t_min", "<f8"),
+    ("t_max", "<f8"),
+])
+
+_CLOSED = 1
+_UNSORTED = 2
+
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "<f8"),
+    ("normalized_value", "<f8"),
+    ("confidence", "<f8"),
+    ("raw_value", "<f8"),
+    ("raw_index", "<i4"),       # Blob line of a non-numeric raw value, -1 if numeric
+    ("metadata_index", "<i4"),  # Blob line of the metadata dict, -1 if none
+    ("source", "i1"),
+    ("species", "i1"),
+)
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+def _layout(capacity: int) -> Tuple[Dict[str, int], int]:
+    """Byte offset of each column, and the file size, for a capacity."""
+    offsets, offset = {}, _aligned(_HEADER.itemsize)
+    for name, dtype in COLUMNS:
+        offsets[name] = offset
+        offset = _aligned(offset + capacity * np.dtype(dtype).itemsize)
+    return offsets, offset
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+def _source_codes(sources: Iterable[Union[int, str, SignalSource]]) -> np.ndarray:
+    return np.array(
+        [s if isinstance(s, (int, np.integer)) else SOURCE_INDEX[SignalSource(s)] for s in sources],
+        dtype=np.int8,
+    )
+
+@dataclass(frozen=True)
+class SegmentInfo:
+    """One segment of a session, as reported by ``SignalArchive.segments``."""
+    name: str
+    rows: int
+    capacity: int
+    closed: bool
+    t_min: float
+    t_max: float
+
+class _Segment:
+    """Memory map of one segment file, with its blob lines."""
+
+    def __init__(self, path: Path, writable: bool = False):
+        self.path = path
+        self.name = path.name.split(".")[0]
+        self.first, self.last = (int(n) for n in self.name.split("-"))
+        self._map = np.memmap(path, dtype=np.uint8, mode="r+" if writable else "r")
+        buffer = self._map.view(np.ndarray)  # Plain views; memmap slicing is slow
+        self.header = buffer[:_HEADER.itemsize].view(_HEADER)[0]  # Record view into the file
+        if self.header["magic"] != _MAGIC or self.header["version"] != _VERSION:
+            raise ValueError(f"{path} is not a signal archive segment")
+        self.capacity = int(self.header["capacity"])
+        offsets, _ = _layout(self.capacity)
+        self.columns = {
+            name: buffer[offsets[name]:offsets[name] + self.capacity * np.dtype(dtype).itemsize]
+            .view(dtype)
+            for name, dtype in COLUMNS
+        }
+        self.blob_path = path.with_name(path.name.replace(".col", ".blob"))
+        self._lines: List[str] = []
+        self._interned: Optional[Dict[str, int]] = None  # Blob line by JSON text
+        self._recent: Dict[int, Tuple[Any, int]] = {}  # id -> (copy of value, blob line)
+        self._blob_size = 0
+
+    @classmethod
+    def create(cls, path: Path, capacity: int) -> "_Segment":
+        """A new, empty segment file (sparse until written) opened for writing."""
+        _, size = _layout(capacity)
+        with open(path, "wb") as f:
+            f.truncate(size)
+        open(path.with_name(path.name.replace(".col", ".blob")), "wb").close()
+        header = np.memmap(path, dtype=_HEADER, mode="r+", shape=(1,))
+        header[0] = (_MAGIC, _VERSION, capacity, 0, 0, 0, np.inf, -np.inf)
+        header.flush()
+        del header
+        return cls(path, writable=True)
+
+    def _field(self, name: str):
+        return self.header[name]
+
+    @property
+    def count(self) -> int:
+        return int(self._field("count"))
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._field("flags") & _CLOSED)
+
+    def info(self) -> SegmentInfo:
+        return SegmentInfo(
+            name=self.name,
+            rows=self.count,
+            capacity=self.capacity,
+            closed=self.closed,
+            t_min=float(self._field("t_min")),
+            t_max=float(self._field("t_max")),
+        )
+
+    def lines(self) -> List[str]:
+        """Blob lines, reread when the blob has grown."""
+        size = self.blob_path.stat().st_size
+        if size != self._blob_size:
+            with open(self.blob_path, encoding="utf-8") as f:
+                self._lines = f.read().splitlines()
+            self._blob_size = size
+        return self._lines
+
+    def intern(self, values: List[Any], index: np.ndarray) -> np.ndarray:
+        """
+        Blob line of each value that ``index`` uses, appending values not yet in the blob.
+
+        Unused values and the extra last entry map to -1, so the result can
+        be indexed with a row's side-table index directly.
+        """
+        if self._interned is None:
+            self._interned = {line: i for i, line in enumerate(self.lines())}
+        lines = np.full(len(values) + 1, -1, np.int32)
+        if not values:
+            return lines
+        new = []
+        for i in np.unique(index[index >= 0]).tolist():
+            value = values[i]
+            # Primitives pass the same dict frame after frame; comparing it to a
+            # copy is cheaper than encoding it
+            recent = self._recent.get(id(value))
+            if recent is not None and recent[0] == value:
+                lines[i] = recent[1]
+                continue
+            text = _dumps(value)
+            j = self._interned.get(text)
+            if j is None:
+                j = self._interned[text] = len(self._interned)
+                new.append(text)
+            if len(self._recent) >= 1024:
+                self._recent.clear()
+            self._recent[id(value)] = copy.deepcopy(value), j
+            lines[i] = j
+        if new:
+            with open(self.blob_path, "a", encoding="utf-8") as f:
+                f.write("\n".join(new) + "\n")
+        return lines
+
+    def append(self, batch: BioSignalBatch) -> None:
+        """Write rows (at most the free capacity), then publish them."""
+        n, count = len(batch), self.count
+        if count + n > self.capacity:
+            raise ValueError(f"segment {self.name} has room for {self.capacity - count} rows")
+        raw_lines = self.intern(batch.raw_objects, batch.raw_index)
+        meta_lines = self.intern(batch.metadata, batch.metadata_index)
+        rows = slice(count, count + n)
+        for name, _ in COLUMNS[:4]:
+            self.columns[name][rows] = getattr(batch, name)
+        self.columns["raw_index"][rows] = raw_lines[batch.raw_index]
+        self.columns["metadata_index"][rows] = meta_lines[batch.metadata_index]
+        self.columns["source"][rows] = batch.source
+        self.columns["species"][rows] = batch.species
+
+        ts = batch.timestamp
+        header = self.header
+        if ts[0] < header["t_max"] or np.any(ts[1:] < ts[:-1]):
+            header["flags"] |= _UNSORTED
+        header["t_min"] = min(header["t_min"], ts.min())
+        header["t_max"] = max(header["t_max"], ts.max())
+        header["source_mask"] |= int(np.bitwise_or.reduce(1 << batch.source.astype(np.int64)))
+        header["count"] = count + n
+
+    def close(self) -> None:
+        self.header["flags"] |= _CLOSED
+        self.flush()
+
+    def flush(self) -> None:
+        if self._map.mode == "r+":
+            self._map.flush()
+
+    def select(
+        self, start: float, end: float, codes: Optional[np.ndarray]
+    ) -> Optional[Tuple[Dict[str, np.ndarray], List[str]]]:
+        """Copies of the rows in [start, end) from sources ``codes``, or None if there are none."""
+        count = self.count  # Before anything else, so every row read is published
+        header = self.header
+        if (
+            count == 0
+            or header["t_max"] < start
+            or header["t_min"] >= end
+            or (codes is not None and not header["source_mask"] & _mask(codes))
+        ):
+            return None
+        timestamp = self.columns["timestamp"][:count]
+        if header["flags"] & _UNSORTED:
+            in_range = (timestamp >= start) & (timestamp < end)
+            rows: Union[slice, np.ndarray] = np.flatnonzero(in_range)
+        else:
+            rows = slice(*np.searchsorted(timestamp, [start, end]).tolist())
+        if codes is not None:
+            keep = np.isin(self.columns["source"][:count][rows], codes)
+            rows = (np.arange(count)[rows] if isinstance(rows, slice) else rows)[keep]
+        selected = {name: np.array(self.columns[name][:count][rows]) for name, _ in COLUMNS}
+        if len(selected["timestamp"]) == 0:
+            return None
+        return selected, self.lines()
+
+def _mask(codes: np.ndarray) -> int:
+    return int(np.bitwise_or.reduce(1 << codes.astype(np.int64)))
+
+class SignalArchive:
+    """
+    Per-session segment files of BioSignal history, appended to and queried by range.
+
+    Example:
+        archive = SignalArchive("/var/lib/doolittle/archive")
+        archive.append("patient-7", batch)
+        ...
+        night = archive.query("patient-7", start=t0, end=t0 + 8 * 3600,
+                              sources=["vision_vitals"])
+        archive.seal("patient-7")      # Discharged; no more rows
+        archive.compact("patient-7")
+
+    Args:
+        root: Archive directory; created when missing.
+        segment_rows: Capacity of a new segment.
+        readonly: Query only (e.g. from another process than the writer's).
+    """
+
+    def __init__(
+        self, root: Union[str, Path], segment_rows: int = 65536, readonly: bool = False
+    ):
+        if segment_rows < 1:
+            raise ValueError("segment_rows must be at least 1")
+        self.root = Path(root)
+        self.segment_rows = int(segment_rows)
+        self.readonly = readonly
+        if not readonly:
+            self.root.mkdir(parents=True, exist_ok=True)
+        self._open: Dict[Tuple[str, int], _Segment] = {}  # (path, inode) -> mapped segment
+        self._active: Dict[str, _Segment] = {}  # Session -> segment being written
+
+    def __enter__(self) -> "SignalArchive":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _dir(self, session_id: str) -> Path:
+        name = quote(session_id, safe="")
+        if name in ("", ".", ".."):
+            raise ValueError(f"invalid session id {session_id!r}")
+        return self.root / name
+
+    def sessions(self) -> List[str]:
+        """Archived session ids."""
+        if not self.root.is_dir():
+            return []
+        return sorted(unquote(p.name) for p in self.root.iterdir() if p.is_dir())
+
+    def _segments(self, session_id: str) -> List[_Segment]:
+        """The session's live segments in order, skipping those a merged segment replaces."""
+        directory = self._dir(session_id)
+        if not directory.is_dir():
+            return []
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".col"):
+                first, last = (int(n) for n in entry.name[:-4].split("-"))
+                entries.append((first, -last, entry))
+        entries.sort(key=lambda e: e[:2])
+        segments, covered, seen = [], -1, set()
+        for first, last, entry in entries:
+            if first <= covered:
+                continue  # Inside a merged segment; left over from an interrupted compaction
+            covered = -last
+            key = (entry.path, entry.inode())
+            segment = self._open.get(key)
+            if segment is None:
+                active = self._active.get(session_id)
+                writable = active is not None and active.path == Path(entry.path)
+                segment = active if writable else _Segment(Path(entry.path))
+                self._open[key] = segment
+            seen.add(key)
+            segments.append(segment)
+        for key in [k for k in self._open if k not in seen and Path(k[0]).parent == directory]:
+            del self._open[key]  # Replaced by compaction; unmap it
+        return segments
+
+    def segments(self, session_id: str) -> List[SegmentInfo]:
+        """The session's segments, oldest first."""
+        return [s.info() for s in self._segments(session_id)]
+
+    def _writer(self, session_id: str) -> _Segment:
+        """The session's open segment with room for a row; a new one after a full or closed one."""
+        if self.readonly:
+            raise ValueError("archive was opened read-only")
+        segment = self._active.get(session_id)
+        if segment is not None and segment.count < segment.capacity:
+            return segment
+        if segment is not None:
+            segment.close()
+        segments = self._segments(session_id)
+        if segments and not segments[-1].closed and segments[-1].count < segments[-1].capacity:
+            # Reopen the last segment of an earlier run for writing
+            last = segments[-1]
+            segment = _Segment(last.path, writable=True)
+            self._forget(last)
+        else:
+            if segments and not segments[-1].closed:
+                segments[-1].close()
+            number = segments[-1].last + 1 if segments else 0
+            directory = self._dir(session_id)
+            directory.mkdir(exist_ok=True)
+            segment = _Segment.create(
+                directory / f"{number:08d}-{number:08d}.col", self.segment_rows
+            )
+        self._active[session_id] = segment
+        return segment
+
+    def _forget(self, segment: _Segment) -> None:
+        for key in [k for k, s in self._open.items() if s is segment]:
+            del self._open[key]
+
+    def append(self, session_id: str, batch: BioSignalBatch) -> None:
+        """Append a batch to a session, starting new segments as they fill."""
+        start = 0
+        while start < len(batch):
+            segment = self._writer(session_id)
+            stop = min(len(batch), start + segment.capacity - segment.count)
+            whole = (start, stop) == (0, len(batch))
+            segment.append(batch if whole else batch.take(slice(start, stop)))
+            start = stop
+
+    def seal(self, session_id: str) -> None:
+        """Close the session's open segment; later appends start a new one."""
+        segment = self._active.pop(session_id, None)
+        if segment is None and not self.readonly:
+            segments = self._segments(session_id)
+            if segments and not segments[-1].closed:
+                segment = _Segment(segments[-1].path, writable=True)
+                self._forget(segments[-1])
+        if segment is not None:
+            segment.close()
+            self._forget(segment)
+
+    def query(
+        self,
+        session_id: str,
+        start: float = -np.inf,
+        end: float = np.inf,
+        sources: Optional[Iterable[Union[int, str, SignalSource]]] = None,
+    ) -> BioSignalBatch:
+        """
+        A session's rows with timestamps in [start, end), oldest segment first.
+
+        Args:
+            session_id: Session to read.
+            start: Earliest timestamp included.
+            end: Timestamp after the last included.
+            sources: SignalSources (or codes) to keep; all when omitted.
+        """
+        codes = None if sources is None else _source_codes(sources)
+        parts = []
+        raw_objects: List[Any] = []
+        metadata: List[Dict[str, Any]] = []
+        for segment in self._segments(session_id):
+            selected = segment.select(start, end, codes)
+            if selected is None:
+                continue
+            columns, lines = selected
+            for name, table in (("raw_index", raw_objects), ("metadata_index", metadata)):
+                index = columns[name]
+                used, inverse = np.unique(index, return_inverse=True)
+                offset = len(table) - (1 if used[0] < 0 else 0)
+                table.extend(json.loads(lines[i]) for i in used.tolist() if i >= 0)
+                remap = np.arange(len(used), dtype=np.int32) + offset
+                if used[0] < 0:
+                    remap[0] = -1
+                columns[name] = remap[inverse].reshape(-1)
+            parts.append(columns)
+
+        def join(name: str, dtype) -> np.ndarray:
+            return np.concatenate([p[name] for p in parts] or [np.empty(0, dtype)]).astype(dtype)
+
+        return BioSignalBatch(
+            source=join("source", np.int8),
+            species=join("species", np.int8),
+            normalized_value=join("normalized_value", np.float64),
+            confidence=join("confidence", np.float64),
+            timestamp=join("timestamp", np.float64),
+            raw_value=join("raw_value", np.float64),
+            raw_index=join("raw_index", np.int32),
+            metadata_index=join("metadata_index", np.int32),
+            raw_objects=raw_objects,
+            metadata=metadata,
+        )
+
+    def compact(self, session_id: str, max_rows: Optional[int] = None) -> int:
+        """
+        Merge runs of the session's closed segments; returns the segments removed.
+
+        Each run of adjacent closed segments, up to ``max_rows`` rows in
+        total (default 16 segments' worth), becomes one segment without
+        spare capacity, sorted by time. A lone closed segment with spare
+        capacity is trimmed. Segments and temporary files left by an
+        interrupted compaction are deleted first.
+        """
+        if self.readonly:
+            raise ValueError("archive was opened read-only")
+        max_rows = 16 * self.segment_rows if max_rows is None else max_rows
+        segments = self._segments(session_id)
+        removed = self._remove_replaced(session_id, segments)
+        runs: List[List[_Segment]] = [[]]
+        for segment in segments:
+            run = runs[-1]
+            if not segment.closed:
+                runs.append([])
+            elif run and sum(s.count for s in run) + segment.count > max_rows:
+                runs.append([segment])
+            else:
+                run.append(segment)
+        for run in runs:
+            if len(run) > 1 or (run and run[0].count < run[0].capacity):
+                self._merge(run)
+                removed += len(run) - 1
+        return removed
+
+    def _remove_replaced(self, session_id: str, segments: List[_Segment]) -> int:
+        """Delete the session's files outside its live ``segments``; returns how many."""
+        directory = self._dir(session_id)
+        if not directory.is_dir():
+            return 0
+        live = {s.path for s in segments}
+        removed = 0
+        for path in directory.iterdir():
+            replaced = path.suffix in (".col", ".blob") and path.with_suffix(".col") not in live
+            if replaced or path.suffix == ".tmp":
+                path.unlink()
+                removed += path.suffix == ".col"
+        return removed
+
+    def _merge(self, run: List[_Segment]) -> None:
+        """Write a run of segments as one, then delete them."""
+        total = sum(s.count for s in run)
+        directory = run[0].path.parent
+        path = directory / f"{run[0].first:08d}-{run[-1].last:08d}.col"
+        tmp = path.with_suffix(".col.tmp")
+        merged = _Segment.create(tmp, max(total, 1))
+        lines: Dict[str, int] = {}
+        columns = {name: [] for name, _ in COLUMNS}
+        for segment in run:
+            count = segment.count
+            old = segment.lines()
+            remap = np.array(
+                [lines.setdefault(line, len(lines)) for line in old] + [-1], dtype=np.int32
+            )  # remap[-1] keeps -1 as -1
+            for name, _ in COLUMNS:
+                column = np.array(segment.columns[name][:count])
+                if name in ("raw_index", "metadata_index"):
+                    column = remap[column]
+                columns[name].append(column)
+        joined = {name: np.concatenate(columns[name]) for name in columns}
+        order = np.argsort(joined["timestamp"], kind="stable")
+        for name, column in joined.items():
+            merged.columns[name][:total] = column[order]
+        with open(merged.blob_path, "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines))
+        header = merged.header
+        if total:
+            header["t_min"] = float(joined["timestamp"][order[0]])
+            header["t_max"] = float(joined["timestamp"][order[-1]])
+            header["source_mask"] = _mask(joined["source"])
+        header["count"] = total
+        merged.close()
+        for segment in run:
+            self._forget(segment)
+        # Blob first: a scan only sees the merged segment once its .col exists
+        os.replace(merged.blob_path, path.with_suffix(".blob"))
+        os.replace(tmp, path)
+        for segment in run:
+            if segment.path != path:
+                segment.path.unlink()
+                segment.blob_path.unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Write the open segments' pages to disk."""
+        for segment in self._active.values():
+            segment.flush()
+
+    def close(self) -> None:
+        """Flush and unmap everything; open segments stay open for a later run."""
+        self.flush()
+        self._active.clear()
+        self._open.clear()
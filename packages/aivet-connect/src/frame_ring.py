@@ -0,0 +1,248 @@
+"""
+Shared-memory ring buffer for camera frames.
+
+A capture process writes each frame once into the next slot of a ring in
+shared memory. Any process that attaches to the ring by name reads
+frames as NumPy views of that memory, addressed by sequence number, so
+frames are not copied between capture, vision workers and storage.
+
+Each slot carries a sequence word in the style of a seqlock. It is odd
+while the writer fills the slot and ``2 * (seq + 1)`` once frame ``seq``
+is complete. A reader checks the word before using a view and again
+afterwards (``is_current``) to detect that the writer lapped it. There
+is one writer per ring; readers never block it.
+
+Layout: a small int64 header, the per-slot sequence words and
+timestamps, then the frame slots, each aligned to 64 bytes.
+"""
+
+from contextlib import contextmanager
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+
+_MAGIC = 0x46524D52494E4731  # "FRMRING1"
+_HEADER_FIELDS = 8  # magic, slots, height, width, channels, slot_bytes, head, reserved
+_HEAD = 6
+_ALIGN = 64
+
+def _aligned(n: int) -> int:
+    return -(-n // _ALIGN) * _ALIGN
+
+def attach_shared(name: str, shared_tracker: bool = False) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing block without making this process responsible for it.
+
+    Args:
+        name: Name of the block.
+        shared_tracker: This process uses the creator's resource tracker
+            (it is the creator, or a multiprocessing child of it), which
+            already holds the block.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    # Python < 3.13 registers every attach with this process's resource
+    # tracker, which would unlink the block when this process exits.
+    # A tracker shared with the creator keeps one entry per block, so
+    # there the registration is a no-op and must be left alone.
+    shm = shared_memory.SharedMemory(name=name)
+    if not shared_tracker:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+class FrameRing:
+    """
+    Fixed-size ring of uint8 frames in shared memory.
+
+    Example:
+        ring = FrameRing.create((480, 640, 3), slots=64)
+        seq = ring.write(frame, timestamp)          # capture process
+
+        reader = FrameRing.attach(ring.name)        # any other process
+        seq = reader.latest()
+        frame = reader.view(seq)
+        ...
+        if not reader.is_current(seq):
+            ...  # Overwritten while in use; discard the result
+
+    Use ``create`` or ``attach`` rather than the constructor.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        if header[0] != _MAGIC:
+            raise ValueError(f"shared memory block {shm.name!r} is not a frame ring")
+        self._header = header
+        self.slots = int(header[1])
+        self.frame_shape: Tuple[int, int, int] = (int(header[2]), int(header[3]), int(header[4]))
+        self.slot_bytes = int(header[5])
+
+        offset = header.nbytes
+        self._seq = np.ndarray((self.slots,), dtype=np.int64, buffer=shm.buf, offset=offset)
+        offset += self._seq.nbytes
+        self._timestamps = np.ndarray(
+            (self.slots,), dtype=np.float64, buffer=shm.buf, offset=offset
+        )
+        offset = _aligned(offset + self._timestamps.nbytes)
+        self._frames = np.ndarray(
+            (self.slots, *self.frame_shape),
+            dtype=np.uint8,
+            buffer=shm.buf,
+            offset=offset,
+            strides=(self.slot_bytes, *np.empty(self.frame_shape, np.uint8).strides),
+        )
+        self._reserved: Optional[int] = None
+
+    @classmethod
+    def create(
+        cls, frame_shape: Tuple[int, ...], slots: int = 64, name: Optional[str] = None
+    ) -> "FrameRing":
+        """
+        Allocate a new ring; this instance owns it and unlinks it on ``close``.
+
+        Args:
+            frame_shape: (height, width) or (height, width, channels).
+            slots: Number of frames the ring holds before it wraps.
+            name: Shared-memory name; generated when omitted.
+        """
+        if len(frame_shape) == 2:
+            frame_shape = (*frame_shape, 1)
+        if len(frame_shape) != 3 or min(frame_shape) < 1:
+            raise ValueError(f"invalid frame shape {frame_shape}")
+        if slots < 2:
+            raise ValueError("slots must be >= 2")
+        slot_bytes = _aligned(int(np.prod(frame_shape)))
+        meta_bytes = _HEADER_FIELDS * 8 + slots * 16
+        size = _aligned(meta_bytes) + slots * slot_bytes
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (_MAGIC, slots, *frame_shape, slot_bytes, 0, 0)  # New blocks are zero-filled
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, shared_tracker: bool = False) -> "FrameRing":
+        """
+        Open an existing ring by name (read side, or a writer that does not own it).
+
+        ``shared_tracker`` is True in the ring's creator or a multiprocessing
+        child of it; see ``attach_shared``.
+        """
+        return cls(attach_shared(name, shared_tracker), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def head(self) -> int:
+        """Number of frames published so far (the next sequence number)."""
+        return int(self._header[_HEAD])
+
+    def __enter__(self) -> "FrameRing":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Detach; the owner also unlinks the ring. Views handed out must be gone by now."""
+        self._header = self._seq = self._timestamps = self._frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    # Writer side
+
+    def reserve(self) -> Tuple[int, np.ndarray]:
+        """
+        Claim the next slot for in-place capture; returns (seq, writable view).
+
+        The slot is marked as being written until ``commit(seq, ...)``.
+        """
+        seq = self.head
+        slot = seq % self.slots
+        self._seq[slot] = 2 * seq + 1
+        self._reserved = seq
+        return seq, self._frames[slot]
+
+    def commit(self, seq: int, timestamp: float) -> None:
+        """Publish a frame previously claimed with ``reserve``."""
+        if seq != self._reserved:
+            raise ValueError(f"frame {seq} was not reserved")
+        slot = seq % self.slots
+        self._timestamps[slot] = timestamp
+        self._seq[slot] = 2 * (seq + 1)
+        self._header[_HEAD] = seq + 1
+        self._reserved = None
+
+    @contextmanager
+    def writing(self, timestamp: float) -> Iterator[np.ndarray]:
+        """``with ring.writing(t) as frame: camera.read_into(frame)``"""
+        seq, frame = self.reserve()
+        yield frame
+        self.commit(seq, timestamp)
+
+    def write(self, frame: np.ndarray, timestamp: float) -> int:
+        """Copy one frame into the ring and publish it; returns its sequence number."""
+        if frame.shape != self.frame_shape:
+            frame = frame.reshape(self.frame_shape)
+        seq, slot = self.reserve()
+        slot[...] = frame
+        self.commit(seq, timestamp)
+        return seq
+
+    # Reader side
+
+    def latest(self) -> Optional[int]:
+        """Sequence number of the newest published frame, or None if the ring is empty."""
+        head = self.head
+        return head - 1 if head else None
+
+    def available(self) -> range:
+        """Sequence numbers that are still in the ring, oldest first."""
+        head = self.head
+        return range(max(head - self.slots, 0), head)
+
+    def is_current(self, seq: int) -> bool:
+        """Whether frame ``seq`` is published and has not been overwritten since."""
+        return seq >= 0 and self._seq[seq % self.slots] == 2 * (seq + 1)
+
+    def view(self, seq: int) -> Optional[np.ndarray]:
+        """
+        Read-only view of frame ``seq``, or None if it is not (or no longer) in the ring.
+
+        The view aliases the ring. Check ``is_current(seq)`` after using it to
+        make sure the writer did not overwrite the slot meanwhile.
+        """
+        if not self.is_current(seq):
+            return None
+        frame = self._frames[seq % self.slots]
+        frame.flags.writeable = False
+        return frame
+
+    def timestamp(self, seq: int) -> Optional[float]:
+        """Capture timestamp of frame ``seq``, or None if it is no longer in the ring."""
+        value = float(self._timestamps[seq % self.slots])
+        return value if self.is_current(seq) else None
+
+    def read(self, seq: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Consistent copy of frame ``seq`` (e.g. for storage), or None if it was overwritten.
+
+        Args:
+            seq: Sequence number to copy.
+            out: Optional preallocated array of ``frame_shape`` to copy into.
+        """
+        frame = self.view(seq)
+        if frame is None:
+            return None
+        if out is None:
+            out = frame.copy()
+        else:
+            out[...] = frame
+        return out if self.is_current(seq) else None
@@ -0,0 +1,101 @@
+"""
+SignalArchive appends, range queries, compaction and reopening.
+"""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from archive import SignalArchive
+from schema import SignalSource
+from signal_batch import BioSignalBatch
+
+def _batch(start, n, source=SignalSource.VISION_VITALS):
+    timestamp = np.arange(start, start + n, dtype=np.float64)
+    return BioSignalBatch.from_columns(
+        source=source,
+        species="dog",
+        normalized_value=timestamp / 100.0,
+        confidence=0.8,
+        timestamp=timestamp,
+        raw_value=timestamp + 0.5,
+        metadata={"metric": "heart_rate", "unit": "bpm"},
+    )
+
+def _files(directory):
+    return sorted(p.name for p in directory.iterdir())
+
+def test_append_and_query(tmp_path):
+    with SignalArchive(tmp_path, segment_rows=4) as archive:
+        archive.append("dog/1", _batch(0, 10))
+        archive.append("dog/1", _batch(10, 2, SignalSource.AUDIO_VOCAL))
+        assert archive.sessions() == ["dog/1"]
+        assert [s.rows for s in archive.segments("dog/1")] == [4, 4, 4]
+        rows = archive.query("dog/1", start=3.0, end=7.0)
+        assert rows.timestamp.tolist() == [3.0, 4.0, 5.0, 6.0]
+        assert rows.raw_value.tolist() == [3.5, 4.5, 5.5, 6.5]
+        assert rows.to_signals()[0].metadata == {"metric": "heart_rate", "unit": "bpm"}
+        audio = archive.query("dog/1", sources=["audio_vocal"])
+        assert audio.timestamp.tolist() == [10.0, 11.0]
+        assert len(archive.query("missing")) == 0
+
+def test_compact_merges_closed_segments(tmp_path):
+    with SignalArchive(tmp_path, segment_rows=4) as archive:
+        archive.append("s", _batch(5, 5))
+        archive.append("s", _batch(0, 5))  # Out of order: the merge sorts by time
+        archive.seal("s")
+        before = archive.query("s")
+        assert archive.compact("s") == 2
+        [merged] = archive.segments("s")
+        assert (merged.name, merged.rows, merged.capacity) == ("00000000-00000002", 10, 10)
+        after = archive.query("s")
+        assert after.timestamp.tolist() == sorted(before.timestamp.tolist())
+        assert archive.query("s", 2.0, 4.0).raw_value.tolist() == [2.5, 3.5]
+        assert len(after.metadata) == 1
+    assert _files(tmp_path / "s") == ["00000000-00000002.blob", "00000000-00000002.col"]
+
+def test_interrupted_compaction_keeps_rows_once(tmp_path):
+    with SignalArchive(tmp_path, segment_rows=4) as archive:
+        archive.append("s", _batch(0, 10))
+        archive.seal("s")
+        old = tmp_path / "old"
+        shutil.copytree(tmp_path / "s", old)
+        archive.compact("s")
+    # Crash after the merged segment was published, before the old ones
+    # were deleted, and during a later merge's temporary write
+    for path in old.iterdir():
+        shutil.copy(path, tmp_path / "s" / path.name)
+    (tmp_path / "s" / "00000000-00000002.col.tmp").write_bytes(b"partial")
+    with SignalArchive(tmp_path, segment_rows=4) as archive:
+        assert archive.query("s").timestamp.tolist() == list(map(float, range(10)))
+        assert [s.name for s in archive.segments("s")] == ["00000000-00000002"]
+        assert archive.compact("s") == 3
+    assert _files(tmp_path / "s") == ["00000000-00000002.blob", "00000000-00000002.col"]
+
+def test_reopen_continues_writing(tmp_path):
+    with SignalArchive(tmp_path, segment_rows=4) as archive:
+        archive.append("s", _batch(0, 3))
+    with SignalArchive(tmp_path, segment_rows=4) as archive:
+        archive.append("s", _batch(3, 3))
+        assert [(s.rows, s.closed) for s in archive.segments("s")] == [(4, True), (2, False)]
+        archive.seal("s")
+        archive.compact("s")
+    with SignalArchive(tmp_path, segment_rows=4) as archive:
+        archive.append("s", _batch(6, 1))
+        assert [s.name for s in archive.segments("s")] == ["00000000-00000001", "00000002-00000002"]
+        assert archive.query("s").timestamp.tolist() == list(map(float, range(7)))
+
+def test_readonly_reader_sees_published_rows(tmp_path):
+    writer = SignalArchive(tmp_path, segment_rows=4)
+    reader = SignalArchive(tmp_path, readonly=True)
+    writer.append("s", _batch(0, 2))
+    assert len(reader.query("s")) == 2
+    writer.append("s", _batch(2, 3))
+    assert reader.query("s").timestamp.tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    with pytest.raises(ValueError):
+        reader.append("s", _batch(5, 1))
+    with pytest.raises(ValueError):
+        reader.compact("s")
+    writer.close()
+    reader.close()
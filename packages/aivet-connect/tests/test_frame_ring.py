@@ -0,0 +1,68 @@
+"""
+FrameRing seqlock under a writer process that keeps lapping the reader.
+"""
+
+import multiprocessing as mp
+
+import numpy as np
+
+from frame_ring import FrameRing
+
+SHAPE = (32, 48, 3)
+
+def _fill(seq):
+    return seq % 251
+
+def _writer(name, frames, ready):
+    ring = FrameRing.attach(name, shared_tracker=True)
+    frame = np.empty(SHAPE, np.uint8)
+    ready.set()
+    for seq in range(frames):
+        frame[...] = _fill(seq)
+        ring.write(frame, float(seq))
+    ring.close()
+
+def test_reader_sees_whole_frames_or_none():
+    with FrameRing.create(SHAPE, slots=4) as ring:
+        ctx = mp.get_context("spawn")
+        ready = ctx.Event()
+        writer = ctx.Process(target=_writer, args=(ring.name, 20000, ready))
+        writer.start()
+        ready.wait(30.0)
+        copies = 0
+        out = np.empty(SHAPE, np.uint8)
+        while writer.is_alive() or copies == 0:
+            seq = ring.latest()
+            if seq is None:
+                continue
+            frame = ring.read(seq, out)
+            if frame is None:
+                continue  # Lapped by the writer
+            copies += 1
+            # A torn copy would mix two frames' fill values
+            assert frame.min() == frame.max() == _fill(seq)
+            assert ring.timestamp(seq) in (None, float(seq))
+        writer.join(30.0)
+        assert writer.exitcode == 0
+        assert copies > 0
+        assert ring.head == 20000
+        assert ring.read(19999)[0, 0, 0] == _fill(19999)
+
+def test_lapped_frames_are_gone():
+    with FrameRing.create(SHAPE, slots=4) as ring:
+        for seq in range(6):
+            assert ring.write(np.full(SHAPE, _fill(seq), np.uint8), float(seq)) == seq
+        assert list(ring.available()) == [2, 3, 4, 5]
+        assert ring.view(1) is None and ring.timestamp(1) is None
+        assert not ring.is_current(1) and ring.is_current(5)
+        reader = FrameRing.attach(ring.name, shared_tracker=True)  # Same process as the owner
+        assert reader.view(5)[0, 0, 0] == _fill(5)
+        reader.close()
+
+def test_reserved_slot_is_not_current():
+    with FrameRing.create(SHAPE, slots=2) as ring:
+        seq, frame = ring.reserve()
+        assert ring.view(seq) is None
+        frame[...] = 7
+        ring.commit(seq, 1.0)
+        assert ring.read(seq)[0, 0, 0] == 7
@@ -0,0 +1,136 @@
+"""
+Reuse of the last vision result for frames that have not materially changed.
+
+Frames are fingerprinted on a strided grayscale thumbnail:
+
+- perceptual hash: the thumbnail is averaged into a ``hash_size`` grid
+  of blocks and each block sets one bit if it is brighter than the
+  median block (an average hash), so noise and small shifts leave most
+  bits alone while a change of scene or pose flips many,
+- motion energy: mean absolute change of the thumbnail.
+
+Both are measured against the session's last analyzed frame, not the
+previous frame, so slow drift accumulates until the frame is analyzed
+again. A frame within both bounds reuses that frame's vision result,
+restamped. After ``max_reuse`` reuses in a row a frame is analyzed
+again, though the quality gate may still turn it away as static.
+
+The vitals estimators still see every frame: a reused frame feeds its
+breathing motion to respiration (``VitalsMonitor.push_motion``), so the
+respiration window keeps every sample, and the pulse estimator repeats
+its last sample in place of tracking the skin region.
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from vitals.flow import frame_to_gray
+
+@dataclass
+class FrameDedupConfig:
+    """Thresholds of a FrameDeduplicator."""
+    step: int = 16  # Thumbnail subsampling; 640x480 -> 40x30
+    hash_size: int = 8  # Hash grid side; 8 gives a 64-bit hash
+    max_hash_distance: int = 2  # Differing hash bits of a duplicate
+    max_motion: float = 2.0  # Mean abs. gray change of a duplicate vs. last analyzed frame
+    max_reuse: int = 30  # Consecutive reuses before a frame is analyzed again
+
+class FrameDedupState:
+    """Per-session fingerprint and reuse counts of the dedup stage (a session primitive)."""
+
+    __slots__ = ("bits", "thumb", "result", "streak", "pending", "frames", "reused")
+
+    def __init__(self):
+        self.bits = 0
+        self.thumb: Optional[np.ndarray] = None
+        self.result: Optional[Dict[str, Any]] = None  # Vision result of the last analyzed frame
+        self.streak = 0  # Consecutive reuses
+        self.pending: Optional[Tuple[int, np.ndarray]] = None  # Fingerprint awaiting analysis
+        self.frames = 0
+        self.reused = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the reference and pending thumbnails."""
+        thumbs = (self.thumb, self.pending[1] if self.pending else None)
+        return sum(t.nbytes for t in thumbs if t is not None)
+
+    def to_dict(self) -> Dict[str, int]:
+        return {"frames": self.frames, "reused": self.reused}
+
+class FrameDeduplicator:
+    """
+    Decide whether a frame can reuse the session's last vision result.
+
+    Example:
+        dedup = FrameDeduplicator()
+        state = FrameDedupState()
+        if dedup.check(frame, state):
+            result = dedup.reuse(state, timestamp)
+        else:
+            result = analyze(frame)
+            dedup.remember(state, result)
+    """
+
+    def __init__(self, config: Optional[FrameDedupConfig] = None):
+        self.config = config or FrameDedupConfig()
+
+    def fingerprint(self, frame: np.ndarray) -> Tuple[int, np.ndarray]:
+        """Perceptual hash and thumbnail of an (H, W, 3) frame."""
+        cfg = self.config
+        thumb = frame_to_gray(frame, cfg.step)
+        k = cfg.hash_size
+        bh, bw = max(thumb.shape[0] // k, 1), max(thumb.shape[1] // k, 1)
+        grid = thumb[:bh * k, :bw * k].reshape(k, bh, k, bw).mean(axis=(1, 3))
+        bits = np.packbits(grid.ravel() > np.median(grid))
+        return int.from_bytes(bits.tobytes(), "big"), thumb
+
+    def check(self, frame: np.ndarray, state: FrameDedupState, force: bool = False) -> bool:
+        """
+        Whether a frame is a near-duplicate of the session's last analyzed frame.
+
+        Counts the frame, and the reuse when it is one. Otherwise its
+        fingerprint is held until ``remember`` records the frame's result.
+
+        Args:
+            frame: RGB frame.
+            state: The session's dedup state.
+            force: Treat the frame as new (e.g. the estimators restart with it).
+        """
+        cfg = self.config
+        state.frames += 1
+        bits, thumb = self.fingerprint(frame)
+        reference = state.thumb
+        if (
+            not force
+            and state.result is not None
+            and state.streak < cfg.max_reuse
+            and reference.shape == thumb.shape
+            and (bits ^ state.bits).bit_count() <= cfg.max_hash_distance
+            and float(np.abs(thumb - reference).mean()) <= cfg.max_motion
+        ):
+            state.streak += 1
+            state.reused += 1
+            return True
+        state.streak = 0
+        state.pending = bits, thumb
+        return False
+
+    @staticmethod
+    def reuse(state: FrameDedupState, timestamp: float) -> Dict[str, Any]:
+        """The last analyzed frame's result, with its signals restamped."""
+        signals = state.result["signals"]
+        if signals is not None:
+            signals = replace(signals, timestamp=np.full(len(signals), timestamp))
+        return {"status": "ok", "signals": signals, "reused": True}
+
+    @staticmethod
+    def remember(state: FrameDedupState, result: Dict[str, Any]) -> None:
+        """Make an analyzed frame (fingerprinted by ``check``) the session's reference."""
+        if state.pending is None or result.get("status") != "ok":
+            return
+        (state.bits, state.thumb), state.pending = state.pending, None
+        state.result = result
+        state.streak = 0
@@ -0,0 +1,31 @@
+"""
+Multimodal fusion engine.
+
+Combines BioSignals from every primitive into a single pain assessment:
+- Bayesian confidence weighting
+- Agreement bonus for correlated signals
+- Species-specific pain hiding factors
+- Optional memoization of near-identical signal sets
+"""
+
+from .engine import (
+    SOURCES,
+    SPECIES,
+    TRIAGE_LEVELS,
+    FusedArrays,
+    FusionConfig,
+    FusionEngine,
+    FusionResult,
+)
+from .cache import CachedFusionEngine
+
+__all__ = [
+    "SOURCES",
+    "SPECIES",
+    "TRIAGE_LEVELS",
+    "CachedFusionEngine",
+    "FusedArrays",
+    "FusionConfig",
+    "FusionEngine",
+    "FusionResult",
+]
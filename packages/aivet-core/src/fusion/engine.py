@@ -0,0 +1,324 @@
+"""
+Bayesian fusion of BioSignals into a pain assessment and triage level.
+
+Each signal contributes log-odds evidence for pain:
+
+    evidence = weight[species, source] * confidence * logit(p(value))
+
+where ``p`` maps the normalized value onto (0.05, 0.95) around the
+source's neutral point (e.g. the FGS 0.39 threshold). Positive evidence
+is amplified by ``1 + pain_hiding_factor``, because species that mask
+pain show weaker signs for the same underlying pain. The posterior is
+``sigmoid(prior + sum(evidence))``.
+
+All per-species quantities are compiled into arrays when the engine is
+built, so fusing a signal set is a few vectorized reductions.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from schema import SignalModality, SignalSource, TriageLevel
+from signal_batch import SOURCE_INDEX, SOURCES, SPECIES, BioSignalBatch, species_code
+from species import get_species_config
+
+if TYPE_CHECKING:
+    from schema import BioSignal, PainAssessment
+
+TRIAGE_LEVELS: Tuple[TriageLevel, ...] = tuple(TriageLevel)
+
+# How diagnostic each source is on its own (before species adjustments)
+SOURCE_WEIGHTS: Dict[SignalSource, float] = {
+    SignalSource.VISION_GRIMACE: 1.0,
+    SignalSource.VISION_VITALS: 0.5,
+    SignalSource.VISION_POSE: 0.6,
+    SignalSource.AUDIO_VOCAL: 0.7,
+    SignalSource.AUDIO_BREATHING: 0.5,
+}
+
+# Normalized value that carries no evidence either way
+SOURCE_NEUTRAL: Dict[SignalSource, float] = {
+    SignalSource.VISION_GRIMACE: 0.39,  # FGS pain threshold
+    SignalSource.VISION_VITALS: 0.0,    # Deviation from resting range; normal is uninformative
+    SignalSource.VISION_POSE: 0.5,
+    SignalSource.AUDIO_VOCAL: 0.5,
+    SignalSource.AUDIO_BREATHING: 0.0,
+}
+
+_VISUAL = {SignalSource.VISION_GRIMACE, SignalSource.VISION_VITALS, SignalSource.VISION_POSE}
+
+@dataclass
+class FusionConfig:
+    """Tunable constants of the fusion model."""
+    prior_pain: float = 0.15  # Inside ROUTINE, so a set without evidence triages as ROUTINE
+    max_likelihood: float = 0.95
+    agreement_bonus: float = 0.1
+    # Probability cut points between consecutive TriageLevels
+    triage_thresholds: Tuple[float, float, float, float] = (0.2, 0.4, 0.6, 0.8)
+    # Deferral threshold is base + scale * pain_hiding_factor
+    defer_confidence_base: float = 0.25
+    defer_confidence_scale: float = 0.25
+
+@dataclass
+class FusionResult:
+    """Fused assessment for one signal set."""
+    assessment: "PainAssessment"
+    triage_level: TriageLevel
+    deferred: bool  # Confidence below the species threshold; defer to a veterinarian
+
+    def to_dict(self) -> Dict:
+        return {
+            "status": "ok",
+            "pain_probability": self.assessment.pain_probability,
+            "confidence": self.assessment.confidence,
+            "triage_level": self.triage_level.value,
+            "deferred": self.deferred,
+            "assessment": self.assessment,
+        }
+
+@dataclass
+class FusedArrays:
+    """Vectorized fusion output for G signal sets."""
+    pain_probability: np.ndarray  # (G,)
+    confidence: np.ndarray        # (G,)
+    triage_index: np.ndarray      # (G,) index into TRIAGE_LEVELS
+    deferred: np.ndarray          # (G,) bool
+    modality: np.ndarray          # (G,) 0 visual, 1 audio, 2 multimodal, -1 no signals
+    source_bits: np.ndarray       # (G,) bit j set if SOURCES[j] is present
+    timestamp: np.ndarray         # (G,) latest signal timestamp
+
+    def __len__(self) -> int:
+        return len(self.pain_probability)
+
+    def result(self, g: int) -> FusionResult:
+        """Materialize group ``g`` as a FusionResult."""
+        from schema import PainAssessment
+
+        bits = int(self.source_bits[g])
+        assessment = PainAssessment(
+            pain_probability=float(self.pain_probability[g]),
+            confidence=float(self.confidence[g]),
+            sources=[s for j, s in enumerate(SOURCES) if bits >> j & 1],
+            modality=_MODALITIES[self.modality[g]],
+            timestamp=float(self.timestamp[g]),
+        )
+        return FusionResult(
+            assessment=assessment,
+            triage_level=TRIAGE_LEVELS[self.triage_index[g]],
+            deferred=bool(self.deferred[g]),
+        )
+
+    def results(self) -> List[FusionResult]:
+        return [self.result(g) for g in range(len(self))]
+
+_MODALITIES = (SignalModality.VISUAL, SignalModality.AUDIO, SignalModality.MULTIMODAL)
+
+def _logit(p: np.ndarray) -> np.ndarray:
+    return np.log(p / (1.0 - p))
+
+class FusionEngine:
+    """
+    Fuses BioSignals into a PainAssessment and TriageLevel.
+
+    Example:
+        engine = FusionEngine()
+        result = engine.fuse(signals, species="cat")
+        result.triage_level
+    """
+
+    def __init__(self, config: Optional[FusionConfig] = None):
+        self.config = config or FusionConfig()
+        self._compile()
+
+    def _compile(self) -> None:
+        cfg = self.config
+        if not 0.0 < cfg.prior_pain < cfg.triage_thresholds[0]:
+            raise ValueError("prior_pain must lie in (0, triage_thresholds[0])")
+        n_species, n_sources = len(SPECIES), len(SOURCES)
+
+        weight = np.zeros((n_species, n_sources))
+        gain = np.ones(n_species)
+        defer = np.zeros(n_species)
+        for i, species in enumerate(SPECIES):
+            sc = get_species_config(species.value)
+            weight[i] = [SOURCE_WEIGHTS[source] for source in SOURCES]
+            if not sc.grimace_supported:
+                weight[i, SOURCE_INDEX[SignalSource.VISION_GRIMACE]] = 0.0
+            gain[i] = 1.0 + sc.pain_hiding_factor
+            defer[i] = (
+                cfg.defer_confidence_base + cfg.defer_confidence_scale * sc.pain_hiding_factor
+            )
+
+        # Tables are flattened over (species, source) cells so a call gathers
+        # everything it needs with one index. Positive evidence is amplified
+        # by the pain-hiding gain, folded into its own weight table.
+        neutral = np.array([SOURCE_NEUTRAL[s] for s in SOURCES])
+        half = cfg.max_likelihood - 0.5
+        below = np.divide(half, neutral, out=np.zeros_like(neutral), where=neutral > 0)
+        above = np.divide(half, 1.0 - neutral, out=np.zeros_like(neutral), where=neutral < 1)
+        self._neutral = np.tile(neutral, n_species)
+        self._slope_below = np.tile(below, n_species)
+        self._slope_above = np.tile(above, n_species)
+        self._weight = weight.ravel()
+        self._weight_positive = (weight * gain[:, None]).ravel()
+        self._defer_threshold = defer
+        self._prior_logit = float(_logit(np.array(cfg.prior_pain)))
+        self._thresholds = np.asarray(cfg.triage_thresholds)
+
+        # Each signal sets its source bit plus a (modality, evidence sign) bit;
+        # OR-ing them per group gives a mask whose modality and cross-modal
+        # agreement are read from tables over every possible mask.
+        visual = [s in _VISUAL for s in SOURCES]
+        visual_bits = sum(1 << j for j in range(n_sources) if visual[j])
+        vp, vn, ap, an = (1 << (n_sources + k) for k in range(4))
+        self._code = np.array([
+            ((1 << j) | (vn if visual[j] else an), 1 << j, (1 << j) | (vp if visual[j] else ap))
+            for j in range(n_sources)
+        ]).ravel()  # indexed by 3 * source + sign + 1
+
+        masks = np.arange(1 << (n_sources + 4))
+        has_visual = (masks & visual_bits) != 0
+        has_audio = (masks & ~visual_bits & ((1 << n_sources) - 1)) != 0
+        self._modality = np.select(
+            [has_visual & has_audio, has_audio, has_visual], [2, 1, 0], default=-1
+        )
+        agree_pos = (masks & (vp | ap | vn | an)) == vp | ap
+        agree_neg = (masks & (vp | ap | vn | an)) == vn | an
+        self._agree = agree_pos | agree_neg
+        self._source_mask = (1 << n_sources) - 1
+
+    def fuse_arrays(
+        self,
+        group: np.ndarray,
+        source: np.ndarray,
+        value: np.ndarray,
+        confidence: np.ndarray,
+        timestamp: np.ndarray,
+        species: np.ndarray,
+    ) -> FusedArrays:
+        """
+        Fuse N signals belonging to G groups.
+
+        Args:
+            group: (N,) group index of each signal, in [0, G).
+            source: (N,) index into ``SOURCES``.
+            value: (N,) normalized values.
+            confidence: (N,) signal confidences.
+            timestamp: (N,) signal timestamps.
+            species: (G,) index into ``SPECIES`` per group.
+        """
+        n_groups = len(species)
+        n_sources = len(SOURCES)
+
+        cell = species[group] * n_sources + source
+
+        offset = value - self._neutral.take(cell)
+        slope = np.where(offset >= 0, self._slope_above.take(cell), self._slope_below.take(cell))
+        log_odds = _logit(0.5 + offset * slope)
+        w = self._weight.take(cell) * confidence
+        positive = self._weight_positive.take(cell) * confidence
+        evidence = np.where(log_odds > 0, positive, w) * log_odds
+
+        logit = self._prior_logit + np.bincount(group, evidence, n_groups)
+        probability = 1.0 / (1.0 + np.exp(-logit))
+
+        # P(at least one reliable signal), from the product of (1 - w * conf)
+        log_miss = np.bincount(group, np.log1p(-np.minimum(w, 1.0 - 1e-12)), n_groups)
+        conf = 1.0 - np.exp(log_miss)
+
+        mask = np.zeros(n_groups, dtype=np.int64)
+        sign = np.sign(evidence).astype(np.int64)
+        np.bitwise_or.at(mask, group, self._code.take(3 * source + sign + 1))
+        conf = np.minimum(conf + self.config.agreement_bonus * self._agree.take(mask), 1.0)
+
+        latest = np.full(n_groups, -np.inf)
+        np.maximum.at(latest, group, timestamp)
+
+        return FusedArrays(
+            pain_probability=probability,
+            confidence=conf,
+            triage_index=np.searchsorted(self._thresholds, probability, side="right"),
+            deferred=conf < self._defer_threshold[species],
+            modality=self._modality.take(mask),
+            source_bits=mask & self._source_mask,
+            timestamp=latest,
+        )
+
+    def fuse_batch(
+        self,
+        batch: BioSignalBatch,
+        offsets: Optional[np.ndarray] = None,
+        species: Optional[Union[Sequence[str], np.ndarray]] = None,
+    ) -> FusedArrays:
+        """
+        Fuse G signal sets stored back to back in one batch.
+
+        Args:
+            batch: Signals of every set, set by set.
+            offsets: G + 1 offsets; set g is rows ``offsets[g]:offsets[g + 1]``.
+                Defaults to the whole batch as one set.
+            species: Per-set species keys or codes; defaults to the species
+                of each set's first signal.
+        """
+        if offsets is None:
+            offsets = np.array([0, len(batch)])
+        offsets = np.asarray(offsets, dtype=np.int64)
+        counts = np.diff(offsets)
+        if offsets[0] != 0 or offsets[-1] != len(batch) or np.any(counts <= 0):
+            raise ValueError("offsets must start at 0, end at len(batch) and give non-empty sets")
+        if species is None:
+            species_idx = batch.species[offsets[:-1]].astype(np.int64)
+        elif isinstance(species, np.ndarray) and species.dtype.kind in "iu":
+            species_idx = species.astype(np.int64)
+        else:
+            species_idx = np.array([species_code(sp) for sp in species], dtype=np.int64)
+        group = np.repeat(np.arange(len(counts)), counts)
+        return self.fuse_arrays(
+            group,
+            batch.source.astype(np.int64),
+            batch.normalized_value,
+            batch.confidence,
+            batch.timestamp,
+            species_idx,
+        )
+
+    def fuse(
+        self,
+        signals: Union[Sequence["BioSignal"], BioSignalBatch],
+        species: Optional[str] = None,
+    ) -> FusionResult:
+        """Fuse one signal set; ``species`` defaults to the signals' species."""
+        if len(signals) == 0:
+            raise ValueError("every signal set needs at least one signal")
+        species_arg = None if species is None else [species]
+        if isinstance(signals, BioSignalBatch):
+            return self.fuse_batch(signals, species=species_arg).result(0)
+        return self.fuse_many([signals], species_arg)[0]
+
+    def fuse_many(
+        self,
+        signal_sets: Sequence[Sequence["BioSignal"]],
+        species: Optional[Sequence[str]] = None,
+    ) -> List[FusionResult]:
+        """Fuse many signal sets in one vectorized pass."""
+        if any(len(signals) == 0 for signals in signal_sets):
+            raise ValueError("every signal set needs at least one signal")
+        # Only the numeric columns matter here, so skip building a full
+        # BioSignalBatch with raw-value and metadata side tables.
+        flat = [s for signals in signal_sets for s in signals]
+        n = len(flat)
+        group = np.repeat(np.arange(len(signal_sets)), [len(signals) for signals in signal_sets])
+        if species is None:
+            species_idx = np.array([species_code(signals[0].species) for signals in signal_sets])
+        else:
+            species_idx = np.array([species_code(sp) for sp in species])
+        return self.fuse_arrays(
+            group,
+            np.fromiter((SOURCE_INDEX[s.source] for s in flat), np.int64, n),
+            np.fromiter((s.normalized_value for s in flat), np.float64, n),
+            np.fromiter((s.confidence for s in flat), np.float64, n),
+            np.fromiter((s.timestamp for s in flat), np.float64, n),
+            species_idx,
+        ).results()
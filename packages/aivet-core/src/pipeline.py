@@ -5,35 +5,202 @@ Coordinates vision, audio, and fusion primitives to produce
 unified triage assessments.
 """
 
-from typing import Optional, Dict, Any
+from typing import (
+    TYPE_CHECKING, Optional, Dict, Any, List, Sequence, Iterable, AsyncIterable, Tuple, Union,
+)
+from collections import Counter
 from dataclasses import dataclass
+import threading
+import time
 import numpy as np
 
+from telemetry import UNTIMED, Telemetry
+from weights import LazyPrimitive
+
+if TYPE_CHECKING:
+    from dedup import FrameDeduplicator
+    from fusion import CachedFusionEngine
+    from guardrails import GuardrailEngine
+    from quality_gate import QualityGate
+    from rules import RuleEngine, SymptomResult
+    from scheduler import Scheduler
+    from session_store import SessionStore
+    from signal_batch import BioSignalBatch
+    from streaming import PipelineStream, StreamConfig
+    from workers import WorkerPool
+
 @dataclass
 class PipelineContext:
     """Shared context for a triage session."""
     session_id: str
     species: str
     patient_id: Optional[str] = None
+    breed: Optional[str] = None  # Selects breed-specific normal vitals ranges
     metadata: Dict[str, Any] = None
 
+def split_ragged(buffer: np.ndarray, offsets: np.ndarray) -> List[np.ndarray]:
+    """
+    Split a ragged buffer into per-item views.
+
+    Item ``i`` is ``buffer[offsets[i]:offsets[i + 1]]``; no samples are copied.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    if offsets.ndim != 1 or offsets.size == 0:
+        raise ValueError("offsets must be a non-empty 1-D array")
+    if offsets[0] != 0 or offsets[-1] != len(buffer) or np.any(np.diff(offsets) < 0):
+        raise ValueError("offsets must be non-decreasing, start at 0 and end at len(buffer)")
+    return [buffer[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+def _build_fusion(cached: bool = False):
+    from fusion import CachedFusionEngine, FusionEngine
+
+    return CachedFusionEngine() if cached else FusionEngine()
+
+def _build_vocal(species: str):
+    from vocalization import VocalFeatureExtractor
+
+    return VocalFeatureExtractor(species)
+
+def _import_vitals():
+    import vitals
+
+    return vitals
+
+def _static(result: Dict[str, Any]) -> bool:
+    """Whether the quality gate turned a frame away as static."""
+    return result.get("quality", {}).get("reason") == "static"
+
+def _build_models():
+    """Import the schema models and build their (deferred) validators."""
+    from schema import BioSignal, PainAssessment
+
+    for model in (BioSignal, PainAssessment):
+        model.model_rebuild(force=True)
+    return True
+
 class AiVetPipeline:
     """
     Main orchestrator for the AiVet system.
 
     Coordinates:
-    - Vision primitives (grimace, vitals)
+    - Scheduler (how often each session runs each primitive)
+    - Frame dedup (reuses the last vision result for near-identical frames)
+    - Quality gate (skips blurry, badly exposed, static or silent input)
+    - Vision primitives (vitals; grimace scoring needs action-unit scores from a detector)
     - Audio primitives (vocalization)
-    - Fusion engine (Bayesian combination)
+    - Biological guardrails (implausible vitals are rejected, abnormal ones flagged)
+    - Fusion engine (Bayesian combination, optionally memoized on quantized signals)
+    - Symptom rules (signal combinations mapped to clinical symptoms)
+    - Telemetry (optional stage latency histograms, input counters and hooks)
     - Output formatting
     """
 
-    def __init__(self, context: PipelineContext):
+    def __init__(
+        self,
+        context: PipelineContext,
+        store: Optional["SessionStore"] = None,
+        workers: Optional["WorkerPool"] = None,
+        gate: Union["QualityGate", bool] = True,
+        scheduler: Optional["Scheduler"] = None,
+        guardrails: Union["GuardrailEngine", bool] = True,
+        rules: Union["RuleEngine", bool] = True,
+        telemetry: Union[Telemetry, bool] = False,
+        fusion_cache: Union["CachedFusionEngine", bool] = False,
+        dedup: Union["FrameDeduplicator", bool] = False,
+        prewarm: bool = False,
+    ):
         self.context = context
-        # Lazy-load primitives to reduce startup time
-        self._grimace = None
-        self._vocal = None
-        self._fusion = None
+        # Optional per-session smoothing and triage hysteresis, shareable across pipelines
+        self.store = store
+        # Optional process pool; batched vision and audio then run in its workers.
+        # Off by default: it only beats in-process runs with several free cores
+        self.workers = workers
+        # Per-session primitive state; a private store when none is given
+        if store is None:
+            from session_store import SessionStore
+
+            self._sessions = SessionStore()
+        else:
+            self._sessions = store
+        # Serializes the session store and scheduler, which the stream's stages share
+        self._state_lock = threading.Lock()
+        # Cheap pre-filter ahead of the primitives; False sends every input through them
+        if gate is True:
+            from quality_gate import QualityGate
+
+            gate = QualityGate()
+        self.gate = gate or None
+        # Optional reuse of the last vision result for near-identical frames (ahead of the gate)
+        if dedup is True:
+            from dedup import FrameDeduplicator
+
+            dedup = FrameDeduplicator()
+        self.dedup = dedup or None
+        # Biological bounds on vitals; implausible rows leave fusion, abnormal ones are flagged
+        if guardrails is True:
+            from guardrails import GuardrailEngine
+
+            guardrails = GuardrailEngine()
+        self.guardrails = guardrails or None
+        # Symptom rules evaluated on every fused assessment; False skips them
+        if rules is True:
+            from rules import RuleEngine
+
+            rules = RuleEngine()
+        self.rules = rules or None
+        # Optional stage timing and input counts; may be shared by several pipelines
+        if telemetry is True:
+            telemetry = Telemetry()
+        self.telemetry = telemetry or None
+        # Optional triage-driven cadence per session; None runs every primitive on every item
+        self.scheduler = scheduler
+        # Lazy-load primitives to reduce startup time; prewarm builds them in the background
+        self._vocal: Dict[str, LazyPrimitive] = {}  # Vocal feature extractors by species
+        # A CachedFusionEngine reuses fused results for near-identical signal sets
+        if fusion_cache is True:
+            self._fusion = LazyPrimitive(lambda: _build_fusion(cached=True))
+        elif fusion_cache:
+            self._fusion = LazyPrimitive(lambda: fusion_cache)
+        else:
+            self._fusion = LazyPrimitive(_build_fusion)
+        if prewarm:
+            self.prewarm()
+
+    def prewarm(self, species: Optional[Sequence[str]] = None) -> List[threading.Thread]:
+        """
+        Start building the primitives on background threads.
+
+        Covers the fusion engine, the vocal extractors of ``species``
+        (default: the context's species), the vitals modules and the
+        schema models. Joining
+        the returned threads is optional; a primitive used while it is
+        still being built waits for that build.
+        """
+        species = [self.context.species] if species is None else species
+        primitives = [self._fusion, LazyPrimitive(_import_vitals), LazyPrimitive(_build_models)]
+        primitives += [self._vocal_primitive(s) for s in species]
+        return [primitive.prewarm() for primitive in primitives]
+
+    def end_session(self, session_id: str) -> None:
+        """Drop a session's primitive state, smoothing history and schedule."""
+        with self._state_lock:
+            self._sessions.drop(session_id)
+            if self.scheduler is not None:
+                self.scheduler.drop(session_id)
+        if self.workers is not None:
+            self.workers.end_session(session_id)
+
+    def reused_frames(self) -> Dict[str, Dict[str, int]]:
+        """Frames seen and reused by the dedup stage, per session (``{}`` without dedup)."""
+        if self.dedup is None:
+            return {}
+        report = {}
+        with self._state_lock:
+            for session_id in self._sessions:
+                primitives = self._sessions.get(session_id).primitives or {}
+                if "dedup" in primitives:
+                    report[session_id] = primitives["dedup"].to_dict()
+        return report
 
     def process_frame(
         self,
@@ -61,17 +228,560 @@ class AiVetPipeline:
 
         return results
 
-    def _process_vision(self, image: np.ndarray) -> Dict[str, Any]:
+    def process_batch(
+        self,
+        images: Optional[np.ndarray] = None,
+        audio: Optional[np.ndarray] = None,
+        audio_offsets: Optional[np.ndarray] = None,
+        session_ids: Optional[Sequence[str]] = None,
+        species: Optional[Sequence[str]] = None,
+        breeds: Optional[Sequence[Optional[str]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Process N frames and/or audio clips from many sessions in one call.
+
+        Items are grouped by species so each primitive sees one stacked
+        array per species instead of N separate calls.
+
+        Args:
+            images: Stacked frames of shape (N, H, W, 3).
+            audio: Ragged audio buffer, all N clips concatenated into one 1-D array.
+            audio_offsets: N + 1 offsets into ``audio``; clip i is
+                ``audio[audio_offsets[i]:audio_offsets[i + 1]]``.
+            session_ids: Per-item session IDs (defaults to this pipeline's session).
+            species: Per-item species (defaults to this pipeline's species).
+            breeds: Per-item breed for the guardrails' normal ranges
+                (defaults to this pipeline's breed).
+
+        Returns:
+            N per-item triage results in input order, each shaped like the
+            result of ``process_frame`` plus the item's ``session_id``.
+        """
+        if images is not None:
+            images = np.asarray(images)
+            if images.ndim != 4 or images.shape[-1] != 3:
+                raise ValueError(f"images must have shape (N, H, W, 3), got {images.shape}")
+        if (audio is None) != (audio_offsets is None):
+            raise ValueError("audio and audio_offsets must be given together")
+
+        clips = split_ragged(np.asarray(audio), audio_offsets) if audio is not None else None
+
+        counts = {len(x) for x in (images, clips) if x is not None}
+        if not counts:
+            return []
+        if len(counts) > 1:
+            raise ValueError("images and audio_offsets describe different batch sizes")
+        n = counts.pop()
+
+        session_ids = self._per_item(session_ids, self.context.session_id, n, "session_ids")
+        species_arr = self._per_item(species, self.context.species, n, "species")
+        if breeds is not None:
+            breeds = self._per_item(breeds, self.context.breed, n, "breeds")
+
+        results: List[Dict[str, Any]] = [
+            {"session_id": session_ids[i]} for i in range(n)
+        ]
+        groups, inverse = np.unique(species_arr, return_inverse=True)
+        for group_index, group_species in enumerate(groups):
+            idx = np.flatnonzero(inverse == group_index)
+            group_sessions = session_ids[idx]
+
+            if images is not None:
+                vision = self._process_vision_batch(images, idx, group_sessions, str(group_species))
+                for i, item in zip(idx, vision):
+                    results[i]["vision"] = item
+
+            if clips is not None:
+                audio_results = self._process_audio_batch(
+                    [clips[i] for i in idx], group_sessions, str(group_species)
+                )
+                for i, item in zip(idx, audio_results):
+                    results[i]["audio"] = item
+
+        self._fuse_batch(results, species_arr, breeds)
+        return results
+
+    def stream(
+        self,
+        frames: Optional[Union[Iterable[np.ndarray], AsyncIterable[np.ndarray]]] = None,
+        audio_chunks: Optional[Union[Iterable[np.ndarray], AsyncIterable[np.ndarray]]] = None,
+        config: Optional["StreamConfig"] = None,
+    ) -> "PipelineStream":
+        """
+        Stream assessments over continuous frames and/or audio chunks.
+
+        Usage::
+
+            async for assessment in pipeline.stream(frames, audio_chunks):
+                ...
+
+        See ``streaming.StreamConfig`` for queue sizes and drop policies.
+        """
+        from streaming import PipelineStream
+
+        return PipelineStream(self, frames, audio_chunks, config)
+
+    @staticmethod
+    def _per_item(values: Optional[Sequence[str]], default: str, n: int, name: str) -> np.ndarray:
+        """Broadcast an optional per-item vector to an array of length n."""
+        if values is None:
+            return np.full(n, default, dtype=object)
+        values = np.asarray(values, dtype=object)
+        if values.shape != (n,):
+            raise ValueError(f"{name} must have length {n}, got shape {values.shape}")
+        return values
+
+    def _session_state(self, session_id: str, species: str):
+        with self._state_lock:
+            return self._sessions.session(session_id, species)
+
+    def _process_vision(
+        self,
+        image: np.ndarray,
+        session_id: Optional[str] = None,
+        species: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """Process visual input."""
-        # Placeholder - actual implementation in aivet-vision
-        return {"status": "not_implemented"}
+        species = species or self.context.species
+        session_id = session_id or self.context.session_id
+        with self._timed("vision", species):
+            state = self._session_state(session_id, species)
+            result, restart = self._admit_frame(image, session_id, state)
+            if result is None:
+                result = self._vitals(image, state, species, restart)
+                self._remember_frame(state, result)
+        self._count("vision", species, (result,))
+        return result
+
+    def _timed(self, stage: str, species: str, items: int = 1):
+        """Context manager that times one stage call; a shared no-op without telemetry."""
+        if self.telemetry is None:
+            return UNTIMED
+        return self.telemetry.stage(stage, species, items)
+
+    def _count(self, stage: str, species: str, results: Sequence[Dict[str, Any]]) -> None:
+        """Count vision or audio results by status (ok, skipped, rejected)."""
+        if self.telemetry is not None:
+            self.telemetry.count_results(stage, species, results)
+
+    def _count_guardrails(self, checks, batch: "BioSignalBatch") -> None:
+        """Count guardrail rejections by species and reason."""
+        if self.telemetry is None:
+            return
+        from guardrails import REASONS
+        from signal_batch import SPECIES
+
+        rejected = checks.rejected
+        pairs = zip(batch.species[rejected].tolist(), checks.reason[rejected].tolist())
+        for (species, reason), n in Counter(pairs).items():
+            name = SPECIES[species].value
+            self.telemetry.count("guardrails", name, "rejected", REASONS[reason], n)
+
+    def _schedule(self, session_id: str, primitive: str) -> str:
+        """Scheduler decision ("skip", "run" or "restart"); "run" without a scheduler."""
+        if self.scheduler is None:
+            return "run"
+        with self._state_lock:
+            return self.scheduler.decide(session_id, primitive).value
+
+    def _admit_frame(
+        self, image: np.ndarray, session_id: str, state, local: bool = True
+    ) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Scheduler, dedup and quality-gate verdict for a frame.
+
+        Returns the result for a frame that is not analyzed (None if it is)
+        and whether the vitals estimators restart with this frame. ``local``
+        is False where the vitals estimators live in worker processes, which
+        leaves out dedup.
+        """
+        decision = self._schedule(session_id, "vitals")
+        if decision == "skip":
+            return {"status": "skipped"}, False
+        if local:
+            reused = self._reuse_frame(image, state, decision == "restart")
+            if reused is not None:
+                return reused, False
+        return self._gate_frame(image, state, motion=local), decision == "restart"
+
+    def _reuse_frame(self, image: np.ndarray, state, restart: bool) -> Optional[Dict[str, Any]]:
+        """
+        The last vision result for a near-duplicate frame, or None.
+
+        The frame's breathing motion still goes to the session's vitals.
+        A frame the vitals estimators restart with is always analyzed.
+        """
+        if self.dedup is None:
+            return None
+        from dedup import FrameDedupState
+
+        history = state.primitive("dedup", FrameDedupState)
+        if not self.dedup.check(image, history, force=restart):
+            return None
+        self._push_motion(image, state)
+        return self.dedup.reuse(history, time.time())
+
+    def _remember_frame(self, state, result: Dict[str, Any]) -> None:
+        """Record an analyzed frame's result as the session's dedup reference."""
+        if self.dedup is not None:
+            from dedup import FrameDedupState
+
+            self.dedup.remember(state.primitive("dedup", FrameDedupState), result)
+
+    def _gate_frame(
+        self, image: np.ndarray, state, motion: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Result for a frame the quality gate turns away, or None if it passes.
+
+        A resting animal barely moves, so a frame turned away as static
+        still feeds its breathing motion to the session's vitals. ``motion``
+        is False where the estimators live in worker processes; the caller
+        sends such frames there instead.
+        """
+        if self.gate is None:
+            return None
+        from quality_gate import FrameHistory
+
+        quality = self.gate.check_frame(image, state.primitive("quality", FrameHistory))
+        if quality.passed:
+            return None
+        if motion and quality.reason == "static":
+            self._push_motion(image, state)
+        return {"status": "rejected", "quality": quality.to_dict()}
+
+    @staticmethod
+    def _push_motion(image: np.ndarray, state) -> None:
+        """Feed a frame that is not analyzed to the session's vitals (breathing motion only)."""
+        from vitals import VitalsMonitor
+
+        state.primitive("vitals", lambda: VitalsMonitor(state.species)).push_motion(image)
+
+    @staticmethod
+    def _vitals(image: np.ndarray, state, species: str, restart: bool = False) -> Dict[str, Any]:
+        from vitals import VitalsMonitor
+
+        monitor = state.primitive("vitals", lambda: VitalsMonitor(species))
+        if restart:
+            monitor.reset()
+        return {"status": "ok", "signals": monitor.push_frame(image, time.time())}
+
+    def _process_vision_batch(
+        self,
+        images: np.ndarray,
+        index: np.ndarray,
+        session_ids: np.ndarray,
+        species: str,
+    ) -> List[Dict[str, Any]]:
+        """Process rows ``index`` of the (N, H, W, 3) stack, all of one species."""
+        with self._timed("vision", species, len(index)):
+            results = self._run_vision_batch(images, index, session_ids, species)
+        self._count("vision", species, results)
+        return results
+
+    def _run_vision_batch(
+        self,
+        images: np.ndarray,
+        index: np.ndarray,
+        session_ids: np.ndarray,
+        species: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Vision stage of ``_process_vision_batch``.
+
+        Gathering rows is left to the primitive so it can downsample before
+        copying. Rows go past the scheduler and the quality gate first. With
+        a worker pool, each row that is admitted is copied once into shared
+        memory and processed there; otherwise rows go through the per-frame
+        path as views.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(index)
+        restart = [False] * len(index)
+        dedup = self.dedup is not None and self.workers is None
+        if self.gate is not None or self.scheduler is not None or dedup:
+            for j, (i, session_id) in enumerate(zip(index, session_ids)):
+                state = self._session_state(session_id, species)
+                results[j], restart[j] = self._admit_frame(
+                    images[i], session_id, state, local=self.workers is None
+                )
+        todo = [j for j, item in enumerate(results) if item is None]
+        if self.workers is not None:
+            # Static frames go along, in order, for their breathing motion only
+            rows = [j for j, item in enumerate(results) if item is None or _static(item)]
+            batches = self.workers.process_frames(
+                images, index[rows], session_ids[rows], species, time.time(),
+                restart=[restart[j] for j in rows],
+                motion_only=[results[j] is not None for j in rows],
+            )
+            for j, batch in zip(rows, batches):
+                if results[j] is None:
+                    results[j] = {"status": "ok", "signals": batch}
+        else:
+            for j in todo:
+                state = self._session_state(session_ids[j], species)
+                results[j] = self._vitals(images[index[j]], state, species, restart[j])
+                self._remember_frame(state, results[j])
+        return results
+
+    def _vocal_primitive(self, species: str) -> LazyPrimitive:
+        primitive = self._vocal.get(species)
+        if primitive is None:
+            primitive = self._vocal.setdefault(
+                species, LazyPrimitive(lambda: _build_vocal(species))
+            )
+        return primitive
+
+    def _vocal_extractor(self, species: str):
+        """Vocal feature extractor for a species (stateless, shared across sessions)."""
+        return self._vocal_primitive(species).get()
 
     def _process_audio(self, audio: np.ndarray) -> Dict[str, Any]:
         """Process audio input."""
-        # Placeholder - actual implementation in aivet-listen
-        return {"status": "not_implemented"}
+        return self._process_audio_batch(
+            [audio], [self.context.session_id], self.context.species
+        )[0]
+
+    def _process_audio_batch(
+        self,
+        clips: List[np.ndarray],
+        session_ids: np.ndarray,
+        species: str,
+    ) -> List[Dict[str, Any]]:
+        """Process audio clips (views into the ragged buffer) that share one species."""
+        with self._timed("audio", species, len(clips)):
+            results = self._run_audio_batch(clips, session_ids, species)
+        self._count("audio", species, results)
+        return results
 
-    def _fuse_signals(self, signals: Dict[str, Any]) -> Dict[str, Any]:
+    def _run_audio_batch(
+        self,
+        clips: List[np.ndarray],
+        session_ids: np.ndarray,
+        species: str,
+    ) -> List[Dict[str, Any]]:
+        """
+        Audio stage of ``_process_audio_batch``.
+
+        Clips that the scheduler and the quality gate admit go through one
+        stacked STFT pass, or are spread over the worker pool when there is one.
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(clips)
+        if self.scheduler is not None:
+            for j, session_id in enumerate(session_ids):
+                if self._schedule(session_id, "vocal") == "skip":
+                    results[j] = {"status": "skipped"}
+        if self.gate is not None:
+            for j, clip in enumerate(clips):
+                if results[j] is not None:
+                    continue
+                quality = self.gate.check_audio(clip)
+                if not quality.passed:
+                    results[j] = {"status": "rejected", "quality": quality.to_dict()}
+        todo = [j for j, item in enumerate(results) if item is None]
+        if not todo:
+            return results
+        passed = [clips[j] for j in todo]
+        if self.workers is not None:
+            batches = self.workers.process_audio(passed, species, time.time())
+            for j, batch in zip(todo, batches):
+                results[j] = {"status": "ok", "signals": batch}
+            return results
+        extractor = self._vocal_extractor(species)
+        features = extractor.extract_batch(passed)
+        signals = features.to_signal_batch(species, time.time())
+        for k, j in enumerate(todo):
+            results[j] = {"status": "ok", "signals": signals[k:k + 1], "features": features[k]}
+        return results
+
+    @property
+    def fusion(self):
+        """The fusion engine (cached with ``fusion_cache``), built on first use."""
+        return self._fusion.get()
+
+    @staticmethod
+    def _gather_signals(results: Dict[str, Any]) -> List["BioSignalBatch"]:
+        """Signal batches emitted by every primitive in a per-item result."""
+        parts = []
+        for key in ("vision", "audio"):
+            signals = results.get(key, {}).get("signals")
+            if signals is not None and len(signals):
+                parts.append(signals)
+        return parts
+
+    @staticmethod
+    def _flag_rejected(triage: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+        """Record quality-gate rejections (reason by modality) on a triage result."""
+        rejected = {
+            key: results[key]["quality"]["reason"]
+            for key in ("vision", "audio")
+            if results.get(key, {}).get("status") == "rejected"
+        }
+        if rejected:
+            triage["rejected"] = rejected
+        return triage
+
+    def _fuse_signals(
+        self, signals: Dict[str, Any], species: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Fuse all signals into unified assessment."""
-        # Placeholder - actual implementation in aivet-core/fusion
-        return {"status": "not_implemented"}
+        from signal_batch import BioSignalBatch
+
+        parts = self._gather_signals(signals)
+        if not parts:
+            return self._flag_rejected({"status": "no_signals"}, signals)
+        batch = BioSignalBatch.concat(parts)
+        species = species or self.context.species
+        alerts = []
+        if self.guardrails is not None:
+            with self._timed("guardrails", species):
+                checks = self.guardrails.check(batch, self.context.breed)
+            if checks.any_rejected or checks.any_flagged:
+                alerts = self._guardrail_alerts(checks, batch, 0, len(batch))
+            if checks.any_rejected:
+                self._count_guardrails(checks, batch)
+                batch = batch.take(~checks.rejected)
+        if not len(batch):
+            triage = self._flag_rejected({"status": "no_signals"}, signals)
+            return self._flag_guardrail(triage, alerts)
+        with self._timed("fusion", species):
+            result = self.fusion.fuse(batch, species)
+        triage = result.to_dict()
+        if self.rules is not None:
+            with self._timed("rules", species):
+                symptoms = self.rules.evaluate(
+                    batch, np.array([0, len(batch)]), [species],
+                    np.array([result.assessment.pain_probability]),
+                    np.array([result.assessment.confidence]),
+                )
+            self._flag_symptoms(triage, symptoms, 0)
+        if self.store is not None:
+            with self._state_lock:
+                update = self.store.record(self.context.session_id, species, batch, result)
+            triage.update(update.to_dict())
+        self._reschedule(self.context.session_id, triage)
+        return self._flag_guardrail(self._flag_rejected(triage, signals), alerts)
+
+    def _fuse_batch(
+        self,
+        results: List[Dict[str, Any]],
+        species: np.ndarray,
+        breeds: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Fuse every item of a batch in one vectorized pass, in place.
+
+        ``breeds`` holds each item's breed; without it every item has the
+        pipeline's breed.
+        """
+        from signal_batch import BioSignalBatch
+
+        index, parts, counts = [], [], []
+        for i, item in enumerate(results):
+            if "vision" not in item and "audio" not in item:
+                continue
+            gathered = self._gather_signals(item)
+            if gathered:
+                index.append(i)
+                parts.extend(gathered)
+                counts.append(sum(len(p) for p in gathered))
+            else:
+                item["triage"] = self._flag_rejected({"status": "no_signals"}, item)
+        if not index:
+            return
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        batch = BioSignalBatch.concat(parts)
+        label = ""  # Species label of the batch-wide stages, for telemetry
+        if self.telemetry is not None:
+            distinct = {str(species[i]) for i in index}
+            label = distinct.pop() if len(distinct) == 1 else "mixed"
+        alerts: Dict[int, List[Dict[str, Any]]] = {}
+        if self.guardrails is not None:
+            breed = self.context.breed if breeds is None else np.repeat(breeds[index], counts)
+            with self._timed("guardrails", label, len(index)):
+                checks = self.guardrails.check(batch, breed)
+            if checks.any_rejected or checks.any_flagged:
+                for g, i in enumerate(index):
+                    start, end = offsets[g], offsets[g + 1]
+                    alerts[i] = self._guardrail_alerts(checks, batch, start, end)
+            if checks.any_rejected:
+                self._count_guardrails(checks, batch)
+                # Regroup the rows that remain, dropping items left without any
+                kept = np.concatenate([[0], np.cumsum(~checks.rejected)])[offsets]
+                counts = np.diff(kept)
+                for g in np.flatnonzero(counts == 0):
+                    item = results[index[g]]
+                    triage = self._flag_rejected({"status": "no_signals"}, item)
+                    item["triage"] = self._flag_guardrail(triage, alerts[index[g]])
+                index = [i for g, i in enumerate(index) if counts[g]]
+                if not index:
+                    return
+                offsets = np.concatenate([[0], np.cumsum(counts[counts > 0])])
+                batch = batch.take(~checks.rejected)
+        fused_species = [str(species[i]) for i in index]
+        with self._timed("fusion", label, len(index)):
+            fused = self.fusion.fuse_batch(batch, offsets, fused_species)
+        symptoms = None
+        if self.rules is not None:
+            with self._timed("rules", label, len(index)):
+                symptoms = self.rules.evaluate(
+                    batch, offsets, fused_species, fused.pain_probability, fused.confidence
+                )
+        for g, i in enumerate(index):
+            result = fused.result(g)
+            triage = self._flag_symptoms(result.to_dict(), symptoms, g)
+            if self.store is not None:
+                signals = batch[offsets[g]:offsets[g + 1]]
+                with self._state_lock:
+                    update = self.store.record(
+                        results[i]["session_id"], str(species[i]), signals, result
+                    )
+                triage.update(update.to_dict())
+            self._reschedule(results[i]["session_id"], triage)
+            triage = self._flag_rejected(triage, results[i])
+            results[i]["triage"] = self._flag_guardrail(triage, alerts.get(i))
+
+    @staticmethod
+    def _guardrail_alerts(
+        checks, batch: "BioSignalBatch", start: int, end: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Guardrail alerts among rows ``start:end`` that carried evidence.
+
+        Rejected rows (implausible) are left out of fusion; flagged rows
+        (outside the normal range) stay in. Rows with zero confidence
+        (estimators still warming up) get no alert.
+        """
+        rows = np.arange(start, end)
+        alerted = checks.rejected[rows] | checks.flagged[rows]
+        rows = rows[alerted & (batch.confidence[rows] > 0)]
+        alerts = checks.alerts(rows)
+        for alert in alerts:
+            del alert["row"]
+        return alerts
+
+    @staticmethod
+    def _flag_guardrail(
+        triage: Dict[str, Any], alerts: Optional[List[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Record guardrail alerts on a triage result."""
+        if alerts:
+            triage["guardrail"] = alerts
+        return triage
+
+    @staticmethod
+    def _flag_symptoms(
+        triage: Dict[str, Any], symptoms: Optional["SymptomResult"], g: int
+    ) -> Dict[str, Any]:
+        """Record the symptoms present in fused group ``g`` on a triage result."""
+        if symptoms is not None:
+            names = symptoms.names(g)
+            if names:
+                triage["symptoms"] = names
+        return triage
+
+    def _reschedule(self, session_id: str, triage: Dict[str, Any]) -> None:
+        """Feed a fused assessment to the scheduler (the held level when there is a store)."""
+        if self.scheduler is not None:
+            level = triage.get("session_triage_level", triage["triage_level"])
+            with self._state_lock:
+                self.scheduler.update(session_id, level, triage["confidence"])
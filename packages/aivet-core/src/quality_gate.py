@@ -0,0 +1,131 @@
+"""
+Cheap input checks that run ahead of the vision and audio primitives.
+
+Frames are judged on a strided grayscale thumbnail:
+
+- sharpness: variance of the thumbnail's Laplacian (the "image blur"
+  kill-switch in ULTRATHINK_AUDIT.md),
+- exposure: mean brightness and the fraction of clipped pixels,
+- motion: mean absolute change against the session's last analyzed
+  frame. A static scene (an empty kennel, or an animal that has not
+  moved at the thumbnail scale) is skipped.
+
+Motion is measured against the last frame that passed, not the previous
+frame, so slow movement accumulates until it is large enough to analyze.
+Breathing is below that scale, so the pipeline still feeds frames
+skipped as static to the respiration window (``VitalsMonitor.push_motion``).
+
+Audio clips are skipped when their RMS level is below a silence floor.
+
+A rejected input yields no signals and a ``quality`` flag in the
+result; fusion then sees only the inputs that passed.
+"""
+
+from dataclasses import dataclass
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from vitals.flow import frame_to_gray
+
+@dataclass
+class QualityGateConfig:
+    """Thresholds of a QualityGate; None disables a check."""
+    step: int = 8  # Thumbnail subsampling; 640x480 -> 80x60
+    min_sharpness: Optional[float] = 20.0  # Laplacian variance of the thumbnail
+    min_brightness: Optional[float] = 20.0
+    max_brightness: Optional[float] = 235.0
+    max_clipped: Optional[float] = 0.6  # Fraction of thumbnail pixels at <= 4 or >= 251
+    min_motion: Optional[float] = 2.0  # Mean abs. gray change vs. last analyzed frame
+    min_audio_dbfs: Optional[float] = -50.0
+
+@dataclass
+class Quality:
+    """Outcome of one gate check."""
+    passed: bool
+    reason: Optional[str] = None  # blurry, underexposed, overexposed, static, silent
+    metrics: Optional[Dict[str, float]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"passed": self.passed, "reason": self.reason, **(self.metrics or {})}
+
+class FrameHistory:
+    """Per-session motion reference of the gate (a session primitive)."""
+
+    __slots__ = ("reference",)
+
+    def __init__(self):
+        self.reference: Optional[np.ndarray] = None
+
+class QualityGate:
+    """
+    Decide whether a frame or clip is worth running the primitives on.
+
+    Example:
+        gate = QualityGate()
+        history = FrameHistory()
+        quality = gate.check_frame(frame, history)
+        if quality.passed:
+            ...
+    """
+
+    def __init__(self, config: Optional[QualityGateConfig] = None):
+        self.config = config or QualityGateConfig()
+
+    def check_frame(self, frame: np.ndarray, history: Optional[FrameHistory] = None) -> Quality:
+        """
+        Check an (H, W, 3) uint8 frame.
+
+        Args:
+            frame: RGB frame.
+            history: The session's motion reference; motion is not checked
+                without one. It is updated when the frame passes.
+        """
+        cfg = self.config
+        gray = frame_to_gray(frame, cfg.step)
+        brightness = float(gray.mean())
+        metrics = {"brightness": brightness}
+
+        if cfg.min_brightness is not None and brightness < cfg.min_brightness:
+            return Quality(False, "underexposed", metrics)
+        if cfg.max_brightness is not None and brightness > cfg.max_brightness:
+            return Quality(False, "overexposed", metrics)
+        if cfg.max_clipped is not None:
+            clipped = float(np.count_nonzero((gray <= 4) | (gray >= 251))) / gray.size
+            metrics["clipped"] = clipped
+            if clipped > cfg.max_clipped:
+                reason = "overexposed" if brightness >= 128 else "underexposed"
+                return Quality(False, reason, metrics)
+
+        if cfg.min_sharpness is not None:
+            laplacian = (
+                gray[1:-1, :-2] + gray[1:-1, 2:] + gray[:-2, 1:-1] + gray[2:, 1:-1]
+                - 4.0 * gray[1:-1, 1:-1]
+            )
+            sharpness = float(laplacian.var())
+            metrics["sharpness"] = sharpness
+            if sharpness < cfg.min_sharpness:
+                return Quality(False, "blurry", metrics)
+
+        if history is not None and cfg.min_motion is not None:
+            reference = history.reference
+            if reference is not None and reference.shape == gray.shape:
+                motion = float(np.abs(gray - reference).mean())
+                metrics["motion"] = motion
+                if motion < cfg.min_motion:
+                    return Quality(False, "static", metrics)
+            history.reference = gray
+        return Quality(True, None, metrics)
+
+    def check_audio(self, clip: np.ndarray) -> Quality:
+        """Check a mono float clip in [-1, 1]."""
+        clip = np.asarray(clip, dtype=np.float32)
+        if not clip.size:
+            return Quality(False, "silent", {"rms_dbfs": -math.inf})
+        rms = math.sqrt(float(np.dot(clip, clip)) / clip.size)
+        dbfs = 20.0 * math.log10(rms) if rms > 0 else -math.inf
+        metrics = {"rms_dbfs": dbfs}
+        if self.config.min_audio_dbfs is not None and dbfs < self.config.min_audio_dbfs:
+            return Quality(False, "silent", metrics)
+        return Quality(True, None, metrics)
@@ -0,0 +1,266 @@
+"""
+Adaptive per-session scheduling of the primitives.
+
+How often a session runs each primitive follows its latest TriageLevel:
+an emergency runs every primitive on every item, a routine patient is
+sampled every few seconds. Low-confidence assessments shorten the
+interval, since more evidence is needed to settle them.
+
+Stateful primitives that need contiguous input (the vitals estimators
+fill a 30 s respiration window and a 10 s pulse window at camera rate)
+are scheduled in bursts: once due, the primitive runs on every item for
+``burst_s`` and is then idle until its next run. A burst that follows a
+gap is reported as ``Decision.RESTART`` so the caller can reset the
+estimator instead of splicing two windows, so a vitals burst must last
+at least the longest window for its estimates to reach full confidence.
+
+A global compute budget (seconds of primitive time per wall-clock
+second) is shared across sessions in triage order. The most urgent
+levels get their full schedule first. The level where the budget runs
+out is stretched to fit, and every level below it runs at
+``min_share`` of its schedule so that escalations are still observed.
+Levels scheduled on every item are never stretched.
+"""
+
+from dataclasses import dataclass, field
+from enum import Enum
+import time
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from schema import TriageLevel
+
+TRIAGE_LEVELS: Tuple[TriageLevel, ...] = tuple(TriageLevel)
+_LEVEL_INDEX = {level: i for i, level in enumerate(TRIAGE_LEVELS)}
+
+class Decision(str, Enum):
+    """What to do with one item for one primitive."""
+    SKIP = "skip"
+    RUN = "run"
+    RESTART = "restart"  # Run after a gap; reset stateful estimators first
+
+@dataclass
+class PrimitiveSchedule:
+    """Run cadence and cost of one primitive."""
+    # Seconds between runs per level, ROUTINE..EMERGENCY; 0 runs on every item
+    intervals: Tuple[float, float, float, float, float]
+    burst_s: float = 0.0  # Keep running for this long once due
+    cost_s: float = 1e-3  # Compute time per item, for the budget
+    item_rate: float = 30.0  # Expected items per second until one is measured
+
+def _default_primitives() -> Dict[str, PrimitiveSchedule]:
+    return {
+        "grimace": PrimitiveSchedule((5.0, 2.0, 1.0, 0.0, 0.0), cost_s=5e-3),
+        # Bursts fill the 30 s respiration window; intervals keep 1/6, 1/3 and all of the time
+        "vitals": PrimitiveSchedule((180.0, 90.0, 30.0, 0.0, 0.0), burst_s=30.0, cost_s=1e-3),
+        "vocal": PrimitiveSchedule((5.0, 2.0, 1.0, 0.0, 0.0), cost_s=2e-3, item_rate=1.0),
+    }
+
+@dataclass
+class SchedulerConfig:
+    """Per-primitive schedules and the shared compute budget."""
+    primitives: Dict[str, PrimitiveSchedule] = field(default_factory=_default_primitives)
+    budget_s: Optional[float] = None  # Primitive seconds per second, all sessions; None = no limit
+    min_share: float = 0.1  # Floor on the fraction of its schedule a level keeps
+    confidence_floor: float = 0.5  # Interval multiplier at zero confidence (1.0 at full confidence)
+    initial_level: TriageLevel = TriageLevel.MODERATE  # Until a session's first assessment
+    rebalance_s: float = 1.0
+    idle_timeout_s: float = 60.0
+    rate_tau_s: float = 5.0  # Time constant of the measured item rates
+
+class _Slot:
+    """Run state of one (session, primitive) pair."""
+
+    __slots__ = ("next_run", "burst_end", "last_item", "last_run", "rate")
+
+    def __init__(self, rate: float):
+        self.next_run = -np.inf
+        self.burst_end = -np.inf
+        self.last_item: Optional[float] = None
+        self.last_run = -np.inf
+        self.rate = rate
+
+class _SessionSchedule:
+    __slots__ = ("level", "confidence", "last_seen", "slots")
+
+    def __init__(self, level: int):
+        self.level = level
+        self.confidence = 1.0
+        self.last_seen = 0.0
+        self.slots: Dict[str, _Slot] = {}
+
+class Scheduler:
+    """
+    Decide per session and item which primitives to run.
+
+    Example:
+        scheduler = Scheduler(SchedulerConfig(budget_s=0.8))
+        if scheduler.due("s1", "vocal"):
+            ...  # Run vocal analysis on this clip
+        scheduler.update("s1", TriageLevel.URGENT, confidence=0.7)
+    """
+
+    def __init__(self, config: Optional[SchedulerConfig] = None):
+        self.config = config or SchedulerConfig()
+        self._sessions: Dict[str, _SessionSchedule] = {}
+        self._shares = [1.0] * len(TRIAGE_LEVELS)
+        self._next_rebalance = -np.inf
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sessions)
+
+    @property
+    def shares(self) -> Dict[TriageLevel, float]:
+        """Fraction of its schedule each triage level currently gets."""
+        return dict(zip(TRIAGE_LEVELS, self._shares))
+
+    def update(
+        self,
+        session_id: str,
+        level: Union[TriageLevel, str],
+        confidence: float = 1.0,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Record a session's latest assessment.
+
+        An escalation makes every primitive due at once; de-escalation
+        takes effect from the next scheduled run.
+        """
+        now = time.monotonic() if now is None else now
+        index = _LEVEL_INDEX[TriageLevel(level)]
+        state = self._session(session_id, now)
+        if index > state.level:
+            for slot in state.slots.values():
+                slot.next_run = -np.inf
+        state.level = index
+        state.confidence = min(max(float(confidence), 0.0), 1.0)
+
+    def drop(self, session_id: str) -> bool:
+        """Forget a session; returns whether it existed."""
+        return self._sessions.pop(session_id, None) is not None
+
+    def decide(self, session_id: str, primitive: str, now: Optional[float] = None) -> Decision:
+        """
+        Whether ``primitive`` runs on this item of the session.
+
+        Every call counts as one arriving item; a RUN or RESTART counts as
+        a run.
+        """
+        now = time.monotonic() if now is None else now
+        schedule = self.config.primitives[primitive]
+        state = self._session(session_id, now)
+        slot = state.slots.get(primitive)
+        if slot is None:
+            slot = state.slots[primitive] = _Slot(schedule.item_rate)
+        self._measure(slot, now)
+        if now >= self._next_rebalance:
+            self._rebalance(now)
+
+        if now < slot.burst_end:
+            decision = Decision.RUN
+        elif now >= slot.next_run:
+            # More than two item periods since the last run is a gap in the input
+            gap = now - slot.last_run > 2.0 / max(slot.rate, 1e-6)
+            decision = Decision.RESTART if gap and schedule.burst_s > 0 else Decision.RUN
+            slot.next_run = now + self._interval(state, schedule)
+            slot.burst_end = now + schedule.burst_s
+        else:
+            return Decision.SKIP
+        slot.last_run = now
+        return decision
+
+    def due(self, session_id: str, primitive: str, now: Optional[float] = None) -> bool:
+        """``decide`` as a bool."""
+        return self.decide(session_id, primitive, now) is not Decision.SKIP
+
+    def decide_many(
+        self, session_ids: Sequence[str], primitive: str, now: Optional[float] = None
+    ) -> List[Decision]:
+        """``decide`` for a batch of items, in order."""
+        now = time.monotonic() if now is None else now
+        return [self.decide(session_id, primitive, now) for session_id in session_ids]
+
+    def interval(self, session_id: str, primitive: str) -> float:
+        """Current effective interval of a session's primitive in seconds."""
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = _SessionSchedule(_LEVEL_INDEX[self.config.initial_level])
+        return self._interval(state, self.config.primitives[primitive])
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Forget sessions without items for ``idle_timeout_s``; returns their IDs."""
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.config.idle_timeout_s
+        idle = [s for s, state in self._sessions.items() if state.last_seen <= cutoff]
+        for session_id in idle:
+            del self._sessions[session_id]
+        return idle
+
+    def _session(self, session_id: str, now: float) -> _SessionSchedule:
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionSchedule(
+                _LEVEL_INDEX[self.config.initial_level]
+            )
+        state.last_seen = now
+        return state
+
+    def _measure(self, slot: _Slot, now: float) -> None:
+        """Track the item rate with an EMA of the instantaneous rate."""
+        if slot.last_item is not None:
+            dt = now - slot.last_item
+            if dt > 0:
+                alpha = min(dt / self.config.rate_tau_s, 1.0)
+                slot.rate += alpha * (1.0 / dt - slot.rate)
+        slot.last_item = now
+
+    def _interval(self, state: _SessionSchedule, schedule: PrimitiveSchedule) -> float:
+        base = schedule.intervals[state.level]
+        if base <= 0:
+            return 0.0
+        floor = self.config.confidence_floor
+        return base * (floor + (1.0 - floor) * state.confidence) / self._shares[state.level]
+
+    @staticmethod
+    def _runs_per_s(interval: float, schedule: PrimitiveSchedule, rate: float) -> float:
+        """Expected runs per second of one slot at a given interval."""
+        if interval <= 0:
+            return rate
+        return min(rate, (1.0 + schedule.burst_s * rate) / interval)
+
+    def _rebalance(self, now: float) -> None:
+        """Share the budget across triage levels, most urgent first."""
+        cfg = self.config
+        self._next_rebalance = now + cfg.rebalance_s
+        self.evict_idle(now)
+        n_levels = len(TRIAGE_LEVELS)
+        if cfg.budget_s is None:
+            self._shares = [1.0] * n_levels
+            return
+
+        floor = cfg.confidence_floor
+        demand = np.zeros(n_levels)  # At full share
+        fixed = np.zeros(n_levels)  # Every-item primitives, which are never stretched
+        for state in self._sessions.values():
+            scale = floor + (1.0 - floor) * state.confidence
+            for name, slot in state.slots.items():
+                schedule = cfg.primitives[name]
+                base = schedule.intervals[state.level]
+                cost = schedule.cost_s * self._runs_per_s(base * scale, schedule, slot.rate)
+                (fixed if base <= 0 else demand)[state.level] += cost
+
+        remaining = max(cfg.budget_s - float(fixed.sum()), 0.0)
+        shares = [1.0] * n_levels
+        for level in reversed(range(n_levels)):
+            if demand[level] <= remaining:
+                remaining -= demand[level]
+                continue
+            # Demand scales roughly with the share (runs per second ~ 1 / interval)
+            shares[level] = max(remaining / float(demand[level]), cfg.min_share)
+            remaining = max(remaining - shares[level] * demand[level], 0.0)
+        self._shares = shares
@@ -0,0 +1,384 @@
+"""
+Per-session temporal state for longitudinal triage.
+
+Each session keeps fixed-size ring buffers of its recent signals and
+fused assessments, sized from a per-session byte cap when the session
+is created, so a session never grows after creation. Only the numeric
+signal columns are kept; raw values and metadata are not retained.
+
+Fused pain probabilities are smoothed with a time-aware exponential
+moving average. The held TriageLevel escalates as soon as the smoothed
+probability crosses a threshold. It de-escalates only after the
+probability has stayed a margin below the threshold for a dwell time,
+so a noisy estimate does not flap between levels.
+
+Sessions can also hold stateful primitives (per-patient estimators),
+which are dropped together with the session. Their size is measured
+(through each primitive's ``nbytes``) whenever the session records an
+update, and counts toward ``memory_bytes`` next to the rings.
+
+Sessions are kept in LRU order. Least recently used sessions are
+evicted past ``max_sessions`` or past ``max_total_bytes`` of rings and
+primitives, and sessions idle for longer than ``idle_timeout_s`` are
+evicted by ``evict_idle``.
+"""
+
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+import math
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from schema import TriageLevel
+from signal_batch import BioSignalBatch
+
+TRIAGE_LEVELS: Tuple[TriageLevel, ...] = tuple(TriageLevel)
+
+SIGNAL_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("normalized_value", "f4"),
+    ("confidence", "f4"),
+    ("source", "i1"),
+    ("species", "i1"),
+])
+
+ASSESSMENT_DTYPE = np.dtype([
+    ("timestamp", "f8"),
+    ("pain_probability", "f4"),
+    ("smoothed_probability", "f4"),
+    ("confidence", "f4"),
+    ("triage_index", "i1"),
+])
+
+@dataclass
+class SessionStoreConfig:
+    """Limits and smoothing parameters for a SessionStore."""
+    max_session_bytes: int = 16 * 1024
+    signal_share: float = 0.75  # Fraction of the per-session cap spent on the signal ring
+    max_sessions: int = 10000
+    max_total_bytes: Optional[int] = None  # Cap on ``memory_bytes``; None caps by count only
+    idle_timeout_s: float = 600.0
+    smoothing_tau_s: float = 10.0
+    triage_thresholds: Tuple[float, float, float, float] = (0.2, 0.4, 0.6, 0.8)
+    deescalate_margin: float = 0.05
+    deescalate_dwell_s: float = 30.0
+
+    def ring_capacities(self) -> Tuple[int, int]:
+        """(signal rows, assessment rows) that fit in ``max_session_bytes``."""
+        signal_bytes = int(self.max_session_bytes * self.signal_share)
+        n_signals = signal_bytes // SIGNAL_DTYPE.itemsize
+        n_assessments = (self.max_session_bytes - signal_bytes) // ASSESSMENT_DTYPE.itemsize
+        if n_signals < 1 or n_assessments < 1:
+            raise ValueError("max_session_bytes is too small for one signal and one assessment")
+        return n_signals, n_assessments
+
+@dataclass
+class SessionAssessment:
+    """Smoothed, hysteresis-held assessment for one session update."""
+    session_id: str
+    pain_probability: float
+    smoothed_probability: float
+    confidence: float
+    raw_triage_level: TriageLevel
+    triage_level: TriageLevel
+    changed: bool
+
+    def to_dict(self) -> Dict:
+        return {
+            "smoothed_probability": self.smoothed_probability,
+            "raw_triage_level": self.raw_triage_level.value,
+            "session_triage_level": self.triage_level.value,
+            "level_changed": self.changed,
+        }
+
+class _Ring:
+    """Fixed-capacity ring of structured rows."""
+
+    __slots__ = ("rows", "pos", "count")
+
+    def __init__(self, dtype: np.dtype, capacity: int):
+        self.rows = np.zeros(capacity, dtype=dtype)
+        self.pos = 0
+        self.count = 0
+
+    def append(self, row: tuple) -> None:
+        capacity = len(self.rows)
+        self.rows[self.pos] = row
+        self.pos = (self.pos + 1) % capacity
+        self.count = min(self.count + 1, capacity)
+
+    def extend(self, columns: Dict[str, np.ndarray], n: int) -> None:
+        """Write ``n`` rows given as one array per field, wrapping at most once."""
+        capacity = len(self.rows)
+        skip = max(n - capacity, 0)  # Rows that would be overwritten anyway
+        pos = self.pos
+        first = min(n - skip, capacity - pos)
+        for name, values in columns.items():
+            values = values[skip:]
+            column = self.rows[name]
+            column[pos:pos + first] = values[:first]
+            column[:len(values) - first] = values[first:]
+        self.pos = (pos + n - skip) % capacity
+        self.count = min(self.count + n - skip, capacity)
+
+    def ordered(self) -> np.ndarray:
+        """Rows oldest first (a copy)."""
+        if self.count < len(self.rows):
+            return self.rows[:self.count].copy()
+        return np.concatenate([self.rows[self.pos:], self.rows[:self.pos]])
+
+    @property
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+
+class SessionState:
+    """Ring buffers and smoothing state of one session."""
+
+    __slots__ = (
+        "session_id", "species", "signals", "assessments", "smoothed",
+        "level", "last_timestamp", "below_since", "last_seen", "primitives",
+        "primitive_bytes",
+    )
+
+    def __init__(self, session_id: str, species: str, n_signals: int, n_assessments: int):
+        self.session_id = session_id
+        self.species = species
+        self.signals = _Ring(SIGNAL_DTYPE, n_signals)
+        self.assessments = _Ring(ASSESSMENT_DTYPE, n_assessments)
+        self.smoothed: Optional[float] = None
+        self.level = 0
+        self.last_timestamp = 0.0
+        self.below_since: Optional[float] = None
+        self.last_seen = 0.0
+        self.primitives: Optional[Dict[str, Any]] = None
+        self.primitive_bytes = 0  # As of the last ``measure``
+
+    def primitive(self, name: str, factory: Callable[[], Any]) -> Any:
+        """
+        Stateful primitive of this session (e.g. a VitalsMonitor), built on first use.
+
+        Primitive state is not part of the per-session ring cap; it is
+        measured by ``measure`` and released when the session is evicted.
+        """
+        if self.primitives is None:
+            self.primitives = {}
+        value = self.primitives.get(name)
+        if value is None:
+            value = self.primitives[name] = factory()
+        return value
+
+    def measure(self) -> int:
+        """Re-measure the primitives' bytes; returns the change since the last measure."""
+        total = sum(getattr(p, "nbytes", 0) for p in (self.primitives or {}).values())
+        delta, self.primitive_bytes = total - self.primitive_bytes, total
+        return delta
+
+    @property
+    def nbytes(self) -> int:
+        return self.signals.nbytes + self.assessments.nbytes + self.primitive_bytes
+
+    def recent_signals(self) -> BioSignalBatch:
+        """Retained signals, oldest first (numeric columns only)."""
+        rows = self.signals.ordered()
+        return BioSignalBatch.from_columns(
+            source=rows["source"],
+            species=rows["species"],
+            normalized_value=rows["normalized_value"].astype(np.float64),
+            confidence=rows["confidence"].astype(np.float64),
+            timestamp=rows["timestamp"],
+        )
+
+    def recent_assessments(self) -> np.ndarray:
+        """Retained assessments as a structured array, oldest first."""
+        return self.assessments.ordered()
+
+class SessionStore:
+    """
+    Bounded store of per-session temporal state.
+
+    Example:
+        store = SessionStore()
+        update = store.record("s1", "cat", signals, fused.result(0))
+        update.triage_level
+    """
+
+    def __init__(self, config: Optional[SessionStoreConfig] = None):
+        self.config = config or SessionStoreConfig()
+        self._capacities = self.config.ring_capacities()
+        self._thresholds = list(self.config.triage_thresholds)
+        self._sessions: "OrderedDict[str, SessionState]" = OrderedDict()
+        self._ring_bytes = (
+            self._capacities[0] * SIGNAL_DTYPE.itemsize
+            + self._capacities[1] * ASSESSMENT_DTYPE.itemsize
+        )
+        self._primitive_bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sessions)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Ring-buffer and primitive bytes held across all sessions."""
+        return len(self._sessions) * self._ring_bytes + self._primitive_bytes
+
+    def get(self, session_id: str) -> Optional[SessionState]:
+        """Session state without touching its LRU position."""
+        return self._sessions.get(session_id)
+
+    def session(self, session_id: str, species: str, now: Optional[float] = None) -> SessionState:
+        """Get or create a session and mark it as most recently used."""
+        now = time.monotonic() if now is None else now
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = SessionState(session_id, species, *self._capacities)
+            self._sessions[session_id] = state
+            self._evict_over_caps()
+        else:
+            self._sessions.move_to_end(session_id)
+        state.last_seen = now
+        return state
+
+    def drop(self, session_id: str) -> bool:
+        """Forget a session; returns whether it existed."""
+        state = self._sessions.pop(session_id, None)
+        if state is None:
+            return False
+        self._primitive_bytes -= state.primitive_bytes
+        return True
+
+    def _pop_lru(self) -> str:
+        session_id, state = self._sessions.popitem(last=False)
+        self._primitive_bytes -= state.primitive_bytes
+        self.evictions += 1
+        return session_id
+
+    def _evict_over_caps(self) -> None:
+        """Evict LRU sessions past either cap; the most recent session is always kept."""
+        cap = self.config.max_total_bytes
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.config.max_sessions
+            or (cap is not None and self.memory_bytes > cap)
+        ):
+            self._pop_lru()
+
+    def evict_idle(self, now: Optional[float] = None) -> List[str]:
+        """Evict sessions idle for longer than ``idle_timeout_s``; returns their IDs."""
+        now = time.monotonic() if now is None else now
+        cutoff = now - self.config.idle_timeout_s
+        evicted = []
+        # LRU order means the idle sessions are all at the front
+        while self._sessions:
+            session_id, state = next(iter(self._sessions.items()))
+            if state.last_seen > cutoff:
+                break
+            evicted.append(self._pop_lru())
+        return evicted
+
+    def record(
+        self,
+        session_id: str,
+        species: str,
+        signals: Optional[BioSignalBatch],
+        result,
+        now: Optional[float] = None,
+    ) -> SessionAssessment:
+        """
+        Append a fused update to a session and return its smoothed assessment.
+
+        Args:
+            session_id: Session to update (created if new).
+            species: Species of the session, used when it is created.
+            signals: The signals that were fused, appended to the signal ring.
+            result: The ``FusionResult`` for those signals.
+            now: Monotonic clock for idle tracking; defaults to ``time.monotonic()``.
+        """
+        assessment = result.assessment
+        return self.record_values(
+            session_id,
+            species,
+            signals,
+            assessment.pain_probability,
+            assessment.confidence,
+            assessment.timestamp,
+            now,
+        )
+
+    def record_values(
+        self,
+        session_id: str,
+        species: str,
+        signals: Optional[BioSignalBatch],
+        pain_probability: float,
+        confidence: float,
+        timestamp: float,
+        now: Optional[float] = None,
+    ) -> SessionAssessment:
+        """``record`` from plain values (e.g. one row of ``FusedArrays``)."""
+        state = self.session(session_id, species, now)
+        delta = state.measure()
+        if delta:
+            self._primitive_bytes += delta
+            self._evict_over_caps()
+        if signals is not None and len(signals):
+            state.signals.extend({
+                "timestamp": signals.timestamp,
+                "normalized_value": signals.normalized_value,
+                "confidence": signals.confidence,
+                "source": signals.source,
+                "species": signals.species,
+            }, len(signals))
+
+        smoothed = self._smooth(state, pain_probability, confidence, timestamp)
+        raw_level = bisect_right(self._thresholds, pain_probability)
+        previous = state.level
+        state.level = self._hold(state, smoothed, timestamp)
+        state.assessments.append((timestamp, pain_probability, smoothed, confidence, state.level))
+
+        return SessionAssessment(
+            session_id=session_id,
+            pain_probability=pain_probability,
+            smoothed_probability=smoothed,
+            confidence=confidence,
+            raw_triage_level=TRIAGE_LEVELS[raw_level],
+            triage_level=TRIAGE_LEVELS[state.level],
+            changed=state.level != previous,
+        )
+
+    def _smooth(self, state: SessionState, p: float, confidence: float, timestamp: float) -> float:
+        """Time-aware EMA; low-confidence updates move the estimate less."""
+        if state.smoothed is None:
+            state.smoothed = p
+        else:
+            dt = max(timestamp - state.last_timestamp, 0.0)
+            alpha = (1.0 - math.exp(-dt / self.config.smoothing_tau_s)) * confidence
+            state.smoothed += alpha * (p - state.smoothed)
+        state.last_timestamp = max(timestamp, state.last_timestamp)
+        return state.smoothed
+
+    def _hold(self, state: SessionState, smoothed: float, timestamp: float) -> int:
+        """Escalate immediately; de-escalate after a margin and a dwell time."""
+        cfg = self.config
+        level = bisect_right(self._thresholds, smoothed)
+        if level >= state.level:
+            state.below_since = None
+            return level
+        if smoothed >= self._thresholds[state.level - 1] - cfg.deescalate_margin:
+            state.below_since = None
+            return state.level
+        if state.below_since is None:
+            state.below_since = timestamp
+        if timestamp - state.below_since < cfg.deescalate_dwell_s:
+            return state.level
+        state.below_since = None
+        # Settle on the level the margin-shifted probability supports
+        return bisect_right(self._thresholds, smoothed + cfg.deescalate_margin)
@@ -0,0 +1,239 @@
+"""
+Asyncio streaming mode for continuous video + audio sessions.
+
+Vision, audio and fusion run as separate stages connected by bounded
+queues, so a slow stage applies backpressure (or drops frames) instead
+of letting memory grow without bound. CPU-heavy stages run in an
+executor so vision and audio overlap rather than running serially.
+
+The vision and audio stages run in executor threads while fusion runs
+on the event loop. The pipeline serializes their access to its session
+store and scheduler; per-session estimators are only touched by the
+vision stage, which handles one frame at a time. While a stream runs it
+is the pipeline's only caller: do not call ``process_frame`` or
+``process_batch`` on the same pipeline from another thread meanwhile.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Union
+
+import numpy as np
+
+class DropPolicy(str, Enum):
+    """What a full queue does with a new item."""
+    BLOCK = "block"              # Wait for space (backpressure to the producer)
+    DROP_OLDEST = "drop_oldest"  # Evict the stalest queued item
+    DROP_NEWEST = "drop_newest"  # Discard the incoming item
+
+@dataclass
+class StreamConfig:
+    """Queue sizes and overload behaviour for a stream."""
+    frame_queue_size: int = 4
+    audio_queue_size: int = 8
+    output_queue_size: int = 4
+    frame_drop_policy: DropPolicy = DropPolicy.DROP_OLDEST
+    audio_drop_policy: DropPolicy = DropPolicy.DROP_OLDEST
+    output_drop_policy: DropPolicy = DropPolicy.DROP_OLDEST
+    executor: Optional[Executor] = None  # None uses the loop's default thread pool
+
+@dataclass
+class StreamStats:
+    """Counters for a running stream."""
+    frames_in: int = 0
+    frames_dropped: int = 0
+    audio_in: int = 0
+    audio_dropped: int = 0
+    assessments_out: int = 0
+    assessments_dropped: int = 0
+    latencies_s: deque = field(default_factory=lambda: deque(maxlen=10_000))
+
+    def latency_percentile(self, q: float) -> float:
+        """Capture-to-emit latency percentile (q in [0, 100]) over recent assessments."""
+        if not self.latencies_s:
+            return float("nan")
+        return float(np.percentile(self.latencies_s, q))
+
+_END = object()
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+class _BoundedQueue:
+    """
+    asyncio.Queue with a drop policy; ``put`` returns False when an item is dropped.
+
+    ``force`` items (end-of-stream, failures) wait for space instead of dropping.
+    """
+
+    def __init__(self, maxsize: int, policy: DropPolicy):
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._policy = policy
+
+    async def put(self, item: Any, force: bool = False) -> bool:
+        if self._policy is DropPolicy.BLOCK or force:
+            await self._queue.put(item)
+            return True
+        dropped = False
+        if self._queue.full():
+            if self._policy is DropPolicy.DROP_NEWEST:
+                return False
+            self._queue.get_nowait()
+            dropped = True
+        self._queue.put_nowait(item)
+        return not dropped
+
+    async def get(self) -> Any:
+        return await self._queue.get()
+
+async def _iterate(source: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(source, "__aiter__"):
+        async for item in source:
+            yield item
+    else:
+        for item in source:
+            yield item
+            await asyncio.sleep(0)
+
+class PipelineStream:
+    """
+    Async iterator of assessments over a frame stream and/or audio stream.
+
+    Each emitted result has the shape of ``process_frame`` output plus
+    ``seq`` (input sequence number) and ``latency_s`` (capture to emit).
+    A frame is paired with the audio result that arrived since the
+    previous frame, so each clip reaches the session store once. Audio
+    with no frame to pair with (an audio-only stream, a second clip before
+    the next frame, or a clip after the last frame) emits an assessment
+    of its own.
+    """
+
+    def __init__(
+        self,
+        pipeline: Any,
+        frames: Optional[Union[Iterable[np.ndarray], AsyncIterable[np.ndarray]]] = None,
+        audio_chunks: Optional[Union[Iterable[np.ndarray], AsyncIterable[np.ndarray]]] = None,
+        config: Optional[StreamConfig] = None,
+    ):
+        if frames is None and audio_chunks is None:
+            raise ValueError("stream needs frames, audio_chunks, or both")
+        self.pipeline = pipeline
+        self.frames = frames
+        self.audio_chunks = audio_chunks
+        self.config = config or StreamConfig()
+        self.stats = StreamStats()
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._run()
+
+    async def _run(self) -> AsyncIterator[Dict[str, Any]]:
+        cfg = self.config
+        loop = asyncio.get_running_loop()
+        stage_out = _BoundedQueue(cfg.frame_queue_size + cfg.audio_queue_size, DropPolicy.BLOCK)
+        output = _BoundedQueue(cfg.output_queue_size, cfg.output_drop_policy)
+
+        tasks = []
+        n_stages = 0
+        if self.frames is not None:
+            frame_q = _BoundedQueue(cfg.frame_queue_size, cfg.frame_drop_policy)
+            tasks.append(self._feed(self.frames, frame_q, "frames"))
+            tasks.append(self._stage(frame_q, stage_out, "vision", self.pipeline._process_vision))
+            n_stages += 1
+        if self.audio_chunks is not None:
+            audio_q = _BoundedQueue(cfg.audio_queue_size, cfg.audio_drop_policy)
+            tasks.append(self._feed(self.audio_chunks, audio_q, "audio"))
+            tasks.append(self._stage(audio_q, stage_out, "audio", self.pipeline._process_audio))
+            n_stages += 1
+        tasks.append(self._fuse(stage_out, output, n_stages))
+
+        running = [loop.create_task(self._guard(t, output)) for t in tasks]
+        try:
+            while True:
+                item = await output.get()
+                if item is _END:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+                self.stats.assessments_out += 1
+                yield item
+        finally:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+
+    async def _guard(self, coro, output: _BoundedQueue) -> None:
+        try:
+            await coro
+        except asyncio.CancelledError:
+            raise
+        except BaseException as error:
+            await output.put(_Failure(error), force=True)
+
+    async def _feed(self, source, queue: _BoundedQueue, kind: str) -> None:
+        loop = asyncio.get_running_loop()
+        seq = 0
+        async for item in _iterate(source):
+            if kind == "frames":
+                self.stats.frames_in += 1
+            else:
+                self.stats.audio_in += 1
+            if not await queue.put((seq, loop.time(), item)):
+                if kind == "frames":
+                    self.stats.frames_dropped += 1
+                else:
+                    self.stats.audio_dropped += 1
+            seq += 1
+        await queue.put(_END, force=True)
+
+    async def _stage(self, inbox: _BoundedQueue, outbox: _BoundedQueue, kind: str, fn) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await inbox.get()
+            if item is _END:
+                await outbox.put(_END)
+                return
+            seq, captured, payload = item
+            result = await loop.run_in_executor(self.config.executor, fn, payload)
+            await outbox.put((kind, seq, captured, result))
+
+    async def _fuse(self, inbox: _BoundedQueue, output: _BoundedQueue, n_stages: int) -> None:
+        audio_only = self.frames is None
+        pending_audio = None  # (seq, captured, result) of audio not fused yet
+        finished = 0
+        while finished < n_stages:
+            item = await inbox.get()
+            if item is _END:
+                finished += 1
+                continue
+            kind, seq, captured, result = item
+            if kind == "audio":
+                if not audio_only:
+                    if pending_audio is not None:
+                        await self._emit({"audio": pending_audio[2]}, *pending_audio[:2], output)
+                    pending_audio = (seq, captured, result)
+                    continue
+                results = {"audio": result}
+            else:
+                results = {"vision": result}
+                if pending_audio is not None:
+                    results["audio"] = pending_audio[2]
+                    pending_audio = None
+            await self._emit(results, seq, captured, output)
+        if pending_audio is not None:
+            seq, captured, result = pending_audio
+            await self._emit({"audio": result}, seq, captured, output)
+        await output.put(_END, force=True)
+
+    async def _emit(
+        self, results: Dict[str, Any], seq: int, captured: float, output: _BoundedQueue
+    ) -> None:
+        results["triage"] = self.pipeline._fuse_signals(results)
+        results["seq"] = seq
+        results["latency_s"] = asyncio.get_running_loop().time() - captured
+        self.stats.latencies_s.append(results["latency_s"])
+        if not await output.put(results):
+            self.stats.assessments_dropped += 1
@@ -0,0 +1,313 @@
+"""
+Per-stage instrumentation of the pipeline: hooks, latency histograms,
+input counters and a Prometheus text exporter.
+
+A ``Telemetry`` object passed to ``AiVetPipeline(telemetry=...)`` times
+every stage call (vision, audio, guardrails, fusion, rules) into an
+HDR-style histogram per stage and species, counts inputs by outcome
+(ok, ok with a reused frame result, skipped, rejected with the
+quality-gate or guardrail reason) and calls any registered
+``StageHook`` around each stage. Without one the
+pipeline only pays for a shared no-op context manager per stage.
+
+Histograms are log-linear, like HdrHistogram: values (ns) fall into
+power-of-two ranges, each split into ``2 ** (significant_bits - 1)``
+linear sub-buckets, so any recorded latency is known to within
+``2 ** -(significant_bits - 1)`` of its value and recording is a
+``bit_length``, a shift and a list increment.
+"""
+
+from contextlib import nullcontext
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+STAGES: Tuple[str, ...] = ("vision", "audio", "guardrails", "fusion", "rules")
+
+# Prometheus ``le`` bounds of the exported stage histograms (seconds)
+EXPORT_BUCKETS_S: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+    2.5, 5.0, 10.0,
+)
+
+UNTIMED = nullcontext()  # What the pipeline enters for a stage when telemetry is off
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram over nanoseconds.
+
+    Args:
+        significant_bits: Sub-bucket resolution; 7 bits keep every value
+            within 1/64 (1.6%).
+        max_ns: Largest trackable value; longer latencies are clamped.
+    """
+
+    __slots__ = ("significant_bits", "max_ns", "counts", "count", "total_ns", "_half")
+
+    def __init__(self, significant_bits: int = 7, max_ns: int = 2**40):
+        self.significant_bits = significant_bits
+        self.max_ns = max_ns
+        self._half = 1 << (significant_bits - 1)
+        self.counts = [0] * self._index(max_ns) + [0]
+        self.count = 0
+        self.total_ns = 0
+
+    def _index(self, ns: int) -> int:
+        shift = ns.bit_length() - self.significant_bits
+        if shift <= 0:
+            return ns
+        return shift * self._half + (ns >> shift)
+
+    def record(self, ns: int) -> None:
+        """Add one latency in nanoseconds."""
+        ns = min(max(int(ns), 0), self.max_ns)
+        self.counts[self._index(ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+
+    def bucket_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(lower, upper) ns bounds of every bucket, upper exclusive."""
+        index = np.arange(len(self.counts))
+        shift = np.maximum(index // self._half - 1, 0)
+        lower = (index - shift * self._half) << shift
+        return lower, lower + (1 << shift)
+
+    def percentile(self, q: float) -> float:
+        """Latency (ns) at percentile ``q`` in [0, 100]; the bucket midpoint, 0 if empty."""
+        if not self.count:
+            return 0.0
+        cumulative = np.cumsum(self.counts)
+        i = int(np.searchsorted(cumulative, max(q / 100.0 * self.count, 1), side="left"))
+        lower, upper = self.bucket_bounds()
+        return float(lower[i] + upper[i] - 1) / 2.0
+
+    def cumulative_counts(self, bounds_ns: Sequence[float]) -> List[int]:
+        """Recorded values at or below each bound (by bucket upper edge)."""
+        _, upper = self.bucket_bounds()
+        cumulative = np.concatenate([[0], np.cumsum(self.counts)])
+        last = np.searchsorted(upper - 1, np.asarray(bounds_ns), side="right")
+        return cumulative[last].tolist()
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram of the same resolution into this one."""
+        if other.significant_bits != self.significant_bits or other.max_ns != self.max_ns:
+            raise ValueError("Histograms of different resolution cannot be merged")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+class StageHook:
+    """
+    Callbacks around every instrumented stage call; override either method.
+
+    ``items`` is the number of inputs the call covers (1 per frame, N
+    for a batch). Hooks run on the thread that runs the stage.
+    """
+
+    def before(self, stage: str, species: str, items: int) -> None:
+        pass
+
+    def after(self, stage: str, species: str, items: int, seconds: float) -> None:
+        pass
+
+class _StageTimer:
+    __slots__ = ("telemetry", "stage", "species", "items", "start")
+
+    def __init__(self, telemetry: "Telemetry", stage: str, species: str, items: int):
+        self.telemetry = telemetry
+        self.stage = stage
+        self.species = species
+        self.items = items
+
+    def __enter__(self) -> None:
+        for hook in self.telemetry.hooks:
+            hook.before(self.stage, self.species, self.items)
+        self.start = time.perf_counter_ns()
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter_ns() - self.start
+        telemetry = self.telemetry
+        telemetry.record(self.stage, self.species, elapsed, self.items)
+        for hook in telemetry.hooks:
+            hook.after(self.stage, self.species, self.items, elapsed / 1e9)
+
+class Telemetry:
+    """
+    Stage latency histograms and input counters of one or more pipelines.
+
+    Example:
+        telemetry = Telemetry()
+        pipeline = AiVetPipeline(context, telemetry=telemetry)
+        telemetry.serve(port=9464)  # http://127.0.0.1:9464/metrics
+        telemetry.percentile("vision", "cat", 99)  # ns
+
+    Args:
+        hooks: StageHooks to call around every stage.
+        significant_bits: Histogram resolution (see ``LatencyHistogram``).
+        namespace: Prefix of the exported metric names.
+    """
+
+    def __init__(
+        self,
+        hooks: Iterable[StageHook] = (),
+        significant_bits: int = 7,
+        namespace: str = "doolittle",
+    ):
+        self.hooks: List[StageHook] = list(hooks)
+        self.significant_bits = significant_bits
+        self.namespace = namespace
+        self.enabled = True
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._items: Dict[Tuple[str, str], int] = {}
+        self._inputs: Dict[Tuple[str, str, str, str], int] = {}
+        # Stages of one pipeline can run on several threads (streaming)
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: StageHook) -> None:
+        self.hooks.append(hook)
+
+    def stage(self, stage: str, species: str, items: int = 1):
+        """Context manager that times one stage call (a no-op while disabled)."""
+        if not self.enabled:
+            return UNTIMED
+        return _StageTimer(self, stage, species, items)
+
+    def record(self, stage: str, species: str, ns: int, items: int = 1) -> None:
+        """Record a stage call of ``ns`` nanoseconds covering ``items`` inputs."""
+        key = (stage, species)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram(self.significant_bits)
+            histogram.record(ns)
+            self._items[key] = self._items.get(key, 0) + items
+
+    def count(self, stage: str, species: str, status: str, reason: str = "", n: int = 1) -> None:
+        """Count ``n`` inputs of a stage by outcome (e.g. "rejected", "blurry")."""
+        if not self.enabled or not n:
+            return
+        key = (stage, species, status, reason)
+        with self._lock:
+            self._inputs[key] = self._inputs.get(key, 0) + n
+
+    def count_results(self, stage: str, species: str, results: Iterable[Dict[str, Any]]) -> None:
+        """Count per-item vision or audio results by status and reason (gate verdict or reuse)."""
+        if not self.enabled:
+            return
+        tally: Dict[Tuple[str, str], int] = {}
+        for result in results:
+            status = result.get("status", "ok")
+            if status == "rejected":
+                reason = result["quality"]["reason"]
+            else:
+                reason = "reused" if result.get("reused") else ""
+            tally[status, reason] = tally.get((status, reason), 0) + 1
+        for (status, reason), n in tally.items():
+            self.count(stage, species, status, reason, n)
+
+    def histogram(self, stage: str, species: str) -> Optional[LatencyHistogram]:
+        return self._histograms.get((stage, species))
+
+    def percentile(self, stage: str, species: str, q: float) -> float:
+        """Latency (ns) at percentile ``q`` of a stage and species; 0 if never run."""
+        histogram = self.histogram(stage, species)
+        return histogram.percentile(q) if histogram is not None else 0.0
+
+    def inputs(self) -> Dict[Tuple[str, str, str, str], int]:
+        """Input counts by (stage, species, status, reason)."""
+        with self._lock:
+            return dict(self._inputs)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Calls, items and p50/p90/p99 (ms) per stage and species."""
+        with self._lock:
+            histograms = list(self._histograms.items())
+            items = dict(self._items)
+        out: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (stage, species), histogram in histograms:
+            out.setdefault(stage, {})[species] = {
+                "calls": histogram.count,
+                "items": items[stage, species],
+                **{f"p{q}_ms": histogram.percentile(q) / 1e6 for q in (50, 90, 99)},
+            }
+        return out
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._items.clear()
+            self._inputs.clear()
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)."""
+        ns = self.namespace
+        with self._lock:
+            histograms = [
+                (key, h.counts[:], h.count, h.total_ns) for key, h in self._histograms.items()
+            ]
+            items = dict(self._items)
+            inputs = dict(self._inputs)
+        bounds_ns = [b * 1e9 for b in EXPORT_BUCKETS_S]
+        lines = [
+            f"# HELP {ns}_stage_seconds Latency of one pipeline stage call.",
+            f"# TYPE {ns}_stage_seconds histogram",
+        ]
+        scratch = LatencyHistogram(self.significant_bits)
+        for (stage, species), counts, count, total_ns in sorted(histograms):
+            labels = f'stage="{stage}",species="{species}"'
+            scratch.counts = counts
+            cumulative = scratch.cumulative_counts(bounds_ns)
+            for bound, n in zip(EXPORT_BUCKETS_S, cumulative):
+                lines.append(f'{ns}_stage_seconds_bucket{{{labels},le="{bound:g}"}} {n}')
+            lines.append(f'{ns}_stage_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{ns}_stage_seconds_sum{{{labels}}} {total_ns / 1e9:.9f}")
+            lines.append(f"{ns}_stage_seconds_count{{{labels}}} {count}")
+        lines += [
+            f"# HELP {ns}_stage_items_total Inputs processed by a stage.",
+            f"# TYPE {ns}_stage_items_total counter",
+        ]
+        for (stage, species), n in sorted(items.items()):
+            lines.append(f'{ns}_stage_items_total{{stage="{stage}",species="{species}"}} {n}')
+        lines += [
+            f"# HELP {ns}_inputs_total Inputs by outcome: ok, skipped or rejected (with reason).",
+            f"# TYPE {ns}_inputs_total counter",
+        ]
+        for (stage, species, status, reason), n in sorted(inputs.items()):
+            labels = f'stage="{stage}",species="{species}",status="{status}",reason="{reason}"'
+            lines.append(f"{ns}_inputs_total{{{labels}}} {n}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+        """
+        Serve ``/metrics`` on a daemon thread; call ``shutdown()`` on the result to stop.
+
+        Binds to localhost by default; pass ``host="0.0.0.0"`` to expose it.
+        """
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
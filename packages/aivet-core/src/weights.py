@@ -0,0 +1,159 @@
+"""
+Model weight loading and lazy primitive construction.
+
+Weights are stored as an uncompressed ``.npz`` (``np.savez`` or
+``save_weights``). ``load_weights`` maps the file read-only and returns
+NumPy views into the mapping instead of reading the arrays. Pages come
+from the OS page cache, so every worker process that loads the same file
+shares one physical copy, and pages that are never touched are never
+read. Loads are also cached per process.
+
+``save_weights`` pads each member so its array data starts on a 64-byte
+boundary. Other uncompressed ``.npz`` files still load, possibly as
+unaligned views.
+
+``LazyPrimitive`` defers building a primitive (and loading its weights)
+until it is first used, and can build it ahead of time on a background
+thread.
+"""
+
+import mmap
+import os
+from pathlib import Path
+import struct
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, Generic, Mapping, Optional, Tuple, TypeVar, Union
+import zipfile
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+T = TypeVar("T")
+
+ALIGNMENT = 64
+_ALIGN_EXTRA_ID = 0xD935  # Zip extra field used for alignment padding (as zipalign does)
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+_cache: Dict[Tuple[str, int, int], Mapping[str, np.ndarray]] = {}
+_cache_lock = threading.Lock()
+
+def save_weights(path: Union[str, Path], arrays: Mapping[str, np.ndarray]) -> None:
+    """Write arrays as an uncompressed ``.npz`` with 64-byte-aligned array data."""
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as zf:
+        for name, array in arrays.items():
+            array = np.asanyarray(array)
+            if array.dtype.hasobject:
+                raise ValueError(f"Weight '{name}' has an object dtype")
+            info = zipfile.ZipInfo(f"{name}.npy", date_time=(1980, 1, 1, 0, 0, 0))
+            info.compress_type = zipfile.ZIP_STORED
+            # The .npy header is padded to a multiple of 64 bytes, so aligning
+            # the member data aligns the array
+            data_start = zf.fp.tell() + _LOCAL_HEADER.size + len(info.filename.encode()) + 4
+            pad = -data_start % ALIGNMENT
+            info.extra = struct.pack("<HH", _ALIGN_EXTRA_ID, pad) + bytes(pad)
+            with zf.open(info, "w", force_zip64=array.nbytes > 0x7FFFFFFF) as f:
+                npy_format.write_array(f, array, allow_pickle=False)
+
+def load_weights(path: Union[str, Path], mmap_mode: bool = True) -> Mapping[str, np.ndarray]:
+    """
+    Arrays of a weight file, by name.
+
+    With ``mmap_mode`` the arrays are read-only views into a shared
+    mapping of the file, and loads of an unchanged file return the same
+    mapping. Otherwise the arrays are read into private memory.
+
+    Raises:
+        ValueError: The file has compressed members or object arrays,
+            neither of which can be mapped.
+    """
+    path = Path(path)
+    if not mmap_mode:
+        with np.load(path, allow_pickle=False) as npz:
+            return {name: npz[name] for name in npz.files}
+    stat = os.stat(path)
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        weights = _cache.get(key)
+        if weights is None:
+            weights = _cache[key] = MappingProxyType(_map_npz(path))
+    return weights
+
+def _map_npz(path: Path) -> Dict[str, np.ndarray]:
+    arrays = {}
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with zipfile.ZipFile(f) as zf:
+            infos = zf.infolist()
+        for info in infos:
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(
+                    f"{path.name}: weight '{name}' is compressed; save with np.savez to map it"
+                )
+            # The local header's extra field can differ from the central directory's
+            header = _LOCAL_HEADER.unpack_from(buffer, info.header_offset)
+            f.seek(info.header_offset + _LOCAL_HEADER.size + header[-2] + header[-1])
+            version = npy_format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = npy_format.read_array_header_1_0(f)
+            elif version == (2, 0):
+                shape, fortran_order, dtype = npy_format.read_array_header_2_0(f)
+            else:
+                raise ValueError(f"{path.name}: weight '{name}' uses .npy format {version}")
+            if dtype.hasobject:
+                raise ValueError(f"{path.name}: weight '{name}' has an object dtype")
+            arrays[name] = np.ndarray(
+                shape, dtype=dtype, buffer=buffer, offset=f.tell(),
+                order="F" if fortran_order else "C",
+            )
+    return arrays
+
+class LazyPrimitive(Generic[T]):
+    """
+    A primitive built on first use.
+
+    Construction runs at most once, also when ``get`` races a background
+    ``prewarm``; callers that arrive meanwhile wait for it. After that,
+    ``get`` is a single attribute check.
+
+    Example:
+        vocal = LazyPrimitive(lambda: VocalFeatureExtractor("cat"))
+        vocal.prewarm()  # Optional: build in the background now
+        features = vocal.get().extract_batch(clips)
+    """
+
+    def __init__(self, factory: Callable[[], T]):
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        """Whether the primitive has been built."""
+        return self._value is not None
+
+    def get(self) -> T:
+        """The primitive, built now if needed."""
+        value = self._value
+        if value is not None:
+            return value
+        with self._lock:
+            if self._value is None:
+                self._value = self._factory()
+            return self._value
+
+    def prewarm(self) -> threading.Thread:
+        """Start building the primitive on a daemon thread; returns the thread."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._warm, daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def _warm(self) -> None:
+        try:
+            self.get()
+        except Exception:
+            pass  # The next get() builds again and raises in the caller
@@ -0,0 +1,505 @@
+"""
+Process-pool execution of the CPU-bound vision and audio primitives.
+
+Frames and audio clips are written into fixed slots of two shared-memory
+arenas. Workers read them as NumPy views, so pixel data is never pickled.
+Only short task tuples go over each worker's pipe, one message per
+batch of slots. Results come back as small structured arrays of signal
+records.
+
+Frames of a session always go to the same worker (by a stable hash of
+the session ID). That worker owns the session's stateful estimators, and
+its pipe keeps the session's frames in order. Audio clips are
+stateless and go to whichever worker has the fewest tasks in flight.
+
+Frames that already sit in a capture ``FrameRing`` are not copied at
+all: ``process_ring`` sends only sequence numbers, and workers read the
+frames straight from the ring.
+
+``end_session`` tells the owning worker to drop a session's estimators.
+"""
+
+from dataclasses import dataclass, field
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+import os
+import traceback
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import weakref
+import zlib
+
+import numpy as np
+
+from frame_ring import FrameRing, attach_shared
+from session_store import SessionStore, SessionStoreConfig
+from signal_batch import BioSignalBatch
+
+RECORD_DTYPE = np.dtype([
+    ("source", "i1"),
+    ("species", "i1"),
+    ("metric", "i1"),  # Index into METRIC_METADATA
+    ("normalized_value", "f8"),
+    ("confidence", "f8"),
+    ("timestamp", "f8"),
+    ("raw_value", "f8"),
+])
+
+METRIC_METADATA: Tuple[Dict[str, str], ...] = (
+    {},
+    {"metric": "respiration_rate", "unit": "bpm"},
+    {"metric": "heart_rate", "unit": "bpm"},
+)
+_METRIC_CODES = {m.get("metric"): i for i, m in enumerate(METRIC_METADATA)}
+
+def records_from_batch(batch: BioSignalBatch) -> np.ndarray:
+    """Pack a batch into signal records (raw-value objects and extra metadata are dropped)."""
+    records = np.empty(len(batch), dtype=RECORD_DTYPE)
+    records["source"] = batch.source
+    records["species"] = batch.species
+    records["normalized_value"] = batch.normalized_value
+    records["confidence"] = batch.confidence
+    records["timestamp"] = batch.timestamp
+    records["raw_value"] = batch.raw_value
+    records["metric"] = [
+        _METRIC_CODES.get(batch.metadata[m].get("metric"), 0) if m >= 0 else 0
+        for m in batch.metadata_index
+    ]
+    return records
+
+def batch_from_records(records: np.ndarray) -> BioSignalBatch:
+    """Unpack signal records into a BioSignalBatch."""
+    return BioSignalBatch.from_columns(
+        source=records["source"],
+        species=records["species"],
+        normalized_value=records["normalized_value"],
+        confidence=records["confidence"],
+        timestamp=records["timestamp"],
+        raw_value=records["raw_value"],
+        metadata=[METRIC_METADATA[m] for m in records["metric"]],
+    )
+
+class SharedArena:
+    """Equal-sized slots in one shared-memory block."""
+
+    def __init__(self, slot_bytes: int, slots: int, name: Optional[str] = None):
+        self.slot_bytes = int(slot_bytes)
+        self.slots = int(slots)
+        if name is None:
+            size = max(self.slot_bytes * self.slots, 1)
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+            self.owner = True
+        else:
+            self.shm = attach_shared(name, shared_tracker=True)  # Workers are children of the pool
+            self.owner = False
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def view(self, slot: int, shape: Tuple[int, ...], dtype: Union[str, np.dtype]) -> np.ndarray:
+        """NumPy view of the start of ``slot``."""
+        return np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def close(self) -> None:
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+@dataclass
+class WorkerConfig:
+    """Pool size, arena geometry and per-worker session limits."""
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    frame_shape: Tuple[int, int, int] = (480, 640, 3)
+    frame_slots_per_worker: int = 2
+    sample_rate: int = 16000
+    max_clip_s: float = 5.0
+    audio_slots_per_worker: int = 2
+    fps: float = 30.0
+    sessions: SessionStoreConfig = field(default_factory=SessionStoreConfig)
+    start_method: Optional[str] = None
+    poll_s: float = 1.0  # How often a waiting parent checks that workers are alive
+
+    @property
+    def clip_samples(self) -> int:
+        return int(self.max_clip_s * self.sample_rate)
+
+    @property
+    def frame_slot_bytes(self) -> int:
+        return int(np.prod(self.frame_shape))
+
+    @property
+    def audio_slot_bytes(self) -> int:
+        return self.clip_samples * 4
+
+    @property
+    def frame_slots(self) -> int:
+        return self.workers * self.frame_slots_per_worker
+
+    @property
+    def audio_slots(self) -> int:
+        return self.workers * self.audio_slots_per_worker
+
+def _worker_main(config: WorkerConfig, frame_arena: str, audio_arena: str, conn) -> None:
+    """Worker loop: run lists of tasks on arena slots, or drop sessions, until None arrives."""
+    from vitals import VitalsMonitor
+    from vocalization import VocalFeatureExtractor
+
+    frames = SharedArena(config.frame_slot_bytes, config.frame_slots, frame_arena)
+    audio = SharedArena(config.audio_slot_bytes, config.audio_slots, audio_arena)
+    store = SessionStore(config.sessions)
+    extractors: Dict[str, VocalFeatureExtractor] = {}
+    rings: Dict[str, FrameRing] = {}
+
+    def vitals(
+        session_id, species, frame, timestamp, restart=False, motion_only=False
+    ) -> BioSignalBatch:
+        state = store.session(session_id, species)
+        monitor = state.primitive("vitals", lambda: VitalsMonitor(species, fps=config.fps))
+        if motion_only:
+            monitor.push_motion(frame)
+            return BioSignalBatch.concat([])
+        if restart:
+            monitor.reset()
+        return monitor.push_frame(frame, timestamp)
+
+    def run(kind, slot, session_id, species, timestamp, arg) -> BioSignalBatch:
+        if kind == "vision":
+            frame = frames.view(slot, config.frame_shape, np.uint8)
+            restart, motion_only = arg
+            return vitals(session_id, species, frame, timestamp, restart, motion_only)
+        if kind == "ring":
+            ring_name, seq, pool_owned = arg
+            ring = rings.get(ring_name)
+            if ring is None:
+                ring = rings[ring_name] = FrameRing.attach(ring_name, shared_tracker=pool_owned)
+            frame = ring.view(seq)
+            if frame is None:
+                raise ValueError(
+                    f"frame {seq} of ring {ring_name} was overwritten before it was read"
+                )
+            if timestamp is None:
+                timestamp = ring.timestamp(seq)
+            batch = vitals(session_id, species, frame, timestamp)
+            del frame
+            if not ring.is_current(seq):
+                raise ValueError(f"frame {seq} of ring {ring_name} was overwritten while in use")
+            return batch
+        clip = audio.view(slot, (arg,), np.float32)
+        extractor = extractors.get(species)
+        if extractor is None:
+            extractor = extractors[species] = VocalFeatureExtractor(
+                species, sample_rate=config.sample_rate
+            )
+        return extractor.extract_batch([clip]).to_signal_batch(species, timestamp)
+
+    try:
+        while True:
+            tasks = conn.recv()
+            if tasks is None:
+                break
+            if tasks[0] == "drop":
+                store.drop(tasks[1])  # No reply
+                continue
+            results = []
+            for kind, task_id, slot, *args in tasks:
+                try:
+                    records = records_from_batch(run(kind, slot, *args))
+                    results.append((task_id, kind, slot, records, None))
+                except Exception:
+                    results.append((task_id, kind, slot, None, traceback.format_exc()))
+            conn.send(results)
+            store.evict_idle()
+    except EOFError:
+        pass  # Parent went away
+    finally:
+        frames.close()
+        audio.close()
+        for ring in rings.values():
+            ring.close()
+
+def _shutdown(processes, conns, arenas) -> None:
+    for conn in conns:
+        try:
+            conn.send(None)
+        except (OSError, ValueError):
+            pass
+    for p in processes:
+        p.join(timeout=5.0)
+        if p.is_alive():
+            p.terminate()
+    for conn in conns:
+        conn.close()
+    for arena in arenas:
+        arena.close()
+
+class WorkerPool:
+    """
+    Managed pool of primitive worker processes.
+
+    Example:
+        with WorkerPool(WorkerConfig(workers=4)) as pool:
+            batches = pool.process_frames(images, np.arange(len(images)), session_ids, species)
+
+    Results are returned in input order as one BioSignalBatch per item.
+    """
+
+    def __init__(self, config: Optional[WorkerConfig] = None):
+        self.config = cfg = config or WorkerConfig()
+        if cfg.workers < 1:
+            raise ValueError("workers must be >= 1")
+        n = cfg.workers
+        self._frames = SharedArena(cfg.frame_slot_bytes, cfg.frame_slots)
+        self._audio = SharedArena(cfg.audio_slot_bytes, cfg.audio_slots)
+
+        ctx = mp.get_context(cfg.start_method)
+        self._conns = []
+        self._processes = []
+        for w in range(n):
+            parent_conn, child_conn = ctx.Pipe()
+            p = ctx.Process(
+                target=_worker_main,
+                args=(cfg, self._frames.name, self._audio.name, child_conn),
+                daemon=True,
+                name=f"aivet-worker-{w}",
+            )
+            p.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(p)
+
+        # Parent-side slot bookkeeping; worker w owns a contiguous block of slots
+        self._slots_per_worker = {
+            "vision": cfg.frame_slots_per_worker,
+            "ring": cfg.frame_slots_per_worker,  # Credits only; ring frames need no slot
+            "audio": cfg.audio_slots_per_worker,
+        }
+        self._free = {
+            kind: [list(range(w * k, (w + 1) * k)) for w in range(n)]
+            for kind, k in self._slots_per_worker.items()
+        }
+        self._in_flight = [0] * n
+        self._finalizer = weakref.finalize(
+            self, _shutdown, self._processes, self._conns, (self._frames, self._audio)
+        )
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the workers and release the shared memory."""
+        self._finalizer()
+
+    @property
+    def workers(self) -> int:
+        return self.config.workers
+
+    def worker_for(self, session_id: str) -> int:
+        """Worker that owns a session's vision state."""
+        return zlib.crc32(session_id.encode()) % self.config.workers
+
+    def end_session(self, session_id: str) -> None:
+        """Drop a session's estimators in the worker that owns them."""
+        w = self.worker_for(session_id)
+        try:
+            self._conns[w].send(("drop", session_id))
+        except OSError as err:
+            raise RuntimeError(f"worker process exited: {self._processes[w].name}") from err
+
+    def process_frames(
+        self,
+        images: np.ndarray,
+        index: Optional[np.ndarray] = None,
+        session_ids: Optional[Sequence[str]] = None,
+        species: Union[str, Sequence[str]] = "unknown",
+        timestamps: Union[float, Sequence[float]] = 0.0,
+        restart: Optional[Sequence[bool]] = None,
+        motion_only: Optional[Sequence[bool]] = None,
+    ) -> List[BioSignalBatch]:
+        """
+        Run the vision primitives on rows ``index`` of an (N, H, W, 3) stack.
+
+        ``session_ids``, ``species`` and ``timestamps`` are per selected row
+        (or scalars). Each row is copied once, straight into a shared slot.
+        Rows flagged in ``restart`` reset their session's vitals estimators first.
+        Rows flagged in ``motion_only`` only feed their breathing motion to
+        the estimators (``VitalsMonitor.push_motion``) and give empty batches.
+        """
+        if tuple(images.shape[1:]) != tuple(self.config.frame_shape):
+            raise ValueError(
+                f"frames must have shape (N, {self.config.frame_shape}), got {images.shape}"
+            )
+        index = np.arange(len(images)) if index is None else np.asarray(index)
+        n = len(index)
+        session_ids = ["default"] * n if session_ids is None else list(session_ids)
+        species = _broadcast(species, n)
+        timestamps = _broadcast(timestamps, n)
+
+        def write(slot: int, i: int) -> bool:
+            self._frames.view(slot, self.config.frame_shape, np.uint8)[...] = images[index[i]]
+            return (
+                bool(restart[i]) if restart is not None else False,
+                bool(motion_only[i]) if motion_only is not None else False,
+            )
+
+        return self._run(
+            "vision",
+            n,
+            write,
+            lambda i: self.worker_for(session_ids[i]),
+            lambda i: (session_ids[i], str(species[i]), float(timestamps[i])),
+        )
+
+    def process_ring(
+        self,
+        ring: FrameRing,
+        seqs: Sequence[int],
+        session_ids: Optional[Sequence[str]] = None,
+        species: Union[str, Sequence[str]] = "unknown",
+        timestamps: Optional[Union[float, Sequence[float]]] = None,
+    ) -> List[BioSignalBatch]:
+        """
+        Run the vision primitives on frames ``seqs`` of a capture ring, without copying them.
+
+        Workers attach to the ring by name. A frame that the ring's writer
+        overwrites before or while a worker reads it fails its task.
+        ``timestamps`` default to the capture timestamps stored in the ring.
+        """
+        if tuple(ring.frame_shape) != tuple(self.config.frame_shape):
+            raise ValueError(
+                f"ring frames have shape {ring.frame_shape}, pool expects {self.config.frame_shape}"
+            )
+        seqs = [int(s) for s in seqs]
+        n = len(seqs)
+        session_ids = ["default"] * n if session_ids is None else list(session_ids)
+        species = _broadcast(species, n)
+        timestamps = [None] * n if timestamps is None else _broadcast(timestamps, n)
+
+        return self._run(
+            "ring",
+            n,
+            lambda slot, i: (ring.name, seqs[i], ring.owner),
+            lambda i: self.worker_for(session_ids[i]),
+            lambda i: (
+                session_ids[i],
+                str(species[i]),
+                None if timestamps[i] is None else float(timestamps[i]),
+            ),
+        )
+
+    def process_audio(
+        self,
+        clips: Sequence[np.ndarray],
+        species: Union[str, Sequence[str]] = "unknown",
+        timestamps: Union[float, Sequence[float]] = 0.0,
+    ) -> List[BioSignalBatch]:
+        """Run vocal feature extraction on each clip in a worker."""
+        n = len(clips)
+        limit = self.config.clip_samples
+        for clip in clips:
+            if len(clip) > limit:
+                raise ValueError(f"clip of {len(clip)} samples exceeds the {limit}-sample slot")
+        species = _broadcast(species, n)
+        timestamps = _broadcast(timestamps, n)
+
+        def write(slot: int, i: int) -> int:
+            clip = clips[i]
+            self._audio.view(slot, (len(clip),), np.float32)[...] = clip
+            return len(clip)
+
+        return self._run(
+            "audio",
+            n,
+            write,
+            lambda i: int(np.argmin(self._in_flight)),
+            lambda i: ("", str(species[i]), float(timestamps[i])),
+        )
+
+    def _run(self, kind, n, write, choose_worker, describe) -> List[BioSignalBatch]:
+        """
+        Fill free slots and send each worker its tasks as one message, once
+        its slots are all assigned or the input runs out.
+
+        If filling a slot or sending fails, the unsent tasks give their slots
+        back and the sent ones are still collected, so the pool stays usable.
+        """
+        records: List[Optional[np.ndarray]] = [None] * n
+        errors: List[str] = []
+        free = self._free[kind]
+        outbox: List[list] = [[] for _ in range(self.config.workers)]
+        pending = 0
+        try:
+            for i in range(n):
+                w = choose_worker(i)
+                if not free[w]:
+                    self._flush(outbox)
+                    while not free[w]:
+                        pending -= self._collect(records, errors)
+                slot = free[w].pop()
+                try:
+                    task = (kind, i, slot, *describe(i), write(slot, i))
+                except BaseException:
+                    free[w].append(slot)
+                    raise
+                outbox[w].append(task)
+                self._in_flight[w] += 1
+                pending += 1
+                if not free[w]:
+                    self._flush(outbox, w)
+            self._flush(outbox)
+        finally:
+            for w, tasks in enumerate(outbox):
+                for task in tasks:
+                    free[w].append(task[2])
+                self._in_flight[w] -= len(tasks)
+                pending -= len(tasks)
+                tasks.clear()
+            while pending:
+                pending -= self._collect(records, errors)
+        if errors:
+            raise RuntimeError(f"{len(errors)} {kind} task(s) failed in workers:\n{errors[0]}")
+        return [batch_from_records(r) for r in records]
+
+    def _flush(self, outbox: List[list], worker: Optional[int] = None) -> None:
+        for w in range(len(outbox)) if worker is None else (worker,):
+            if outbox[w]:
+                try:
+                    self._conns[w].send(outbox[w])
+                except OSError as err:
+                    raise RuntimeError(f"worker process exited: {self._processes[w].name}") from err
+                outbox[w] = []
+
+    def _collect(self, records: List[Optional[np.ndarray]], errors: List[str]) -> int:
+        """Wait for one worker's results and release their slots; returns the count."""
+        busy = [w for w in range(self.config.workers) if self._in_flight[w]]
+        conns = {self._conns[w]: w for w in busy}
+        sentinels = {self._processes[w].sentinel: w for w in busy}
+        while True:
+            ready = wait(list(conns) + list(sentinels), timeout=self.config.poll_s)
+            ready_conns = [c for c in ready if c in conns]
+            if ready_conns:
+                break
+            if ready:
+                dead = ", ".join(self._processes[sentinels[r]].name for r in ready)
+                raise RuntimeError(f"worker process(es) exited: {dead}")
+        results = ready_conns[0].recv()
+        for task_id, kind, slot, result, error in results:
+            w = slot // self._slots_per_worker[kind]
+            self._free[kind][w].append(slot)
+            self._in_flight[w] -= 1
+            if error is not None:
+                errors.append(error)
+            else:
+                records[task_id] = result
+        return len(results)
+
+def _broadcast(values, n: int) -> np.ndarray:
+    if isinstance(values, (str, int, float)):
+        return np.full(n, values, dtype=object)
+    values = np.asarray(values, dtype=object)
+    if values.shape != (n,):
+        raise ValueError(f"expected {n} values, got shape {values.shape}")
+    return values
@@ -0,0 +1,50 @@
+"""
+DolittleBridge pipeline pooling and per-session species and breed.
+"""
+
+import numpy as np
+import pytest
+
+from doolittle.bridge import DolittleBridge, PipelinePool
+
+def _breathing(bpm, seconds=12.0, fps=30.0):
+    """Frames of a textured flank rising and falling ``bpm`` times a minute."""
+    base = np.random.default_rng(0).integers(0, 255, (256, 320, 3), dtype=np.uint8)
+    for i in range(int(seconds * fps)):
+        dy = int(round(4 * np.sin(2 * np.pi * bpm / 60.0 * i / fps)))
+        yield base[8 + dy:248 + dy]
+
+def test_pool_reuses_pipelines_and_evicts_least_recent():
+    pool = PipelinePool(max_pipelines=2)
+    plain = pool.acquire()
+    assert pool.acquire() is plain
+    cached = pool.acquire(fusion_cache=True)
+    assert pool.acquire() is plain  # Now the most recent
+    ungated = pool.acquire(gate=False)
+    assert len(pool) == 2
+    assert pool.acquire() is plain and pool.acquire(gate=False) is ungated
+    assert pool.acquire(fusion_cache=True) is not cached  # Evicted, rebuilt
+
+def test_pool_rejects_unhashable_options():
+    pool = PipelinePool()
+    with pytest.raises(ValueError, match="rules"):
+        pool.acquire(rules=[], gate=False)
+    assert len(pool) == 0
+
+def test_sessions_keep_their_species_and_breed():
+    bridge = DolittleBridge(species="dog", pool=PipelinePool())
+    bridge.start_session("pug", breed="pug")
+    bridge.start_session("mutt")
+    bridge.start_session("tom", species="cat")
+    bridge.start_session("pug")  # Reopened: keeps its breed
+    for frame in _breathing(36.0):
+        for session_id in ("pug", "mutt"):
+            bridge.run_triage(image=frame, session_id=session_id)
+
+    sessions = bridge._sessions
+    assert (sessions["pug"].species, sessions["pug"].breed) == ("dog", "pug")
+    assert (sessions["tom"].species, sessions["tom"].breed) == ("cat", None)
+    # 36 bpm is a normal resting rate for a pug but not for a generic dog
+    assert "guardrail" not in sessions["pug"].last_result["triage"]
+    alerts = sessions["mutt"].last_result["triage"]["guardrail"]
+    assert [(a["metric"], a["reason"]) for a in alerts] == [("respiration_rate", "above_normal")]
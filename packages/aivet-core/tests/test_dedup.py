@@ -0,0 +1,88 @@
+"""
+FrameDeduplicator verdicts and reuse of vision results in the pipeline.
+"""
+
+import numpy as np
+import pytest
+
+from dedup import FrameDedupConfig, FrameDedupState, FrameDeduplicator
+from pipeline import AiVetPipeline, PipelineContext
+
+def _textured(seed=0):
+    return np.random.default_rng(seed).integers(0, 255, (240, 320, 3), dtype=np.uint8)
+
+def _breathing(bpm, amplitude, seconds=32.0, fps=30.0):
+    """Frames of a smoothly shaded flank moving ``amplitude`` pixels ``bpm`` times a minute."""
+    y, x = np.arange(256)[:, None], np.arange(320)[None, :]
+    noise = np.random.default_rng(0).integers(-20, 21, (256, 320))
+    base = np.clip(128 + 50 * np.sin(y / 9.0) * np.cos(x / 13.0) + noise, 0, 255)
+    base = base.astype(np.uint8)[:, :, None].repeat(3, axis=2)
+    for i in range(int(seconds * fps)):
+        dy = int(round(amplitude * np.sin(2 * np.pi * bpm / 60.0 * i / fps)))
+        yield base[8 + dy:248 + dy]
+
+def test_near_duplicates_reuse_the_restamped_result():
+    dedup = FrameDeduplicator()
+    state = FrameDedupState()
+    frame = _textured()
+    assert not dedup.check(frame, state)  # Nothing analyzed yet
+    dedup.remember(state, {"status": "ok", "signals": None})
+
+    assert dedup.check(frame, state)
+    assert dedup.check(np.clip(frame.astype(np.int16) + 1, 0, 255).astype(np.uint8), state)
+    assert not dedup.check(_textured(seed=1), state)  # New scene
+    assert not dedup.check(frame, state, force=True)
+    assert state.to_dict() == {"frames": 5, "reused": 2}
+    assert dedup.reuse(state, 12.5) == {"status": "ok", "signals": None, "reused": True}
+
+def test_only_ok_results_become_the_reference():
+    dedup = FrameDeduplicator()
+    state = FrameDedupState()
+    frame = _textured()
+    dedup.check(frame, state)
+    dedup.remember(state, {"status": "rejected", "reason": "blurry"})
+    assert state.result is None and not dedup.check(frame, state)
+    dedup.remember(state, {"status": "ok", "signals": None})
+    assert state.pending is None and dedup.check(frame, state)
+
+def test_reuse_streak_is_bounded():
+    dedup = FrameDeduplicator(FrameDedupConfig(max_reuse=3))
+    state = FrameDedupState()
+    frame = _textured()
+    verdicts = []
+    for _ in range(9):
+        verdicts.append(dedup.check(frame, state))
+        if not verdicts[-1]:
+            dedup.remember(state, {"status": "ok", "signals": None})
+    assert verdicts == [False, True, True, True, False, True, True, True, False]
+
+def test_pipeline_reuses_vision_results_per_session():
+    pipeline = AiVetPipeline(PipelineContext(session_id="s", species="cat"), gate=False, dedup=True)
+    frame = _textured()
+    results = [pipeline.process_frame(frame)["vision"] for _ in range(40)]
+
+    # The first frame and the one after 30 reuses are analyzed
+    assert [i for i, r in enumerate(results) if not r.get("reused")] == [0, 31]
+    assert pipeline.reused_frames() == {"s": {"frames": 40, "reused": 38}}
+    analyzed, reused = results[0]["signals"], results[1]["signals"]
+    np.testing.assert_array_equal(reused.raw_value, analyzed.raw_value)
+    assert (reused.timestamp >= analyzed.timestamp).all()
+    assert not pipeline._process_vision(_textured(seed=1)).get("reused")
+    assert AiVetPipeline(PipelineContext(session_id="s", species="cat")).reused_frames() == {}
+
+def test_reused_frames_still_feed_respiration():
+    estimates = {}
+    for dedup in (True, False):
+        pipeline = AiVetPipeline(
+            PipelineContext(session_id="cat-1", species="cat"), gate=False, dedup=dedup
+        )
+        for frame in _breathing(36.0, amplitude=2):
+            pipeline.process_frame(frame)
+        if dedup:
+            assert pipeline.reused_frames()["cat-1"]["reused"] > 0.75 * 960
+        monitor = pipeline._sessions.session("cat-1", "cat").primitive("vitals", None)
+        estimates[dedup] = monitor.respiration.estimate()
+
+    assert estimates[True].rate_bpm[0] == pytest.approx(36.0, abs=2.0)
+    assert estimates[True].rate_bpm[0] == estimates[False].rate_bpm[0]
+    assert estimates[True].confidence[0] == pytest.approx(estimates[False].confidence[0])
@@ -0,0 +1,76 @@
+"""
+CachedFusionEngine hits, and invalidation when the species registry changes.
+"""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from fusion import CachedFusionEngine, FusionEngine
+from schema import SignalSource, Species
+from signal_batch import BioSignalBatch
+from species import REGISTRY
+
+def _batch(value, confidence=0.9, timestamp=0.0):
+    return BioSignalBatch.from_columns(
+        source=SignalSource.VISION_GRIMACE,
+        species=Species.CAT,
+        normalized_value=np.atleast_1d(value),
+        confidence=confidence,
+        timestamp=timestamp,
+    )
+
+def test_equal_sets_after_rounding_hit():
+    engine = CachedFusionEngine(value_quantum=0.01)
+    first = engine.fuse(_batch(0.601, timestamp=1.0))
+    second = engine.fuse(_batch(0.599, timestamp=2.0))
+    assert (engine.hits, engine.misses) == (1, 1)
+    assert second.assessment.pain_probability == first.assessment.pain_probability
+    assert second.assessment.timestamp == 2.0
+    expected = FusionEngine().fuse(_batch(0.6)).assessment.pain_probability
+    assert first.assessment.pain_probability == pytest.approx(expected)
+
+def test_registry_change_invalidates_cache():
+    engine = CachedFusionEngine()
+    original = REGISTRY.get("cat")
+    before = engine.fuse(_batch(0.6)).assessment.pain_probability
+    try:
+        REGISTRY.register("cat", replace(original, pain_hiding_factor=0.0))
+        changed = engine.fuse(_batch(0.6)).assessment.pain_probability
+        assert engine.invalidations == 1 and engine.misses == 2
+        assert changed < before
+        fresh = FusionEngine().fuse(_batch(0.6)).assessment.pain_probability
+        assert changed == pytest.approx(fresh)
+    finally:
+        REGISTRY.register("cat", original)
+    assert engine.fuse(_batch(0.6)).assessment.pain_probability == pytest.approx(before)
+    assert engine.invalidations == 2
+    assert engine.stats()["size"] == 1
+
+def test_batched_fusion_follows_registry_changes():
+    engine = CachedFusionEngine()
+    batch = BioSignalBatch.concat([_batch(0.6), _batch(0.3)])
+    offsets = np.array([0, 1, 2])
+    original = REGISTRY.get("cat")
+    before = engine.fuse_batch(batch, offsets).pain_probability
+    try:
+        REGISTRY.register("cat", replace(original, pain_hiding_factor=0.0))
+        changed = engine.fuse_batch(batch, offsets).pain_probability
+        assert engine.invalidations == 1
+        fresh = FusionEngine().fuse_batch(batch, offsets).pain_probability
+        np.testing.assert_allclose(changed, fresh)
+        assert changed[0] < before[0]
+    finally:
+        REGISTRY.register("cat", original)
+    np.testing.assert_allclose(engine.fuse_batch(batch, offsets).pain_probability, before)
+
+@pytest.mark.parametrize("quantum", [0.6, 0.3, 0.07])
+def test_steps_that_do_not_divide_one_stay_in_range(quantum):
+    engine = CachedFusionEngine(value_quantum=quantum, confidence_quantum=quantum)
+    rounded = lambda x: min(round(x / quantum) * quantum, 1.0)  # noqa: E731
+    for value in (0.0, 0.95, 1.0):
+        result = engine.fuse(_batch(value, confidence=1.0))
+        expected = FusionEngine().fuse(_batch(rounded(value), rounded(1.0))).assessment
+        assert result.assessment.pain_probability == pytest.approx(expected.pain_probability)
+        assert 0.0 <= result.assessment.confidence <= 1.0
@@ -0,0 +1,33 @@
+"""
+FusionEngine triage at the edges of the evidence range.
+"""
+
+import numpy as np
+import pytest
+
+from fusion.engine import FusionConfig, FusionEngine
+from schema import SignalSource, Species, TriageLevel
+from signal_batch import BioSignalBatch
+
+def _batch(value, confidence):
+    return BioSignalBatch.from_columns(
+        source=SignalSource.VISION_GRIMACE,
+        species=Species.CAT,
+        normalized_value=np.atleast_1d(value),
+        confidence=confidence,
+        timestamp=0.0,
+    )
+
+@pytest.mark.parametrize("value, confidence", [(0.9, 0.0), (0.39, 1.0)])
+def test_no_evidence_triages_routine(value, confidence):
+    result = FusionEngine().fuse(_batch(value, confidence))
+    assert result.assessment.pain_probability == pytest.approx(FusionConfig.prior_pain)
+    assert result.triage_level is TriageLevel.ROUTINE
+
+def test_strong_evidence_escalates():
+    result = FusionEngine().fuse(_batch(1.0, 1.0))
+    assert result.triage_level is not TriageLevel.ROUTINE
+
+def test_prior_outside_routine_is_rejected():
+    with pytest.raises(ValueError):
+        FusionEngine(FusionConfig(prior_pain=0.2))
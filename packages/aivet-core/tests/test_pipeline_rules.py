@@ -0,0 +1,39 @@
+"""
+Symptom rules and guardrail alerts reached end to end through AiVetPipeline.
+"""
+
+import numpy as np
+import pytest
+
+from pipeline import AiVetPipeline, PipelineContext
+
+def _breathing(bpm, seconds=32.0, fps=30.0):
+    """Frames of a textured flank rising and falling ``bpm`` times a minute."""
+    base = np.random.default_rng(0).integers(0, 255, (256, 320, 3), dtype=np.uint8)
+    for i in range(int(seconds * fps)):
+        dy = int(round(4 * np.sin(2 * np.pi * bpm / 60.0 * i / fps)))
+        yield base[8 + dy:248 + dy]
+
+@pytest.mark.parametrize("species, bpm", [("cat", 55.0), ("horse", 30.0)])
+def test_tachypnea_reaches_triage(species, bpm):
+    pipeline = AiVetPipeline(PipelineContext(session_id=f"{species}-1", species=species))
+    fused = [
+        t for t in (pipeline.process_frame(f)["triage"] for f in _breathing(bpm))
+        if "triage_level" in t
+    ]
+    last = fused[-1]
+    assert "tachypnea" in last["symptoms"]
+    assert [a["reason"] for a in last["guardrail"]] == ["above_normal"]
+
+def test_batch_guardrails_use_each_items_breed():
+    # A resting 36 bpm is normal for a pug but above the range of a generic dog
+    pipeline = AiVetPipeline(PipelineContext(session_id="clinic", species="dog"))
+    for frame in _breathing(36.0, seconds=12.0):
+        results = pipeline.process_batch(
+            np.stack([frame, frame]), session_ids=["pug", "mutt"], breeds=["pug", None]
+        )
+    pug, mutt = (r["triage"] for r in results)
+    assert "guardrail" not in pug
+    assert [(a["metric"], a["reason"]) for a in mutt["guardrail"]] == [
+        ("respiration_rate", "above_normal")
+    ]
@@ -0,0 +1,82 @@
+"""
+QualityGate verdicts and the breathing motion of frames it turns away.
+"""
+
+import numpy as np
+import pytest
+
+from pipeline import AiVetPipeline, PipelineContext
+from quality_gate import FrameHistory, QualityGate
+
+def _textured(level=128, spread=60, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.integers(-spread, spread + 1, (240, 320, 1))
+    return np.clip(level + noise, 0, 255).astype(np.uint8).repeat(3, axis=2)
+
+def _clipped(white, seed=0):
+    """Pure black and white pixels, a ``white`` fraction of them white."""
+    rng = np.random.default_rng(seed)
+    return np.where(rng.random((240, 320, 1)) < white, 255, 0).astype(np.uint8).repeat(3, axis=2)
+
+def _breathing(bpm, amplitude, seconds=32.0, fps=30.0):
+    """Frames of a textured flank moving ``amplitude`` pixels ``bpm`` times a minute."""
+    base = np.random.default_rng(0).integers(0, 255, (256, 320, 3), dtype=np.uint8)
+    for i in range(int(seconds * fps)):
+        dy = int(round(amplitude * np.sin(2 * np.pi * bpm / 60.0 * i / fps)))
+        yield base[8 + dy:248 + dy]
+
+@pytest.mark.parametrize("frame, reason", [
+    (np.full((240, 320, 3), 8, dtype=np.uint8), "underexposed"),
+    (np.full((240, 320, 3), 250, dtype=np.uint8), "overexposed"),
+    (np.full((240, 320, 3), 128, dtype=np.uint8), "blurry"),
+    (_clipped(white=0.7), "overexposed"),  # Mean brightness passes, pixels clip
+    (_clipped(white=0.3), "underexposed"),
+])
+def test_bad_frames_are_rejected(frame, reason):
+    quality = QualityGate().check_frame(frame)
+    assert not quality.passed
+    assert quality.reason == reason
+
+def test_sharp_frame_passes():
+    quality = QualityGate().check_frame(_textured())
+    assert quality.passed and quality.reason is None
+    assert quality.metrics["sharpness"] > 20.0
+
+def test_motion_accumulates_against_last_passed_frame():
+    gate = QualityGate()
+    history = FrameHistory()
+    frame = _textured(spread=40)
+    assert gate.check_frame(frame, history).passed
+    # Each step brightens by 1 gray level; the reference stays at the first frame
+    quality = gate.check_frame(frame + np.uint8(1), history)
+    assert quality.reason == "static"
+    assert quality.metrics["motion"] == pytest.approx(1.0, abs=0.1)
+    assert gate.check_frame(frame + np.uint8(3), history).passed
+    assert gate.check_frame(frame + np.uint8(4), history).reason == "static"
+
+def test_audio_silence_floor():
+    gate = QualityGate()
+    assert gate.check_audio(np.zeros(1600, dtype=np.float32)).reason == "silent"
+    assert gate.check_audio(np.array([], dtype=np.float32)).reason == "silent"
+    quiet = np.full(1600, 10 ** (-60 / 20), dtype=np.float32)
+    assert gate.check_audio(quiet).metrics["rms_dbfs"] == pytest.approx(-60.0, abs=0.01)
+    assert not gate.check_audio(quiet).passed
+    assert gate.check_audio(quiet * 100).passed
+
+def test_static_frames_still_feed_respiration():
+    estimates = {}
+    for gate in (True, False):
+        pipeline = AiVetPipeline(PipelineContext(session_id="cat-1", species="cat"), gate=gate)
+        results = [pipeline.process_frame(f) for f in _breathing(36.0, amplitude=2)]
+        rejected = [r for r in results if r["vision"]["status"] == "rejected"]
+        if gate:
+            assert len(rejected) > len(results) // 2
+            assert {r["triage"]["rejected"]["vision"] for r in rejected} == {"static"}
+        else:
+            assert not rejected
+        monitor = pipeline._sessions.session("cat-1", "cat").primitive("vitals", None)
+        estimates[gate] = monitor.respiration.estimate()
+
+    assert estimates[True].rate_bpm[0] == pytest.approx(36.0, abs=2.0)
+    assert estimates[True].rate_bpm[0] == estimates[False].rate_bpm[0]
+    assert estimates[True].confidence[0] == pytest.approx(estimates[False].confidence[0])
@@ -0,0 +1,70 @@
+"""
+Scheduler cadence, vitals bursts, escalation and the shared budget.
+"""
+
+import numpy as np
+import pytest
+
+from schema import TriageLevel
+from scheduler import Decision, Scheduler, SchedulerConfig
+
+FPS = 30.0
+
+def _run(scheduler, session_id, primitive, start, seconds, fps=FPS):
+    """Decisions for ``seconds`` of items at ``fps``; returns (times, decisions)."""
+    times = start + np.arange(int(round(seconds * fps))) / fps
+    return times, [scheduler.decide(session_id, primitive, now=t) for t in times]
+
+def test_vitals_burst_covers_the_respiration_window():
+    scheduler = Scheduler()
+    scheduler.update("s1", TriageLevel.ROUTINE, now=0.0)
+    times, decisions = _run(scheduler, "s1", "vitals", 0.0, 200.0)
+    ran = np.array([d is not Decision.SKIP for d in decisions])
+
+    assert decisions[0] is Decision.RESTART
+    burst = times[ran & (times < 100.0)]
+    assert burst[-1] - burst[0] >= 30.0 - 1.0 / FPS
+    assert ran[times < 30.0].all() and not ran[(times >= 30.0) & (times < 180.0)].any()
+    # Next burst after the 180 s ROUTINE interval starts over after the gap
+    restarts = [t for t, d in zip(times, decisions) if d is Decision.RESTART]
+    assert restarts == [0.0, pytest.approx(180.0, abs=1.0 / FPS)]
+
+def test_level_and_confidence_set_the_interval():
+    scheduler = Scheduler()
+    scheduler.update("s1", TriageLevel.ROUTINE, confidence=1.0, now=0.0)
+    assert scheduler.interval("s1", "vocal") == 5.0
+    scheduler.update("s1", TriageLevel.ROUTINE, confidence=0.0, now=0.0)
+    assert scheduler.interval("s1", "vocal") == 2.5  # confidence_floor
+    scheduler.update("s1", TriageLevel.EMERGENCY, now=0.0)
+    assert scheduler.interval("s1", "vitals") == 0.0
+    _, decisions = _run(scheduler, "s1", "grimace", 0.0, 2.0)
+    assert all(d is Decision.RUN for d in decisions)
+
+def test_escalation_makes_primitives_due_at_once():
+    scheduler = Scheduler()
+    scheduler.update("s1", TriageLevel.ROUTINE, now=0.0)
+    assert scheduler.due("s1", "grimace", now=0.0)
+    assert not scheduler.due("s1", "grimace", now=1.0)
+    scheduler.update("s1", TriageLevel.LOW, now=1.0)  # Escalation
+    assert scheduler.due("s1", "grimace", now=1.1)
+    scheduler.update("s1", TriageLevel.ROUTINE, now=1.2)  # De-escalation waits
+    assert not scheduler.due("s1", "grimace", now=1.3)
+
+def test_budget_goes_to_urgent_levels_first():
+    config = SchedulerConfig(budget_s=0.01, min_share=0.1)
+    scheduler = Scheduler(config)
+    scheduler.update("moderate", TriageLevel.MODERATE, now=0.0)
+    for i in range(20):
+        scheduler.update(f"routine-{i}", TriageLevel.ROUTINE, now=0.0)
+    t = 0.0
+    for _ in range(5):
+        for session_id in scheduler:
+            scheduler.decide(session_id, "grimace", now=t)
+        t += 1.0
+
+    shares = scheduler.shares
+    assert shares[TriageLevel.MODERATE] == 1.0
+    # MODERATE takes 5 ms/s; 20 ROUTINE sessions want 20 ms/s and get the other 5
+    assert shares[TriageLevel.ROUTINE] == pytest.approx(0.25)
+    assert scheduler.interval("routine-0", "grimace") == pytest.approx(20.0)
+    assert scheduler.interval("moderate", "grimace") == 1.0
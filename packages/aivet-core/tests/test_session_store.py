@@ -0,0 +1,86 @@
+"""
+SessionStore smoothing hysteresis and eviction.
+"""
+
+import numpy as np
+
+from schema import TriageLevel
+from session_store import SessionStore, SessionStoreConfig
+
+class _Primitive:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+def _store(**overrides):
+    config = dict(smoothing_tau_s=1e-6, deescalate_margin=0.05, deescalate_dwell_s=30.0)
+    config.update(overrides)
+    return SessionStore(SessionStoreConfig(**config))
+
+def _record(store, p, t, session_id="s1"):
+    return store.record_values(session_id, "cat", None, p, 1.0, t, now=t)
+
+def test_escalates_at_once_and_holds_within_margin():
+    store = _store()
+    assert _record(store, 0.1, 0.0).triage_level is TriageLevel.ROUTINE
+    update = _record(store, 0.45, 1.0)
+    assert update.changed and update.triage_level is TriageLevel.MODERATE
+    # Just below the 0.4 cut but within the margin: held
+    update = _record(store, 0.37, 100.0)
+    assert update.raw_triage_level is TriageLevel.LOW
+    assert update.triage_level is TriageLevel.MODERATE
+
+def test_deescalates_after_dwell():
+    store = _store()
+    _record(store, 0.45, 0.0)
+    assert _record(store, 0.1, 1.0).triage_level is TriageLevel.MODERATE
+    assert _record(store, 0.1, 20.0).triage_level is TriageLevel.MODERATE
+    update = _record(store, 0.1, 31.0)
+    assert update.changed and update.triage_level is TriageLevel.ROUTINE
+
+def test_rebound_restarts_dwell():
+    store = _store()
+    _record(store, 0.45, 0.0)
+    _record(store, 0.1, 1.0)
+    _record(store, 0.42, 20.0)
+    assert _record(store, 0.1, 40.0).triage_level is TriageLevel.MODERATE
+
+def test_evicts_least_recently_used_past_max_sessions():
+    store = _store(max_sessions=2)
+    for i, session_id in enumerate(["a", "b", "a", "c"]):
+        _record(store, 0.1, float(i), session_id)
+    assert list(store) == ["a", "c"]
+    assert store.evictions == 1
+
+def test_evict_idle():
+    store = _store(idle_timeout_s=10.0)
+    _record(store, 0.1, 0.0, "a")
+    _record(store, 0.1, 8.0, "b")
+    assert store.evict_idle(now=15.0) == ["a"]
+    assert list(store) == ["b"]
+
+def test_memory_counts_primitives():
+    store = _store()
+    base = store.memory_bytes
+    _record(store, 0.1, 0.0)
+    rings = store.memory_bytes - base
+    store.get("s1").primitive("vitals", lambda: _Primitive(50_000))
+    _record(store, 0.1, 1.0)
+    assert store.memory_bytes == rings + 50_000
+    assert store.get("s1").nbytes == rings + 50_000
+    store.drop("s1")
+    assert store.memory_bytes == 0
+
+def test_evicts_past_max_total_bytes():
+    ring = _store().config.max_session_bytes
+    store = _store(max_total_bytes=3 * ring + 60_000)
+    for i, session_id in enumerate(["a", "b", "c"]):
+        _record(store, 0.1, float(i), session_id)
+        store.get(session_id).primitive("vitals", lambda: _Primitive(40_000))
+    assert len(store) == 3
+    _record(store, 0.1, 3.0, "a")
+    _record(store, 0.1, 4.0, "b")
+    # a and b fit; measuring c as well goes over the cap and evicts a
+    _record(store, 0.1, 5.0, "c")
+    assert list(store) == ["b", "c"]
+    assert store.memory_bytes <= store.config.max_total_bytes
+    assert np.isclose(store.memory_bytes, store.get("b").nbytes + store.get("c").nbytes)
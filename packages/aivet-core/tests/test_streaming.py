@@ -0,0 +1,90 @@
+"""
+PipelineStream queue drop policies, backpressure and audio pairing.
+"""
+
+import asyncio
+import time
+
+import numpy as np
+
+from streaming import DropPolicy, PipelineStream, StreamConfig, _BoundedQueue
+
+class _Recorder:
+    """Stand-in pipeline that records what fusion receives."""
+
+    def __init__(self, vision_s=0.0):
+        self.vision_s = vision_s
+        self.fused = []
+
+    def _process_vision(self, frame):
+        time.sleep(self.vision_s)
+        return {"status": "ok", "frame": int(frame[0])}
+
+    def _process_audio(self, clip):
+        return {"status": "ok", "clip": int(clip[0])}
+
+    def _fuse_signals(self, results):
+        self.fused.append(dict(results))
+        return {"status": "ok"}
+
+def _collect(stream):
+    async def run():
+        return [item async for item in stream]
+    return asyncio.run(run())
+
+def _frames(n):
+    return [np.full(4, i) for i in range(n)]
+
+def test_drop_oldest_keeps_newest_items():
+    async def run():
+        queue = _BoundedQueue(2, DropPolicy.DROP_OLDEST)
+        accepted = [await queue.put(i) for i in range(4)]
+        return accepted, [await queue.get(), await queue.get()]
+    assert asyncio.run(run()) == ([True, True, False, False], [2, 3])
+
+def test_drop_newest_discards_incoming_items():
+    async def run():
+        queue = _BoundedQueue(2, DropPolicy.DROP_NEWEST)
+        accepted = [await queue.put(i) for i in range(4)]
+        return accepted, [await queue.get(), await queue.get()]
+    assert asyncio.run(run()) == ([True, True, False, False], [0, 1])
+
+def test_block_waits_for_space():
+    async def run():
+        queue = _BoundedQueue(1, DropPolicy.BLOCK)
+        await queue.put(0)
+        waiting = asyncio.ensure_future(queue.put(1))
+        await asyncio.sleep(0.01)
+        blocked = not waiting.done()
+        first = await queue.get()
+        await waiting
+        return blocked, first, await queue.get()
+    assert asyncio.run(run()) == (True, 0, 1)
+
+def test_block_policy_backpressures_without_loss():
+    pipeline = _Recorder(vision_s=0.002)
+    config = StreamConfig(frame_queue_size=1, frame_drop_policy=DropPolicy.BLOCK)
+    stream = PipelineStream(pipeline, frames=_frames(20), config=config)
+    out = _collect(stream)
+    assert [r["seq"] for r in out] == list(range(20))
+    assert (stream.stats.frames_in, stream.stats.frames_dropped) == (20, 0)
+
+def test_slow_stage_drops_frames_by_policy():
+    pipeline = _Recorder(vision_s=0.002)
+    config = StreamConfig(frame_queue_size=1, frame_drop_policy=DropPolicy.DROP_NEWEST)
+    stream = PipelineStream(pipeline, frames=_frames(50), config=config)
+    out = _collect(stream)
+    assert stream.stats.frames_dropped > 0
+    assert len(out) + stream.stats.frames_dropped == stream.stats.frames_in == 50
+    seqs = [r["seq"] for r in out]
+    assert seqs == sorted(seqs)
+
+def test_each_audio_clip_is_fused_once():
+    pipeline = _Recorder()
+    config = StreamConfig(frame_drop_policy=DropPolicy.BLOCK, audio_drop_policy=DropPolicy.BLOCK)
+    clips = [np.full(8, i) for i in range(3)]
+    out = _collect(PipelineStream(pipeline, _frames(12), clips, config))
+    fused_clips = [f["audio"]["clip"] for f in pipeline.fused if "audio" in f]
+    assert sorted(fused_clips) == [0, 1, 2]
+    assert len(out) == len(pipeline.fused)
+    assert sum("vision" in f for f in pipeline.fused) == 12
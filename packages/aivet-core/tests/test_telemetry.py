@@ -0,0 +1,126 @@
+"""
+Latency histograms, stage hooks, input counters and the Prometheus export.
+"""
+
+import re
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from pipeline import AiVetPipeline, PipelineContext
+from telemetry import LatencyHistogram, StageHook, Telemetry
+
+class _Recorder(StageHook):
+    def __init__(self):
+        self.calls = []
+
+    def before(self, stage, species, items):
+        self.calls.append(("before", stage, species, items))
+
+    def after(self, stage, species, items, seconds):
+        assert seconds >= 0.0
+        self.calls.append(("after", stage, species, items))
+
+def test_histogram_buckets_hold_values_within_resolution():
+    histogram = LatencyHistogram(significant_bits=7)
+    lower, upper = histogram.bucket_bounds()
+    assert (lower[1:] == upper[:-1]).all()  # Contiguous, no gaps
+    for ns in (0, 1, 63, 64, 127, 128, 1_000, 12_345, 10**6, 987_654_321):
+        i = histogram._index(ns)
+        assert lower[i] <= ns < upper[i]
+        assert upper[i] - lower[i] <= max(1, ns / 64)
+
+def test_histogram_percentiles_and_merge():
+    rng = np.random.default_rng(0)
+    values = rng.lognormal(np.log(2e6), 0.5, 20_000).astype(np.int64)
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for ns in values[:10_000]:
+        first.record(ns)
+    for ns in values[10_000:]:
+        second.record(ns)
+    first.merge(second)
+
+    assert first.count == len(values) and first.total_ns == int(values.sum())
+    for q in (50, 90, 99):
+        assert first.percentile(q) == pytest.approx(np.percentile(values, q), rel=0.02)
+    assert first.cumulative_counts([np.inf])[0] == len(values)
+    assert LatencyHistogram().percentile(99) == 0.0
+    with pytest.raises(ValueError):
+        first.merge(LatencyHistogram(significant_bits=5))
+
+def test_histogram_clamps_out_of_range_values():
+    histogram = LatencyHistogram(max_ns=10**6)
+    histogram.record(-5)
+    histogram.record(10**9)
+    assert histogram.count == 2 and histogram.total_ns == 10**6
+    assert histogram.percentile(100) == pytest.approx(10**6, rel=0.02)
+
+def _batch(n=3):
+    rng = np.random.default_rng(0)
+    images = rng.integers(0, 256, (n, 120, 160, 3), dtype=np.uint8)
+    images[0] = 5  # Underexposed
+    clip = (0.3 * np.sin(2 * np.pi * 600 * np.arange(8000) / 16000)).astype(np.float32)
+    audio = np.concatenate([clip, np.zeros(8000, dtype=np.float32), clip][:n])
+    return images, audio, np.arange(n + 1) * 8000
+
+def test_pipeline_stages_are_timed_counted_and_hooked():
+    hook = _Recorder()
+    telemetry = Telemetry(hooks=[hook])
+    pipeline = AiVetPipeline(PipelineContext(session_id="s", species="cat"), telemetry=telemetry)
+    images, audio, offsets = _batch()
+    pipeline.process_batch(images, audio, offsets, ["a", "b", "c"], ["cat"] * 3)
+
+    summary = telemetry.summary()
+    for stage in ("vision", "audio", "guardrails", "fusion", "rules"):
+        assert summary[stage]["cat"]["calls"] == 1
+        assert summary[stage]["cat"]["p99_ms"] > 0.0
+    assert summary["vision"]["cat"]["items"] == 3
+    inputs = telemetry.inputs()
+    assert inputs["vision", "cat", "rejected", "underexposed"] == 1
+    assert inputs["vision", "cat", "ok", ""] == 2
+    assert inputs["audio", "cat", "rejected", "silent"] == 1
+    assert inputs["audio", "cat", "ok", ""] == 2
+    # Every stage call is bracketed by its hooks, in order
+    assert hook.calls[:2] == [("before", "vision", "cat", 3), ("after", "vision", "cat", 3)]
+    assert [c[0] for c in hook.calls] == ["before", "after"] * (len(hook.calls) // 2)
+
+    telemetry.enabled = False
+    pipeline.process_batch(images, audio, offsets, ["a", "b", "c"], ["cat"] * 3)
+    assert telemetry.summary()["vision"]["cat"]["calls"] == 1
+    assert telemetry.inputs() == inputs
+
+def test_prometheus_export_and_endpoint():
+    telemetry = Telemetry(namespace="vet")
+    for ms in (0.2, 3.0, 40.0):
+        telemetry.record("fusion", "dog", int(ms * 1e6), items=2)
+    telemetry.count("vision", "dog", "rejected", "blurry", n=4)
+    text = telemetry.to_prometheus()
+
+    buckets = re.findall(
+        r'vet_stage_seconds_bucket\{stage="fusion",species="dog",le="([^"]+)"\} (\d+)', text
+    )
+    counts = {le: int(n) for le, n in buckets}
+    assert counts["0.0001"] == 0 and counts["0.00025"] == 1
+    assert counts["0.005"] == 2 and counts["0.05"] == 3 and counts["+Inf"] == 3
+    values = [int(n) for _, n in buckets]
+    assert values == sorted(values)
+    assert 'vet_stage_seconds_count{stage="fusion",species="dog"} 3' in text
+    assert 'vet_stage_items_total{stage="fusion",species="dog"} 6' in text
+    assert (
+        'vet_inputs_total{stage="vision",species="dog",status="rejected",reason="blurry"} 4'
+        in text
+    )
+
+    server = telemetry.serve(port=0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert response.read().decode() == text
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
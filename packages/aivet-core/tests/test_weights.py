@@ -0,0 +1,112 @@
+"""
+Memory-mapped weight files and lazily built primitives.
+"""
+
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from weights import ALIGNMENT, LazyPrimitive, load_weights, save_weights
+
+def _arrays():
+    rng = np.random.default_rng(0)
+    return {
+        "conv.weight": rng.standard_normal((8, 3, 3, 3)).astype(np.float32),
+        "conv.bias": np.arange(8, dtype=np.float64),
+        "embedding": np.asfortranarray(rng.integers(0, 100, (5, 7), dtype=np.int16)),
+        "scale": np.array(0.5),
+        "empty": np.zeros((0, 4), dtype=np.uint8),
+        "odd": np.arange(3, dtype=np.uint8),  # Leaves the next member unaligned unless padded
+        "last": np.ones(9, dtype=np.float32),
+    }
+
+def test_round_trip_as_aligned_read_only_views(tmp_path):
+    path = tmp_path / "model.npz"
+    arrays = _arrays()
+    save_weights(path, arrays)
+    weights = load_weights(path)
+
+    assert set(weights) == set(arrays)
+    for name, array in arrays.items():
+        loaded = weights[name]
+        np.testing.assert_array_equal(loaded, array)
+        assert loaded.dtype == array.dtype and loaded.shape == array.shape
+        assert not loaded.flags.writeable and not loaded.flags.owndata
+        if loaded.size:
+            assert loaded.ctypes.data % ALIGNMENT == 0, name
+    assert weights["embedding"].flags.f_contiguous
+    with pytest.raises(TypeError):
+        weights["scale"] = np.zeros(1)
+
+def test_loads_are_cached_until_the_file_changes(tmp_path):
+    path = tmp_path / "model.npz"
+    save_weights(path, {"w": np.zeros(4)})
+    first = load_weights(path)
+    assert load_weights(path) is first
+    assert load_weights(str(path)) is first
+
+    save_weights(path, {"w": np.ones(6)})
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    reloaded = load_weights(path)
+    assert reloaded is not first
+    np.testing.assert_array_equal(reloaded["w"], np.ones(6))
+
+def test_plain_savez_and_private_loads(tmp_path):
+    path = tmp_path / "plain.npz"
+    arrays = _arrays()
+    np.savez(path, **arrays)
+    for mmap_mode in (True, False):
+        weights = load_weights(path, mmap_mode=mmap_mode)
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(weights[name], array)
+    private = load_weights(path, mmap_mode=False)
+    assert private["odd"].flags.writeable
+
+def test_unmappable_files_are_rejected(tmp_path):
+    path = tmp_path / "compressed.npz"
+    np.savez_compressed(path, w=np.zeros(16))
+    with pytest.raises(ValueError, match="compressed"):
+        load_weights(path)
+    with pytest.raises(ValueError, match="object dtype"):
+        save_weights(tmp_path / "objects.npz", {"w": np.array([{}, None], dtype=object)})
+
+def test_lazy_primitive_builds_once_across_threads():
+    calls = []
+
+    def build():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        return object()
+
+    primitive = LazyPrimitive(build)
+    assert not primitive.ready
+    thread = primitive.prewarm()
+    assert primitive.prewarm() is thread
+    results = []
+    getters = [threading.Thread(target=lambda: results.append(primitive.get())) for _ in range(4)]
+    for t in getters:
+        t.start()
+    for t in [thread, *getters]:
+        t.join()
+
+    assert len(calls) == 1 and primitive.ready
+    assert all(r is results[0] for r in results)
+
+def test_failed_prewarm_is_retried_by_get():
+    attempts = []
+
+    def build():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("weights missing")
+        return "built"
+
+    primitive = LazyPrimitive(build)
+    primitive.prewarm().join()
+    assert not primitive.ready
+    assert primitive.get() == "built"
+    assert len(attempts) == 2
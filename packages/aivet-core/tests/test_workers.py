@@ -0,0 +1,99 @@
+"""
+WorkerPool ordering, failure recovery, session cleanup and motion-only frames.
+"""
+
+import numpy as np
+import pytest
+
+from frame_ring import FrameRing
+from vitals import VitalsMonitor
+from workers import WorkerConfig, WorkerPool
+
+SHAPE = (48, 64, 3)
+
+def _pool(workers=2):
+    return WorkerPool(WorkerConfig(workers=workers, frame_shape=SHAPE, max_clip_s=0.5))
+
+def _frames(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(n, *SHAPE), dtype=np.uint8)
+
+def _columns(batch):
+    return np.stack([batch.normalized_value, batch.confidence, batch.raw_value, batch.timestamp])
+
+def _assert_same(pooled, local):
+    assert len(pooled) == len(local)
+    for got, want in zip(pooled, local):
+        assert len(got) == len(want)
+        np.testing.assert_allclose(_columns(got), _columns(want), equal_nan=True)
+
+def _in_process(images, session_ids, timestamps, motion_only=None):
+    monitors = {}
+    batches = []
+    for i, (image, session_id) in enumerate(zip(images, session_ids)):
+        monitor = monitors.setdefault(session_id, VitalsMonitor("cat"))
+        if motion_only is not None and motion_only[i]:
+            monitor.push_motion(image)
+            batches.append(None)
+        else:
+            batches.append(monitor.push_frame(image, timestamps[i]))
+    return batches
+
+def test_results_follow_input_order_across_workers():
+    images = _frames(24)
+    session_ids = [f"s{i % 5}" for i in range(len(images))]
+    timestamps = np.arange(len(images)) / 30.0
+    with _pool(workers=3) as pool:
+        assert len({pool.worker_for(s) for s in session_ids}) > 1
+        batches = pool.process_frames(images, None, session_ids, "cat", timestamps)
+
+        rng = np.random.default_rng(1)
+        clips = [(rng.standard_normal(4000) * 0.1).astype(np.float32) for _ in range(9)]
+        audio = pool.process_audio(clips, "cat", np.arange(len(clips), dtype=float))
+
+    _assert_same(batches, _in_process(images, session_ids, timestamps))
+    for t, batch in enumerate(audio):
+        assert len(batch) and np.all(batch.timestamp == t)
+
+def test_failed_task_returns_its_slot():
+    images = _frames(12)
+    with _pool() as pool, FrameRing.create(SHAPE, slots=4) as ring:
+        free = {kind: [sorted(slots) for slots in lists] for kind, lists in pool._free.items()}
+        ring.write(images[0], 0.0)
+        with pytest.raises(RuntimeError, match="overwritten before it was read"):
+            pool.process_ring(ring, [0, 7, 0], ["a", "a", "b"], "cat")
+        assert {k: [sorted(s) for s in v] for k, v in pool._free.items()} == free
+        assert pool._in_flight == [0, 0]
+
+        # More frames than slots: only completes if every slot came back
+        batches = pool.process_frames(images, None, ["a", "b"] * 6, "cat", 1.0)
+        assert len(batches) == len(images)
+
+def test_end_session_drops_worker_state():
+    images = _frames(10)
+    timestamps = np.arange(len(images)) / 30.0
+    with _pool() as pool:
+        first = pool.process_frames(images, None, ["a"] * 10, "cat", timestamps)
+        again = pool.process_frames(images, None, ["a"] * 10, "cat", timestamps)
+        pool.end_session("a")
+        fresh = pool.process_frames(images, None, ["a"] * 10, "cat", timestamps)
+
+    _assert_same(fresh, first)
+    assert not np.allclose(_columns(again[-1]), _columns(first[-1]), equal_nan=True)
+
+def test_motion_only_frames_feed_motion_and_return_empty():
+    images = _frames(16)
+    session_ids = ["a", "b"] * 8
+    timestamps = np.arange(len(images)) / 30.0
+    motion_only = [i % 4 in (1, 2) for i in range(len(images))]
+    with _pool() as pool:
+        batches = pool.process_frames(
+            images, None, session_ids, "cat", timestamps, motion_only=motion_only
+        )
+
+    local = _in_process(images, session_ids, timestamps, motion_only)
+    for skip, got, want in zip(motion_only, batches, local):
+        if skip:
+            assert len(got) == 0
+        else:
+            _assert_same([got], [want])
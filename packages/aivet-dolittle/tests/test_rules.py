@@ -0,0 +1,111 @@
+"""
+Symptom rule compilation, padding and evaluation.
+"""
+
+import numpy as np
+import pytest
+
+from rules import FEATURE_INDEX, FEATURES, Rule, RuleEngine, signal_features
+from schema import SignalSource
+from signal_batch import BioSignalBatch, species_code
+
+def _features(values=None):
+    x = np.full((1, len(FEATURES)), np.nan)
+    for name, value in (values or {}).items():
+        x[0, FEATURE_INDEX[name]] = value
+    return x
+
+def _codes(*species):
+    return np.array([species_code(s) for s in species], dtype=np.intp)
+
+@pytest.mark.parametrize("rule, message", [
+    (Rule("tachypnea", {}), "has no conditions"),
+    (Rule("tachypnea", {"respiration_rate.bogus": (40, None)}), "unknown feature"),
+    (Rule("tachypnea", {"respiration_rate.raw": (40, None)}, species=("dragon",)),
+     "unknown species"),
+    (Rule("tachypnea", {"respiration_rate.raw": (60, 40)}), "is empty"),
+])
+def test_invalid_rules_raise(rule, message):
+    with pytest.raises(ValueError, match=message):
+        RuleEngine([rule])
+
+def test_padding_keeps_short_rules_exact():
+    engine = RuleEngine([
+        Rule("fever", {"temperature.raw": (39.5, None)}),
+        Rule("shock", {
+            "heart_rate.raw": (180, None),
+            "respiration_rate.raw": (40, None),
+            "temperature.raw": (None, 37.0),
+        }),
+    ])
+    assert engine._feature.shape == (2, 3)
+    cat = _codes("cat")
+    assert engine.evaluate_features(_features({"temperature.raw": 40.0}), cat).names(0) == ["fever"]
+    assert engine.evaluate_features(_features({"temperature.raw": 38.5}), cat).names(0) == []
+    # Every condition of the long rule must hold, not only the first
+    shock = _features(
+        {"heart_rate.raw": 200.0, "respiration_rate.raw": 20.0, "temperature.raw": 36.0}
+    )
+    assert engine.evaluate_features(shock, cat).names(0) == []
+    shock[0, FEATURE_INDEX["respiration_rate.raw"]] = 50.0
+    assert engine.evaluate_features(shock, cat).names(0) == ["shock"]
+
+def test_missing_features_and_species_do_not_fire():
+    engine = RuleEngine([Rule("tachypnea", {"respiration_rate.raw": (40, None)}, ("cat",))])
+    x = np.vstack([_features({"respiration_rate.raw": 55.0}), _features()])
+    result = engine.evaluate_features(np.vstack([x, x[:1]]), _codes("cat", "cat", "dog"))
+    assert result.present[:, 0].tolist() == [True, False, False]
+
+def test_core_tachypnea_needs_confident_reading():
+    engine = RuleEngine()
+    for species, rr in (("cat", 55.0), ("horse", 30.0)):
+        for confidence, expected in ((0.9, True), (0.3, False)):
+            batch = BioSignalBatch.from_columns(
+                source=SignalSource.VISION_VITALS, species=species,
+                normalized_value=[0.0], confidence=confidence, timestamp=0.0,
+                raw_value=np.array([rr]),
+                metadata={"metric": "respiration_rate", "unit": "bpm"},
+            )
+            names = engine.evaluate(batch, np.array([0, 1]), [species]).names(0)
+            assert ("tachypnea" in names) == expected
+
+def test_batched_evaluation_matches_per_rule_checks():
+    rng = np.random.default_rng(0)
+    species_names = ["cat", "dog", "horse"]
+    rules = []
+    for r in range(40):
+        names = rng.choice(FEATURES, size=rng.integers(1, 4), replace=False)
+        when = {str(f): (float(rng.uniform(0, 0.6)), None) for f in names}
+        rules.append(Rule(f"symptom_{r % 7}", when, species=(species_names[r % 3],)))
+    engine = RuleEngine(rules)
+    groups = 300  # Above the reduceat crossover; the single rows below are under it
+    x = rng.random((groups, len(FEATURES)))
+    x[rng.random(x.shape) < 0.1] = np.nan
+    codes = _codes(*rng.choice(species_names, size=groups))
+
+    result = engine.evaluate_features(x, codes)
+    for g in range(groups):
+        fired = [
+            codes[g] == species_code(rule.species[0])
+            and all(x[g, FEATURE_INDEX[f]] >= lo for f, (lo, _) in rule.when.items())
+            for rule in engine.rules
+        ]
+        assert result.fired[g].tolist() == fired
+        present = [any(f for f, r in zip(fired, engine.rules) if r.symptom == s)
+                   for s in engine.symptoms]
+        assert result.present[g].tolist() == present
+        single = engine.evaluate_features(x[g:g + 1], codes[g:g + 1])
+        assert single.present[0].tolist() == present
+
+def test_features_take_the_most_confident_signal():
+    batch = BioSignalBatch.from_columns(
+        source=SignalSource.VISION_VITALS, species="cat",
+        normalized_value=[0.1, 0.2, 0.3, 0.4, 0.5], confidence=[0.5, 0.9, 0.2, 0.9, 0.1],
+        timestamp=0.0, raw_value=np.array([30.0, 40.0, 50.0, 60.0, 70.0]),
+        metadata=[{"metric": "respiration_rate"}] * 5,
+    )
+    x = signal_features(batch, np.array([0, 3, 3, 5]))
+    rr = FEATURE_INDEX["respiration_rate.raw"]
+    assert x[0, rr] == 40.0 and x[2, rr] == 60.0
+    assert np.isnan(x[1]).all()
+    assert x[0, FEATURE_INDEX["respiration_rate.confidence"]] == 0.9
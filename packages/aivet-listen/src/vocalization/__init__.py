@@ -7,3 +7,27 @@ Analyzes:
 - Emotional valence (positive, negative, neutral)
 - Pain probability estimation
 """
+
+from .classify import VocalizationType, classify_vocalization
+from .features import (
+    FrameFeatures,
+    StftPlan,
+    VocalFeatureBatch,
+    VocalFeatureExtractor,
+    VocalFeatures,
+    frame_features,
+)
+from .streaming import StreamingVocalAnalyzer, VocalEvent
+
+__all__ = [
+    "FrameFeatures",
+    "StftPlan",
+    "StreamingVocalAnalyzer",
+    "VocalFeatureBatch",
+    "VocalFeatureExtractor",
+    "VocalEvent",
+    "VocalFeatures",
+    "VocalizationType",
+    "classify_vocalization",
+    "frame_features",
+]
@@ -0,0 +1,40 @@
+"""
+Rule-based vocalization type classification.
+
+Thresholds follow the acoustic descriptions of feline vocal types
+(tonal mid-pitch meows, low harsh growls, low-frequency sustained purrs,
+broadband unvoiced hisses). They are starting points for the classifier
+that will be trained on the labeled ``doolittle/cat-vocalizations`` data.
+"""
+
+from enum import Enum
+
+class VocalizationType(str, Enum):
+    """Vocalization categories."""
+    MEOW = "meow"
+    GROWL = "growl"
+    PURR = "purr"
+    HISS = "hiss"
+    OTHER = "other"
+
+# Purring is a ~25 Hz pulse train, below the pitch search range, so it shows
+# up as sustained, mostly unvoiced, low-centroid energy rather than as a pitch.
+def classify_vocalization(
+    pitch_hz: float,
+    hnr_db: float,
+    centroid_hz: float,
+    voiced_fraction: float,
+    duration_s: float,
+) -> VocalizationType:
+    """Classify one segmented vocalization from its summary features."""
+    if voiced_fraction < 0.3:
+        if centroid_hz >= 3000.0:
+            return VocalizationType.HISS
+        if centroid_hz < 600.0 and duration_s >= 1.0:
+            return VocalizationType.PURR
+        return VocalizationType.OTHER
+    if pitch_hz < 350.0 and hnr_db < 15.0:
+        return VocalizationType.GROWL
+    if 300.0 <= pitch_hz <= 1500.0 and hnr_db >= 5.0 and 0.15 <= duration_s <= 4.0:
+        return VocalizationType.MEOW
+    return VocalizationType.OTHER
@@ -0,0 +1,439 @@
+"""
+Spectral vocal features from a single shared STFT.
+
+Every clip is framed once (as a strided view of the input buffer) and
+transformed once; pitch, jitter, shimmer and HNR are all derived from
+that one spectrum:
+
+- band power within ``SpeciesConfig.vocal_freq_range`` gives frame amplitude;
+- its inverse FFT is the frame autocorrelation (Wiener-Khinchin), whose
+  peak gives the pitch period and the harmonicity behind HNR;
+- that period guides a cycle-peak search over the same frame views, and
+  cycle-to-cycle period and peak-amplitude changes give jitter and shimmer.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from schema import SignalSource, Species
+from signal_batch import BioSignalBatch, species_code
+from species import get_species_config
+
+if TYPE_CHECKING:
+    from schema import BioSignal
+
+@dataclass(frozen=True)
+class StftPlan:
+    """
+    Precomputed framing, window and band parameters shared by every clip.
+
+    The FFT is zero-padded to twice the frame length so the inverse
+    transform of the power spectrum is a linear (not circular) autocorrelation.
+    """
+    sample_rate: int
+    frame_length: int
+    hop: int
+    n_fft: int
+    window: np.ndarray          # (frame_length,) float32 Hann window
+    freqs: np.ndarray           # (n_fft // 2 + 1,) bin centre frequencies in Hz
+    band_mask: np.ndarray       # (n_fft // 2 + 1,) bool, inside vocal_freq_range
+    window_acf: np.ndarray      # Normalized autocorrelation of the window itself
+    min_lag: int
+    max_lag: int
+
+    @classmethod
+    def create(
+        cls,
+        sample_rate: int,
+        vocal_freq_range: Tuple[float, float],
+        frame_length: int = 1024,
+        hop: int = 256,
+        max_pitch_hz: float = 2000.0,
+    ) -> "StftPlan":
+        n_fft = 2 * frame_length
+        window = np.hanning(frame_length).astype(np.float32)
+        freqs = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+        f_lo, f_hi = vocal_freq_range
+        band_mask = (freqs >= f_lo) & (freqs <= min(f_hi, sample_rate / 2))
+
+        window_power = np.abs(np.fft.rfft(window, n_fft)) ** 2
+        window_acf = np.fft.irfft(window_power, n_fft)[:frame_length]
+        window_acf = (window_acf / window_acf[0]).astype(np.float32)
+
+        # Pitch search: at least two periods must fit in a frame
+        min_lag = max(int(np.ceil(sample_rate / min(max_pitch_hz, f_hi))), 2)
+        max_lag = min(int(np.floor(sample_rate / max(f_lo, 1.0))), frame_length // 2)
+        if max_lag <= min_lag + 1:
+            raise ValueError(f"vocal range {vocal_freq_range} leaves no pitch lags to search")
+        return cls(
+            sample_rate=sample_rate,
+            frame_length=frame_length,
+            hop=hop,
+            n_fft=n_fft,
+            window=window,
+            freqs=freqs,
+            band_mask=band_mask,
+            window_acf=window_acf,
+            min_lag=min_lag,
+            max_lag=max_lag,
+        )
+
+    def frames(self, audio: np.ndarray) -> np.ndarray:
+        """(n_frames, frame_length) strided view of a float32 clip."""
+        if len(audio) < self.frame_length:
+            return np.empty((0, self.frame_length), dtype=np.float32)
+        return sliding_window_view(audio, self.frame_length)[::self.hop]
+
+@dataclass
+class FrameFeatures:
+    """Per-frame measurements derived from one STFT."""
+    pitch_hz: np.ndarray     # (F,) 0 where unvoiced
+    harmonicity: np.ndarray  # (F,) normalized autocorrelation peak in (0, 1)
+    amplitude: np.ndarray    # (F,) band-limited RMS
+    voiced: np.ndarray       # (F,) bool
+    jitter: np.ndarray       # (F,) local cycle jitter, 0 where unvoiced
+    shimmer: np.ndarray      # (F,) local cycle shimmer, 0 where unvoiced
+    centroid_hz: np.ndarray  # (F,) spectral centroid of the band-limited power
+
+def frame_features(
+    plan: StftPlan,
+    frames: np.ndarray,
+    voicing_threshold: float = 0.45,
+    silence_rms: float = 1e-3,
+    octave_tolerance: float = 0.9,
+) -> FrameFeatures:
+    """Compute per-frame pitch, harmonicity, amplitude and cycle perturbation."""
+    n = len(frames)
+    if n == 0:
+        empty = np.zeros(0, dtype=np.float32)
+        return FrameFeatures(empty, empty, empty, np.zeros(0, dtype=bool), empty, empty, empty)
+
+    spectrum = np.fft.rfft(frames * plan.window, plan.n_fft, axis=1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    power *= plan.band_mask
+
+    energy = power.sum(axis=1)
+    centroid = np.divide(power @ plan.freqs, energy, out=np.zeros_like(energy), where=energy > 0)
+    # Parseval over the one-sided, zero-padded spectrum, relative to the window energy
+    amplitude = np.sqrt(2.0 * energy / (plan.n_fft * float(np.sum(plan.window ** 2))))
+
+    acf = np.fft.irfft(power, plan.n_fft, axis=1)[:, :plan.max_lag + 2]
+    r0 = np.maximum(acf[:, :1], 1e-20)
+    norm = acf / r0 / np.maximum(plan.window_acf[:plan.max_lag + 2], 1e-6)
+
+    lo, hi = plan.min_lag, plan.max_lag
+    centre = norm[:, lo:hi + 1]
+    left = norm[:, lo - 1:hi]
+    right = norm[:, lo + 1:hi + 2]
+    peaks = np.where((centre > left) & (centre >= right), centre, -np.inf)
+    rows = np.arange(n)
+    best = peaks.max(axis=1)
+    # Multiples of the period score almost as high as the period itself;
+    # take the shortest lag close to the best peak to avoid octave errors.
+    k = np.argmax(peaks >= octave_tolerance * best[:, None], axis=1)
+    best = peaks[rows, k]
+
+    # Parabolic interpolation of the peak lag
+    a, b, c = left[rows, k], centre[rows, k], right[rows, k]
+    denom = a - 2 * b + c
+    offset = np.divide(0.5 * (a - c), denom, out=np.zeros_like(denom), where=denom < 0)
+    lag = lo + k + np.clip(offset, -0.5, 0.5)
+
+    harmonicity = np.clip(np.where(np.isfinite(best), best, 0.0), 1e-6, 1.0 - 1e-6)
+    voiced = (harmonicity >= voicing_threshold) & (amplitude >= silence_rms)
+    pitch = np.where(voiced, plan.sample_rate / lag, 0.0)
+
+    jitter = np.zeros(n, dtype=np.float32)
+    shimmer = np.zeros(n, dtype=np.float32)
+    if voiced.any():
+        jitter[voiced], shimmer[voiced] = cycle_perturbation(frames[voiced], lag[voiced])
+    return FrameFeatures(
+        pitch_hz=pitch.astype(np.float32),
+        harmonicity=harmonicity.astype(np.float32),
+        amplitude=amplitude.astype(np.float32),
+        voiced=voiced,
+        jitter=jitter,
+        shimmer=shimmer,
+        centroid_hz=centroid.astype(np.float32),
+    )
+
+def cycle_perturbation(
+    frames: np.ndarray,
+    period: np.ndarray,
+    search: float = 0.2,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Local jitter and shimmer per frame from cycle peaks.
+
+    Starting at the largest sample of the first period, each next cycle
+    peak is searched within +/- ``search`` periods of where the STFT
+    period predicts it. All frames advance together, one cycle per step.
+    Peak positions are refined by parabolic interpolation, which matters
+    at 16 kHz where a high-pitched period is only ~15 samples long.
+
+    Args:
+        frames: (F, L) voiced frames.
+        period: (F,) pitch period in samples from the autocorrelation.
+
+    Returns:
+        (jitter, shimmer): mean absolute difference of consecutive cycle
+        periods / peak amplitudes, relative to their mean.
+    """
+    n, length = frames.shape
+    rows = np.arange(n)
+    first = int(np.ceil(period.max()))
+    head = np.where(np.arange(first) < period[:, None], frames[:, :first], -np.inf)
+    mark = np.argmax(head, axis=1)
+
+    half = int(np.ceil(search * period.max()))
+    offsets = np.arange(-half, half + 1)
+    allowed = np.abs(offsets) <= search * period[:, None]
+
+    marks = [mark]
+    alive = np.ones(n, dtype=bool)
+    for _ in range(int(length / max(period.min(), 1.0))):
+        cand = np.rint(marks[-1] + period).astype(np.int64)[:, None] + offsets
+        ok = allowed & (cand >= 1) & (cand < length - 1)
+        values = np.where(ok, frames[rows[:, None], np.clip(cand, 0, length - 1)], -np.inf)
+        j = np.argmax(values, axis=1)
+        alive &= ok[rows, j]
+        if not alive.any():
+            break
+        marks.append(np.where(alive, cand[rows, j], -1))
+
+    marks = np.stack(marks, axis=1)                     # (F, C), -1 once a frame runs out
+    valid = marks >= 0
+    p = np.clip(marks, 1, length - 2)
+    y0 = frames[rows[:, None], p - 1]
+    y1 = frames[rows[:, None], p]
+    y2 = frames[rows[:, None], p + 1]
+    denom = y0 - 2 * y1 + y2
+    delta = np.divide(0.5 * (y0 - y2), denom, out=np.zeros_like(denom), where=denom < 0)
+    position = p + np.clip(delta, -0.5, 0.5)
+    peak = np.abs(y1 - 0.25 * (y0 - y2) * delta)
+
+    period_ok = valid[:, 1:] & valid[:, :-1]
+    periods = np.diff(position, axis=1)
+    change_ok = period_ok[:, 1:] & period_ok[:, :-1]
+
+    def relative_change(x: np.ndarray, x_ok: np.ndarray, d_ok: np.ndarray) -> np.ndarray:
+        mean = np.divide((x * x_ok).sum(1), x_ok.sum(1), out=np.zeros(n), where=x_ok.sum(1) > 0)
+        diff = np.abs(np.diff(x, axis=1)) * d_ok
+        mean_diff = np.divide(diff.sum(1), d_ok.sum(1), out=np.zeros(n), where=d_ok.sum(1) > 0)
+        return np.divide(mean_diff, mean, out=np.zeros(n), where=mean > 0)
+
+    jitter = relative_change(periods, period_ok, change_ok)
+    shimmer = relative_change(peak, valid, period_ok)
+    return jitter, shimmer
+
+@dataclass
+class VocalFeatures:
+    """Clip-level vocal features."""
+    pitch_hz: float         # Mean F0 over voiced frames (0 if none)
+    jitter: float           # Mean local cycle jitter over voiced frames
+    shimmer: float          # Mean local cycle shimmer over voiced frames
+    hnr_db: float           # Mean harmonics-to-noise ratio over voiced frames
+    voiced_fraction: float
+    duration_s: float
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+@dataclass
+class VocalFeatureBatch:
+    """Clip-level features for N clips, one array per feature."""
+    pitch_hz: np.ndarray
+    jitter: np.ndarray
+    shimmer: np.ndarray
+    hnr_db: np.ndarray
+    voiced_fraction: np.ndarray
+    duration_s: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.pitch_hz)
+
+    def __getitem__(self, i: int) -> VocalFeatures:
+        return VocalFeatures(
+            pitch_hz=float(self.pitch_hz[i]),
+            jitter=float(self.jitter[i]),
+            shimmer=float(self.shimmer[i]),
+            hnr_db=float(self.hnr_db[i]),
+            voiced_fraction=float(self.voiced_fraction[i]),
+            duration_s=float(self.duration_s[i]),
+        )
+
+    def pain_score(self) -> np.ndarray:
+        """
+        Pain likelihood from the vocal pain signature.
+
+        High jitter (> 3%) together with elevated pitch (> 800 Hz); each
+        criterion is a soft step so the score degrades gracefully near
+        the thresholds.
+        """
+        return _sigmoid((self.jitter - 0.03) / 0.01) * _sigmoid((self.pitch_hz - 800.0) / 100.0)
+
+    def confidence(self) -> np.ndarray:
+        """More voiced material gives a more reliable estimate; 0.5 s of voice saturates."""
+        voiced_s = self.voiced_fraction * self.duration_s
+        return np.clip(voiced_s / 0.5, 0.0, 1.0)
+
+    def to_signal_batch(
+        self,
+        species: Union[str, Species],
+        timestamps: Union[float, np.ndarray],
+    ) -> BioSignalBatch:
+        """One ``AUDIO_VOCAL`` row per clip, as columns."""
+        raw = [
+            {
+                "pitch_hz": float(self.pitch_hz[i]),
+                "jitter": float(self.jitter[i]),
+                "shimmer": float(self.shimmer[i]),
+                "hnr_db": float(self.hnr_db[i]),
+                "voiced_fraction": float(self.voiced_fraction[i]),
+            }
+            for i in range(len(self))
+        ]
+        return BioSignalBatch.from_columns(
+            source=SignalSource.AUDIO_VOCAL,
+            species=species_code(species),
+            normalized_value=self.pain_score(),
+            confidence=self.confidence(),
+            timestamp=timestamps,
+            raw_value=raw,
+            metadata=[{"duration_s": float(d)} for d in self.duration_s],
+        )
+
+    def to_signals(
+        self,
+        species: Union[str, Species],
+        timestamps: Union[float, np.ndarray],
+    ) -> List["BioSignal"]:
+        """Emit one ``AUDIO_VOCAL`` BioSignal per clip."""
+        return self.to_signal_batch(species, timestamps).to_signals()
+
+def _segment_mean(values: np.ndarray, weights: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Weighted mean of ``values`` over consecutive frame segments beginning at ``starts``."""
+    # A trailing zero lets empty segments at the end index one past the last frame
+    total = np.add.reduceat(np.append(values * weights, 0.0), starts)
+    count = np.add.reduceat(np.append(weights, 0.0), starts)
+    empty = np.diff(np.append(starts, len(values))) == 0
+    total[empty] = 0.0
+    count[empty] = 0.0
+    return np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+
+class VocalFeatureExtractor:
+    """
+    Extracts pitch, jitter, shimmer and HNR with one STFT per clip.
+
+    Args:
+        species: Species key; its ``vocal_freq_range`` bounds the analysis band.
+        sample_rate: Audio sample rate (16 kHz per the dataset spec).
+        frame_length: STFT frame length in samples.
+        hop: Hop between frames in samples.
+        max_pitch_hz: Upper limit of the F0 search (harmonics above it still
+            contribute to the band-limited spectrum).
+        voicing_threshold: Minimum normalized autocorrelation peak for a voiced frame.
+        silence_rms: Minimum band-limited RMS for a voiced frame.
+        block_frames: Frames per FFT call when many clips are stacked; keeps
+            the working set in cache.
+    """
+
+    def __init__(
+        self,
+        species: str,
+        sample_rate: int = 16000,
+        frame_length: int = 1024,
+        hop: int = 256,
+        max_pitch_hz: float = 2000.0,
+        voicing_threshold: float = 0.45,
+        silence_rms: float = 1e-3,
+        block_frames: int = 256,
+    ):
+        config = get_species_config(species)
+        self.species = species.lower()
+        self.plan = StftPlan.create(
+            sample_rate, config.vocal_freq_range, frame_length, hop, max_pitch_hz
+        )
+        self.voicing_threshold = voicing_threshold
+        self.silence_rms = silence_rms
+        self.block_frames = block_frames
+
+    def analyze_frames(self, frames: np.ndarray) -> FrameFeatures:
+        """Per-frame features over stacked frames, in cache-sized FFT blocks."""
+        step = self.block_frames
+        if len(frames) <= step:
+            return frame_features(self.plan, frames, self.voicing_threshold, self.silence_rms)
+        parts = [
+            frame_features(self.plan, frames[i:i + step], self.voicing_threshold, self.silence_rms)
+            for i in range(0, len(frames), step)
+        ]
+        return FrameFeatures(*(
+            np.concatenate([getattr(p, name) for p in parts])
+            for name in FrameFeatures.__dataclass_fields__
+        ))
+
+    def extract(self, audio: np.ndarray) -> VocalFeatures:
+        """Features for one clip (float32 input is used without copying)."""
+        return self.extract_batch([audio])[0]
+
+    def extract_batch(
+        self,
+        clips: Union[Sequence[np.ndarray], np.ndarray],
+        offsets: Optional[np.ndarray] = None,
+    ) -> VocalFeatureBatch:
+        """
+        Features for many clips, with the frames of all clips stacked into
+        shared FFT calls rather than one set of calls per clip.
+
+        Args:
+            clips: A sequence of 1-D clips, or one ragged buffer when
+                ``offsets`` is given.
+            offsets: N + 1 offsets into ``clips`` for the ragged form.
+        """
+        if offsets is not None:
+            buffer = np.asarray(clips, dtype=np.float32)
+            offsets = np.asarray(offsets, dtype=np.int64)
+            clips = [buffer[s:e] for s, e in zip(offsets[:-1], offsets[1:])]
+        clips = [np.asarray(c, dtype=np.float32) for c in clips]
+        plan = self.plan
+
+        frame_views = [plan.frames(c) for c in clips]
+        counts = np.array([len(f) for f in frame_views], dtype=np.int64)
+        starts = np.cumsum(counts) - counts  # Empty for no clips
+        n_frames = int(counts.sum())
+        if len(frame_views) == 1:
+            frames = frame_views[0]  # Strided view; the window multiply is the only copy
+        elif n_frames:
+            frames = np.concatenate(frame_views)
+        else:
+            frames = np.empty((0, plan.frame_length), np.float32)
+
+        ff = self.analyze_frames(frames)
+        voiced = ff.voiced.astype(np.float64)
+        jitter = _segment_mean(ff.jitter.astype(np.float64), voiced, starts)
+        shimmer = _segment_mean(ff.shimmer.astype(np.float64), voiced, starts)
+        h = ff.harmonicity.astype(np.float64)
+        hnr = _segment_mean(10.0 * np.log10(h / (1.0 - h)), voiced, starts)
+        pitch = _segment_mean(ff.pitch_hz.astype(np.float64), voiced, starts)
+        voiced_fraction = _segment_mean(voiced, np.ones(n_frames), starts)
+
+        return VocalFeatureBatch(
+            pitch_hz=pitch,
+            jitter=jitter,
+            shimmer=shimmer,
+            hnr_db=hnr,
+            voiced_fraction=voiced_fraction,
+            duration_s=np.array([len(c) for c in clips], dtype=np.float64) / plan.sample_rate,
+        )
+
+    def extract_signals(
+        self,
+        clips: Union[Sequence[np.ndarray], np.ndarray],
+        timestamps: Union[float, np.ndarray],
+        offsets: Optional[np.ndarray] = None,
+    ) -> List["BioSignal"]:
+        """Extract a batch and emit ``AUDIO_VOCAL`` BioSignals."""
+        return self.extract_batch(clips, offsets).to_signals(self.species, timestamps)
@@ -0,0 +1,242 @@
+"""
+Incremental vocal analysis over a continuous microphone stream.
+
+Chunks of any size (typically 20 ms) are appended to an overlap-save
+buffer that only ever holds the last partial frame. Each STFT frame is
+computed exactly once, when its final sample arrives, and folded into
+fixed-size running state, so the CPU cost of a chunk does not depend on
+how long the session has been running.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from schema import BioSignal
+
+from .classify import VocalizationType, classify_vocalization
+from .features import FrameFeatures, VocalFeatureBatch, VocalFeatures, VocalFeatureExtractor
+
+@dataclass
+class VocalEvent:
+    """A segmented vocalization."""
+    type: VocalizationType
+    start_s: float
+    end_s: float
+    features: VocalFeatures
+    centroid_hz: float
+    pain_score: float
+
+class _Accumulator:
+    """Running sums over the frames of one event or window."""
+
+    __slots__ = ("frames", "voiced", "pitch", "jitter", "shimmer", "hnr", "centroid")
+
+    def __init__(self):
+        self.frames = 0
+        self.voiced = 0
+        self.pitch = self.jitter = self.shimmer = self.hnr = self.centroid = 0.0
+
+    def add(self, ff: FrameFeatures, i: int, hnr_db: float) -> None:
+        self.frames += 1
+        self.centroid += float(ff.centroid_hz[i])
+        if ff.voiced[i]:
+            self.voiced += 1
+            self.pitch += float(ff.pitch_hz[i])
+            self.jitter += float(ff.jitter[i])
+            self.shimmer += float(ff.shimmer[i])
+            self.hnr += hnr_db
+
+    def features(self, duration_s: float) -> VocalFeatures:
+        v = max(self.voiced, 1)
+        return VocalFeatures(
+            pitch_hz=self.pitch / v,
+            jitter=self.jitter / v,
+            shimmer=self.shimmer / v,
+            hnr_db=self.hnr / v,
+            voiced_fraction=self.voiced / max(self.frames, 1),
+            duration_s=duration_s,
+        )
+
+class StreamingVocalAnalyzer:
+    """
+    Stateful vocal analyzer for one audio stream.
+
+    ``push`` returns the vocalization events that finished within the
+    chunk. Between events, ``current_features`` summarizes the last
+    ``window_s`` seconds of frames from a fixed-size ring.
+
+    Args:
+        species: Species key; sets the analysis band as in ``VocalFeatureExtractor``.
+        sample_rate: Stream sample rate.
+        frame_length: STFT frame length in samples.
+        hop: Hop between frames in samples.
+        activity_rms: Band-limited RMS above which a frame belongs to an event.
+        hangover_s: Silence that closes an event.
+        min_event_s: Events shorter than this are discarded as clicks.
+        max_event_s: Long events (purring) are emitted in pieces of this length.
+        window_s: Length of the rolling summary window.
+        start_time: Timestamp of the first sample.
+    """
+
+    def __init__(
+        self,
+        species: str,
+        sample_rate: int = 16000,
+        frame_length: int = 1024,
+        hop: int = 256,
+        activity_rms: float = 5e-3,
+        hangover_s: float = 0.15,
+        min_event_s: float = 0.1,
+        max_event_s: float = 5.0,
+        window_s: float = 2.0,
+        start_time: float = 0.0,
+    ):
+        self.extractor = VocalFeatureExtractor(
+            species, sample_rate=sample_rate, frame_length=frame_length, hop=hop
+        )
+        self.plan = self.extractor.plan
+        self.species = self.extractor.species
+        self.activity_rms = activity_rms
+        self.hangover_frames = max(int(round(hangover_s * sample_rate / hop)), 1)
+        self.min_event_s = min_event_s
+        self.max_event_frames = max(int(round(max_event_s * sample_rate / hop)), 1)
+        self.start_time = start_time
+
+        # Overlap-save state: samples not yet covered by a complete frame
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._frames_done = 0
+
+        # Fixed-size ring of recent per-frame values for the rolling summary
+        n = max(int(round(window_s * sample_rate / hop)), 2)
+        self._ring = np.zeros((n, 6))  # voiced, pitch, jitter, shimmer, hnr, centroid
+        self._ring_pos = 0
+        self._ring_count = 0
+
+        self._event: Optional[_Accumulator] = None
+        self._event_start = 0
+        self._event_last_active = 0
+
+    @property
+    def samples_seen(self) -> int:
+        return self._frames_done * self.plan.hop + len(self._pending)
+
+    def _frame_time(self, index: int) -> float:
+        return self.start_time + index * self.plan.hop / self.plan.sample_rate
+
+    def push(self, chunk: np.ndarray) -> List[VocalEvent]:
+        """Feed a chunk of samples; returns events that ended in it."""
+        chunk = np.asarray(chunk, dtype=np.float32)
+        plan = self.plan
+        data = np.concatenate([self._pending, chunk]) if len(self._pending) else chunk
+        if len(data) < plan.frame_length:
+            self._pending = data.copy() if data is chunk else data
+            return []
+
+        frames = plan.frames(data)
+        consumed = len(frames) * plan.hop
+        # Keep only the samples later frames still need (copied so the caller's
+        # chunk buffer can be reused).
+        self._pending = data[consumed:].copy()
+
+        ff = self.extractor.analyze_frames(frames)
+        h = ff.harmonicity.astype(np.float64)
+        hnr = 10.0 * np.log10(h / (1.0 - h))
+        events = []
+        for i in range(len(frames)):
+            index = self._frames_done + i
+            self._update_ring(ff, i, hnr[i])
+            event = self._update_event(ff, i, hnr[i], index)
+            if event is not None:
+                events.append(event)
+        self._frames_done += len(frames)
+        return events
+
+    def flush(self) -> List[VocalEvent]:
+        """Close any open event (end of stream)."""
+        if self._event is None:
+            return []
+        event = self._close_event(self._event_last_active + 1)
+        return [event] if event is not None else []
+
+    def _update_ring(self, ff: FrameFeatures, i: int, hnr_db: float) -> None:
+        voiced = bool(ff.voiced[i])
+        self._ring[self._ring_pos] = (
+            voiced,
+            ff.pitch_hz[i],
+            ff.jitter[i],
+            ff.shimmer[i],
+            hnr_db if voiced else 0.0,
+            ff.centroid_hz[i],
+        )
+        self._ring_pos = (self._ring_pos + 1) % len(self._ring)
+        self._ring_count = min(self._ring_count + 1, len(self._ring))
+
+    def _update_event(
+        self, ff: FrameFeatures, i: int, hnr_db: float, index: int
+    ) -> Optional[VocalEvent]:
+        active = ff.amplitude[i] >= self.activity_rms
+        if self._event is None:
+            if not active:
+                return None
+            self._event = _Accumulator()
+            self._event_start = index
+        if active:
+            self._event.add(ff, i, hnr_db)
+            self._event_last_active = index
+            if index - self._event_start + 1 >= self.max_event_frames:
+                event = self._close_event(index + 1)
+                return event
+        elif index - self._event_last_active >= self.hangover_frames:
+            return self._close_event(self._event_last_active + 1)
+        return None
+
+    def _close_event(self, end_index: int) -> Optional[VocalEvent]:
+        acc, start = self._event, self._event_start
+        self._event = None
+        start_s = self._frame_time(start)
+        tail_s = (self.plan.frame_length - self.plan.hop) / self.plan.sample_rate
+        end_s = self._frame_time(end_index) + tail_s
+        duration = end_s - start_s
+        if duration < self.min_event_s:
+            return None
+        features = acc.features(duration)
+        centroid = acc.centroid / max(acc.frames, 1)
+        return VocalEvent(
+            type=classify_vocalization(
+                features.pitch_hz, features.hnr_db, centroid, features.voiced_fraction, duration
+            ),
+            start_s=start_s,
+            end_s=end_s,
+            features=features,
+            centroid_hz=centroid,
+            pain_score=float(_as_batch(features).pain_score()[0]),
+        )
+
+    def current_features(self) -> VocalFeatures:
+        """Summary of the last ``window_s`` seconds of frames."""
+        ring = self._ring[:self._ring_count] if self._ring_count < len(self._ring) else self._ring
+        voiced = ring[:, 0]
+        n_voiced = voiced.sum()
+        means = (ring[:, 1:5] * voiced[:, None]).sum(axis=0) / max(n_voiced, 1.0)
+        return VocalFeatures(
+            pitch_hz=float(means[0]),
+            jitter=float(means[1]),
+            shimmer=float(means[2]),
+            hnr_db=float(means[3]),
+            voiced_fraction=float(n_voiced / max(len(ring), 1)),
+            duration_s=len(ring) * self.plan.hop / self.plan.sample_rate,
+        )
+
+    def to_signal(self, timestamp: Optional[float] = None) -> "BioSignal":
+        """Emit the rolling summary as an ``AUDIO_VOCAL`` BioSignal."""
+        if timestamp is None:
+            timestamp = self.start_time + self.samples_seen / self.plan.sample_rate
+        return _as_batch(self.current_features()).to_signals(self.species, timestamp)[0]
+
+def _as_batch(features: VocalFeatures) -> VocalFeatureBatch:
+    return VocalFeatureBatch(**{
+        name: np.array([getattr(features, name)]) for name in VocalFeatureBatch.__dataclass_fields__
+    })
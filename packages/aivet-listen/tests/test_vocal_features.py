@@ -0,0 +1,71 @@
+"""
+VocalFeatureExtractor pitch, jitter, shimmer and HNR on synthetic calls.
+"""
+
+import numpy as np
+import pytest
+
+from vocalization import VocalFeatureExtractor
+
+SAMPLE_RATE = 16000
+
+def _call(f0, jitter=0.0, shimmer=0.0, noise=0.0, seconds=1.0, seed=0):
+    """A sine whose cycle lengths and amplitudes vary by the given relative std."""
+    rng = np.random.default_rng(seed)
+    n = int(SAMPLE_RATE * seconds)
+    period = SAMPLE_RATE / f0
+    cycles = int(1.5 * n / period) + 2
+    lengths = period * (1 + jitter * rng.standard_normal(cycles))
+    gains = 1 + shimmer * rng.standard_normal(cycles)
+    edges = np.concatenate([[0.0], np.cumsum(lengths)])
+    samples = np.arange(n)
+    cycle = np.searchsorted(edges, samples, side="right") - 1
+    phase = (samples - edges[cycle]) / lengths[cycle]
+    voice = 0.3 * gains[cycle] * np.sin(2 * np.pi * phase)
+    return (voice + noise * rng.standard_normal(n)).astype(np.float32)
+
+@pytest.fixture(scope="module")
+def extractor():
+    return VocalFeatureExtractor("cat", sample_rate=SAMPLE_RATE)
+
+@pytest.mark.parametrize("f0", [300.0, 600.0, 1200.0])
+def test_pure_tone_pitch(extractor, f0):
+    features = extractor.extract(_call(f0))
+    assert features.pitch_hz == pytest.approx(f0, rel=0.01)
+    assert features.voiced_fraction == 1.0
+    # A 1200 Hz period is ~13 samples, so interpolation error is the floor
+    assert features.jitter < 0.005 and features.shimmer < 0.005
+    assert features.hnr_db > 15.0
+
+def test_jitter_tracks_cycle_perturbation(extractor):
+    jitter = [extractor.extract(_call(600.0, jitter=j)).jitter for j in (0.0, 0.01, 0.05)]
+    assert jitter == sorted(jitter)
+    assert jitter[1] < 0.03 < jitter[2]  # Either side of the vocal pain threshold
+
+def test_shimmer_tracks_amplitude_perturbation(extractor):
+    features = extractor.extract(_call(600.0, shimmer=0.05))
+    # Mean |a_i - a_i+1| / mean a of N(1, s) gains is 2 s / sqrt(pi)
+    assert features.shimmer == pytest.approx(2 * 0.05 / np.sqrt(np.pi), rel=0.25)
+    assert features.jitter < 0.002
+
+def test_hnr_matches_signal_to_noise_ratio(extractor):
+    noise = 0.1
+    features = extractor.extract(_call(600.0, noise=noise))
+    expected = 10 * np.log10((0.3 ** 2 / 2) / noise ** 2)
+    assert features.hnr_db == pytest.approx(expected, abs=1.5)
+
+def test_silence_and_short_clips_are_unvoiced(extractor):
+    batch = extractor.extract_batch([np.zeros(SAMPLE_RATE, np.float32), _call(600.0)[:100]])
+    assert batch.voiced_fraction.tolist() == [0.0, 0.0]
+    assert batch.pitch_hz.tolist() == [0.0, 0.0]
+    assert batch.confidence().tolist() == [0.0, 0.0]
+
+def test_batch_matches_single_clips(extractor):
+    clips = [_call(500.0, seconds=0.5), _call(900.0, jitter=0.02, seconds=0.8, seed=1)]
+    buffer = np.concatenate(clips)
+    batch = extractor.extract_batch(buffer, offsets=np.array([0, len(clips[0]), len(buffer)]))
+    for i, clip in enumerate(clips):
+        single = extractor.extract(clip)
+        assert batch[i].pitch_hz == pytest.approx(single.pitch_hz)
+        assert batch[i].jitter == pytest.approx(single.jitter)
+    assert batch.pain_score()[1] > batch.pain_score()[0]
@@ -0,0 +1,72 @@
+"""
+StreamingVocalAnalyzer event segmentation over a chunked stream.
+"""
+
+import numpy as np
+import pytest
+
+from vocalization import StreamingVocalAnalyzer, VocalizationType
+
+SAMPLE_RATE = 16000
+FRAME_S = 1024 / SAMPLE_RATE  # Event edges are resolved to about a frame
+
+def _tone(f0, seconds):
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (0.3 * np.sin(2 * np.pi * f0 * t)).astype(np.float32)
+
+def _silence(seconds):
+    return np.zeros(int(SAMPLE_RATE * seconds), np.float32)
+
+@pytest.fixture(scope="module")
+def stream():
+    """Two calls, at 0.5-0.9 s and 1.5-1.8 s, then a 1 ms click at 2.3 s."""
+    click = _silence(0.01)
+    click[:16] = 0.5
+    return np.concatenate([
+        _silence(0.5), _tone(600.0, 0.4), _silence(0.6), _tone(900.0, 0.3),
+        _silence(0.5), click, _silence(0.5),
+    ])
+
+def _run(analyzer, audio, chunk):
+    events = []
+    for start in range(0, len(audio), chunk):
+        events += analyzer.push(audio[start:start + chunk])
+    return events + analyzer.flush()
+
+def test_calls_are_segmented_and_clicks_dropped(stream):
+    events = _run(StreamingVocalAnalyzer("cat"), stream, 320)  # 20 ms chunks
+    assert len(events) == 2
+    for event, (start, end, f0) in zip(events, [(0.5, 0.9, 600.0), (1.5, 1.8, 900.0)]):
+        assert event.start_s == pytest.approx(start, abs=FRAME_S)
+        assert event.end_s == pytest.approx(end, abs=FRAME_S)
+        assert event.features.pitch_hz == pytest.approx(f0, rel=0.01)
+        assert event.type is VocalizationType.MEOW
+
+def test_chunking_does_not_change_events(stream):
+    whole = _run(StreamingVocalAnalyzer("cat"), stream, len(stream))
+    odd = _run(StreamingVocalAnalyzer("cat"), stream, 173)
+    assert [(e.start_s, e.end_s) for e in whole] == [(e.start_s, e.end_s) for e in odd]
+    assert [e.features.pitch_hz for e in whole] == pytest.approx(
+        [e.features.pitch_hz for e in odd]
+    )
+
+def test_long_events_are_split_and_open_events_flushed():
+    analyzer = StreamingVocalAnalyzer("cat", max_event_s=1.0, start_time=100.0)
+    events = analyzer.push(_tone(400.0, 2.5))
+    assert len(events) == 2
+    assert events[0].start_s == pytest.approx(100.0)
+    # The next piece starts at the frame after the split; end_s adds the last frame's tail
+    tail_s = (1024 - 256) / SAMPLE_RATE
+    assert events[1].start_s == pytest.approx(events[0].end_s - tail_s)
+    [tail] = analyzer.flush()
+    assert tail.end_s == pytest.approx(102.5, abs=FRAME_S)
+    assert analyzer.flush() == []
+
+def test_rolling_summary_covers_recent_frames():
+    analyzer = StreamingVocalAnalyzer("cat", window_s=1.0)
+    analyzer.push(_tone(700.0, 1.5))
+    assert analyzer.current_features().pitch_hz == pytest.approx(700.0, rel=0.01)
+    analyzer.push(_silence(1.5))
+    summary = analyzer.current_features()
+    assert summary.voiced_fraction == 0.0 and summary.pitch_hz == 0.0
+    assert summary.duration_s == pytest.approx(1.0, abs=0.02)
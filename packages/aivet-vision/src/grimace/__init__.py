@@ -6,3 +6,21 @@ Supported scales:
 - Rabbit Grimace Scale (RGS) - rabbits
 - Glasgow Composite Pain Scale (GCPS) - dogs (partial)
 """
+
+from .scorer import (
+    FELINE_GRIMACE_SCALE,
+    RABBIT_GRIMACE_SCALE,
+    SCALES,
+    GrimaceScale,
+    GrimaceScorer,
+    GrimaceScores,
+)
+
+__all__ = [
+    "FELINE_GRIMACE_SCALE",
+    "RABBIT_GRIMACE_SCALE",
+    "SCALES",
+    "GrimaceScale",
+    "GrimaceScorer",
+    "GrimaceScores",
+]
@@ -0,0 +1,210 @@
+"""
+Vectorized grimace scale scoring over action-unit arrays.
+
+Each action unit (AU) is scored 0 (absent), 1 (moderately present) or
+2 (obviously present). AUs that could not be scored (occluded, out of
+frame) are passed as NaN and excluded from both the total and the
+maximum possible score, as in the published FGS scoring protocol.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from schema import SignalSource, Species
+from signal_batch import SOURCE_INDEX, BioSignalBatch, species_code
+from species import get_species_config
+
+if TYPE_CHECKING:
+    from schema import BioSignal
+
+@dataclass(frozen=True)
+class GrimaceScale:
+    """Definition of a grimace scale."""
+    name: str
+    action_units: Tuple[str, ...]
+    pain_threshold: Optional[float]  # Normalized score; None if no validated cut-off
+    max_au_score: int = 2
+
+FELINE_GRIMACE_SCALE = GrimaceScale(
+    name="FGS",
+    action_units=(
+        "ear_position",
+        "orbital_tightening",
+        "muzzle_tension",
+        "whisker_change",
+        "head_position",
+    ),
+    pain_threshold=0.39,  # Evangelista et al. 2019
+)
+
+RABBIT_GRIMACE_SCALE = GrimaceScale(
+    name="RGS",
+    action_units=(
+        "orbital_tightening",
+        "cheek_flattening",
+        "nostril_shape",
+        "whisker_shape",
+        "ear_position",
+    ),
+    pain_threshold=None,  # No validated normalized cut-off yet; score is still emitted
+)
+
+SCALES: Dict[str, GrimaceScale] = {
+    "cat": FELINE_GRIMACE_SCALE,
+    "rabbit": RABBIT_GRIMACE_SCALE,
+}
+
+@dataclass
+class GrimaceScores:
+    """Scores for a batch of N frames."""
+    scale: GrimaceScale
+    normalized: np.ndarray      # (N,) total / max possible over scored AUs, 0 if none scored
+    pain_detected: np.ndarray   # (N,) bool, normalized >= threshold
+    confidence: np.ndarray      # (N,) mean AU confidence scaled by AU coverage
+    au_normalized: np.ndarray   # (N, n_aus) per-AU score / max, NaN where not scored
+    au_confidence: np.ndarray   # (N, n_aus) per-AU confidence, 0 where not scored
+
+    def __len__(self) -> int:
+        return len(self.normalized)
+
+    def to_signal_batch(
+        self,
+        species: Union[str, Species],
+        timestamps: Union[float, np.ndarray],
+    ) -> BioSignalBatch:
+        """
+        One ``VISION_GRIMACE`` row per frame, as columns.
+
+        A row's raw value is its per-AU scores (AUs not scored are left
+        out). Frames with equal AU scores share one entry of the raw
+        table, so a batch builds one dict per distinct score row.
+        """
+        names = self.scale.action_units
+        # NaN never equals itself; mark unscored AUs with -1 so equal rows collapse
+        rows, inverse = np.unique(
+            np.nan_to_num(self.au_normalized, nan=-1.0), axis=0, return_inverse=True
+        )
+        table = [
+            {name: float(v) for name, v in zip(names, row) if v >= 0}
+            for row in rows.tolist()
+        ]
+        # Rows differ only in pain_detected, so two shared dicts cover the batch
+        metadata = [
+            {
+                "scale": self.scale.name,
+                "pain_detected": detected,
+                "threshold": self.scale.pain_threshold,
+            }
+            for detected in (False, True)
+        ]
+        n = len(self)
+        metadata_index = self.pain_detected.astype(np.int32)
+        return BioSignalBatch(
+            source=np.full(n, SOURCE_INDEX[SignalSource.VISION_GRIMACE], dtype=np.int8),
+            species=np.full(n, species_code(species), dtype=np.int8),
+            normalized_value=np.asarray(self.normalized, dtype=np.float64),
+            confidence=np.asarray(self.confidence, dtype=np.float64),
+            timestamp=np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (n,)).copy(),
+            raw_value=np.full(n, np.nan),
+            raw_index=inverse.reshape(-1).astype(np.int32),
+            metadata_index=metadata_index,
+            raw_objects=table,
+            metadata=metadata,
+        )
+
+    def to_signals(
+        self,
+        species: Union[str, Species],
+        timestamps: Union[float, np.ndarray],
+    ) -> List["BioSignal"]:
+        """Emit one ``VISION_GRIMACE`` BioSignal per frame."""
+        return self.to_signal_batch(species, timestamps).to_signals()
+
+class GrimaceScorer:
+    """
+    Scores grimace action units for a species in one NumPy pass.
+
+    Example:
+        scorer = GrimaceScorer("cat")
+        scores = scorer.score(au_scores)            # au_scores: (N, 5)
+        signals = scores.to_signals("cat", timestamps)
+    """
+
+    def __init__(self, species: str):
+        config = get_species_config(species)
+        scale = SCALES.get(species.lower())
+        if not config.grimace_supported or scale is None:
+            raise ValueError(f"No grimace scale is supported for species '{species}'")
+        self.species = species.lower()
+        self.scale = scale
+
+    def score(
+        self,
+        au_scores: np.ndarray,
+        au_confidence: Optional[np.ndarray] = None,
+    ) -> GrimaceScores:
+        """
+        Score a batch of frames.
+
+        Args:
+            au_scores: Array of shape (N, n_aus) with raw AU scores in
+                [0, max_au_score]; NaN marks an AU that could not be scored.
+            au_confidence: Optional (N, n_aus) detector confidence per AU in
+                [0, 1]. Defaults to 1 for every scored AU.
+
+        Returns:
+            GrimaceScores with per-frame and per-AU arrays.
+        """
+        n_aus = len(self.scale.action_units)
+        max_score = float(self.scale.max_au_score)
+
+        scores = np.asarray(au_scores, dtype=np.float64)
+        if scores.ndim != 2 or scores.shape[1] != n_aus:
+            raise ValueError(f"au_scores must have shape (N, {n_aus}), got {scores.shape}")
+        scored = ~np.isnan(scores)
+        if np.any((scores[scored] < 0) | (scores[scored] > max_score)):
+            raise ValueError(f"AU scores must lie in [0, {self.scale.max_au_score}]")
+
+        if au_confidence is None:
+            au_conf = scored.astype(np.float64)
+        else:
+            au_conf = np.asarray(au_confidence, dtype=np.float64)
+            if au_conf.shape != scores.shape:
+                raise ValueError("au_confidence must have the same shape as au_scores")
+            if np.any((au_conf < 0) | (au_conf > 1)):
+                raise ValueError("au_confidence must lie in [0, 1]")
+            au_conf = np.where(scored, au_conf, 0.0)
+
+        n_scored = scored.sum(axis=1)
+        total = np.where(scored, scores, 0.0).sum(axis=1)
+        max_possible = n_scored * max_score
+        normalized = np.divide(total, max_possible, out=np.zeros_like(total), where=n_scored > 0)
+
+        threshold = self.scale.pain_threshold
+        if threshold is None:
+            pain = np.zeros(len(scores), dtype=bool)
+        else:
+            pain = (normalized >= threshold) & (n_scored > 0)
+
+        # Mean confidence over scored AUs, scaled by the fraction of AUs scored
+        confidence = au_conf.sum(axis=1) / n_aus
+
+        return GrimaceScores(
+            scale=self.scale,
+            normalized=normalized,
+            pain_detected=pain,
+            confidence=confidence,
+            au_normalized=scores / max_score,
+            au_confidence=au_conf,
+        )
+
+    def score_signals(
+        self,
+        au_scores: np.ndarray,
+        timestamps: Union[float, np.ndarray],
+        au_confidence: Optional[np.ndarray] = None,
+    ) -> List["BioSignal"]:
+        """Score a batch and emit ``VISION_GRIMACE`` BioSignals."""
+        return self.score(au_scores, au_confidence).to_signals(self.species, timestamps)
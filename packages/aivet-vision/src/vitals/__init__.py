@@ -6,3 +6,26 @@ Uses optical flow and color analysis to detect:
 - Heart rate (via photoplethysmography)
 - Movement patterns
 """
+
+from .flow import frame_to_gray, global_flow
+from .monitor import VitalsMonitor
+from .respiration import RespirationEstimate, RespirationEstimator
+from .rppg import HeartRateEstimate, Roi, RoiTracker, RppgEstimator, detect_skin_roi
+from .spectral import SlidingDFT, band_bins, peak_frequency, range_deviation
+
+__all__ = [
+    "HeartRateEstimate",
+    "RespirationEstimate",
+    "RespirationEstimator",
+    "Roi",
+    "RoiTracker",
+    "RppgEstimator",
+    "SlidingDFT",
+    "VitalsMonitor",
+    "band_bins",
+    "detect_skin_roi",
+    "frame_to_gray",
+    "global_flow",
+    "peak_frequency",
+    "range_deviation",
+]
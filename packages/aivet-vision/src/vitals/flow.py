@@ -0,0 +1,46 @@
+"""
+Cheap motion measures for vital-sign estimation.
+"""
+
+import numpy as np
+
+def frame_to_gray(frame: np.ndarray, step: int = 4) -> np.ndarray:
+    """
+    Downsampled float32 grayscale of an (..., H, W, 3) frame or frame stack.
+
+    Subsampling is a strided view, so only the kept pixels are read.
+    """
+    view = frame[..., ::step, ::step, :]
+    return (
+        view[..., 0] * np.float32(0.299)
+        + view[..., 1] * np.float32(0.587)
+        + view[..., 2] * np.float32(0.114)
+    )
+
+def global_flow(prev_gray: np.ndarray, gray: np.ndarray) -> np.ndarray:
+    """
+    Signed global optical flow (dx, dy) in pixels/frame between two gray frames.
+
+    Solves the Lucas-Kanade normal equations over the whole frame (a single
+    window), which is enough to expose periodic chest or flank motion.
+    Works on stacks: inputs of shape (..., h, w) give output (..., 2).
+    """
+    lead = gray.shape[:-2]
+    # Central differences on the interior; the 2x2 system and its right-hand
+    # side are then two small matmuls instead of five separate reductions.
+    gx = 0.5 * (gray[..., 1:-1, 2:] - gray[..., 1:-1, :-2])
+    gy = 0.5 * (gray[..., 2:, 1:-1] - gray[..., :-2, 1:-1])
+    it = gray[..., 1:-1, 1:-1] - prev_gray[..., 1:-1, 1:-1]
+
+    n = gx.shape[-2] * gx.shape[-1]
+    g = np.stack([gx.reshape(*lead, n), gy.reshape(*lead, n)], axis=-2)
+    a = g @ np.swapaxes(g, -1, -2)                 # (..., 2, 2)
+    b = g @ it.reshape(*lead, n, 1)                # (..., 2, 1)
+
+    sxx, sxy, syy = a[..., 0, 0], a[..., 0, 1], a[..., 1, 1]
+    sxt, syt = b[..., 0, 0], b[..., 1, 0]
+    det = sxx * syy - sxy * sxy
+    safe = np.where(np.abs(det) > 1e-6, det, np.inf)
+    dx = (-syy * sxt + sxy * syt) / safe
+    dy = (sxy * sxt - sxx * syt) / safe
+    return np.stack([dx, dy], axis=-1)
@@ -0,0 +1,77 @@
+"""
+Per-patient vitals monitoring from a single camera stream.
+
+Bundles the respiration and rPPG estimators so a frame is handed over
+once and both vital signs come back as one BioSignalBatch.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+from signal_batch import BioSignalBatch
+
+from .respiration import RespirationEstimator
+from .rppg import RppgEstimator
+
+class VitalsMonitor:
+    """
+    Respiration and heart rate for one patient.
+
+    Example:
+        monitor = VitalsMonitor("cat", fps=30)
+        for t, frame in enumerate(frames):
+            signals = monitor.push_frame(frame, t / 30)
+
+    Args:
+        species: Species key for the resting ranges.
+        fps: Camera frame rate.
+        gray_step: Spatial subsampling for optical flow.
+    """
+
+    def __init__(self, species: str, fps: float = 30.0, gray_step: int = 4):
+        self.species = species.lower()
+        self.respiration = RespirationEstimator(species, fps=fps, gray_step=gray_step)
+        self.heart_rate = RppgEstimator(species, fps=fps)
+
+    def push_frame(
+        self, frame: np.ndarray, timestamp: Optional[float] = None
+    ) -> Optional[BioSignalBatch]:
+        """
+        Update both estimators from an (H, W, 3) RGB frame.
+
+        Returns the two ``VISION_VITALS`` rows (respiration, then heart
+        rate) when ``timestamp`` is given, otherwise None.
+        """
+        self.respiration.push_frames(frame)
+        self.heart_rate.push_frame(frame)
+        if timestamp is None:
+            return None
+        return self.to_signal_batch(timestamp)
+
+    def push_motion(self, frame: np.ndarray) -> None:
+        """
+        Update the estimators from a frame whose analysis is reused.
+
+        Breathing motion is still measured from the frame; the pulse
+        estimator repeats its last sample instead of tracking the skin
+        region, and no estimates are computed.
+        """
+        self.respiration.push_frames(frame)
+        self.heart_rate.hold()
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by both estimators."""
+        return self.respiration.nbytes + self.heart_rate.nbytes
+
+    def to_signal_batch(self, timestamp: float) -> BioSignalBatch:
+        """Current respiration and heart-rate estimates as two rows."""
+        return BioSignalBatch.concat([
+            self.respiration.to_signal_batch(timestamp),
+            self.heart_rate.to_signal_batch(timestamp),
+        ])
+
+    def reset(self) -> None:
+        self.respiration.reset()
+        self.heart_rate.reset_signal()
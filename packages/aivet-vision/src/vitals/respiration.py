@@ -0,0 +1,119 @@
+"""
+Streaming respiration-rate estimation from optical flow.
+
+Per-frame global flow is pushed into a sliding DFT restricted to the
+species' plausible breathing band, so every new frame costs O(bins)
+regardless of how long the session has been running.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+from schema import SignalSource
+from signal_batch import BioSignalBatch, species_code
+from species import get_species_config
+
+if TYPE_CHECKING:
+    from schema import BioSignal
+
+from .flow import frame_to_gray, global_flow
+from .spectral import SlidingDFT, band_bins, peak_frequency, range_deviation
+
+@dataclass
+class RespirationEstimate:
+    """Respiration estimates for P patients."""
+    rate_bpm: np.ndarray     # (P,) breaths per minute
+    confidence: np.ndarray   # (P,) spectral concentration x window fill
+    deviation: np.ndarray    # (P,) 0 inside the resting range, up to 1 outside
+
+class RespirationEstimator:
+    """
+    Rolling-window respiration estimator for one or more patients of a species.
+
+    Each patient contributes two channels (signed dx and dy flow); their
+    power spectra are summed so the estimate does not depend on the
+    direction the animal is breathing in.
+
+    Args:
+        species: Species key used for the resting RR range.
+        fps: Frame rate of the flow signal.
+        window_s: Analysis window in seconds (sets the frequency resolution).
+        patients: Number of patients updated together.
+        band_margin: Multipliers applied to ``typical_resting_rr`` to get
+            the search band, so abnormal rates are still detected.
+        gray_step: Spatial subsampling used by ``push_frames``.
+    """
+
+    def __init__(
+        self,
+        species: str,
+        fps: float = 30.0,
+        window_s: float = 30.0,
+        patients: int = 1,
+        band_margin: Tuple[float, float] = (0.5, 2.0),
+        gray_step: int = 4,
+    ):
+        config = get_species_config(species)
+        self.species = species.lower()
+        self.fps = float(fps)
+        self.patients = int(patients)
+        self.resting_rr = config.typical_resting_rr
+        self.gray_step = gray_step
+
+        lo_bpm = self.resting_rr[0] * band_margin[0]
+        hi_bpm = self.resting_rr[1] * band_margin[1]
+        self.window = int(round(window_s * self.fps))
+        self.bins = band_bins((lo_bpm / 60.0, hi_bpm / 60.0), self.window, self.fps)
+        self._sdft = SlidingDFT(self.window, self.bins, channels=self.patients * 2)
+        self._prev_gray: Optional[np.ndarray] = None
+
+    def push(self, flow: np.ndarray) -> None:
+        """Push one flow sample per patient, shape (2,) or (P, 2)."""
+        self._sdft.update(np.asarray(flow, dtype=np.float64).reshape(self.patients * 2))
+
+    def push_frames(self, frames: np.ndarray) -> None:
+        """Push one frame per patient, shape (H, W, 3) or (P, H, W, 3)."""
+        gray = frame_to_gray(frames, self.gray_step)
+        if self._prev_gray is not None:
+            self.push(global_flow(self._prev_gray, gray))
+        self._prev_gray = gray
+
+    def estimate(self) -> RespirationEstimate:
+        """Current dominant breathing rate and confidence per patient."""
+        power = self._sdft.power().reshape(self.patients, 2, -1).sum(axis=1)
+        freq, concentration = peak_frequency(power, self.bins, self.window, self.fps)
+        rate = freq * 60.0
+        return RespirationEstimate(
+            rate_bpm=rate,
+            confidence=concentration * self._sdft.fill,
+            deviation=range_deviation(rate, self.resting_rr),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the flow window and the previous gray frame."""
+        gray = 0 if self._prev_gray is None else self._prev_gray.nbytes
+        return self._sdft.nbytes + self.bins.nbytes + gray
+
+    def to_signal_batch(self, timestamp: float) -> BioSignalBatch:
+        """One ``VISION_VITALS`` row per patient, as columns."""
+        est = self.estimate()
+        return BioSignalBatch.from_columns(
+            source=SignalSource.VISION_VITALS,
+            species=species_code(self.species),
+            normalized_value=est.deviation,
+            confidence=est.confidence,
+            timestamp=timestamp,
+            raw_value=est.rate_bpm,
+            metadata={"metric": "respiration_rate", "unit": "bpm"},
+        )
+
+    def to_signals(self, timestamp: float) -> List["BioSignal"]:
+        """Emit one ``VISION_VITALS`` BioSignal per patient."""
+        return self.to_signal_batch(timestamp).to_signals()
+
+    def reset(self) -> None:
+        self._sdft.reset()
+        self._prev_gray = None
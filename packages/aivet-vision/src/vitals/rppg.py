@@ -0,0 +1,291 @@
+"""
+Camera-based photoplethysmography (rPPG) heart-rate estimation.
+
+A skin region (ear pinna, nose) is located once and cached; each frame
+only matches the row and column profiles of a small window around it,
+which follows the skin as the animal breathes or shifts. The full-frame
+search runs when the skin is lost rather than per frame, and the pulse
+signal carries on across small movements. Channel means are taken from
+a view of the incoming frame and turned into CHROM chrominance signals
+(de Haan & Jeanne, 2013), which feed a sliding DFT over the species'
+heart-rate band.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional, Tuple
+
+import numpy as np
+
+from schema import SignalSource
+from signal_batch import BioSignalBatch, species_code
+from species import get_species_config
+
+if TYPE_CHECKING:
+    from schema import BioSignal
+
+from .spectral import SlidingDFT, band_bins, peak_frequency, range_deviation
+
+Roi = Tuple[int, int, int, int]  # (top, left, height, width) in full-frame pixels
+
+def detect_skin_roi(frame: np.ndarray, roi_size: Tuple[int, int] = (48, 48), step: int = 8) -> Roi:
+    """
+    Full-frame search for the most skin-like patch.
+
+    Scores every ``roi_size`` block of a subsampled frame by red
+    chromaticity (thinly furred, perfused skin is pinker than fur)
+    minus its brightness variance (fur texture), using integral images.
+    """
+    small = frame[::step, ::step].astype(np.float32)
+    total = small.sum(axis=-1) + 1.0
+    redness = (small[..., 0] - small[..., 1]) / total
+    luma = total / 3.0
+
+    bh = max(roi_size[0] // step, 1)
+    bw = max(roi_size[1] // step, 1)
+    if bh > small.shape[0] or bw > small.shape[1]:
+        return 0, 0, frame.shape[0], frame.shape[1]
+
+    def box_mean(x: np.ndarray) -> np.ndarray:
+        c = np.pad(x, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+        return (c[bh:, bw:] - c[:-bh, bw:] - c[bh:, :-bw] + c[:-bh, :-bw]) / (bh * bw)
+
+    texture = box_mean(luma * luma) - box_mean(luma) ** 2
+    score = box_mean(redness) - 1e-4 * texture
+    y, x = np.unravel_index(np.argmax(score), score.shape)
+    return int(y * step), int(x * step), int(roi_size[0]), int(roi_size[1])
+
+_SHIFT_COST = 0.1  # Gray levels of profile error per pixel moved
+
+# Reductions ordered so the inner loop runs over contiguous pixels; summing
+# over axes (0, 2) of a frame view at once is several times slower
+def _row_means(region: np.ndarray) -> np.ndarray:
+    """Mean gray level of each row of an (h, w, 3) region."""
+    return region.reshape(len(region), -1).sum(axis=1, dtype=np.float64) / region[0].size
+
+def _column_means(region: np.ndarray) -> np.ndarray:
+    """Mean gray level of each column of an (h, w, 3) region."""
+    return region.sum(axis=0, dtype=np.float64).sum(axis=1) / (3 * len(region))
+
+def _channel_means(region: np.ndarray) -> np.ndarray:
+    """Mean of each channel of an (h, w, 3) region."""
+    return region.sum(axis=0, dtype=np.float64).sum(axis=0) / (len(region) * region.shape[1])
+
+class RoiTracker:
+    """
+    Caches a detected ROI, follows it as it moves, and re-detects on loss or expiry.
+
+    At detection the ROI's gray row and column profiles are kept as a
+    template. Each frame, the profiles of a slightly larger window are
+    matched against it to find the ROI's shift (within ``search_radius``
+    pixels), so skin that moves with breathing or posture is recentred
+    rather than lost. When even the best shift leaves a mean absolute
+    profile difference above ``drift_threshold``, the skin is gone and
+    detection is re-run.
+
+    Args:
+        detector: Full-frame ROI detector, ``frame -> Roi``.
+        drift_threshold: Mean absolute gray-level change that triggers re-detection.
+        max_age: Frames after which detection is re-run regardless of drift.
+        search_radius: Largest per-frame shift, in pixels, that is followed.
+    """
+
+    def __init__(
+        self,
+        detector: Callable[[np.ndarray], Roi] = detect_skin_roi,
+        drift_threshold: float = 12.0,
+        max_age: int = 900,
+        search_radius: int = 8,
+    ):
+        self.detector = detector
+        self.drift_threshold = drift_threshold
+        self.max_age = max_age
+        self.search_radius = search_radius
+        self.roi: Optional[Roi] = None
+        self.detections = 0
+        self.frames = 0
+        self._rows: Optional[np.ndarray] = None  # Template row profile
+        self._cols: Optional[np.ndarray] = None  # Template column profile
+        self._age = 0
+
+    def view(self, frame: np.ndarray) -> np.ndarray:
+        """The cached ROI as a view into ``frame`` (no pixels copied)."""
+        top, left, height, width = self.roi
+        return frame[top:top + height, left:left + width]
+
+    def update(self, frame: np.ndarray) -> Tuple[Roi, bool]:
+        """Return the ROI for ``frame`` and whether detection was re-run."""
+        self.frames += 1
+        self._age += 1
+        if self.roi is not None and self._age < self.max_age:
+            roi = self._follow(frame)
+            if roi is not None:
+                self.roi = roi
+                return roi, False
+        self.roi = self.detector(frame)
+        roi = self.view(frame)
+        self._rows, self._cols = _row_means(roi), _column_means(roi)
+        self._age = 0
+        self.detections += 1
+        return self.roi, True
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the template profiles."""
+        return sum(p.nbytes for p in (self._rows, self._cols) if p is not None)
+
+    def _follow(self, frame: np.ndarray) -> Optional[Roi]:
+        """The ROI shifted to where its profiles match best, or None if nothing matches."""
+        top, left, height, width = self.roi
+        r = self.search_radius
+        y0, x0 = max(top - r, 0), max(left - r, 0)
+        y1 = min(top + height + r, frame.shape[0])
+        x1 = min(left + width + r, frame.shape[1])
+        if y1 - y0 < height or x1 - x0 < width:
+            return None
+        # Rows over the ROI's columns and columns over its rows, for every candidate shift
+        rows = _row_means(frame[y0:y1, left:left + width])
+        cols = _column_means(frame[top:top + height, x0:x1])
+        dy, row_err = self._best_shift(rows, self._rows, top - y0)
+        dx, col_err = self._best_shift(cols, self._cols, left - x0)
+        if max(row_err, col_err) > self.drift_threshold:
+            return None
+        return y0 + dy, x0 + dx, height, width
+
+    @staticmethod
+    def _best_shift(profile: np.ndarray, template: np.ndarray, current: int) -> Tuple[int, float]:
+        shifts = np.arange(len(profile) - len(template) + 1)
+        error = np.abs(profile[shifts[:, None] + np.arange(len(template))] - template).mean(axis=1)
+        # Moving has to pay: along a flat profile (uniform skin) noise alone
+        # would otherwise walk the ROI about and mix in other pixels
+        best = int(np.argmin(error + _SHIFT_COST * np.abs(shifts - current)))
+        return best, float(error[best])
+
+@dataclass
+class HeartRateEstimate:
+    """Heart-rate estimate for one patient."""
+    rate_bpm: float
+    confidence: float
+    deviation: float  # 0 inside the resting range, up to 1 outside
+    roi: Optional[Roi]
+
+def _overlap(a: Roi, b: Roi) -> float:
+    """Intersection over union of two ROIs."""
+    top, left = max(a[0], b[0]), max(a[1], b[1])
+    bottom = min(a[0] + a[2], b[0] + b[2])
+    right = min(a[1] + a[3], b[1] + b[3])
+    inter = max(bottom - top, 0) * max(right - left, 0)
+    union = a[2] * a[3] + b[2] * b[3] - inter
+    return inter / union if union else 0.0
+
+class RppgEstimator:
+    """
+    Streaming rPPG heart-rate estimator for one patient.
+
+    Args:
+        species: Species key used for the resting HR range.
+        fps: Camera frame rate.
+        window_s: Analysis window in seconds.
+        band_margin: Multipliers applied to ``typical_resting_hr`` to get the
+            search band, so tachy- and bradycardia are still detected.
+        tracker: ROI tracker; defaults to ``RoiTracker()`` with the skin detector.
+        norm_tau_s: Time constant of the running channel means and variances.
+    """
+
+    def __init__(
+        self,
+        species: str,
+        fps: float = 30.0,
+        window_s: float = 10.0,
+        band_margin: Tuple[float, float] = (0.7, 1.5),
+        tracker: Optional[RoiTracker] = None,
+        norm_tau_s: float = 1.0,
+    ):
+        config = get_species_config(species)
+        self.species = species.lower()
+        self.fps = float(fps)
+        self.resting_hr = config.typical_resting_hr
+        self.tracker = tracker or RoiTracker()
+
+        lo_bpm = self.resting_hr[0] * band_margin[0]
+        hi_bpm = self.resting_hr[1] * band_margin[1]
+        self.window = int(round(window_s * self.fps))
+        self.bins = band_bins((lo_bpm / 60.0, hi_bpm / 60.0), self.window, self.fps)
+        self._sdft = SlidingDFT(self.window, self.bins, channels=2)
+        self._alpha = 1.0 / (norm_tau_s * self.fps)
+        self._mean: Optional[np.ndarray] = None
+        self._var = np.zeros(2)
+        self._last: Optional[np.ndarray] = None  # Last pushed chrominance sample
+
+    def push_frame(self, frame: np.ndarray) -> None:
+        """Track the ROI in an (H, W, 3) RGB frame and push one pulse sample."""
+        previous = self.tracker.roi
+        roi, redetected = self.tracker.update(frame)
+        if redetected and previous is not None and _overlap(previous, roi) == 0.0:
+            # Skin elsewhere is a different signal; start over. A new ROI that
+            # overlaps the old one is the same skin, found a few pixels away
+            self.reset_signal()
+
+        rgb = _channel_means(self.tracker.view(frame))
+        if self._mean is None:
+            self._mean = rgb.copy()
+        self._mean += self._alpha * (rgb - self._mean)
+        rn, gn, bn = rgb / np.maximum(self._mean, 1e-6)
+        xy = np.array([3.0 * rn - 2.0 * gn, 1.5 * rn + gn - 1.5 * bn]) - np.array([1.0, 1.0])
+        self._var += self._alpha * (xy * xy - self._var)
+        self._sdft.update(xy)
+        self._last = xy
+
+    def hold(self) -> None:
+        """
+        Push the last pulse sample again, for a frame that is not analyzed.
+
+        Keeps the window on the camera's time base when near-identical
+        frames are skipped; a no-op before the first frame.
+        """
+        if self._last is not None:
+            self._sdft.update(self._last)
+
+    def estimate(self) -> HeartRateEstimate:
+        """Current dominant pulse rate and confidence."""
+        # CHROM: S = X - alpha * Y, combined in the frequency domain
+        alpha = np.sqrt(self._var[0] / self._var[1]) if self._var[1] > 0 else 1.0
+        spectrum = self._sdft.spectrum()
+        pulse = spectrum[0] - alpha * spectrum[1]
+        power = (pulse.real ** 2 + pulse.imag ** 2)[None, :]
+        freq, concentration = peak_frequency(power, self.bins, self.window, self.fps)
+        rate = float(freq[0] * 60.0)
+        return HeartRateEstimate(
+            rate_bpm=rate,
+            confidence=float(concentration[0] * self._sdft.fill),
+            deviation=float(range_deviation(np.array(rate), self.resting_hr)),
+            roi=self.tracker.roi,
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the pulse window and the ROI tracker."""
+        return self._sdft.nbytes + self.bins.nbytes + self.tracker.nbytes
+
+    def to_signal_batch(self, timestamp: float) -> BioSignalBatch:
+        """The current estimate as one ``VISION_VITALS`` row."""
+        est = self.estimate()
+        return BioSignalBatch.from_columns(
+            source=SignalSource.VISION_VITALS,
+            species=species_code(self.species),
+            normalized_value=est.deviation,
+            confidence=est.confidence,
+            timestamp=timestamp,
+            raw_value=np.array([est.rate_bpm]),
+            metadata={"metric": "heart_rate", "unit": "bpm", "roi": est.roi},
+        )
+
+    def to_signal(self, timestamp: float) -> "BioSignal":
+        """Emit the current estimate as a ``VISION_VITALS`` BioSignal."""
+        return self.to_signal_batch(timestamp)[0]
+
+    def reset_signal(self) -> None:
+        """Clear the pulse history, keeping the cached ROI."""
+        self._sdft.reset()
+        self._mean = None
+        self._var[:] = 0.0
+        self._last = None
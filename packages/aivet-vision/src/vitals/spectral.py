@@ -0,0 +1,139 @@
+"""
+Incremental spectral estimation shared by the vital-sign estimators.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+def band_bins(band_hz: Tuple[float, float], window: int, fs: float) -> np.ndarray:
+    """DFT bin indices covering ``band_hz`` for a ``window``-sample DFT at ``fs``."""
+    lo = max(int(np.ceil(band_hz[0] * window / fs)), 1)
+    hi = min(int(np.floor(band_hz[1] * window / fs)), window // 2)
+    if hi < lo:
+        raise ValueError(f"band {band_hz} Hz has no bins for window={window}, fs={fs}")
+    return np.arange(lo, hi + 1)
+
+def range_deviation(value: np.ndarray, normal_range: Tuple[float, float]) -> np.ndarray:
+    """
+    Map a vital value to [0, 1]: 0 inside ``normal_range``, rising linearly
+    with distance outside it and saturating one range-width away.
+    """
+    lo, hi = normal_range
+    width = max(hi - lo, 1e-9)
+    distance = np.maximum(lo - value, 0.0) + np.maximum(value - hi, 0.0)
+    return np.clip(distance / width, 0.0, 1.0)
+
+class SlidingDFT:
+    """
+    Sliding DFT over the last ``window`` samples for a subset of bins.
+
+    Each update costs O(channels x bins) instead of an FFT over the whole
+    window. The recurrence accumulates rounding error, so the spectrum is
+    recomputed exactly once per ``resync_every`` samples (amortized O(bins)).
+
+    Args:
+        window: Window length in samples.
+        bins: DFT bin indices to track.
+        channels: Number of independent signals updated together.
+        resync_every: Samples between exact recomputations (defaults to ``window``).
+    """
+
+    def __init__(
+        self,
+        window: int,
+        bins: np.ndarray,
+        channels: int = 1,
+        resync_every: Optional[int] = None,
+    ):
+        self.window = int(window)
+        self.bins = np.asarray(bins, dtype=np.int64)
+        self.channels = int(channels)
+        self.resync_every = int(resync_every or window)
+        self._twiddle = np.exp(2j * np.pi * self.bins / self.window)
+        self._buffer = np.zeros((self.channels, self.window))
+        self._spectrum = np.zeros((self.channels, len(self.bins)), dtype=np.complex128)
+        self._basis: Optional[np.ndarray] = None
+        self._pos = 0
+        self.count = 0
+
+    @property
+    def fill(self) -> float:
+        """Fraction of the window holding real samples."""
+        return min(self.count / self.window, 1.0)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the window, spectrum and (once built) resync basis."""
+        arrays = (self.bins, self._twiddle, self._buffer, self._spectrum, self._basis)
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def update(self, x: np.ndarray) -> None:
+        """Push one sample per channel (shape ``(channels,)``)."""
+        x = np.asarray(x, dtype=np.float64).reshape(self.channels)
+        delta = x - self._buffer[:, self._pos]
+        self._spectrum += delta[:, None]
+        self._spectrum *= self._twiddle
+        self._buffer[:, self._pos] = x
+        self._pos = (self._pos + 1) % self.window
+        self.count += 1
+        if self.count % self.resync_every == 0:
+            self._resync()
+
+    def spectrum(self) -> np.ndarray:
+        """Complex spectrum per channel and tracked bin, shape ``(channels, bins)``."""
+        return self._spectrum
+
+    def power(self) -> np.ndarray:
+        """Power per channel and tracked bin, shape ``(channels, bins)``."""
+        return self._spectrum.real ** 2 + self._spectrum.imag ** 2
+
+    def reset(self) -> None:
+        self._buffer[:] = 0.0
+        self._spectrum[:] = 0.0
+        self._pos = 0
+        self.count = 0
+
+    def _resync(self) -> None:
+        if self._basis is None:
+            n = np.arange(self.window)
+            self._basis = np.exp(-2j * np.pi * np.outer(n, self.bins) / self.window)
+        ordered = np.roll(self._buffer, -self._pos, axis=1)  # Oldest sample first
+        self._spectrum = ordered @ self._basis
+
+def peak_frequency(
+    power: np.ndarray,
+    bins: np.ndarray,
+    window: int,
+    fs: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dominant frequency and spectral concentration per row of ``power``.
+
+    Returns:
+        (frequency_hz, concentration), where concentration is the share of
+        band power in the peak bin and its neighbours, rescaled so that a
+        flat spectrum gives 0 and a pure tone gives 1.
+    """
+    power = np.atleast_2d(power)
+    n_bins = power.shape[1]
+    rows = np.arange(power.shape[0])
+    k = np.argmax(power, axis=1)
+
+    # Parabolic interpolation on magnitude around the peak bin
+    left = power[rows, np.maximum(k - 1, 0)]
+    right = power[rows, np.minimum(k + 1, n_bins - 1)]
+    centre = power[rows, k]
+    a, b, c = np.sqrt(left), np.sqrt(centre), np.sqrt(right)
+    denom = a - 2 * b + c
+    offset = np.divide(0.5 * (a - c), denom, out=np.zeros_like(denom), where=denom < 0)
+    interior = (k > 0) & (k < n_bins - 1)
+    offset = np.where(interior, np.clip(offset, -0.5, 0.5), 0.0)
+    frequency = (bins[k] + offset) * fs / window
+
+    total = power.sum(axis=1)
+    peak = centre + np.where(k > 0, left, 0.0) + np.where(k < n_bins - 1, right, 0.0)
+    share = np.divide(peak, total, out=np.zeros_like(total), where=total > 0)
+    floor = min(3.0 / n_bins, 1.0)
+    concentration = np.clip((share - floor) / max(1.0 - floor, 1e-9), 0.0, 1.0)
+    return frequency, concentration
@@ -0,0 +1,59 @@
+"""
+GrimaceScorer totals, thresholds, coverage-scaled confidence and signal rows.
+"""
+
+import numpy as np
+import pytest
+
+from grimace import GrimaceScorer
+from schema import SignalSource
+from signal_batch import SOURCE_INDEX, species_code
+
+NAN = np.nan
+
+def test_feline_scores_and_threshold():
+    scores = GrimaceScorer("cat").score(np.array([
+        [0, 0, 0, 0, 0],
+        [2, 2, 2, 2, 2],
+        [1, 1, 0, 0, 0],      # 2 / 10 = 0.2
+        [1, 1, 1, 1, NAN],    # 4 / 8 = 0.5 over the four scored AUs
+        [NAN] * 5,
+    ]))
+    assert scores.normalized.tolist() == pytest.approx([0.0, 1.0, 0.2, 0.5, 0.0])
+    assert scores.pain_detected.tolist() == [False, True, False, True, False]
+    assert scores.confidence.tolist() == pytest.approx([1.0, 1.0, 1.0, 0.8, 0.0])
+
+def test_detector_confidence_is_masked_and_scaled():
+    au = np.array([[2, 2, NAN, 0, 0]])
+    conf = np.array([[0.5, 1.0, 0.9, 1.0, 0.5]])
+    scores = GrimaceScorer("cat").score(au, conf)
+    assert scores.au_confidence[0, 2] == 0.0
+    assert scores.confidence[0] == pytest.approx(3.0 / 5)
+
+def test_rabbit_scale_reports_without_flag():
+    scores = GrimaceScorer("rabbit").score(np.full((1, 5), 2.0))
+    assert scores.normalized[0] == 1.0 and not scores.pain_detected[0]
+
+@pytest.mark.parametrize("species, au, message", [
+    ("dog", np.zeros((1, 5)), "No grimace scale"),
+    ("cat", np.zeros((1, 4)), "shape"),
+    ("cat", np.full((1, 5), 3.0), "must lie in"),
+])
+def test_invalid_input_raises(species, au, message):
+    with pytest.raises(ValueError, match=message):
+        GrimaceScorer(species).score(au)
+
+def test_signal_batch_shares_raw_rows():
+    scores = GrimaceScorer("cat").score(np.array([
+        [1, 1, 1, 1, NAN], [1, 1, 1, 1, NAN], [0, 0, 0, 0, 0],
+    ]))
+    batch = scores.to_signal_batch("Cat", np.array([1.0, 2.0, 3.0]))
+    assert batch.source.tolist() == [SOURCE_INDEX[SignalSource.VISION_GRIMACE]] * 3
+    assert batch.species.tolist() == [species_code("cat")] * 3
+    assert len(batch.raw_objects) == 2 and batch.raw_index[0] == batch.raw_index[1]
+    first = batch.to_signals()[0]
+    assert first.raw_value == {
+        "ear_position": 0.5, "orbital_tightening": 0.5,
+        "muzzle_tension": 0.5, "whisker_change": 0.5,
+    }
+    assert first.metadata["pain_detected"] is True
@@ -0,0 +1,34 @@
+"""
+rPPG heart rate from a breathing animal, and ROI tracking.
+"""
+
+import numpy as np
+import pytest
+
+from testing.vetsimbench.generator import Physiology, SyntheticPatient
+from vitals import RoiTracker, RppgEstimator
+
+def test_heart_rate_of_swaying_patient():
+    # The skin patch rises and falls a few pixels with every breath; true HR 130 bpm
+    patient = SyntheticPatient("cat", Physiology.for_severity("cat", 0.0), seed=1)
+    estimator = RppgEstimator("cat")
+    for i in range(330):  # 11 s, past the 10 s window
+        estimator.push_frame(patient.frame(i))
+    estimate = estimator.estimate()
+    assert estimate.rate_bpm == pytest.approx(patient.physiology.heart_rate_bpm, abs=3.0)
+    assert estimate.confidence > 0.5
+    assert estimator.tracker.detections == 1
+
+def _frame(top, left, size=48):
+    frame = np.full((240, 320, 3), (110, 80, 55), np.uint8)
+    frame[top:top + size, left:left + size] = (200, 140, 130)
+    return frame
+
+def test_tracker_follows_small_moves_and_redetects_when_lost():
+    tracker = RoiTracker(detector=lambda frame: (100, 100, 48, 48))
+    assert tracker.update(_frame(100, 100)) == ((100, 100, 48, 48), True)
+    assert tracker.update(_frame(105, 97)) == ((105, 97, 48, 48), False)
+    assert tracker.update(_frame(99, 103)) == ((99, 103, 48, 48), False)
+    # The patch jumped out of the search window: detection runs again
+    assert tracker.update(_frame(20, 200)) == ((100, 100, 48, 48), True)
+    assert tracker.detections == 2
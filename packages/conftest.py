@@ -0,0 +1,5 @@
+"""
+Put every package's ``src/`` tree on ``sys.path`` for the unit tests.
+"""
+
+import doolittle._paths  # noqa: F401
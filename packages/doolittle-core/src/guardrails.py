@@ -0,0 +1,294 @@
+"""
+Biological guardrails for vital-sign signals.
+
+Each reading is checked against two ranges per (species, metric):
+
+- plausibility bounds: what the animal can physiologically produce. A
+  reading outside them is a measurement error and is rejected.
+- normal range: the ULTRATHINK_AUDIT.md guardrail table, widened to the
+  breed's typical resting range from the species registry (a bulldog
+  breathes faster, a greyhound's heart beats slower). A reading outside
+  it is kept and flagged, since an abnormal vital is evidence.
+
+Species or metrics without a listed range fall back to the species'
+typical resting range (``SpeciesConfig``), widened by a margin for the
+plausibility bounds. Both ranges are compiled into (species x metric)
+NumPy arrays, the normal ones once per breed, so a whole BioSignalBatch
+is checked with a few array lookups and comparisons instead of per-value
+validators.
+
+Rows are matched to a metric by their metadata ``"metric"`` key, as the
+vitals primitives emit it. The raw value (bpm, degC) is what gets
+checked. Rows without a known metric are not checked.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from signal_batch import SPECIES, BioSignalBatch
+from species import get_species_config
+
+METRICS: Tuple[str, ...] = ("heart_rate", "respiration_rate", "temperature")
+METRIC_INDEX: Dict[str, int] = {m: i for i, m in enumerate(METRICS)}
+
+# Rejection reason codes; 0 means the row passed or was not checked
+REASONS: Tuple[str, ...] = ("ok", "below_min", "above_max", "not_finite")
+OK, BELOW_MIN, ABOVE_MAX, NOT_FINITE = range(len(REASONS))
+
+# Flag codes of rows that are kept; 0 means within the normal range or not checked
+FLAGS: Tuple[str, ...] = ("normal", "below_normal", "above_normal")
+NORMAL, BELOW_NORMAL, ABOVE_NORMAL = range(len(FLAGS))
+
+# Physiologic limits (panting dogs, tachycardic cats, a horse in colic)
+PLAUSIBLE_BOUNDS: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "cat": {"heart_rate": (40, 350), "respiration_rate": (5, 150), "temperature": (30.0, 43.5)},
+    "dog": {"heart_rate": (20, 350), "respiration_rate": (4, 400), "temperature": (30.0, 43.5)},
+    "horse": {"heart_rate": (15, 120), "respiration_rate": (4, 100), "temperature": (32.0, 43.0)},
+}
+
+# ULTRATHINK_AUDIT.md, "Biological Guardrails"
+AUDITED_NORMAL: Dict[str, Dict[str, Tuple[float, float]]] = {
+    "cat": {"heart_rate": (120, 280), "respiration_rate": (20, 40), "temperature": (37.5, 39.5)},
+    "dog": {"heart_rate": (60, 180), "respiration_rate": (10, 35), "temperature": (37.5, 39.2)},
+    "horse": {"heart_rate": (28, 44), "respiration_rate": (8, 16)},
+}
+
+@dataclass
+class GuardrailResult:
+    """Per-row outcome of a guardrail check."""
+    reason: np.ndarray  # (N,) int8 code into REASONS
+    metric: np.ndarray  # (N,) int8 code into METRICS, -1 for unchecked rows
+    value: np.ndarray   # (N,) checked value (raw value of the row)
+    flag: np.ndarray    # (N,) int8 code into FLAGS; only set on rows that are not rejected
+
+    def __len__(self) -> int:
+        return len(self.reason)
+
+    @property
+    def rejected(self) -> np.ndarray:
+        """(N,) bool mask of rows outside their bounds."""
+        return self.reason != OK
+
+    @property
+    def any_rejected(self) -> bool:
+        return bool(self.reason.any())
+
+    @property
+    def flagged(self) -> np.ndarray:
+        """(N,) bool mask of plausible rows outside the normal range."""
+        return self.flag != NORMAL
+
+    @property
+    def any_flagged(self) -> bool:
+        return bool(self.flag.any())
+
+    def counts(self) -> Dict[str, int]:
+        """Number of rejected rows per reason."""
+        counts = np.bincount(self.reason, minlength=len(REASONS))
+        return {REASONS[r]: int(c) for r, c in enumerate(counts) if r != OK and c}
+
+    def rejections(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, object]]:
+        """Rejected rows (optionally among ``rows``) as dicts for alerts and logs."""
+        index = np.flatnonzero(self.reason) if rows is None else np.asarray(rows)
+        return [
+            {
+                "row": int(i),
+                "metric": METRICS[self.metric[i]],
+                "value": float(self.value[i]),
+                "reason": REASONS[self.reason[i]],
+            }
+            for i in index
+            if self.reason[i] != OK
+        ]
+
+    def alerts(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, object]]:
+        """Rejected and flagged rows (optionally among ``rows``), in row order."""
+        index = np.flatnonzero(self.reason | self.flag) if rows is None else np.asarray(rows)
+        return [
+            {
+                "row": int(i),
+                "metric": METRICS[self.metric[i]],
+                "value": float(self.value[i]),
+                "reason": REASONS[self.reason[i]] if self.reason[i] else FLAGS[self.flag[i]],
+            }
+            for i in index
+            if self.reason[i] or self.flag[i]
+        ]
+
+class GuardrailEngine:
+    """
+    Vectorized biological bounds checks.
+
+    Example:
+        guardrails = GuardrailEngine()
+        result = guardrails.check(batch, breed="french bulldog")
+        batch = batch.take(~result.rejected)  # Flagged rows stay
+
+    Args:
+        bounds: Per-species ``{metric: (min, max)}`` plausibility bounds;
+            defaults to ``PLAUSIBLE_BOUNDS``.
+        normal: Per-species ``{metric: (min, max)}`` normal ranges; defaults
+            to the audited table.
+        resting_margin: Multipliers applied to ``typical_resting_hr/rr`` for
+            species without plausibility bounds for heart or respiration rate.
+    """
+
+    def __init__(
+        self,
+        bounds: Optional[Mapping[str, Mapping[str, Tuple[float, float]]]] = None,
+        normal: Optional[Mapping[str, Mapping[str, Tuple[float, float]]]] = None,
+        resting_margin: Tuple[float, float] = (0.25, 4.0),
+    ):
+        self.bounds = PLAUSIBLE_BOUNDS if bounds is None else bounds
+        self.normal = AUDITED_NORMAL if normal is None else normal
+        self.resting_margin = resting_margin
+        self.low, self.high = self._compile(self.bounds, resting_margin)
+        self._bounds = np.stack([self.low, self.high], axis=-1)  # One gather per check
+        self._tables: Dict[Optional[str], np.ndarray] = {}  # Bounds and normal ranges by breed
+
+    @staticmethod
+    def _compile(
+        table: Mapping[str, Mapping[str, Tuple[float, float]]],
+        margin: Tuple[float, float],
+        breed: Optional[str] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (species, metric) min and max arrays; unbounded entries are -inf / +inf.
+
+        Listed ranges are widened to cover a breed group's typical resting
+        range. A trailing unbounded column serves metric code -1 (unchecked rows).
+        """
+        shape = (len(SPECIES), len(METRICS) + 1)
+        low = np.full(shape, -np.inf)
+        high = np.full(shape, np.inf)
+        lo_margin, hi_margin = margin
+        for s, species in enumerate(SPECIES):
+            config = get_species_config(species.value, breed)
+            resting = {
+                "heart_rate": config.typical_resting_hr,
+                "respiration_rate": config.typical_resting_rr,
+            }
+            for metric, (lo, hi) in resting.items():
+                low[s, METRIC_INDEX[metric]] = lo * lo_margin
+                high[s, METRIC_INDEX[metric]] = hi * hi_margin
+            for metric, (lo, hi) in table.get(species.value, {}).items():
+                if metric not in METRIC_INDEX:
+                    raise ValueError(f"Unknown guardrail metric '{metric}'")
+                if lo > hi:
+                    raise ValueError(f"{species.value} {metric}: min {lo} > max {hi}")
+                m = METRIC_INDEX[metric]
+                if config.breed_group is not None and metric in resting:
+                    lo, hi = min(lo, resting[metric][0]), max(hi, resting[metric][1])
+                low[s, m], high[s, m] = lo, hi
+        return low, high
+
+    def _table(self, breed: Optional[str]) -> np.ndarray:
+        """
+        (species, metric, 4) plausibility min and max, then normal min and
+        max, for a breed; compiled on first use.
+        """
+        table = self._tables.get(breed)
+        if table is None:
+            if len(self._tables) >= 256:  # Breeds are caller strings; keep the cache bounded
+                self._tables.clear()
+            low, high = self._compile(self.normal, (1.0, 1.0), breed)
+            table = self._tables[breed] = np.stack([self.low, self.high, low, high], axis=-1)
+        return table
+
+    def _rows(
+        self,
+        species: np.ndarray,
+        metric: np.ndarray,
+        breed: Union[Optional[str], Sequence[Optional[str]]],
+    ) -> np.ndarray:
+        """(N, 4) ranges of each row, gathered from one table per distinct breed."""
+        if breed is None or isinstance(breed, str):
+            return self._table(breed)[species, metric]
+        if len(breed) != len(species):
+            raise ValueError(f"expected {len(species)} breeds, got {len(breed)}")
+        codes: Dict[Optional[str], int] = {}
+        inverse = np.array([codes.setdefault(b, len(codes)) for b in breed], dtype=np.intp)
+        if len(codes) == 1:
+            return self._table(next(iter(codes)))[species, metric]
+        table = np.empty((len(species), 4))
+        for b, code in codes.items():
+            rows = inverse == code
+            table[rows] = self._table(b)[species[rows], metric[rows]]
+        return table
+
+    def bounds_for(self, species: str, metric: str) -> Tuple[float, float]:
+        """Compiled plausibility (min, max) of one species and metric."""
+        s = [sp.value for sp in SPECIES].index(species.lower())
+        m = METRIC_INDEX[metric]
+        return float(self.low[s, m]), float(self.high[s, m])
+
+    def normal_for(
+        self, species: str, metric: str, breed: Optional[str] = None
+    ) -> Tuple[float, float]:
+        """Compiled normal (min, max) of one species (and breed) and metric."""
+        s = [sp.value for sp in SPECIES].index(species.lower())
+        low, high = self._table(breed)[s, METRIC_INDEX[metric], 2:]
+        return float(low), float(high)
+
+    def check_values(
+        self, species: np.ndarray, metric: np.ndarray, values: np.ndarray
+    ) -> np.ndarray:
+        """
+        Reason codes for parallel arrays of species codes, metric codes and values.
+
+        Rows with metric code -1 are not checked. Infinite values fail
+        their bound; NaN fails as ``not_finite``.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        bounds = self._bounds[species, metric]
+        reason = (values < bounds[:, 0]).view(np.int8)  # BELOW_MIN == 1
+        reason[values > bounds[:, 1]] = ABOVE_MAX
+        nan = np.isnan(values)
+        if nan.any():
+            reason[nan & (metric >= 0)] = NOT_FINITE
+        return reason
+
+    def check(
+        self,
+        batch: BioSignalBatch,
+        breed: Union[Optional[str], Sequence[Optional[str]]] = None,
+    ) -> GuardrailResult:
+        """
+        Check every row of a batch in one pass; ``breed`` selects the normal ranges.
+
+        ``breed`` is one breed for the whole batch, or one per row for a
+        batch that mixes patients.
+        """
+        metric = metric_codes(batch)
+        values = batch.raw_value
+        table = self._rows(batch.species, metric, breed)
+        reason = (values < table[:, 0]).view(np.int8)  # BELOW_MIN == 1
+        reason[values > table[:, 1]] = ABOVE_MAX
+        flag = (values < table[:, 2]).view(np.int8)  # BELOW_NORMAL == 1
+        flag[values > table[:, 3]] = ABOVE_NORMAL
+        nan = np.isnan(values)
+        if nan.any():
+            reason[nan & (metric >= 0)] = NOT_FINITE
+        if reason.any():
+            flag[reason != OK] = NORMAL
+        return GuardrailResult(reason=reason, metric=metric, value=values, flag=flag)
+
+    def filter(
+        self,
+        batch: BioSignalBatch,
+        breed: Union[Optional[str], Sequence[Optional[str]]] = None,
+    ) -> Tuple[BioSignalBatch, GuardrailResult]:
+        """The batch without rejected rows (flagged rows stay), and the check result."""
+        result = self.check(batch, breed)
+        if not result.any_rejected:
+            return batch, result
+        return batch.take(~result.rejected), result
+
+def metric_codes(batch: BioSignalBatch) -> np.ndarray:
+    """(N,) metric code of each row from its metadata, -1 where there is none."""
+    # One lookup per distinct metadata dict; the trailing -1 serves metadata_index == -1
+    table = [METRIC_INDEX.get(m.get("metric"), -1) for m in batch.metadata]
+    table.append(-1)
+    return np.array(table, dtype=np.int8)[batch.metadata_index]
@@ -3,12 +3,20 @@ Core schemas for the Doolittle ecosystem.
 
 These types are shared across all packages to ensure consistent
 data structures throughout the pipeline.
+
+The enums are defined here. The pydantic models (``BioSignal``,
+``PainAssessment``) live in ``schema_models`` and are imported on first
+access (PEP 562), so importing ``schema`` for the enums does not import
+pydantic.
 """
 
 from enum import Enum
-from typing import Dict, List, Optional, Any
-from pydantic import BaseModel, Field
-from datetime import datetime
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from schema_models import BioSignal, PainAssessment
+
+_MODELS = ("BioSignal", "PainAssessment")
 
 class Species(str, Enum):
     """Supported species for analysis."""
@@ -33,31 +41,6 @@ class SignalModality(str, Enum):
     AUDIO = "audio"
     MULTIMODAL = "multimodal"
 
-class BioSignal(BaseModel):
-    """
-    Universal biological signal container.
-
-    All primitives emit BioSignals that can be fused by the triage engine.
-    """
-    source: SignalSource
-    species: Species
-    raw_value: float | str | Dict[str, Any]
-    normalized_value: float = Field(ge=0.0, le=1.0)
-    confidence: float = Field(ge=0.0, le=1.0)
-    timestamp: float
-    metadata: Dict[str, Any] = {}
-
-    class Config:
-        frozen = True
-
-class PainAssessment(BaseModel):
-    """Pain assessment result from any primitive or fusion."""
-    pain_probability: float = Field(ge=0.0, le=1.0)
-    confidence: float = Field(ge=0.0, le=1.0)
-    sources: List[SignalSource]
-    modality: SignalModality
-    timestamp: float
-
 class TriageLevel(str, Enum):
     """Clinical triage urgency levels."""
     ROUTINE = "routine"
@@ -65,3 +48,15 @@ class TriageLevel(str, Enum):
     MODERATE = "moderate"
     URGENT = "urgent"
     EMERGENCY = "emergency"
+
+def __getattr__(name: str) -> Any:
+    if name in _MODELS:
+        import schema_models
+
+        value = getattr(schema_models, name)
+        globals()[name] = value  # Later lookups skip this hook
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_MODELS))
@@ -0,0 +1,39 @@
+"""
+Pydantic models of the core schemas.
+
+Import these through ``schema``, which defines them on first access so
+that modules needing only the enums do not import pydantic. Validators
+are built on first validation (``defer_build``), not at import.
+"""
+
+from typing import Any, Dict, List
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from schema import SignalModality, SignalSource, Species
+
+class BioSignal(BaseModel):
+    """
+    Universal biological signal container.
+
+    All primitives emit BioSignals that can be fused by the triage engine.
+    """
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
+    source: SignalSource
+    species: Species
+    raw_value: float | str | Dict[str, Any]
+    normalized_value: float = Field(ge=0.0, le=1.0)
+    confidence: float = Field(ge=0.0, le=1.0)
+    timestamp: float
+    metadata: Dict[str, Any] = {}
+
+class PainAssessment(BaseModel):
+    """Pain assessment result from any primitive or fusion."""
+    model_config = ConfigDict(defer_build=True)
+
+    pain_probability: float = Field(ge=0.0, le=1.0)
+    confidence: float = Field(ge=0.0, le=1.0)
+    sources: List[SignalSource]
+    modality: SignalModality
+    timestamp: float
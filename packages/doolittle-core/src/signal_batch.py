@@ -0,0 +1,300 @@
+"""
+Columnar container for many BioSignals.
+
+A BioSignalBatch holds one NumPy column per scalar BioSignal field.
+Sources and species are small integer codes into ``SOURCES`` and
+``SPECIES``. Non-numeric raw values and metadata dicts live in side
+tables that rows reference by index. Rows that share a metadata dict
+(every signal from one primitive, typically) store it once.
+
+Columns are validated once on construction, so ``to_signals`` builds
+BioSignals without re-validating each object.
+"""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from schema import SignalSource, Species
+
+if TYPE_CHECKING:
+    from schema import BioSignal
+
+SOURCES: Tuple[SignalSource, ...] = tuple(SignalSource)
+SOURCE_INDEX: Dict[SignalSource, int] = {s: i for i, s in enumerate(SOURCES)}
+SPECIES: Tuple[Species, ...] = tuple(Species)
+SPECIES_INDEX: Dict[Species, int] = {s: i for i, s in enumerate(SPECIES)}
+
+CodeLike = Union[int, str, SignalSource, Species, Sequence, np.ndarray]
+
+def species_code(species: Union[str, Species]) -> int:
+    """Code for a species key; unknown keys map to UNKNOWN."""
+    try:
+        return SPECIES_INDEX[Species(species.lower() if isinstance(species, str) else species)]
+    except ValueError:
+        return SPECIES_INDEX[Species.UNKNOWN]
+
+def _codes(values: CodeLike, enum: type, index: Dict, n: int, name: str) -> np.ndarray:
+    """Broadcast an enum value or code, a code array or a sequence of enum values to codes."""
+    if isinstance(values, (str, enum)):
+        values = index[enum(values)]
+    if isinstance(values, (int, np.integer)):
+        return np.full(n, values, dtype=np.int8)
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        codes = values.astype(np.int8)
+    else:
+        codes = np.fromiter((index[enum(v)] for v in values), np.int8, len(values))
+    if codes.shape != (n,):
+        raise ValueError(f"{name} must have length {n}, got shape {codes.shape}")
+    return codes
+
+def _column(values: Any, n: int, name: str) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 0:
+        return np.full(n, float(values))
+    if values.shape != (n,):
+        raise ValueError(f"{name} must have length {n}, got shape {values.shape}")
+    return values
+
+@dataclass
+class BioSignalBatch:
+    """
+    N BioSignals as columns.
+
+    Row ``i`` has raw value ``raw_value[i]`` when ``raw_index[i] == -1``
+    and ``raw_objects[raw_index[i]]`` otherwise, and metadata
+    ``metadata[metadata_index[i]]`` (``{}`` when the index is -1).
+    """
+    source: np.ndarray            # (N,) int8 code into SOURCES
+    species: np.ndarray           # (N,) int8 code into SPECIES
+    normalized_value: np.ndarray  # (N,) float64 in [0, 1]
+    confidence: np.ndarray        # (N,) float64 in [0, 1]
+    timestamp: np.ndarray         # (N,) float64
+    raw_value: np.ndarray         # (N,) float64, NaN where raw_index >= 0
+    raw_index: np.ndarray         # (N,) int32 into raw_objects, -1 for numeric raw values
+    metadata_index: np.ndarray    # (N,) int32 into metadata, -1 for no metadata
+    raw_objects: List[Any] = field(default_factory=list)
+    metadata: List[Dict[str, Any]] = field(default_factory=list)
+
+    def __post_init__(self):
+        self.validate()
+
+    @classmethod
+    def _unchecked(cls, **columns: Any) -> "BioSignalBatch":
+        """A batch of columns taken from validated batches, which need no second check."""
+        batch = cls.__new__(cls)
+        batch.__dict__.update(columns)
+        return batch
+
+    def validate(self) -> None:
+        """Check every column at once; raises ValueError on the first problem."""
+        n = len(self.source)
+        for name in ("species", "normalized_value", "confidence", "timestamp",
+                     "raw_value", "raw_index", "metadata_index"):
+            if getattr(self, name).shape != (n,):
+                raise ValueError(f"{name} must have shape ({n},), got {getattr(self, name).shape}")
+        if n == 0:
+            return
+        if self.source.min() < 0 or self.source.max() >= len(SOURCES):
+            raise ValueError("source codes out of range")
+        if self.species.min() < 0 or self.species.max() >= len(SPECIES):
+            raise ValueError("species codes out of range")
+        for name in ("normalized_value", "confidence"):
+            column = getattr(self, name)
+            if not np.all((column >= 0.0) & (column <= 1.0)):
+                raise ValueError(f"{name} must be within [0, 1]")
+        if self.raw_index.max() >= len(self.raw_objects) or self.raw_index.min() < -1:
+            raise ValueError("raw_index out of range")
+        if self.metadata_index.max() >= len(self.metadata) or self.metadata_index.min() < -1:
+            raise ValueError("metadata_index out of range")
+
+    @classmethod
+    def from_columns(
+        cls,
+        source: CodeLike,
+        species: CodeLike,
+        normalized_value: Any,
+        confidence: Any,
+        timestamp: Any,
+        raw_value: Optional[Any] = None,
+        metadata: Optional[Union[Dict[str, Any], Sequence[Dict[str, Any]]]] = None,
+    ) -> "BioSignalBatch":
+        """
+        Build a batch from columns, broadcasting scalars.
+
+        Args:
+            source: One SignalSource for every row, or one per row (enums or codes).
+            species: One Species for every row, or one per row (enums or codes).
+            normalized_value: (N,) values in [0, 1].
+            confidence: (N,) confidences in [0, 1]; scalars broadcast.
+            timestamp: (N,) timestamps; scalars broadcast.
+            raw_value: (N,) numbers, or a sequence of per-row raw values
+                (numbers, strings or dicts). Defaults to ``normalized_value``.
+            metadata: One dict shared by every row, or one dict per row.
+        """
+        normalized_value = np.atleast_1d(np.asarray(normalized_value, dtype=np.float64))
+        n = len(normalized_value)
+
+        if raw_value is None:
+            raw, raw_index, raw_objects = normalized_value.copy(), np.full(n, -1, np.int32), []
+        else:
+            raw, raw_index, raw_objects = _split_raw(raw_value, n)
+
+        if metadata is None:
+            metadata_index, tables = np.full(n, -1, np.int32), []
+        elif isinstance(metadata, dict):
+            metadata_index = np.full(n, 0 if metadata else -1, np.int32)
+            tables = [metadata] if metadata else []
+        else:
+            if len(metadata) != n:
+                raise ValueError(f"metadata must have length {n}, got {len(metadata)}")
+            metadata_index, tables = _intern(metadata)
+
+        return cls(
+            source=_codes(source, SignalSource, SOURCE_INDEX, n, "source"),
+            species=_codes(species, Species, SPECIES_INDEX, n, "species"),
+            normalized_value=normalized_value,
+            confidence=_column(confidence, n, "confidence"),
+            timestamp=_column(timestamp, n, "timestamp"),
+            raw_value=raw,
+            raw_index=raw_index,
+            metadata_index=metadata_index,
+            raw_objects=raw_objects,
+            metadata=tables,
+        )
+
+    @classmethod
+    def from_signals(cls, signals: Sequence["BioSignal"]) -> "BioSignalBatch":
+        """Pack BioSignals into columns."""
+        n = len(signals)
+        metadata_index, tables = _intern([s.metadata for s in signals])
+        raw, raw_index, raw_objects = _split_raw([s.raw_value for s in signals], n)
+        return cls(
+            source=np.fromiter((SOURCE_INDEX[s.source] for s in signals), np.int8, n),
+            species=np.fromiter((SPECIES_INDEX[s.species] for s in signals), np.int8, n),
+            normalized_value=np.fromiter((s.normalized_value for s in signals), np.float64, n),
+            confidence=np.fromiter((s.confidence for s in signals), np.float64, n),
+            timestamp=np.fromiter((s.timestamp for s in signals), np.float64, n),
+            raw_value=raw,
+            raw_index=raw_index,
+            metadata_index=metadata_index,
+            raw_objects=raw_objects,
+            metadata=tables,
+        )
+
+    @classmethod
+    def concat(cls, batches: Sequence["BioSignalBatch"]) -> "BioSignalBatch":
+        """Concatenate batches, shifting side-table indices."""
+        if len(batches) == 1:
+            return batches[0]
+        raw_objects: List[Any] = []
+        metadata: List[Dict[str, Any]] = []
+        raw_index, metadata_index = [], []
+        for b in batches:
+            raw_index.append(np.where(b.raw_index >= 0, b.raw_index + len(raw_objects), -1))
+            shifted = b.metadata_index + len(metadata)
+            metadata_index.append(np.where(b.metadata_index >= 0, shifted, -1))
+            raw_objects.extend(b.raw_objects)
+            metadata.extend(b.metadata)
+
+        def join(name: str, dtype) -> np.ndarray:
+            return np.concatenate([getattr(b, name) for b in batches] or [np.empty(0, dtype)])
+
+        return cls._unchecked(
+            source=join("source", np.int8),
+            species=join("species", np.int8),
+            normalized_value=join("normalized_value", np.float64),
+            confidence=join("confidence", np.float64),
+            timestamp=join("timestamp", np.float64),
+            raw_value=join("raw_value", np.float64),
+            raw_index=np.concatenate(raw_index or [np.empty(0, np.int32)]).astype(np.int32),
+            metadata_index=np.concatenate(
+                metadata_index or [np.empty(0, np.int32)]
+            ).astype(np.int32),
+            raw_objects=raw_objects,
+            metadata=metadata,
+        )
+
+    def __len__(self) -> int:
+        return len(self.source)
+
+    def __getitem__(
+        self, index: Union[int, slice, np.ndarray]
+    ) -> Union["BioSignal", "BioSignalBatch"]:
+        """An int gives one BioSignal; a slice or index array gives a sub-batch."""
+        if isinstance(index, (int, np.integer)):
+            return self._signal(int(index))
+        return self.take(index)
+
+    def take(self, index: Union[slice, np.ndarray]) -> "BioSignalBatch":
+        """Rows ``index`` as a new batch; side tables are shared, not copied."""
+        return BioSignalBatch._unchecked(
+            source=self.source[index],
+            species=self.species[index],
+            normalized_value=self.normalized_value[index],
+            confidence=self.confidence[index],
+            timestamp=self.timestamp[index],
+            raw_value=self.raw_value[index],
+            raw_index=self.raw_index[index],
+            metadata_index=self.metadata_index[index],
+            raw_objects=self.raw_objects,
+            metadata=self.metadata,
+        )
+
+    def to_signals(self) -> List["BioSignal"]:
+        """Unpack into BioSignals (columns are already validated)."""
+        return [self._signal(i) for i in range(len(self))]
+
+    def _signal(self, i: int) -> "BioSignal":
+        from schema import BioSignal
+
+        r, m = self.raw_index[i], self.metadata_index[i]
+        return BioSignal.model_construct(
+            source=SOURCES[self.source[i]],
+            species=SPECIES[self.species[i]],
+            raw_value=float(self.raw_value[i]) if r < 0 else self.raw_objects[r],
+            normalized_value=float(self.normalized_value[i]),
+            confidence=float(self.confidence[i]),
+            timestamp=float(self.timestamp[i]),
+            metadata=dict(self.metadata[m]) if m >= 0 else {},
+        )
+
+def _split_raw(values: Any, n: int) -> Tuple[np.ndarray, np.ndarray, List[Any]]:
+    """Numeric raw values go to a float column, anything else to the side table."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in "fiub":
+        if values.shape != (n,):
+            raise ValueError(f"raw_value must have length {n}, got shape {values.shape}")
+        return values.astype(np.float64), np.full(n, -1, np.int32), []
+    if len(values) != n:
+        raise ValueError(f"raw_value must have length {n}, got {len(values)}")
+    raw = np.full(n, np.nan)
+    raw_index = np.full(n, -1, np.int32)
+    objects: List[Any] = []
+    for i, v in enumerate(values):
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            raw[i] = v
+        else:
+            raw_index[i] = len(objects)
+            objects.append(v)
+    return raw, raw_index, objects
+
+def _intern(metadata: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, List[Dict[str, Any]]]:
+    """Index rows into a table of distinct metadata dicts (by identity, then by value)."""
+    index = np.full(len(metadata), -1, np.int32)
+    tables: List[Dict[str, Any]] = []
+    seen: Dict[int, int] = {}
+    for i, m in enumerate(metadata):
+        if not m:
+            continue
+        j = seen.get(id(m))
+        if j is None:
+            # Consecutive rows from one primitive often carry equal dicts
+            if tables and tables[-1] == m:
+                j = len(tables) - 1
+            else:
+                j = len(tables)
+                tables.append(m)
+            seen[id(m)] = j
+        index[i] = j
+    return index, tables
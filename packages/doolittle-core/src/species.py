@@ -1,11 +1,28 @@
 """
 Species-specific configurations and parameters.
+
+Configurations come from JSON config packs in ``species_packs/``, which
+are read on first lookup. A pack entry describes one species and may
+define breed groups (e.g. brachycephalic dogs) that override some of its
+fields for the listed breeds. Further packs can be added at runtime with
+``REGISTRY.load_pack``; later entries replace earlier ones. Each such
+change bumps ``REGISTRY.version``, so tables derived from the configs
+(the fusion engine's, say) can tell when to rebuild.
+
+Configs are immutable and interned, so equal configs are one object.
+Lookups are cached under the exact key the caller passed, which makes a
+repeated ``get_species_config(species, breed)`` two dict hits with no
+allocation.
 """
 
-from dataclasses import dataclass
-from typing import Dict, Tuple
+from dataclasses import dataclass, fields, replace
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
-@dataclass
+PACK_DIR = Path(__file__).parent / "species_packs"
+
+@dataclass(frozen=True, slots=True)
 class SpeciesConfig:
     """Configuration for a specific species."""
     name: str
@@ -15,45 +32,201 @@ class SpeciesConfig:
     gcps_supported: bool  # Glasgow Composite Pain Scale
     typical_resting_rr: Tuple[int, int]  # Respiration rate range
     typical_resting_hr: Tuple[int, int]  # Heart rate range
+    breed_group: Optional[str] = None  # Breed group whose overrides apply
+
+_FIELDS = {f.name for f in fields(SpeciesConfig)}
+_PAIR_FIELDS = ("vocal_freq_range", "typical_resting_rr", "typical_resting_hr")
 
-SPECIES_CONFIGS: Dict[str, SpeciesConfig] = {
-    "cat": SpeciesConfig(
-        name="Felis catus",
-        pain_hiding_factor=0.6,
-        vocal_freq_range=(50, 10000),
-        grimace_supported=True,
-        gcps_supported=False,
-        typical_resting_rr=(20, 30),
-        typical_resting_hr=(120, 140),
-    ),
-    "dog": SpeciesConfig(
-        name="Canis familiaris",
-        pain_hiding_factor=0.2,
-        vocal_freq_range=(40, 8000),
-        grimace_supported=False,
-        gcps_supported=True,
-        typical_resting_rr=(10, 30),
-        typical_resting_hr=(60, 140),
-    ),
-    "rabbit": SpeciesConfig(
-        name="Oryctolagus cuniculus",
-        pain_hiding_factor=0.8,
-        vocal_freq_range=(100, 16000),
-        grimace_supported=True,
-        gcps_supported=False,
-        typical_resting_rr=(30, 60),
-        typical_resting_hr=(130, 325),
-    ),
+# Defaults for species no pack describes
+_FALLBACK = {
+    "pain_hiding_factor": 0.5,
+    "vocal_freq_range": (50, 8000),
+    "grimace_supported": False,
+    "gcps_supported": False,
+    "typical_resting_rr": (15, 40),
+    "typical_resting_hr": (60, 180),
 }
 
-def get_species_config(species: str) -> SpeciesConfig:
-    """Get configuration for a species, with fallback defaults."""
-    return SPECIES_CONFIGS.get(species.lower(), SpeciesConfig(
-        name=species,
-        pain_hiding_factor=0.5,
-        vocal_freq_range=(50, 8000),
-        grimace_supported=False,
-        gcps_supported=False,
-        typical_resting_rr=(15, 40),
-        typical_resting_hr=(60, 180),
-    ))
+def _normalize(key: str) -> str:
+    return key.strip().lower().replace("-", "_").replace(" ", "_")
+
+def _fields_from_json(entry: Mapping[str, Any]) -> Dict[str, Any]:
+    values = {k: v for k, v in entry.items() if k in _FIELDS}
+    for name in _PAIR_FIELDS:
+        if name in values:
+            values[name] = tuple(values[name])
+    return values
+
+class SpeciesRegistry:
+    """
+    Species and breed configurations with cached O(1) lookup.
+
+    Example:
+        registry = SpeciesRegistry()
+        registry.get("dog", "French Bulldog").typical_resting_rr  # (15, 40)
+
+    Args:
+        packs: Pack files to load on first use; defaults to every
+            ``*.json`` in ``species_packs/``.
+        max_cached_keys: Bound on cached raw species and breed spellings,
+            so arbitrary caller strings cannot grow the caches without limit.
+    """
+
+    def __init__(self, packs: Optional[Sequence[Path]] = None, max_cached_keys: int = 1024):
+        self._packs = packs
+        self.max_cached_keys = max_cached_keys
+        self._loaded = False
+        self.version = 0  # Bumped whenever configs are added or replaced after loading
+        self._species: Dict[str, SpeciesConfig] = {}
+        self._breeds: Dict[str, Dict[str, SpeciesConfig]] = {}
+        self._fallbacks: Dict[str, SpeciesConfig] = {}
+        self._interned: Dict[SpeciesConfig, SpeciesConfig] = {}
+        # Raw species key -> {None: species config, raw or normalized breed: config}
+        self._lookup: Dict[str, Dict[Optional[str], SpeciesConfig]] = {}
+
+    def get(self, species: str, breed: Optional[str] = None) -> SpeciesConfig:
+        """
+        Configuration of a species, or of one of its breeds.
+
+        Unknown species get a cached fallback config; unknown breeds get
+        the species config.
+        """
+        table = self._lookup.get(species)
+        if table is not None:
+            config = table.get(breed)
+            if config is not None:
+                return config
+        return self._resolve(species, breed)
+
+    def species(self) -> List[str]:
+        """Names of the species the loaded packs describe."""
+        self._load()
+        return list(self._species)
+
+    def breeds(self, species: str) -> List[str]:
+        """Breeds with overrides for a species."""
+        self._load()
+        return list(self._breeds.get(_normalize(species), {}))
+
+    def register(
+        self,
+        species: str,
+        config: SpeciesConfig,
+        breeds: Optional[Mapping[str, SpeciesConfig]] = None,
+    ) -> None:
+        """
+        Add or replace a species and, optionally, configs for its breeds.
+
+        Breeds the species already has keep their overrides (the fields
+        where they differ from the replaced config), applied to the new
+        one. ``breeds`` adds configs or replaces them as given.
+        """
+        self._load()
+        key = _normalize(species)
+        old = self._species.get(key)
+        new = self._species[key] = self._intern(config)
+        self._fallbacks.pop(key, None)
+        if old is not None and self._breeds.get(key):
+            self._breeds[key] = {
+                breed: self._rebase(breed_config, old, new)
+                for breed, breed_config in self._breeds[key].items()
+            }
+        if breeds:
+            table = self._breeds.setdefault(key, {})
+            for breed, breed_config in breeds.items():
+                table[_normalize(breed)] = self._intern(breed_config)
+        self._lookup.clear()
+        self.version += 1
+
+    def load_pack(self, path: Union[str, Path]) -> None:
+        """Load a JSON config pack; its entries replace existing ones."""
+        self._load()
+        self._read_pack(Path(path))
+        self._lookup.clear()
+        self.version += 1
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        packs = self._packs if self._packs is not None else sorted(PACK_DIR.glob("*.json"))
+        for path in packs:
+            self._read_pack(Path(path))
+
+    def _read_pack(self, path: Path) -> None:
+        with open(path, encoding="utf-8") as f:
+            pack = json.load(f)
+        for key, entry in pack.get("species", {}).items():
+            key = _normalize(key)
+            values = _fields_from_json(entry)
+            missing = _FIELDS - values.keys() - {"breed_group"}
+            if missing:
+                raise ValueError(f"{path.name}: species '{key}' is missing {sorted(missing)}")
+            base = self._species[key] = self._intern(SpeciesConfig(**values))
+            self._fallbacks.pop(key, None)
+            table = self._breeds[key] = {}
+            for group, overrides in entry.get("breed_groups", {}).items():
+                config = self._intern(
+                    replace(base, breed_group=group, **_fields_from_json(overrides))
+                )
+                for breed in overrides.get("breeds", ()):
+                    table[_normalize(breed)] = config
+
+    def _resolve(self, species: str, breed: Optional[str]) -> SpeciesConfig:
+        """Slow path: normalize the keys and cache the result under the raw ones."""
+        self._load()
+        key = _normalize(species)
+        base = self._species.get(key) or self._fallbacks.get(key)
+        if base is None:
+            # Built once per unknown species, not on every miss
+            if len(self._fallbacks) >= self.max_cached_keys:
+                self._fallbacks.clear()
+            base = self._fallbacks[key] = SpeciesConfig(name=key, **_FALLBACK)
+        config = base
+        if breed is not None:
+            config = self._breeds.get(key, {}).get(_normalize(breed), base)
+
+        if len(self._lookup) >= self.max_cached_keys:
+            self._lookup.clear()
+        table = self._lookup.setdefault(species, {None: base})
+        if len(table) < self.max_cached_keys:
+            table[breed] = config
+        return config
+
+    def _rebase(
+        self, config: SpeciesConfig, old: SpeciesConfig, new: SpeciesConfig
+    ) -> SpeciesConfig:
+        """A breed's overrides of species config ``old``, applied to ``new``."""
+        overrides = {
+            name: getattr(config, name)
+            for name in _FIELDS
+            if getattr(config, name) != getattr(old, name)
+        }
+        return self._intern(replace(new, **overrides))
+
+    def _intern(self, config: SpeciesConfig) -> SpeciesConfig:
+        return self._interned.setdefault(config, config)
+
+class _SpeciesView(Mapping):
+    """Read-only ``{species: SpeciesConfig}`` view of a registry."""
+
+    def __init__(self, registry: SpeciesRegistry):
+        self._registry = registry
+
+    def __getitem__(self, species: str) -> SpeciesConfig:
+        self._registry._load()
+        return self._registry._species[species]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._registry.species())
+
+    def __len__(self) -> int:
+        return len(self._registry.species())
+
+REGISTRY = SpeciesRegistry()
+
+SPECIES_CONFIGS: Mapping[str, SpeciesConfig] = _SpeciesView(REGISTRY)
+
+def get_species_config(species: str, breed: Optional[str] = None) -> SpeciesConfig:
+    """Get configuration for a species (and breed), with fallback defaults."""
+    return REGISTRY.get(species, breed)
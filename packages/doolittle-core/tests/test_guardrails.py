@@ -0,0 +1,67 @@
+"""
+Guardrail plausibility bounds, normal-range flags and breed ranges.
+"""
+
+import numpy as np
+import pytest
+
+from guardrails import GuardrailEngine
+from schema import SignalSource
+from signal_batch import BioSignalBatch
+
+def _vitals(species, metric, values):
+    values = np.asarray(values, dtype=np.float64)
+    return BioSignalBatch.from_columns(
+        source=SignalSource.VISION_VITALS,
+        species=species,
+        normalized_value=np.zeros(len(values)),
+        confidence=0.9,
+        timestamp=0.0,
+        raw_value=values,
+        metadata={"metric": metric, "unit": "bpm"},
+    )
+
+def test_abnormal_vitals_are_flagged_not_rejected():
+    guardrails = GuardrailEngine()
+    for species, rr in (("cat", 55.0), ("horse", 30.0)):
+        result = guardrails.check(_vitals(species, "respiration_rate", [rr]))
+        assert not result.any_rejected
+        assert [a["reason"] for a in result.alerts()] == ["above_normal"]
+
+def test_implausible_vitals_are_rejected():
+    guardrails = GuardrailEngine()
+    result = guardrails.check(_vitals("cat", "respiration_rate", [1.0, 25.0, 400.0, np.nan]))
+    assert result.rejected.tolist() == [True, False, True, True]
+    assert [a["reason"] for a in result.alerts()] == ["below_min", "above_max", "not_finite"]
+    assert not result.any_flagged
+    batch, _ = guardrails.filter(_vitals("horse", "heart_rate", [36.0, 90.0, 400.0]))
+    assert batch.raw_value.tolist() == [36.0, 90.0]
+
+def test_breed_widens_normal_range():
+    guardrails = GuardrailEngine()
+    batch = _vitals("dog", "respiration_rate", [38.0])
+    assert guardrails.check(batch).flag.tolist() == [2]
+    assert guardrails.check(batch, breed="French Bulldog").flag.tolist() == [0]
+    assert guardrails.normal_for("dog", "heart_rate", "greyhound") == (45.0, 180.0)
+    assert guardrails.normal_for("dog", "heart_rate") == (60.0, 180.0)
+
+def test_per_row_breeds():
+    guardrails = GuardrailEngine()
+    batch = BioSignalBatch.concat([
+        _vitals("dog", "respiration_rate", [38.0, 38.0, 38.0]),
+        _vitals("cat", "respiration_rate", [38.0]),
+    ])
+    breeds = ["pug", None, "greyhound", "persian"]
+    assert guardrails.check(batch, breeds).flag.tolist() == [0, 2, 2, 0]
+    default = guardrails.check(batch).flag.tolist()
+    assert guardrails.check(batch, [None] * 4).flag.tolist() == default
+    with pytest.raises(ValueError):
+        guardrails.check(batch, ["pug"])
+
+def test_unchecked_rows_pass():
+    batch = BioSignalBatch.from_columns(
+        source=SignalSource.VISION_GRIMACE, species="cat", normalized_value=[0.5],
+        confidence=1.0, timestamp=0.0, raw_value=np.array([1e9]),
+    )
+    result = GuardrailEngine().check(batch)
+    assert not result.any_rejected and not result.any_flagged
@@ -0,0 +1,61 @@
+"""
+Import-time budget for every module of every package.
+
+Each module is imported in a fresh interpreter after NumPy, which every
+package needs anyway. A module fails if its import takes longer than the
+budget, or if it imports pydantic (only ``schema_models`` may).
+
+The budget defaults to 100 ms; set ``DOOLITTLE_IMPORT_BUDGET_MS`` to
+adjust it for slow machines.
+"""
+
+import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+import pytest
+
+PACKAGES = Path(__file__).resolve().parents[2]
+SOURCES = sorted(PACKAGES.glob("*/src"))
+BUDGET_MS = float(os.environ.get("DOOLITTLE_IMPORT_BUDGET_MS", 100))
+HEAVY = {"schema_models": 1000.0}  # Modules that exist to hold the pydantic models
+ATTEMPTS = 3  # Best of, to ride out a busy machine
+
+PROBE = """
+import importlib, json, sys, time
+import numpy
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+print(json.dumps([(time.perf_counter() - start) * 1e3, "pydantic" in sys.modules]))
+"""
+
+def _modules():
+    for src in SOURCES:
+        for path in sorted(src.iterdir()):
+            if path.suffix == ".py" and path.stem != "__init__":
+                yield path.stem
+            elif (path / "__init__.py").is_file():
+                yield path.name
+
+def _import(module: str):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(str(s) for s in SOURCES))
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE, module],
+        env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+@pytest.mark.parametrize("module", list(_modules()))
+def test_import_budget(module):
+    budget = HEAVY.get(module, BUDGET_MS)
+    elapsed = float("inf")
+    for _ in range(ATTEMPTS):
+        ms, pydantic = _import(module)
+        elapsed = min(elapsed, ms)
+        if elapsed <= budget:
+            break
+    if module not in HEAVY:
+        assert not pydantic, f"importing {module} imports pydantic"
+    assert elapsed <= budget, f"importing {module} took {elapsed:.1f} ms (budget {budget:.0f} ms)"
@@ -0,0 +1,84 @@
+"""
+BioSignalBatch round trips, concatenation and row selection.
+"""
+
+import numpy as np
+import pytest
+
+from schema import BioSignal, SignalSource, Species
+from signal_batch import BioSignalBatch
+
+def _signals():
+    return [
+        BioSignal(
+            source=SignalSource.VISION_GRIMACE,
+            species=Species.CAT,
+            raw_value={"ears": 1.0},
+            normalized_value=0.6,
+            confidence=0.9,
+            timestamp=1.0,
+            metadata={"pain_detected": True},
+        ),
+        BioSignal(
+            source=SignalSource.VISION_VITALS,
+            species=Species.CAT,
+            raw_value=42.0,
+            normalized_value=0.3,
+            confidence=0.7,
+            timestamp=2.0,
+        ),
+        BioSignal(
+            source=SignalSource.AUDIO_VOCAL,
+            species=Species.DOG,
+            raw_value="whine",
+            normalized_value=0.8,
+            confidence=0.5,
+            timestamp=3.0,
+            metadata={"unit": "label"},
+        ),
+    ]
+
+def _dumps(signals):
+    return [s.model_dump() for s in signals]
+
+def test_round_trip():
+    signals = _signals()
+    batch = BioSignalBatch.from_signals(signals)
+    assert len(batch) == 3
+    assert batch.raw_objects == [{"ears": 1.0}, "whine"]
+    assert _dumps(batch.to_signals()) == _dumps(signals)
+    assert batch[1].raw_value == 42.0
+
+def test_from_columns_broadcasts_and_validates():
+    batch = BioSignalBatch.from_columns(
+        source=SignalSource.VISION_VITALS,
+        species=Species.HORSE,
+        normalized_value=[0.1, 0.2],
+        confidence=1.0,
+        timestamp=5.0,
+        metadata={"metric": "heart_rate"},
+    )
+    assert [s.metadata for s in batch.to_signals()] == [{"metric": "heart_rate"}] * 2
+    with pytest.raises(ValueError):
+        BioSignalBatch.from_columns(SignalSource.VISION_VITALS, Species.HORSE, [1.5], 1.0, 0.0)
+
+def test_concat_shifts_side_tables():
+    signals = _signals()
+    parts = [BioSignalBatch.from_signals(signals[:1]), BioSignalBatch.from_signals(signals[1:])]
+    batch = BioSignalBatch.concat(parts)
+    batch.validate()
+    assert _dumps(batch.to_signals()) == _dumps(signals)
+    assert batch.raw_index.dtype == np.int32 and batch.metadata_index.dtype == np.int32
+
+def test_concat_empty():
+    assert len(BioSignalBatch.concat([])) == 0
+
+def test_take_shares_side_tables():
+    signals = _signals()
+    batch = BioSignalBatch.from_signals(signals)
+    mask = np.array([True, False, True])
+    picked = batch.take(mask)
+    picked.validate()
+    assert picked.raw_objects is batch.raw_objects
+    assert _dumps(picked.to_signals()) == _dumps([signals[0], signals[2]])
+    assert _dumps(batch[1:].to_signals()) == _dumps(signals[1:])
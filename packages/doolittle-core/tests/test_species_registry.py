@@ -0,0 +1,93 @@
+"""
+SpeciesRegistry pack loading, breed lookup and runtime packs.
+"""
+
+from dataclasses import replace
+import json
+
+import pytest
+
+from species import PACK_DIR, REGISTRY, SpeciesConfig, SpeciesRegistry, get_species_config
+
+CORE = PACK_DIR / "core.json"
+
+def _write_pack(path, species):
+    path.write_text(json.dumps({"species": species}), encoding="utf-8")
+    return path
+
+FERRET = {
+    "name": "Mustela furo",
+    "pain_hiding_factor": 0.7,
+    "vocal_freq_range": [100, 9000],
+    "grimace_supported": False,
+    "gcps_supported": False,
+    "typical_resting_rr": [33, 36],
+    "typical_resting_hr": [180, 250],
+    "breed_groups": {"angora": {"breeds": ["Angora"], "typical_resting_rr": [30, 40]}},
+}
+
+def test_core_pack_is_loaded_lazily():
+    registry = SpeciesRegistry([CORE])
+    assert not registry._loaded
+    assert set(registry.species()) >= {"cat", "dog", "rabbit", "horse", "bird"}
+    cat = registry.get("cat")
+    assert cat.typical_resting_rr == (20, 30) and cat.breed_group is None
+
+def test_breed_lookup_normalizes_keys():
+    registry = SpeciesRegistry([CORE])
+    bulldog = registry.get("Dog", "French Bulldog")
+    assert bulldog.breed_group == "brachycephalic"
+    assert bulldog.typical_resting_rr == (15, 40)
+    assert bulldog.typical_resting_hr == registry.get("dog").typical_resting_hr
+    assert registry.get("dog", "french-bulldog") is bulldog  # Interned
+    assert registry.get("dog", "greyhound").typical_resting_hr == (45, 110)
+    assert "pug" in registry.breeds("dog")
+
+def test_unknown_species_and_breeds_fall_back():
+    registry = SpeciesRegistry([CORE])
+    assert registry.get("dog", "labrador") is registry.get("dog")
+    unknown = registry.get("axolotl")
+    assert unknown.name == "axolotl" and unknown.typical_resting_rr == (15, 40)
+    assert registry.get("axolotl") is unknown
+
+def test_load_pack_replaces_entries_and_bumps_version(tmp_path):
+    registry = SpeciesRegistry([CORE])
+    assert registry.get("ferret").name == "ferret"  # Fallback
+    version = registry.version
+    registry.load_pack(_write_pack(tmp_path / "ferret.json", {"ferret": FERRET}))
+    assert registry.version == version + 1
+    assert registry.get("ferret").name == "Mustela furo"
+    assert registry.get("ferret", "angora").typical_resting_rr == (30, 40)
+
+def test_register_bumps_version():
+    registry = SpeciesRegistry([CORE])
+    config = SpeciesConfig("Test", 0.5, (1.0, 2.0), False, False, (1, 2), (3, 4))
+    version = registry.version
+    registry.register("test", config, {"Big": config})
+    assert registry.version == version + 1
+    assert registry.get("TEST", "big") == config
+
+def test_register_rebases_existing_breeds():
+    registry = SpeciesRegistry([CORE])
+    dog = registry.get("dog")
+    assert registry.get("dog", "pug").typical_resting_rr == (15, 40)
+    registry.register("dog", replace(dog, typical_resting_hr=(70, 160), pain_hiding_factor=0.3))
+
+    pug = registry.get("dog", "pug")
+    assert pug.breed_group == "brachycephalic"
+    assert pug.typical_resting_rr == (15, 40)  # Breed override kept
+    assert pug.typical_resting_hr == (70, 160) and pug.pain_hiding_factor == 0.3
+    greyhound = registry.get("dog", "greyhound")
+    assert greyhound.typical_resting_hr == (45, 110)
+    assert greyhound.pain_hiding_factor == 0.3
+    assert registry.get("dog", "labrador") is registry.get("dog")
+
+def test_pack_missing_fields_is_rejected(tmp_path):
+    entry = {k: v for k, v in FERRET.items() if k != "typical_resting_hr"}
+    registry = SpeciesRegistry([_write_pack(tmp_path / "bad.json", {"ferret": entry})])
+    with pytest.raises(ValueError, match="typical_resting_hr"):
+        registry.get("ferret")
+
+def test_module_lookup_uses_shared_registry():
+    assert get_species_config("cat", "persian") is REGISTRY.get("cat", "persian")
+    assert get_species_config("cat", "persian").typical_resting_rr == (24, 40)
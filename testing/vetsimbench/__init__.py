@@ -0,0 +1,36 @@
+"""
+VetSimBench - deterministic benchmark and latency-regression suite
+
+Seeded synthetic patients of several species (``generator``) are grouped
+into one scenario per TriageLevel (``scenarios``) and streamed through
+AiVetPipeline, measuring per-stage latency, throughput and peak memory
+(``harness``). Runs are compared with the baselines in
+``baselines.json``; outputs that differ from the baseline's, or peak
+memory beyond the tolerance, fail the suite. Latency is reported, and
+only gated with ``--benchmark-latency-tolerance``, as timings on a
+shared machine are too noisy to fail on by default.
+
+Run with:
+    pytest testing/vetsimbench/ -v                    # Determinism checks only
+    pytest testing/vetsimbench/ -v --benchmark        # Plus baseline comparison
+    pytest testing/vetsimbench/ -v --update-baseline  # Record new baselines
+
+Part of the Doolittle open-source collective.
+"""
+
+import doolittle._paths  # noqa: F401
+from .generator import Physiology, SyntheticPatient
+from .harness import STAGES, ScenarioReport, calibrate, compare, run_scenario
+from .scenarios import SCENARIOS, Scenario
+
+__all__ = [
+    "Physiology",
+    "SCENARIOS",
+    "STAGES",
+    "Scenario",
+    "ScenarioReport",
+    "SyntheticPatient",
+    "calibrate",
+    "compare",
+    "run_scenario",
+]
@@ -0,0 +1,82 @@
+"""
+Command-line options and shared fixtures of the VetSimBench suite.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from .harness import STAGES, TOTAL, ScenarioReport, load_baselines, save_baselines
+
+REPORTS = pytest.StashKey[List[ScenarioReport]]()
+
+def pytest_addoption(parser):
+    group = parser.getgroup("vetsimbench")
+    group.addoption(
+        "--benchmark", action="store_true",
+        help="Measure every scenario and compare it with the stored baselines",
+    )
+    group.addoption(
+        "--update-baseline", action="store_true",
+        help="Measure every scenario and store the results as the new baselines",
+    )
+    group.addoption(
+        "--benchmark-tolerance", type=float, default=0.10,
+        help="Allowed relative peak memory growth (default 0.10)",
+    )
+    group.addoption(
+        "--benchmark-latency-tolerance", type=float, default=None,
+        help="Also fail on a relative latency slowdown beyond this (default: report only)",
+    )
+    group.addoption("--benchmark-seed", type=int, default=0, help="Seed of the synthetic patients")
+
+def pytest_configure(config):
+    config.stash[REPORTS] = []
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    reports = config.stash.get(REPORTS, [])
+    if not reports:
+        return
+    stages = (*STAGES, TOTAL)
+    terminalreporter.section("VetSimBench (p50 ms per tick)")
+    terminalreporter.write_line(
+        f"{'scenario':>10} " + " ".join(f"{s:>8}" for s in stages)
+        + f" {'items/s':>8} {'peak MB':>8}  levels"
+    )
+    for r in reports:
+        latency = " ".join(f"{r.latency_ms[s]['p50']:8.2f}" for s in stages)
+        memory = float("nan") if r.peak_memory_mb is None else r.peak_memory_mb
+        terminalreporter.write_line(
+            f"{r.scenario:>10} {latency} {r.throughput:8.1f} {memory:8.1f}  {r.levels}"
+        )
+
+@pytest.fixture(scope="session")
+def benchmark_mode(request) -> str:
+    """"update", "compare" or "off"."""
+    if request.config.getoption("--update-baseline"):
+        return "update"
+    return "compare" if request.config.getoption("--benchmark") else "off"
+
+@pytest.fixture(scope="session")
+def seed(request) -> int:
+    return request.config.getoption("--benchmark-seed")
+
+@pytest.fixture(scope="session")
+def tolerance(request) -> float:
+    return request.config.getoption("--benchmark-tolerance")
+
+@pytest.fixture(scope="session")
+def latency_tolerance(request) -> Optional[float]:
+    return request.config.getoption("--benchmark-latency-tolerance")
+
+@pytest.fixture(scope="session")
+def stored_baselines() -> Dict[str, Any]:
+    return load_baselines()
+
+@pytest.fixture(scope="session")
+def reports(request, benchmark_mode) -> List[ScenarioReport]:
+    """Reports measured in this session; saved as the baselines in update mode."""
+    measured = request.config.stash[REPORTS]
+    yield measured
+    if benchmark_mode == "update" and measured:
+        save_baselines(measured)
@@ -0,0 +1,128 @@
+"""
+Seeded synthetic patients: camera frames and vocalization clips.
+
+Frames extend the ``demo.py`` mock (480x640 RGB, uint8) with what the
+vitals primitives look for: a furred background with a patch of
+perfused skin whose color pulses at the heart rate, all of it rising
+and falling with the breath. Clips extend the demo's 16 kHz noise with
+a voiced call whose pitch and cycle jitter grow with severity, which is
+the vocal pain signature.
+
+Everything is drawn from a ``numpy.random.Generator`` seeded per
+patient, so a scenario replays bit for bit.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from species import get_species_config
+
+FUR_RGB = (110.0, 80.0, 55.0)
+SKIN_RGB = (200.0, 140.0, 130.0)
+PULSE_RGB = np.array([0.33, 0.77, 0.53], dtype=np.float32)  # Blood volume pulse per channel
+
+@dataclass(frozen=True)
+class Physiology:
+    """Vital signs and voice of a synthetic patient."""
+    heart_rate_bpm: float
+    respiration_rate_bpm: float
+    pitch_hz: float
+    jitter: float  # Relative cycle-to-cycle period perturbation
+
+    @classmethod
+    def for_severity(cls, species: str, severity: float) -> "Physiology":
+        """
+        Vitals from mid resting range (severity 0) to well above it (1).
+
+        Heart and respiration rates stay inside the estimators' search
+        bands; pitch and jitter cross the vocal pain thresholds (800 Hz,
+        3%) near severity 0.4.
+        """
+        config = get_species_config(species)
+        hr_lo, hr_hi = config.typical_resting_hr
+        rr_lo, rr_hi = config.typical_resting_rr
+        hr_rest, rr_rest = (hr_lo + hr_hi) / 2, (rr_lo + rr_hi) / 2
+        return cls(
+            heart_rate_bpm=hr_rest + severity * (1.4 * hr_hi - hr_rest),
+            respiration_rate_bpm=rr_rest + severity * (1.8 * rr_hi - rr_rest),
+            pitch_hz=500.0 + 700.0 * severity,
+            jitter=0.005 + 0.08 * severity,
+        )
+
+class SyntheticPatient:
+    """
+    Frame and audio source for one patient.
+
+    Example:
+        patient = SyntheticPatient("cat", Physiology.for_severity("cat", 0.8), seed=7)
+        frame = patient.frame(0)
+        clip = patient.clip(0.5)
+
+    Args:
+        species: Species key.
+        physiology: Rates and voice to render.
+        seed: Seed of the patient's random stream.
+        frame_shape: (H, W) of the frames.
+        fps: Frame rate that frame indices are converted at.
+        sample_rate: Audio sample rate.
+    """
+
+    def __init__(
+        self,
+        species: str,
+        physiology: Physiology,
+        seed: int = 0,
+        frame_shape: Tuple[int, int] = (480, 640),
+        fps: float = 30.0,
+        sample_rate: int = 16000,
+    ):
+        self.species = species
+        self.physiology = physiology
+        self.fps = float(fps)
+        self.sample_rate = int(sample_rate)
+        self.rng = np.random.default_rng(seed)
+        h, w = frame_shape
+        texture = self.rng.normal(0.0, 12.0, size=(h, w, 1)).astype(np.float32)
+        self._fur = np.clip(np.asarray(FUR_RGB, dtype=np.float32) + texture, 0, 255)
+        # Skin patch of a tenth of the frame, placed at random away from the edges
+        self._patch = (max(h // 10, 8), max(w // 10, 8))
+        self._origin = (
+            int(self.rng.integers(h // 4, h // 2)),
+            int(self.rng.integers(w // 4, w // 2)),
+        )
+        self._sway = max(h // 120, 1)  # Breathing amplitude in rows
+
+    def frame(self, index: int) -> np.ndarray:
+        """The (H, W, 3) uint8 frame at frame ``index``."""
+        t = index / self.fps
+        p = self.physiology
+        breath = np.sin(2 * np.pi * p.respiration_rate_bpm / 60.0 * t)
+        # Blood absorbs green most, then blue, then red, so the pulse
+        # changes the skin's color and not only its brightness
+        pulse = 1.0 - 0.02 * np.sin(2 * np.pi * p.heart_rate_bpm / 60.0 * t) * PULSE_RGB
+        image = np.roll(self._fur, int(round(self._sway * breath)), axis=0)
+        y, x = self._origin
+        y += int(round(self._sway * breath))
+        ph, pw = self._patch
+        image[y:y + ph, x:x + pw] = np.asarray(SKIN_RGB, dtype=np.float32) * pulse
+        image += 2.0 * self.rng.standard_normal(image.shape[:2] + (1,), dtype=np.float32)
+        return np.clip(image, 0, 255).astype(np.uint8)
+
+    def clip(self, duration_s: float) -> np.ndarray:
+        """A float32 clip of a jittered voiced call over the demo's noise floor."""
+        n = int(round(duration_s * self.sample_rate))
+        p = self.physiology
+        period = self.sample_rate / p.pitch_hz
+        cycles = int(np.ceil(n / (period * (1 - 3 * p.jitter)))) + 1
+        lengths = np.maximum(period * (1 + p.jitter * self.rng.standard_normal(cycles)), 2.0)
+        gains = 1 + p.jitter * self.rng.standard_normal(cycles)
+        # Phase advances one cycle per (jittered) period
+        edges = np.concatenate([[0.0], np.cumsum(lengths)])
+        samples = np.arange(n)
+        cycle = np.minimum(np.searchsorted(edges, samples, side="right") - 1, cycles - 1)
+        phase = (samples - edges[cycle]) / lengths[cycle]
+        voice = 0.3 * gains[cycle] * np.sin(2 * np.pi * phase)
+        noise = self.rng.standard_normal(n) * 0.1
+        return (voice + noise).astype(np.float32)
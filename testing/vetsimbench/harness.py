@@ -0,0 +1,281 @@
+"""
+Per-stage measurement of AiVetPipeline on a scenario, and baseline comparison.
+
+Each tick hands the whole ward to ``process_batch``. The pipeline's
+stages (vision, audio, guardrails, fusion, rules) are timed through a
+telemetry hook; inputs are generated outside the timed region. Latency
+is the per-tick time of each stage and of the whole call after the warm-up
+ticks; throughput is patients analyzed per second. Peak memory is
+traced in a separate, shorter pass because tracing slows allocation.
+
+Every result is reduced to its outputs (status, triage level, rounded
+probability and confidence, symptoms) and hashed, so a replay can be
+checked for determinism and a baseline for changed behavior.
+
+A fixed NumPy workload is timed before and after every tick as a
+reference for the machine's current speed. Latency is compared as the
+median per-tick time in units of that reference, which carries across
+machines better than milliseconds do, but still moves by tens of percent
+on a busy one; it is reported, and gated only on request.
+"""
+
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+import hashlib
+import json
+from pathlib import Path
+import platform
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from pipeline import AiVetPipeline, PipelineContext
+from telemetry import STAGES, StageHook, Telemetry
+
+from .scenarios import Scenario
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+
+TOTAL = "total"
+
+@dataclass
+class ScenarioReport:
+    """Measurements of one scenario run."""
+    scenario: str
+    seed: int
+    ticks: int
+    patients: int
+    latency_ms: Dict[str, Dict[str, float]]  # Stage (and "total") -> {"p50", "p95"}
+    relative: Dict[str, float]               # Stage -> median per-tick time / reference time
+    throughput: float                        # Patients analyzed per second
+    peak_memory_mb: Optional[float]
+    levels: Dict[str, int]                   # Final triage level -> patients
+    calibration_ms: float                    # Median reference time during the run
+    digest: str = ""
+    outputs: List[List[Any]] = field(default_factory=list, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        del out["outputs"]
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScenarioReport":
+        return cls(**data)
+
+class _StageClock(StageHook):
+    """Accumulates time spent in each pipeline stage."""
+
+    def __init__(self):
+        self.elapsed = dict.fromkeys(STAGES, 0.0)
+
+    def after(self, stage: str, species: str, items: int, seconds: float) -> None:
+        self.elapsed[stage] += seconds
+
+    def reset(self) -> None:
+        for stage in self.elapsed:
+            self.elapsed[stage] = 0.0
+
+def _output(result: Dict[str, Any]) -> List[Any]:
+    """The deterministic part of a per-item result (no timestamps)."""
+    triage = result.get("triage", {})
+    probability, confidence = triage.get("pain_probability"), triage.get("confidence")
+    return [
+        result["session_id"],
+        triage.get("status", "ok"),
+        triage.get("triage_level"),
+        None if probability is None else round(probability, 4),
+        None if confidence is None else round(confidence, 4),
+        triage.get("symptoms", []),
+    ]
+
+def _percentiles(times: List[float]) -> Dict[str, float]:
+    ms = np.asarray(times) * 1e3
+    return {"p50": float(np.percentile(ms, 50)), "p95": float(np.percentile(ms, 95))}
+
+_REFERENCE_RNG = np.random.default_rng(0)
+_REFERENCE_SIGNAL = _REFERENCE_RNG.standard_normal((64, 1024)).astype(np.float32)
+_REFERENCE_MATRIX = _REFERENCE_RNG.standard_normal((128, 128)).astype(np.float32)
+
+def calibrate() -> float:
+    """Time (ms) of a fixed FFT, matmul and sort workload, the machine's speed reference."""
+    start = time.perf_counter()
+    np.abs(np.fft.rfft(_REFERENCE_SIGNAL, axis=1)).sum()
+    (_REFERENCE_MATRIX @ _REFERENCE_MATRIX).sum()
+    np.sort(_REFERENCE_SIGNAL, axis=None)
+    return (time.perf_counter() - start) * 1e3
+
+def _inputs(patients, tick: int, clip_s: float):
+    images = np.stack([p.frame(tick) for p in patients])
+    clips = [p.clip(clip_s) for p in patients]
+    offsets = np.concatenate([[0], np.cumsum([len(c) for c in clips])])
+    return images, np.concatenate(clips), offsets
+
+def _pipeline(scenario: Scenario, *hooks: StageHook) -> AiVetPipeline:
+    context = PipelineContext(
+        session_id=f"vetsimbench-{scenario.name}", species=scenario.species[0]
+    )
+    options = dict(scenario.pipeline_options)
+    if hooks:
+        options["telemetry"] = Telemetry(hooks=hooks)
+    return AiVetPipeline(context, **options)
+
+def _peak_memory_mb(scenario: Scenario, seed: int, ticks: int) -> float:
+    pipeline = _pipeline(scenario)
+    patients = scenario.patients(seed)
+    session_ids = [f"patient-{i}" for i in range(len(patients))]
+    species = [p.species for p in patients]
+    batches = [_inputs(patients, t, scenario.clip_s) for t in range(ticks)]
+    tracemalloc.start()
+    try:
+        for images, audio, offsets in batches:
+            pipeline.process_batch(images, audio, offsets, session_ids, species)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+def run_scenario(
+    scenario: Scenario,
+    seed: int = 0,
+    ticks: Optional[int] = None,
+    memory: bool = True,
+) -> ScenarioReport:
+    """
+    Stream a scenario through a fresh pipeline and measure it.
+
+    Args:
+        scenario: Workload to run.
+        seed: Seed of the synthetic patients.
+        ticks: Number of ticks; defaults to the scenario's.
+        memory: Also trace peak memory (a second pass of the warm-up
+            ticks plus a few more).
+    """
+    ticks = scenario.ticks if ticks is None else ticks
+    warmup = min(scenario.warmup_ticks, max(ticks - 1, 0))
+    clock = _StageClock()
+    pipeline = _pipeline(scenario, clock)
+    patients = scenario.patients(seed)
+    session_ids = [f"patient-{i}" for i in range(len(patients))]
+    species = [p.species for p in patients]
+
+    times: Dict[str, List[float]] = {stage: [] for stage in (*STAGES, TOTAL)}
+    reference: List[float] = []
+    outputs: List[List[Any]] = []
+    results: List[Dict[str, Any]] = []
+    for tick in range(ticks):
+        images, audio, offsets = _inputs(patients, tick, scenario.clip_s)
+        clock.reset()
+        before = calibrate()
+        start = time.perf_counter()
+        results = pipeline.process_batch(images, audio, offsets, session_ids, species)
+        elapsed = time.perf_counter() - start
+        after = calibrate()
+        outputs.extend([tick] + _output(r) for r in results)
+        if tick >= warmup:
+            reference.append((before + after) / 2e3)
+            times[TOTAL].append(elapsed)
+            for stage, seconds in clock.elapsed.items():
+                times[stage].append(seconds)
+
+    measured = times[TOTAL]
+    digest = hashlib.sha256(json.dumps(outputs).encode()).hexdigest()
+    return ScenarioReport(
+        scenario=scenario.name,
+        seed=seed,
+        ticks=ticks,
+        patients=len(patients),
+        latency_ms={stage: _percentiles(t) for stage, t in times.items() if t},
+        relative={
+            stage: float(np.median(np.asarray(t) / reference)) for stage, t in times.items() if t
+        },
+        throughput=len(patients) * len(measured) / sum(measured) if measured else 0.0,
+        peak_memory_mb=_peak_memory_mb(scenario, seed, warmup + 5) if memory else None,
+        levels=dict(Counter(str(r["triage"].get("triage_level")) for r in results)),
+        calibration_ms=float(np.median(reference) * 1e3) if reference else 0.0,
+        digest=digest,
+        outputs=outputs,
+    )
+
+
+def machine() -> Dict[str, str]:
+    """What a baseline was recorded on."""
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+def load_baselines(path: Union[str, Path] = BASELINE_PATH) -> Dict[str, Any]:
+    """Stored baselines, or an empty set if none were recorded."""
+    path = Path(path)
+    if not path.is_file():
+        return {"scenarios": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baselines(reports: List[ScenarioReport], path: Union[str, Path] = BASELINE_PATH) -> None:
+    """Record reports as baselines, keeping stored scenarios that were not rerun."""
+    baselines = load_baselines(path)
+    baselines["machine"] = machine()
+    baselines["scenarios"].update({r.scenario: r.to_dict() for r in reports})
+    baselines["scenarios"] = dict(sorted(baselines["scenarios"].items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baselines, f, indent=2)
+        f.write("\n")
+
+def latency_change(report: ScenarioReport, baseline: ScenarioReport) -> Dict[str, float]:
+    """Relative change of each stage's (and the total) reference-scaled time."""
+    return {
+        stage: now / baseline.relative[stage] - 1
+        for stage, now in report.relative.items()
+        if baseline.relative.get(stage)
+    }
+
+def compare(
+    report: ScenarioReport,
+    baseline: ScenarioReport,
+    tolerance: float = 0.10,
+    latency_tolerance: Optional[float] = None,
+) -> List[str]:
+    """
+    Regressions of a run against its baseline, as messages (empty if none).
+
+    Outputs and peak memory are deterministic and always gated. Latency
+    is gated only when ``latency_tolerance`` is given: even in units of
+    the reference workload, a busy machine moves the median by 20% or
+    more between runs. The latency gate is the whole ``process_batch``
+    call; a failure lists every stage's change to show where the time
+    went.
+
+    Args:
+        report: The run.
+        baseline: The stored run of the same scenario.
+        tolerance: Allowed relative peak memory growth.
+        latency_tolerance: Allowed relative slowdown; None reports
+            latency (see ``latency_change``) without gating it.
+    """
+    regressions = []
+    same_run = (report.seed, report.ticks) == (baseline.seed, baseline.ticks)
+    if same_run and report.digest != baseline.digest:
+        regressions.append(
+            f"{report.scenario}: outputs differ from the baseline (levels {report.levels}, "
+            f"baseline {baseline.levels})"
+        )
+    change = latency_change(report, baseline)
+    if latency_tolerance is not None and change.get(TOTAL, 0.0) > latency_tolerance:
+        stages = ", ".join(f"{stage} {c:+.0%}" for stage, c in change.items())
+        regressions.append(
+            f"{report.scenario}: latency {change[TOTAL]:+.0%} over the baseline "
+            f"(tolerance {latency_tolerance:.0%}; {stages})"
+        )
+    if report.peak_memory_mb is not None and baseline.peak_memory_mb is not None:
+        if report.peak_memory_mb > baseline.peak_memory_mb * (1 + tolerance):
+            regressions.append(
+                f"{report.scenario}: peak memory {report.peak_memory_mb:.1f} MB vs "
+                f"{baseline.peak_memory_mb:.1f} MB baseline"
+            )
+    return regressions
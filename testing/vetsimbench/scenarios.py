@@ -0,0 +1,68 @@
+"""
+Benchmark scenarios, one per TriageLevel.
+
+A scenario is a ward of synthetic patients of several species, all
+presenting at the severity of one triage level, streamed through the
+pipeline as one ``process_batch`` call per tick (a frame and an audio
+clip per patient). The severity is what the patients are rendered with;
+the level the pipeline actually reaches is part of the measured output.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from schema import TriageLevel
+
+from .generator import Physiology, SyntheticPatient
+
+_LEVEL_INDEX = {level: i for i, level in enumerate(TriageLevel)}
+
+@dataclass(frozen=True)
+class Scenario:
+    """A seeded, fixed-size workload."""
+    name: str
+    level: TriageLevel  # Level the patients are meant to present at
+    severity: float     # 0 (calm) to 1 (critical), see Physiology.for_severity
+    species: Tuple[str, ...] = ("cat", "dog", "rabbit")
+    patients_per_species: int = 2
+    ticks: int = 45
+    warmup_ticks: int = 5  # Excluded from latency (primitives are built lazily)
+    clip_s: float = 0.5
+    frame_shape: Tuple[int, int] = (480, 640)
+    fps: float = 30.0
+    pipeline_options: Dict[str, Any] = field(default_factory=dict, hash=False)
+
+    @property
+    def n_patients(self) -> int:
+        return len(self.species) * self.patients_per_species
+
+    def patients(self, seed: int) -> List[SyntheticPatient]:
+        """The ward, each patient with its own stream derived from ``seed``."""
+        seeds = np.random.SeedSequence([seed, _LEVEL_INDEX[self.level]]).spawn(self.n_patients)
+        patients = []
+        for i in range(self.n_patients):
+            species = self.species[i % len(self.species)]
+            patients.append(SyntheticPatient(
+                species,
+                Physiology.for_severity(species, self.severity),
+                seed=int(seeds[i].generate_state(1)[0]),
+                frame_shape=self.frame_shape,
+                fps=self.fps,
+            ))
+        return patients
+
+# Severities at which the default ward settles at (or next to) each level
+SEVERITY: Dict[TriageLevel, float] = {
+    TriageLevel.ROUTINE: 0.0,
+    TriageLevel.LOW: 0.5,
+    TriageLevel.MODERATE: 0.65,
+    TriageLevel.URGENT: 0.8,
+    TriageLevel.EMERGENCY: 1.0,
+}
+
+SCENARIOS: Dict[str, Scenario] = {
+    level.value: Scenario(name=level.value, level=level, severity=severity)
+    for level, severity in SEVERITY.items()
+}
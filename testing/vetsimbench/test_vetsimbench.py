@@ -0,0 +1,50 @@
+"""
+VetSimBench: determinism of the synthetic workload and of the pipeline,
+and, with ``--benchmark``, regressions against the stored baselines.
+"""
+
+import warnings
+
+import numpy as np
+import pytest
+
+from .generator import Physiology, SyntheticPatient
+from .harness import TOTAL, ScenarioReport, compare, latency_change, run_scenario
+from .scenarios import SCENARIOS
+
+SHORT_TICKS = 8  # Enough to get past the warm-up and fuse vitals with audio
+
+def test_patients_are_seeded():
+    physiology = Physiology.for_severity("dog", 0.5)
+    a, b, c = (SyntheticPatient("dog", physiology, seed=s) for s in (1, 1, 2))
+    assert np.array_equal(a.frame(3), b.frame(3))
+    assert np.array_equal(a.clip(0.25), b.clip(0.25))
+    assert not np.array_equal(a.frame(3), c.frame(3))
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_deterministic_outputs(name, seed):
+    first = run_scenario(SCENARIOS[name], seed, ticks=SHORT_TICKS, memory=False)
+    second = run_scenario(SCENARIOS[name], seed, ticks=SHORT_TICKS, memory=False)
+    diverged = [(a, b) for a, b in zip(first.outputs, second.outputs) if a != b]
+    assert not diverged, f"replay diverged, first at {diverged[0]}"
+    assert first.digest == second.digest
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_benchmark(
+    name, benchmark_mode, seed, tolerance, latency_tolerance, stored_baselines, reports
+):
+    if benchmark_mode == "off":
+        pytest.skip("pass --benchmark to compare with the baselines")
+    report = run_scenario(SCENARIOS[name], seed)
+    reports.append(report)
+    if benchmark_mode == "update":
+        return
+    stored = stored_baselines["scenarios"].get(name)
+    if stored is None:
+        pytest.fail(f"No baseline for scenario '{name}'; record one with --update-baseline")
+    baseline = ScenarioReport.from_dict(stored)
+    regressions = compare(report, baseline, tolerance, latency_tolerance)
+    assert not regressions, "\n".join(regressions)
+    slowdown = latency_change(report, baseline).get(TOTAL, 0.0)
+    if slowdown > tolerance:
+        warnings.warn(f"{name}: latency {slowdown:+.0%} over the baseline (not gated)")